@@ -4,6 +4,7 @@ import logging
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi.responses import PlainTextResponse
 
 from app.api.deps import get_db_session, verify_job_secret
 from app.schemas import (
@@ -15,6 +16,7 @@ from app.schemas import (
 from app.redis_client import redis_client
 from app.crud import major_map_crud
 from app.database import SessionLocal
+from app.utils.catalog_version import bump_catalog_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -78,7 +80,8 @@ async def flush_cache(
 async def flush_and_sync_cache(
     _: bool = Depends(verify_job_secret)
 ):
-    """Flush all cache and trigger background sync from DB (qualification + stats → fastcert:*)."""
+    """Flush all cache and trigger background sync from DB (qualification + stats → fastcert:*).
+    동기화는 FAST_SYNC_BATCH_SIZE 단위 청크 파이프라인으로 진행되며 /admin/sync/progress로 확인."""
     if not redis_client.is_connected():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -100,6 +103,7 @@ async def flush_and_sync_cache(
         finally:
             db.close()
 
+    bump_catalog_version()
     asyncio.create_task(_run_sync())
     logger.info("Cache flushed; background Redis sync started.")
     return SyncStatsResponse(
@@ -109,6 +113,46 @@ async def flush_and_sync_cache(
     )
 
 
+@router.get(
+    "/sync/progress",
+    summary="Fast sync progress",
+    description="Progress of the current (or last) chunked fastcert:* Redis sync."
+)
+async def fast_sync_progress(
+    _: bool = Depends(verify_job_secret)
+):
+    """FastSyncService 진행 상황 (batches/processed/written/skipped/last_qual_id)."""
+    from app.services.fast_sync_service import FastSyncService
+    return FastSyncService.get_progress()
+
+
+@router.get(
+    "/sync/stream",
+    summary="Cert update stream lag",
+    description="Length, pending count and consumer-group lag of the cert_updates Redis stream plus worker metrics."
+)
+async def cert_update_stream_lag(
+    _: bool = Depends(verify_job_secret)
+):
+    """cert_updates 스트림 lag/pending 및 redis_sync_worker 처리 지표."""
+    from app.redis_sync_worker import get_stream_lag
+    return get_stream_lag()
+
+
+@router.get(
+    "/metrics/stages",
+    summary="Pipeline stage timings",
+    description="Per-stage call counts, latency and memo cache hit rates for staged pipelines (hybrid recommendation)."
+)
+async def pipeline_stage_metrics(
+    _: bool = Depends(verify_job_secret)
+):
+    """단계별 누적 소요 시간(count/avg_ms/max_ms/cache_hits)과 단계 memo 캐시 통계."""
+    from app.api.ai_recommendations import get_hybrid_stage_cache_stats
+    from app.utils.stage_cache import get_stage_stats
+    return {"stages": get_stage_stats(), "caches": get_hybrid_stage_cache_stats()}
+
+
 @router.post(
     "/sync/stats",
     response_model=SyncStatsResponse,
@@ -130,6 +174,7 @@ async def sync_stats(
         "Stats sync: invalidated certs cache certs:stats=%s certs:trends=%s certs:detail=%s",
         n_stats, n_trends, n_detail,
     )
+    bump_catalog_version()
 
     # In production, this would also:
     # 1. Queue a background job to fetch from external sources
@@ -143,6 +188,23 @@ async def sync_stats(
     )
 
 
+@router.get(
+    "/metrics/db",
+    summary="DB pool and query metrics",
+    description="Connection-pool gauges, checkout wait, per-statement latency and per-endpoint query counts. format=prometheus returns Prometheus text format."
+)
+async def db_metrics(
+    format: str = "json",
+    top: int = 30,
+    _: bool = Depends(verify_job_secret)
+):
+    """풀 게이지(size/in_use/overflow)·checkout 대기·statement별 지연·엔드포인트별 쿼리 수."""
+    from app.utils.db_metrics import get_db_metrics, render_prometheus
+    if format == "prometheus":
+        return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+    return get_db_metrics(top_statements=top)
+
+
 @router.post(
     "/rebuild/recommendations",
     response_model=RebuildRecommendationsResponse,
@@ -164,6 +226,7 @@ async def rebuild_recommendations(
     # Invalidate recommendation cache
     deleted = redis_client.delete_pattern("recs:*")
     logger.info(f"Invalidated {deleted} recommendation cache keys")
+    bump_catalog_version()
     
     return RebuildRecommendationsResponse(
         success=True,
@@ -5,9 +5,11 @@ import os
 import re
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
@@ -31,6 +33,10 @@ from app.schemas import (
 )
 from app.crud import favorite_crud, acquired_cert_crud, get_qualification_aggregated_stats_bulk
 from app.redis_client import redis_client
+from app.services.cert_embedding_matrix import get_cert_embedding_matrix
+from app.services.major_index import NGRAM_MIN_SIMILARITY, resolve_majors
+from app.utils.catalog_version import get_catalog_version
+from app.utils.stage_cache import StageCache, StageTimer
 from app.rag.config import get_rag_settings
 from app.rag.utils.dense_query_rewrite import UserProfile
 from app.rag.utils.hybrid_recommend_query import build_expanded_interest_for_hybrid
@@ -43,6 +49,41 @@ HYBRID_TOP_PER_QUERY = 30            # certificates_vectors에서 질의당 가
 HYBRID_GLOBAL_RESULTS_LIMIT = 80     # RRF 이후 전역 후보에서 사용할 상위 결과 수
 HYBRID_CANDIDATE_TRIM_LIMIT = 120    # major/semantic 통합 후 유지할 최대 후보 수
 
+# 하이브리드 추천 단계별 memo (app.utils.stage_cache)
+HYBRID_RRF_K = 60
+MAJOR_CANDIDATE_LIMIT = 60
+# 취득 자격증 제외 전 여유분 (acquired_cert_crud 조회 page_size=200에 맞춤)
+_MAJOR_CANDIDATE_FETCH = MAJOR_CANDIDATE_LIMIT + 200
+_major_candidate_cache = StageCache("hybrid.major_candidates", max_size=512, ttl_seconds=3600)
+_rag_candidate_cache = StageCache("hybrid.rag_candidates", max_size=256, ttl_seconds=600)
+
+_MAJOR_CANDIDATES_SQL = text("""
+    SELECT q.qual_id, q.qual_name, q.qual_type, q.main_field,
+           mq.score AS mapping_score, mq.weight AS mapping_weight, mq.reason
+    FROM qualification q
+    JOIN major_qualification_map mq ON q.qual_id = mq.qual_id
+    WHERE mq.major = :major
+    ORDER BY mq.score DESC
+    LIMIT :limit
+""")
+# 퍼지 해석된 전공 전체에서 자격증별 최고 매핑 1건 (기존 pg_trgm DISTINCT ON 쿼리와 같은 정렬)
+_FUZZY_MAJOR_CANDIDATES_SQL = text("""
+    SELECT DISTINCT ON (q.qual_id)
+           q.qual_id, q.qual_name, q.qual_type, q.main_field,
+           mq.score AS mapping_score, mq.weight AS mapping_weight, mq.reason
+    FROM qualification q
+    JOIN major_qualification_map mq ON q.qual_id = mq.qual_id
+    WHERE mq.major = ANY(:majors)
+    ORDER BY q.qual_id, mq.score DESC
+    LIMIT :limit
+""")
+
+
+def get_hybrid_stage_cache_stats() -> Dict[str, dict]:
+    """단계 memo 캐시 통계 (admin 모니터링용)."""
+    return {c.name: c.stats() for c in (_major_candidate_cache, _rag_candidate_cache)}
+
+
 # 고도화 RAG( app.rag hybrid_retrieve ) ON/OFF.
 # - 기본값: ON (환경변수 미설정 시 True)
 # - 비활성화하고 싶을 때만 USE_ENHANCED_RAG=0 / false 로 설정
@@ -96,7 +137,10 @@ def _ai_recommend_hybrid_retrieve_kwargs(*, guest: bool = False) -> Dict[str, An
 
 
 def _major_sim_lookup_sync(major_vector: Any, qual_ids: List[int]) -> Dict[int, float]:
-    """전공 임베딩으로 qual_id 집합에 대한 major_sim 한 번에 조회 (별도 세션)."""
+    """
+    전공 임베딩으로 qual_id 집합에 대한 major_sim 한 번에 조회.
+    in-process 임베딩 행렬이 준비돼 있으면 행렬-벡터 곱(같은 전공은 memo 적중), 아니면 DB 집계 (별도 세션).
+    """
     if not qual_ids or major_vector is None:
         return {}
     from app.database import SessionLocal
@@ -104,6 +148,11 @@ def _major_sim_lookup_sync(major_vector: Any, qual_ids: List[int]) -> Dict[int,
     uniq = list(dict.fromkeys(int(x) for x in qual_ids if x is not None))
     if not uniq:
         return {}
+    matrix = get_cert_embedding_matrix()
+    if matrix is not None:
+        sims = matrix.lookup(major_vector, uniq)
+        if sims is not None:
+            return sims
     db = SessionLocal()
     try:
         major_sim_sql = text("""
@@ -122,31 +171,21 @@ def _major_sim_lookup_sync(major_vector: Any, qual_ids: List[int]) -> Dict[int,
         db.close()
 
 
-def _run_enhanced_rag_sync(
-    major: str,
+def _enhanced_rag_scores_sync(
     expanded_interest: str,
-    acq_qual_ids: List[int],
-    user_profile: Optional[UserProfile] = None,
-    guest_mode: int = 0,
+    user_profile: Optional[UserProfile],
+    guest: bool,
 ) -> tuple:
     """
-    동기 고도화 RAG(hybrid_retrieve만). 전공 임베딩은 비동기 라우트에서 RAG와 병렬 호출.
-    guest_mode=1: 비로그인 — 채널 cap·rag_top_k 축소로 응답 시간 단축(상위 3건 미리보기에 맞춤).
-    성공 시 (global_results, rag_qual_ids_for_major_sim), 실패 시 (None, None).
+    hybrid_retrieve 1회 → (qual_id별 점수 합 [(qid, score), ...] 등장 순, qual_id→이름, rag_top_k, 이름 조회 성공 여부).
+    취득 자격증 제외 전 결과라 같은 질의·프로필이면 취득 목록이 달라도 재사용 가능. 실패 시 예외.
     """
     from app.database import SessionLocal
     from app.rag.config import get_rag_settings
     from app.rag.retrieve.hybrid import hybrid_retrieve
 
-    guest = bool(guest_mode)
     db = SessionLocal()
     try:
-        acq_set: set[int] = set()
-        for x in acq_qual_ids or []:
-            try:
-                acq_set.add(int(x))
-            except (TypeError, ValueError):
-                continue
         trace_on = getattr(get_rag_settings(), "RAG_PRE_RETRIEVAL_TRACE_ENABLE", False)
         pre_trace: Optional[Dict[str, Any]] = {} if trace_on else None
         hybrid_kw: Dict[str, Any] = {
@@ -177,25 +216,84 @@ def _run_enhanced_rag_sync(
                 pre_trace.get("query_type"),
                 pre_trace.get("rewrite_skipped"),
             )
-        hybrid_rrf_scores = {}
+        hybrid_rrf_scores: Dict[int, float] = {}
         for chunk_id, score in (rag_list or []):
             part = (chunk_id or "").split(":")
             if len(part) >= 1 and part[0].isdigit():
                 qid = int(part[0])
-                if qid in acq_set:
-                    continue
                 hybrid_rrf_scores[qid] = hybrid_rrf_scores.get(qid, 0.0) + float(score)
-        hybrid_qual_names = {}
-        rag_qual_ids = list(hybrid_rrf_scores.keys())
+        hybrid_qual_names: Dict[int, str] = {}
+        names_ok = True
         if hybrid_rrf_scores:
             try:
                 name_rows = db.execute(
                     text("SELECT qual_id, qual_name FROM qualification WHERE qual_id = ANY(:ids)"),
-                    {"ids": rag_qual_ids},
+                    {"ids": list(hybrid_rrf_scores.keys())},
                 ).fetchall()
                 hybrid_qual_names = {r.qual_id: (r.qual_name or "").strip() for r in name_rows}
             except Exception:
-                pass
+                names_ok = False
+        return (tuple(hybrid_rrf_scores.items()), hybrid_qual_names, rag_top_k, names_ok)
+    finally:
+        db.close()
+
+
+def _rag_candidates_stage(
+    expanded_interest: str,
+    user_profile: Optional[UserProfile],
+    guest: bool,
+    timer: Optional[StageTimer] = None,
+) -> tuple:
+    """
+    2단계: RAG 후보. 확장 관심사 질의(+비로그인 여부, 프로필 지문)로 memo.
+    비로그인은 같은 전공·관심사면 공유, 로그인 사용자는 개인화 soft score 입력(프로필)이 같을 때만 공유.
+    RAG 설정 fingerprint(A/B arm별로 다름)·카탈로그 버전(수정·재색인 시 변경)도 키에 넣어 arm 간·버전 간 공유를 막는다.
+    """
+    profile_fp = orjson.dumps(user_profile, option=orjson.OPT_SORT_KEYS) if user_profile else b""
+    key = (
+        get_catalog_version(),
+        get_rag_settings().fingerprint,
+        expanded_interest,
+        guest,
+        profile_fp,
+        _ai_recommend_rag_fast_enabled(),
+    )
+    hit, value = _rag_candidate_cache.get(key)
+    if timer is not None:
+        timer.mark_cache("rag", hit)
+    if hit:
+        return value
+    value = _enhanced_rag_scores_sync(expanded_interest, user_profile, guest)
+    if value[3]:
+        _rag_candidate_cache.set(key, value)
+    return value
+
+
+def _run_enhanced_rag_sync(
+    major: str,
+    expanded_interest: str,
+    acq_qual_ids: List[int],
+    user_profile: Optional[UserProfile] = None,
+    guest_mode: int = 0,
+    timer: Optional[StageTimer] = None,
+) -> tuple:
+    """
+    동기 고도화 RAG(hybrid_retrieve만). 전공 임베딩은 비동기 라우트에서 RAG와 병렬 호출.
+    guest_mode=1: 비로그인 — 채널 cap·rag_top_k 축소로 응답 시간 단축(상위 3건 미리보기에 맞춤).
+    성공 시 (global_results, rag_qual_ids_for_major_sim), 실패 시 (None, None).
+    """
+    try:
+        acq_set: set[int] = set()
+        for x in acq_qual_ids or []:
+            try:
+                acq_set.add(int(x))
+            except (TypeError, ValueError):
+                continue
+        scored, hybrid_qual_names, rag_top_k, _ = _rag_candidates_stage(
+            expanded_interest, user_profile, bool(guest_mode), timer
+        )
+        hybrid_rrf_scores = {qid: sc for qid, sc in scored if qid not in acq_set}
+        rag_qual_ids = list(hybrid_rrf_scores.keys())
         limit_out = rag_top_k
         global_results = [
             type("Row", (), {"qual_id": qid, "qual_name": hybrid_qual_names.get(qid, ""), "similarity": sc})()
@@ -205,8 +303,6 @@ def _run_enhanced_rag_sync(
     except Exception as e:
         logger.warning("_run_enhanced_rag_sync failed: %s", e, exc_info=True)
         return (None, None)
-    finally:
-        db.close()
 
 
 @router.get("/semantic-search", response_model=SemanticSearchResponse)
@@ -254,15 +350,302 @@ async def semantic_search(
 GUEST_RESULT_LIMIT = 3  # 비로그인 사용자에게 보여줄 최대 결과 수
 
 
+def _major_candidates_response(
+    major: str,
+    interest: Optional[str],
+    major_results: List[Any],
+    acq_qual_ids: set[int],
+    user_id: Optional[str],
+    limit: int,
+) -> HybridRecommendationResponse:
+    """스트리밍 1단계: 전공 매핑 점수 순 후보 (RAG·통계 보정 전 잠정 순위)."""
+    effective_limit = min(limit, GUEST_RESULT_LIMIT) if not user_id else limit
+    items: List[HybridRecommendationItem] = []
+    for r in major_results:
+        if r.qual_id in acq_qual_ids:
+            continue
+        raw = float(r.mapping_score or 0.0)
+        items.append(
+            HybridRecommendationItem(
+                qual_id=r.qual_id,
+                qual_name=r.qual_name,
+                major_score=raw,
+                reason=r.reason or "전공 맞춤형 자격증",
+                semantic_similarity=0.0,
+                hybrid_score=max(0.0, min(1.0, raw / 10.0)),
+                major_score_normalized=max(0.0, min(1.0, raw / 10.0)),
+            )
+        )
+        if len(items) >= effective_limit:
+            break
+    return HybridRecommendationResponse(
+        mode="hybrid",
+        major=major,
+        interest=interest,
+        results=items,
+        guest_limited=not bool(user_id),
+        retrieval_pipeline="major_map",
+    )
+
+
+def _major_candidate_rows(db: Session, major_name: str) -> list:
+    return db.execute(
+        _MAJOR_CANDIDATES_SQL, {"major": major_name, "limit": _MAJOR_CANDIDATE_FETCH}
+    ).fetchall()
+
+
+def _load_major_candidates(db: Session, major: str) -> tuple:
+    """전공 매핑 후보 (취득 제외 전). 정확히 일치하는 전공이 없으면 인메모리 전공 인덱스로 퍼지 해석."""
+    rows = _major_candidate_rows(db, major)
+    if rows:
+        return tuple(rows)
+    # 인메모리 전공 인덱스로 퍼지 해석 (기존 pg_trgm similarity > 0.35 전체 스캔 대체): 임계값을 넘는 전공 전부 사용
+    try:
+        matches = [m for m in resolve_majors(major, NGRAM_MIN_SIMILARITY) if m.major != major]
+        if matches:
+            rows = db.execute(
+                _FUZZY_MAJOR_CANDIDATES_SQL,
+                {"majors": [m.major for m in matches], "limit": _MAJOR_CANDIDATE_FETCH},
+            ).fetchall()
+            if rows:
+                logger.info(
+                    "fuzzy major match for %r -> %d majors (best %r, %s, confidence=%.2f): found %d certs",
+                    major, len(matches), matches[0].major, matches[0].method, matches[0].confidence, len(rows),
+                )
+    except Exception as fuzzy_err:
+        logger.warning("fuzzy major search skipped for %r: %s", major, fuzzy_err)
+        rows = []
+    return tuple(rows)
+
+
+def _major_candidates_stage(db: Session, major: str, acq_qual_ids: set[int], timer: StageTimer) -> list:
+    """
+    1단계: 전공 매핑 후보. 전공명(+카탈로그 버전)만으로 memo → 관심사·취득 자격증이 다른 사용자도 공유.
+    취득 자격증 제외와 상위 MAJOR_CANDIDATE_LIMIT개 절단은 memo 이후 요청별로 적용.
+    """
+    key = (get_catalog_version(), major)
+    hit, rows = _major_candidate_cache.get(key)
+    timer.mark_cache("major_candidates", hit)
+    if not hit:
+        rows = _load_major_candidates(db, major)
+        _major_candidate_cache.set(key, rows)
+    return [r for r in rows if r.qual_id not in acq_qual_ids][:MAJOR_CANDIDATE_LIMIT]
+
+
+def _classify_query_and_expand(q_text: str) -> tuple[float, float, str]:
+    """
+    질의 타입에 따라 Dense/Sparse 가중치와 풀텍스트용 확장 질의를 결정.
+    - w_d: Dense(OpenAI) 가중치
+    - w_s: Sparse(키워드) 가중치
+    - expanded: 풀텍스트에 사용할 문자열 (간단한 동의어 확장 포함)
+    """
+    q = (q_text or "").strip()
+    base = q
+    # 간단한 동의어/키워드 확장 (plainto_tsquery에 들어가므로 공백 구분만 사용)
+    if "정보처리기사" in q:
+        base = "정보처리기사 정보처리"
+    elif q.upper() == "SQL" or "SQL" in q:
+        base = "SQL 데이터베이스"
+    elif "간호" in q:
+        base = "간호사 간호"
+
+    tokens = q.split()
+    is_short = len(tokens) <= 2 and len(q) <= 8
+    has_cert_suffix = any(s in q for s in ["기사", "산업기사", "기능사"])
+    is_keywordy = is_short or has_cert_suffix or q.upper() == "SQL" or "컴퓨터" in q
+
+    if is_keywordy:
+        # 토큰이 명확한 쿼리: Sparse 비중을 조금 더 높인다.
+        w_d, w_s = 1.0, 1.2
+    else:
+        # 설명형/서술형 쿼리: Dense 비중을 높인다.
+        w_d, w_s = 1.3, 0.7
+    return w_d, w_s, base
+
+def _hybrid_rrf_from_certificates_vectors(
+    db: Session,
+    queries: List[str],
+    query_vectors: List[List[float]],
+    exclude_qual_ids: List[int],
+    top_per_query: int = HYBRID_TOP_PER_QUERY,
+    use_fulltext: bool = True,
+) -> tuple[dict[int, float], dict[int, str]]:
+    """
+    certificates_vectors에서 벡터 검색 + tsvector 풀텍스트 검색을 결합하고
+    RRF: Score = w_d/(K+rank_vector) + w_s/(K+rank_text) 로 융합.
+    반환: (qual_id -> RRF 점수 합계, qual_id -> qual_name)
+    """
+    qual_rrf: dict[int, float] = {}
+    qual_names: dict[int, str] = {}
+    use_github_rrf = os.environ.get("RECOMMENDATION_USE_GITHUB_RRF") == "1"
+    for qi, (q_text, q_vec) in enumerate(zip(queries, query_vectors)):
+        if use_github_rrf:
+            w_d, w_s, expanded_q = 1.0, 1.0, (q_text or "").strip()
+        else:
+            w_d, w_s, expanded_q = _classify_query_and_expand(q_text)
+        # 벡터 검색 (HNSW cosine), 거리 순으로 정렬 후 qual_id별 첫 등장 순위 사용
+        _vec_exclude = "AND qual_id != ALL(:exclude_ids)" if exclude_qual_ids else ""
+        vec_sql = text(f"""
+            SELECT qual_id, name, 1 - (embedding <=> :vec) AS similarity
+            FROM certificates_vectors
+            WHERE embedding IS NOT NULL
+              {_vec_exclude}
+            ORDER BY embedding <=> :vec
+            LIMIT :limit
+        """)
+        params_v = {"vec": str(q_vec), "limit": top_per_query}
+        if exclude_qual_ids:
+            params_v["exclude_ids"] = exclude_qual_ids
+        vec_rows = db.execute(vec_sql, params_v).fetchall()
+        seen_v: set[int] = set()
+        vec_rank_list: List[int] = []
+        for r in vec_rows:
+            if r.qual_id not in seen_v:
+                seen_v.add(r.qual_id)
+                vec_rank_list.append(r.qual_id)
+                qual_names[r.qual_id] = getattr(r, "name", "") or ""
+        vec_rank_map = {qid: i + 1 for i, qid in enumerate(vec_rank_list)}
+
+        text_rank_map: dict[int, int] = {}
+        if use_fulltext:
+            # 풀텍스트 검색 (content_tsv) — content_tsv 컬럼이 있을 때만
+            try:
+                _ft_exclude = "AND qual_id != ALL(:exclude_ids)" if exclude_qual_ids else ""
+                ft_sql = text(f"""
+                    SELECT qual_id, name,
+                           ts_rank_cd(content_tsv, plainto_tsquery('simple', :q)) AS rank
+                    FROM certificates_vectors
+                    WHERE content_tsv @@ plainto_tsquery('simple', :q)
+                      {_ft_exclude}
+                    ORDER BY rank DESC
+                    LIMIT :limit
+                """)
+                params_ft = {"q": expanded_q, "limit": top_per_query}
+                if exclude_qual_ids:
+                    params_ft["exclude_ids"] = exclude_qual_ids
+                ft_rows = db.execute(ft_sql, params_ft).fetchall()
+            except Exception:
+                db.rollback()
+                ft_rows = []
+            seen_t: set[int] = set()
+            text_rank_list: List[int] = []
+            for r in ft_rows:
+                if r.qual_id not in seen_t:
+                    seen_t.add(r.qual_id)
+                    text_rank_list.append(r.qual_id)
+                    if r.qual_id not in qual_names:
+                        qual_names[r.qual_id] = getattr(r, "name", "") or ""
+            text_rank_map = {qid: i + 1 for i, qid in enumerate(text_rank_list)}
+
+        # RRF: w_d/(K+rank_vector) + w_s/(K+rank_text) [GitHub는 1/(K+r1)+1/(K+r2)만]
+        all_qids = set(vec_rank_map) | set(text_rank_map)
+        for qid in all_qids:
+            rv = vec_rank_map.get(qid, 9999)
+            rt = text_rank_map.get(qid, 9999)
+            if use_github_rrf:
+                s = 1.0 / (HYBRID_RRF_K + rv) + 1.0 / (HYBRID_RRF_K + rt)
+            else:
+                s = w_d * (1.0 / (HYBRID_RRF_K + rv)) + w_s * (1.0 / (HYBRID_RRF_K + rt))
+                name = qual_names.get(qid, "")
+                if name and q_text and q_text.replace(" ", "") in name.replace(" ", ""):
+                    s += 0.05
+            qual_rrf[qid] = qual_rrf.get(qid, 0.0) + s
+
+    return qual_rrf, qual_names
+
+
+# 합격률 시그널: 적정 합격률(25~55%) 구간에 점수 부스트, 너무 낮거나(< 5%) 너무 높으면(> 85%) 약간 감점
+# 추가로, 매우 낮은 합격률(< 20%) 시험은 체감 난이도가 높다고 보고 가중치를 더 준다.
+def _pass_rate_factor(pr: Optional[float]) -> float:
+    if pr is None:
+        return 1.0  # 데이터 없으면 중립
+    p = pr / 100.0
+    base = max(0.85, 1.05 - abs(p - 0.40) * 0.5)
+    if p < 0.20:
+        base *= 1.15
+    elif p < 0.40:
+        base *= 1.05
+    elif p > 0.70:
+        base *= 0.90
+    return base
+
+
+def _rule_based_reason(
+    c: dict,
+    diff: Optional[float],
+    *,
+    major: str,
+    interest: Optional[str],
+    grade_year: Optional[int],
+    target_difficulty: float,
+    pass_rate: Optional[float],
+) -> str:
+    """규칙 기반 추천 사유 (전공/관심사 점수·난이도·합격률 조합)."""
+    ms, ss = c["major_score"], c["semantic_similarity"]
+    pr = pass_rate
+
+    # 난이도 문구에 사용할 표시용 난이도 (실제 로직에는 영향 X)
+    display_diff = diff
+    if diff is not None and grade_year is not None and grade_year >= 4:
+        # 4학년 이상에게는 5.0~7.0 구간을 적합 난이도로 강조
+        display_diff = max(5.0, min(diff, 7.0))
+
+    # 전공/관심사·난이도·합격률 조합에 따른 기본 설명 패턴
+    if ms > 8.0 and ss > 0.6:
+        base = f"전공({major})과 매우 밀접하며 입력하신 관심사와도 강하게 연결되는 핵심 자격증입니다."
+    elif ms > 8.0:
+        base = "전공 분야의 핵심 역량을 증명할 수 있는 대표적인 자격증입니다."
+    elif ss > 0.7 and interest:
+        # interest는 클라이언트에서 받은 값 그대로 사용 (연어/언어 등 표기 확인용)
+        base = f"입력하신 \"{interest}\"와(과) 내용이 밀접하게 연결된 실무 중심 자격증입니다."
+    elif ss > 0.5 and interest:
+        base = f"관심사와 연관된 업무에서 자주 활용되는 자격증입니다."
+    elif diff is not None and diff > target_difficulty + 1.5:
+        base = "현재 수준보다 한 단계 높은 난이도로, 성장과 포트폴리오 강화를 노릴 때 적합한 자격증입니다."
+    else:
+        base = c.get("reason") or "전공·관심사 분석에 기반해 선별된 추천 자격증입니다."
+
+    # 합격률 맥락 추가
+    if pr is not None:
+        if pr < 20:
+            base += " 합격률이 낮아 난이도는 높은 편이지만, 취득 시 경쟁력이 크게 올라갑니다."
+        elif pr < 40:
+            base += " 합격률이 높지는 않지만 준비할 가치가 큰 자격증입니다."
+        elif pr > 70:
+            base += " 비교적 합격률이 높아 입문·기초를 다지기 좋은 자격증입니다."
+
+    # 난이도 맥락 추가 (표시용 난이도 사용)
+    if display_diff is not None and grade_year is not None:
+        if grade_year <= 2 and display_diff <= 6.0:
+            base += f" 현재 {grade_year}학년 수준에서 도전하기 좋은 난이도({display_diff:.1f})입니다."
+        elif grade_year >= 3:
+            base += f" {grade_year}학년에게 적합한 난이도({display_diff:.1f})로 설계되어 있습니다."
+
+    return base
+
+
+_MajorQuery = Query(
+    None,
+    min_length=0,
+    max_length=200,
+    description="User's major. 로그인 사용자는 프로필 전공(detail_major)을 자동 사용하며, 비로그인은 직접 입력해야 합니다.",
+)
+_InterestQuery = Query(None, max_length=500, description="Specific interests or career goals")
+
+# 스트리밍 응답 단계 (NDJSON 한 줄 = {"stage": ..., "response": HybridRecommendationResponse})
+STAGE_MAJOR_CANDIDATES = "major_candidates"  # 전공 매핑 후보 (RAG 이전, 가장 빠름)
+STAGE_RANKING = "ranking"                    # RAG 융합 순위 (규칙 기반 사유 생성 전)
+STAGE_FINAL = "final"                        # 최종 응답 (단일 응답 모드와 동일)
+STAGE_ERROR = "error"
+
+EmitStage = Callable[[str, HybridRecommendationResponse], Awaitable[None]]
+
+
 @router.get("/hybrid-recommendation", response_model=HybridRecommendationResponse)
 async def hybrid_recommendation(
-    major: Optional[str] = Query(
-        None,
-        min_length=0,
-        max_length=200,
-        description="User's major. 로그인 사용자는 프로필 전공(detail_major)을 자동 사용하며, 비로그인은 직접 입력해야 합니다.",
-    ),
-    interest: Optional[str] = Query(None, max_length=500, description="Specific interests or career goals"),
+    response: Response,
+    major: Optional[str] = _MajorQuery,
+    interest: Optional[str] = _InterestQuery,
     limit: int = Query(15, ge=1, le=30),
     db: Session = Depends(get_db_session),
     _: None = Depends(check_rate_limit),
@@ -271,10 +654,99 @@ async def hybrid_recommendation(
     """
     Combines Major-based mapping with Semantic search (Hybrid Search).
     비로그인 사용자도 사용 가능하나 결과를 GUEST_RESULT_LIMIT개로 제한한다.
+    단계별 소요 시간은 Server-Timing 헤더로 내려간다.
+    """
+    timer = StageTimer("hybrid_recommendation")
+    try:
+        return await _hybrid_recommendation_impl(major, interest, limit, db, user_id, timer=timer)
+    finally:
+        response.headers["Server-Timing"] = timer.server_timing()
+
+
+@router.get("/hybrid-recommendation/stream")
+async def hybrid_recommendation_stream(
+    major: Optional[str] = _MajorQuery,
+    interest: Optional[str] = _InterestQuery,
+    limit: int = Query(15, ge=1, le=30),
+    _: None = Depends(check_rate_limit),
+    user_id: Optional[str] = Depends(get_optional_user),
+) -> StreamingResponse:
+    """
+    hybrid-recommendation 스트리밍 모드 (NDJSON).
+    전공 매핑 후보 → RAG 융합 순위 → 최종(사유 포함) 순으로 한 줄씩 내려보내 첫 화면 표시를 앞당긴다.
+    각 줄은 {"stage": ..., "response": HybridRecommendationResponse}, 오류는 {"stage": "error", "status", "detail"}.
+    final 줄에는 단계별 소요 시간·memo 적중 여부(timings)도 포함된다.
+    캐시 적중 시 final 한 줄만 나간다.
+    """
+    from app.database import SessionLocal
+
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def emit(stage: str, response: HybridRecommendationResponse) -> None:
+        await queue.put({"stage": stage, "response": response.model_dump(mode="json")})
+
+    async def run() -> None:
+        # 의존성 세션은 스트리밍 본문 전송 전에 닫히므로 전용 세션 사용
+        db = SessionLocal()
+        try:
+            timer = StageTimer("hybrid_recommendation")
+            response = await _hybrid_recommendation_impl(major, interest, limit, db, user_id, emit, timer)
+            await queue.put({
+                "stage": STAGE_FINAL,
+                "response": response.model_dump(mode="json"),
+                "timings": timer.as_dict(),
+            })
+        except HTTPException as e:
+            await queue.put({"stage": STAGE_ERROR, "status": e.status_code, "detail": e.detail})
+        except Exception:
+            logger.exception("hybrid_recommendation_stream failed")
+            await queue.put({"stage": STAGE_ERROR, "status": 500, "detail": "추천 처리 중 오류가 발생했습니다."})
+        finally:
+            db.close()
+            await queue.put(done)
+
+    async def body():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await queue.get()
+                if event is done:
+                    break
+                yield orjson.dumps(event) + b"\n"
+        finally:
+            # 클라이언트 연결이 끊기면 남은 단계 계산 중단
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _hybrid_recommendation_impl(
+    major: Optional[str],
+    interest: Optional[str],
+    limit: int,
+    db: Session,
+    user_id: Optional[str],
+    emit_stage: Optional[EmitStage] = None,
+    timer: Optional[StageTimer] = None,
+) -> HybridRecommendationResponse:
+    """
+    Combines Major-based mapping with Semantic search (Hybrid Search).
+    비로그인 사용자도 사용 가능하나 결과를 GUEST_RESULT_LIMIT개로 제한한다.
 
     2026-02: 사용자 맥락(학년, 프로필 전공, 북마크/취득 자격증 난이도)을 반영해
     추천 난이도를 자동 조절한다.
+
+    emit_stage 가 주어지면(스트리밍 모드) 중간 단계 결과를 먼저 내보낸다 (final은 호출부가 반환값으로 처리).
+    단계: user_context → major_candidates(전공 memo) → rag(관심사 질의 memo) → major_sim → scoring → reasons.
+    timer 에 단계별 소요 시간·memo 적중 여부가 기록된다 (Server-Timing 헤더·stage 통계로 export).
     """
+    timer = timer or StageTimer("hybrid_recommendation")
     # 입력 정제 — 프론트엔드에서 줄바꿈(\n) 등 공백 문자가 붙어올 수 있음
     major = (major or "").strip()
     interest = interest.strip() if interest else None
@@ -321,7 +793,10 @@ async def hybrid_recommendation(
     cached = redis_client.get(cache_key)
     if cached:
         try:
-            return HybridRecommendationResponse(**cached)
+            response = HybridRecommendationResponse(**cached)
+            timer.mark_cache("response", True)
+            timer.lap("response")
+            return response
         except Exception:
             logger.warning("hybrid_recommendation: failed to parse cache for key %s", cache_key)
 
@@ -459,196 +934,19 @@ async def hybrid_recommendation(
             continue
     exclude_ids_list: List[int] = sorted(acq_qual_ids)
 
-    RRF_K = 60
-
-    def _classify_query_and_expand(q_text: str) -> tuple[float, float, str]:
-        """
-        질의 타입에 따라 Dense/Sparse 가중치와 풀텍스트용 확장 질의를 결정.
-        - w_d: Dense(OpenAI) 가중치
-        - w_s: Sparse(키워드) 가중치
-        - expanded: 풀텍스트에 사용할 문자열 (간단한 동의어 확장 포함)
-        """
-        q = (q_text or "").strip()
-        base = q
-        # 간단한 동의어/키워드 확장 (plainto_tsquery에 들어가므로 공백 구분만 사용)
-        if "정보처리기사" in q:
-            base = "정보처리기사 정보처리"
-        elif q.upper() == "SQL" or "SQL" in q:
-            base = "SQL 데이터베이스"
-        elif "간호" in q:
-            base = "간호사 간호"
-
-        tokens = q.split()
-        is_short = len(tokens) <= 2 and len(q) <= 8
-        has_cert_suffix = any(s in q for s in ["기사", "산업기사", "기능사"])
-        is_keywordy = is_short or has_cert_suffix or q.upper() == "SQL" or "컴퓨터" in q
-
-        if is_keywordy:
-            # 토큰이 명확한 쿼리: Sparse 비중을 조금 더 높인다.
-            w_d, w_s = 1.0, 1.2
-        else:
-            # 설명형/서술형 쿼리: Dense 비중을 높인다.
-            w_d, w_s = 1.3, 0.7
-        return w_d, w_s, base
-
-    def _hybrid_rrf_from_certificates_vectors(
-        db: Session,
-        queries: List[str],
-        query_vectors: List[List[float]],
-        exclude_qual_ids: List[int],
-        top_per_query: int = HYBRID_TOP_PER_QUERY,
-        use_fulltext: bool = True,
-    ) -> tuple[dict[int, float], dict[int, str]]:
-        """
-        certificates_vectors에서 벡터 검색 + tsvector 풀텍스트 검색을 결합하고
-        RRF: Score = w_d/(K+rank_vector) + w_s/(K+rank_text) 로 융합.
-        반환: (qual_id -> RRF 점수 합계, qual_id -> qual_name)
-        """
-        qual_rrf: dict[int, float] = {}
-        qual_names: dict[int, str] = {}
-        use_github_rrf = os.environ.get("RECOMMENDATION_USE_GITHUB_RRF") == "1"
-        for qi, (q_text, q_vec) in enumerate(zip(queries, query_vectors)):
-            if use_github_rrf:
-                w_d, w_s, expanded_q = 1.0, 1.0, (q_text or "").strip()
-            else:
-                w_d, w_s, expanded_q = _classify_query_and_expand(q_text)
-            # 벡터 검색 (HNSW cosine), 거리 순으로 정렬 후 qual_id별 첫 등장 순위 사용
-            _vec_exclude = "AND qual_id != ALL(:exclude_ids)" if exclude_qual_ids else ""
-            vec_sql = text(f"""
-                SELECT qual_id, name, 1 - (embedding <=> :vec) AS similarity
-                FROM certificates_vectors
-                WHERE embedding IS NOT NULL
-                  {_vec_exclude}
-                ORDER BY embedding <=> :vec
-                LIMIT :limit
-            """)
-            params_v = {"vec": str(q_vec), "limit": top_per_query}
-            if exclude_qual_ids:
-                params_v["exclude_ids"] = exclude_qual_ids
-            vec_rows = db.execute(vec_sql, params_v).fetchall()
-            seen_v: set[int] = set()
-            vec_rank_list: List[int] = []
-            for r in vec_rows:
-                if r.qual_id not in seen_v:
-                    seen_v.add(r.qual_id)
-                    vec_rank_list.append(r.qual_id)
-                    qual_names[r.qual_id] = getattr(r, "name", "") or ""
-            vec_rank_map = {qid: i + 1 for i, qid in enumerate(vec_rank_list)}
-
-            text_rank_map: dict[int, int] = {}
-            if use_fulltext:
-                # 풀텍스트 검색 (content_tsv) — content_tsv 컬럼이 있을 때만
-                try:
-                    _ft_exclude = "AND qual_id != ALL(:exclude_ids)" if exclude_qual_ids else ""
-                    ft_sql = text(f"""
-                        SELECT qual_id, name,
-                               ts_rank_cd(content_tsv, plainto_tsquery('simple', :q)) AS rank
-                        FROM certificates_vectors
-                        WHERE content_tsv @@ plainto_tsquery('simple', :q)
-                          {_ft_exclude}
-                        ORDER BY rank DESC
-                        LIMIT :limit
-                    """)
-                    params_ft = {"q": expanded_q, "limit": top_per_query}
-                    if exclude_qual_ids:
-                        params_ft["exclude_ids"] = exclude_qual_ids
-                    ft_rows = db.execute(ft_sql, params_ft).fetchall()
-                except Exception:
-                    db.rollback()
-                    ft_rows = []
-                seen_t: set[int] = set()
-                text_rank_list: List[int] = []
-                for r in ft_rows:
-                    if r.qual_id not in seen_t:
-                        seen_t.add(r.qual_id)
-                        text_rank_list.append(r.qual_id)
-                        if r.qual_id not in qual_names:
-                            qual_names[r.qual_id] = getattr(r, "name", "") or ""
-                text_rank_map = {qid: i + 1 for i, qid in enumerate(text_rank_list)}
-
-            # RRF: w_d/(K+rank_vector) + w_s/(K+rank_text) [GitHub는 1/(K+r1)+1/(K+r2)만]
-            all_qids = set(vec_rank_map) | set(text_rank_map)
-            for qid in all_qids:
-                rv = vec_rank_map.get(qid, 9999)
-                rt = text_rank_map.get(qid, 9999)
-                if use_github_rrf:
-                    s = 1.0 / (RRF_K + rv) + 1.0 / (RRF_K + rt)
-                else:
-                    s = w_d * (1.0 / (RRF_K + rv)) + w_s * (1.0 / (RRF_K + rt))
-                    name = qual_names.get(qid, "")
-                    if name and q_text and q_text.replace(" ", "") in name.replace(" ", ""):
-                        s += 0.05
-                qual_rrf[qid] = qual_rrf.get(qid, 0.0) + s
-
-        return qual_rrf, qual_names
+    RRF_K = HYBRID_RRF_K
+    timer.lap("user_context")
 
     # --- 2) 후보 생성: Major Map + Hybrid RAG (certificates_vectors) --------------------------
     try:
-        if exclude_ids_list:
-            major_sql = text("""
-                SELECT q.qual_id, q.qual_name, q.qual_type, q.main_field,
-                       mq.score AS mapping_score, mq.weight AS mapping_weight, mq.reason
-                FROM qualification q
-                JOIN major_qualification_map mq ON q.qual_id = mq.qual_id
-                WHERE mq.major = :major
-                  AND q.qual_id != ALL(:exclude_ids)
-                ORDER BY mq.score DESC
-                LIMIT 60
-            """)
-            major_results = db.execute(
-                major_sql, {"major": major, "exclude_ids": exclude_ids_list}
-            ).fetchall()
-        else:
-            major_sql = text("""
-                SELECT q.qual_id, q.qual_name, q.qual_type, q.main_field,
-                       mq.score AS mapping_score, mq.weight AS mapping_weight, mq.reason
-                FROM qualification q
-                JOIN major_qualification_map mq ON q.qual_id = mq.qual_id
-                WHERE mq.major = :major
-                ORDER BY mq.score DESC
-                LIMIT 60
-            """)
-            major_results = db.execute(major_sql, {"major": major}).fetchall()
+        major_results = _major_candidates_stage(db, major, acq_qual_ids, timer)
+        timer.lap("major_candidates")
 
-        if not major_results:
-            try:
-                if exclude_ids_list:
-                    fuzzy_sql = text("""
-                        SELECT DISTINCT ON (q.qual_id)
-                               q.qual_id, q.qual_name, q.qual_type, q.main_field,
-                               mq.score AS mapping_score,
-                               mq.weight AS mapping_weight,
-                               mq.reason,
-                               similarity(mq.major, :major) AS fuzzy_sim
-                        FROM qualification q
-                        JOIN major_qualification_map mq ON q.qual_id = mq.qual_id
-                        WHERE similarity(mq.major, :major) > 0.35
-                          AND q.qual_id != ALL(:exclude_ids)
-                        ORDER BY q.qual_id, mq.score DESC
-                        LIMIT 60
-                    """)
-                    fuzzy_params = {"major": major, "exclude_ids": exclude_ids_list}
-                else:
-                    fuzzy_sql = text("""
-                        SELECT DISTINCT ON (q.qual_id)
-                               q.qual_id, q.qual_name, q.qual_type, q.main_field,
-                               mq.score AS mapping_score,
-                               mq.weight AS mapping_weight,
-                               mq.reason,
-                               similarity(mq.major, :major) AS fuzzy_sim
-                        FROM qualification q
-                        JOIN major_qualification_map mq ON q.qual_id = mq.qual_id
-                        WHERE similarity(mq.major, :major) > 0.35
-                        ORDER BY q.qual_id, mq.score DESC
-                        LIMIT 60
-                    """)
-                    fuzzy_params = {"major": major}
-                major_results = db.execute(fuzzy_sql, fuzzy_params).fetchall()
-                if major_results:
-                    logger.info("fuzzy major match for %r: found %d certs (trgm fallback)", major, len(major_results))
-            except Exception as fuzzy_err:
-                logger.warning("fuzzy major search skipped for %r: %s", major, fuzzy_err)
-                major_results = []
+        if emit_stage is not None and major_results:
+            await emit_stage(
+                STAGE_MAJOR_CANDIDATES,
+                _major_candidates_response(major, interest, major_results, acq_qual_ids, user_id, limit),
+            )
 
         use_enhanced_rag_result = False
         global_results = []
@@ -667,6 +965,7 @@ async def hybrid_recommendation(
                     list(acq_qual_ids),
                     user_profile,
                     1 if not user_id else 0,
+                    timer,
                 )
             finally:
                 if global_results_th is None:
@@ -685,6 +984,7 @@ async def hybrid_recommendation(
                 except Exception as emb_e:
                     logger.warning("hybrid_recommendation: major embedding failed: %s", emb_e)
                     major_vector = None
+                timer.lap("rag")
                 need_sim: set[int] = set()
                 for q in rag_qids_th or []:
                     try:
@@ -708,6 +1008,7 @@ async def hybrid_recommendation(
                         )
                     except Exception as e:
                         logger.debug("hybrid_recommendation: major_sim batch failed: %s", e)
+                timer.lap("major_sim")
                 use_enhanced_rag_result = True
                 logger.info(
                     "hybrid_recommendation: using enhanced RAG, candidates=%d",
@@ -752,6 +1053,7 @@ async def hybrid_recommendation(
                 len(hybrid_rrf_scores),
                 len(global_results),
             )
+            timer.lap("rag")
             major_sim_sql = text("""
                 SELECT qual_id, MAX(1 - (embedding <=> :vec)) AS major_sim
                 FROM certificates_vectors
@@ -776,6 +1078,7 @@ async def hybrid_recommendation(
                     major_sim_lookup = {r.qual_id: float(r.major_sim) for r in m_sims}
             except Exception:
                 major_sim_lookup = {}
+            timer.lap("major_sim")
     except Exception as e:
         logger.exception("hybrid_recommendation DB query failed")
         raise HTTPException(
@@ -885,22 +1188,7 @@ async def hybrid_recommendation(
         )
         c["rrf_score"] = rrf
 
-    # --- 6) 합격률 시그널 계산 ------------------------------------------------
-    # 적정 합격률(25~55%) 구간에 점수 부스트, 너무 낮거나(< 5%) 너무 높으면(> 85%) 약간 감점
-    # 추가로, 매우 낮은 합격률(< 20%) 시험은 체감 난이도가 높다고 보고 가중치를 더 준다.
-    def _pass_rate_factor(pr: Optional[float]) -> float:
-        if pr is None:
-            return 1.0  # 데이터 없으면 중립
-        p = pr / 100.0
-        base = max(0.85, 1.05 - abs(p - 0.40) * 0.5)
-        if p < 0.20:
-            base *= 1.15
-        elif p < 0.40:
-            base *= 1.05
-        elif p > 0.70:
-            base *= 0.90
-        return base
-
+    # --- 6) 합격률 시그널: _pass_rate_factor ----------------------------------
     # --- 7) 최종 스코어 (정규화 + 가중합) --------------------------------------
     # major_score와 semantic_similarity를 0~1 범위로 정규화한 뒤
     # 가중치를 두어 Hybrid Score를 계산하고, 여기에 난이도·합격률 보정을 곱한다.
@@ -1032,53 +1320,47 @@ async def hybrid_recommendation(
             else:
                 c["semantic_score_normalized"] = 1.0
 
-    # --- 9) 규칙 기반 reason 생성 --------------------------
-    def _fallback_reason(c: dict, diff: Optional[float]) -> str:
-        ms, ss = c["major_score"], c["semantic_similarity"]
-        pr = pass_rate_lookup.get(c["qual_id"]) if "qual_id" in c else None
-
-        # 난이도 문구에 사용할 표시용 난이도 (실제 로직에는 영향 X)
-        display_diff = diff
-        if diff is not None and grade_year is not None and grade_year >= 4:
-            # 4학년 이상에게는 5.0~7.0 구간을 적합 난이도로 강조
-            display_diff = max(5.0, min(diff, 7.0))
-
-        # 전공/관심사·난이도·합격률 조합에 따른 기본 설명 패턴
-        if ms > 8.0 and ss > 0.6:
-            base = f"전공({major})과 매우 밀접하며 입력하신 관심사와도 강하게 연결되는 핵심 자격증입니다."
-        elif ms > 8.0:
-            base = "전공 분야의 핵심 역량을 증명할 수 있는 대표적인 자격증입니다."
-        elif ss > 0.7 and interest:
-            # interest는 클라이언트에서 받은 값 그대로 사용 (연어/언어 등 표기 확인용)
-            base = f"입력하신 \"{interest}\"와(과) 내용이 밀접하게 연결된 실무 중심 자격증입니다."
-        elif ss > 0.5 and interest:
-            base = f"관심사와 연관된 업무에서 자주 활용되는 자격증입니다."
-        elif diff is not None and diff > target_difficulty + 1.5:
-            base = "현재 수준보다 한 단계 높은 난이도로, 성장과 포트폴리오 강화를 노릴 때 적합한 자격증입니다."
-        else:
-            base = c.get("reason") or "전공·관심사 분석에 기반해 선별된 추천 자격증입니다."
-
-        # 합격률 맥락 추가
-        if pr is not None:
-            if pr < 20:
-                base += " 합격률이 낮아 난이도는 높은 편이지만, 취득 시 경쟁력이 크게 올라갑니다."
-            elif pr < 40:
-                base += " 합격률이 높지는 않지만 준비할 가치가 큰 자격증입니다."
-            elif pr > 70:
-                base += " 비교적 합격률이 높아 입문·기초를 다지기 좋은 자격증입니다."
-
-        # 난이도 맥락 추가 (표시용 난이도 사용)
-        if display_diff is not None and grade_year is not None:
-            if grade_year <= 2 and display_diff <= 6.0:
-                base += f" 현재 {grade_year}학년 수준에서 도전하기 좋은 난이도({display_diff:.1f})입니다."
-            elif grade_year >= 3:
-                base += f" {grade_year}학년에게 적합한 난이도({display_diff:.1f})로 설계되어 있습니다."
-
-        return base
+    timer.lap("scoring")
+
+    if emit_stage is not None and sorted_results:
+        await emit_stage(
+            STAGE_RANKING,
+            HybridRecommendationResponse(
+                mode="hybrid",
+                major=major,
+                interest=interest,
+                results=[
+                    HybridRecommendationItem(
+                        qual_id=c["qual_id"],
+                        qual_name=c["qual_name"],
+                        major_score=c["major_score"],
+                        reason=c.get("reason") or "전공·관심사 분석에 기반해 선별된 추천 자격증입니다.",
+                        semantic_similarity=c["semantic_similarity"],
+                        hybrid_score=c["hybrid_score"],
+                        pass_rate=c.get("pass_rate"),
+                        rrf_score=c.get("rrf_score"),
+                        major_score_normalized=c.get("major_score_normalized"),
+                        semantic_score_normalized=c.get("semantic_score_normalized"),
+                    )
+                    for c in sorted_results
+                ],
+                guest_limited=not bool(user_id),
+                rag_mode="enhanced" if use_enhanced_rag_result else "current",
+            ),
+        )
 
+    # --- 9) 규칙 기반 reason 생성 --------------------------
     items = []
     for c in sorted_results:
-        reason = _fallback_reason(c, diff_lookup.get(c["qual_id"]))
+        reason = _rule_based_reason(
+            c,
+            diff_lookup.get(c["qual_id"]),
+            major=major,
+            interest=interest,
+            grade_year=grade_year,
+            target_difficulty=target_difficulty,
+            pass_rate=pass_rate_lookup.get(c["qual_id"]),
+        )
         items.append(
             HybridRecommendationItem(
                 qual_id=c["qual_id"],
@@ -1095,6 +1377,8 @@ async def hybrid_recommendation(
             )
         )
 
+    timer.lap("reasons")
+
     fusion_tag = "linear"
     if use_enhanced_rag_result:
         try:
@@ -1118,7 +1402,7 @@ async def hybrid_recommendation(
     elapsed_ms = (time.perf_counter() - start_time) * 1000.0
     logger.info(
         "hybrid_recommendation.metrics major=%r interest_len=%d tier=%s "
-        "candidates=%d final=%d elapsed_ms=%.1f max_h=%.3f min_h=%.3f",
+        "candidates=%d final=%d elapsed_ms=%.1f max_h=%.3f min_h=%.3f stages=%s",
         major,
         len(interest) if interest else 0,
         "guest" if not user_id else "user",
@@ -1127,6 +1411,7 @@ async def hybrid_recommendation(
         elapsed_ms,
         max_h,
         min_h,
+        timer.server_timing(),
     )
 
     # --- 12) Redis 캐시에 최종 결과 저장 ---------------------------------------
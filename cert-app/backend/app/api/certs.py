@@ -1,10 +1,17 @@
 """Certification API routes."""
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import logging
 
-from app.api.deps import get_db_session, check_rate_limit, get_optional_user
+from app.api.deps import (
+    get_db_session,
+    get_async_db_session,
+    check_rate_limit,
+    check_catalog_not_modified,
+    get_optional_user,
+)
 from app.schemas import (
     QualificationListResponse,
     QualificationDetailResponse,
@@ -17,8 +24,20 @@ from app.schemas import (
 )
 from sqlalchemy import text, func
 from datetime import date
-from app.crud import qualification_crud, stats_crud, get_qualification_aggregated_stats
+from app.crud import get_qualification_aggregated_stats
+from app.crud_async import (
+    qualification_async_crud,
+    stats_async_crud,
+    get_qualification_aggregated_stats_async,
+    get_qualification_aggregated_stats_bulk_async,
+)
 from app.redis_client import redis_client
+from app.utils.trending_buffer import trending_buffer
+from app.utils.response_cache import (
+    CERT_DETAIL_CACHE_KEY,
+    cache_and_respond,
+    get_cached_response,
+)
 from app.config import get_settings
 
 settings = get_settings()
@@ -56,13 +75,16 @@ async def get_certs(
     sort_desc: bool = Query(True, description="Sort direction: true for descending, false for ascending"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
     _: None = Depends(check_rate_limit)
 ):
     """Get certification list with filters and pagination."""
-    # Build cache key (v7: has_pass_rate 파라미터 추가)
+    # 검색(q)은 상위 결과로 trending을 올리므로 결과를 만든 뒤에 304 여부를 판단
+    if not q:
+        await check_catalog_not_modified(request)
+    # Build cache key (v7: has_pass_rate 파라미터 추가, v8: 응답 바이트 그대로 저장)
     cache_key = redis_client.make_cache_key(
-        "certs:list:v7",
+        "certs:list:v8",
         hash=redis_client.hash_query_params(
             q=q, main_field=main_field, ncs_large=ncs_large,
             qual_type=qual_type, managing_body=managing_body,
@@ -71,14 +93,11 @@ async def get_certs(
         )
     )
     
-    # Try cache
-    try:
-        cached = redis_client.get(cache_key)
-        if cached and isinstance(cached, dict):
-            logger.debug("Cache hit for cert list")
-            return QualificationListResponse(**cached)
-    except Exception as e:
-        logger.warning(f"Cache read failed for cert list: {e}")
+    # Try cache (직렬화된 응답 바이트 그대로 반환, If-None-Match 시 304)
+    cached_response = get_cached_response(request, cache_key)
+    if cached_response is not None:
+        logger.debug("Cache hit for cert list")
+        return cached_response
 
     # Count 캐시 키 (필터만, 페이지 제외) — 동일 필터의 다른 페이지 요청 시 count() 생략
     count_cache_key = "certs:count:v7:" + redis_client.hash_query_params(
@@ -96,7 +115,7 @@ async def get_certs(
         pass
 
     # Get from database
-    items, total = qualification_crud.get_list(
+    items, total = await qualification_async_crud.get_list(
         db,
         q=q,
         main_field=main_field,
@@ -113,10 +132,8 @@ async def get_certs(
     )
     
     # Build response with aggregated stats in BULK (O(1) instead of N queries)
-    from app.crud import get_qualification_aggregated_stats_bulk
-    
     qual_ids = [item.qual_id for item in items]
-    all_stats = get_qualification_aggregated_stats_bulk(db, qual_ids)
+    all_stats = await get_qualification_aggregated_stats_bulk_async(db, qual_ids)
     
     response_items = []
     for item in items:
@@ -153,20 +170,17 @@ async def get_certs(
         total_pages=total_pages
     )
     
-    # Save the computed result to cache
-    try:
-        redis_client.set(cache_key, response.model_dump(), get_cache_ttl("list"))
-        redis_client.set(count_cache_key, total, get_cache_ttl("list"))
-        logger.debug(f"Cached cert list for key: {cache_key}")
-    except Exception as e:
-        logger.warning(f"Failed to cache cert list: {e}")
-    
     # If searching, increment trending for top results
     if q and response_items:
         # Increment trending for the top 3 results to avoid over-counting everything
         for item in response_items[:3]:
-            redis_client.increment_trending("trending_certs", str(item.qual_id), amount=0.5)
-            
+            trending_buffer.add(str(item.qual_id), amount=0.5)
+
+    # Save the computed result to cache (응답과 동일한 바이트)
+    redis_client.set(count_cache_key, total, get_cache_ttl("list"))
+    response = cache_and_respond(request, cache_key, response, get_cache_ttl("list"))
+    if q:
+        await check_catalog_not_modified(request)
     return response
 
 
@@ -176,8 +190,9 @@ async def get_certs(
     description="Get available filter values for dropdowns."
 )
 async def get_filter_options(
-    db: Session = Depends(get_db_session),
-    _: None = Depends(check_rate_limit)
+    db: AsyncSession = Depends(get_async_db_session),
+    _: None = Depends(check_rate_limit),
+    __: None = Depends(check_catalog_not_modified),
 ):
     """Get available filter options."""
     cache_key = "certs:filter_options:v5"
@@ -189,7 +204,7 @@ async def get_filter_options(
     except Exception as e:
         logger.warning(f"Cache read failed for filter options: {e}")
     
-    options = qualification_crud.get_filter_options(db)
+    options = await qualification_async_crud.get_filter_options(db)
     # dataset 허용 목록으로 main_fields, ncs_large 제한
     try:
         from app.rag.utils.dataset_allowlist import filter_main_fields, filter_ncs_large
@@ -217,37 +232,30 @@ async def get_filter_options(
     description="Get detailed information about a specific certification."
 )
 async def get_cert_detail(
+    request: Request,
     qual_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
     user_id: Optional[str] = Depends(get_optional_user),
     _: None = Depends(check_rate_limit)
 ):
     """Get certification detail by ID."""
-    cache_key = f"certs:detail:{qual_id}"
+    cache_key = CERT_DETAIL_CACHE_KEY.format(qual_id=qual_id)
     
     # Try cache
-    try:
-        cached = redis_client.get(cache_key)
-        if cached:
-            if isinstance(cached, str):
-                import orjson
-                cached = orjson.loads(cached)
-            
-            if isinstance(cached, dict):
-                logger.debug(f"Cache hit for cert detail: {qual_id}")
-                # Increment trending traffic
-                redis_client.increment_trending("trending_certs", str(qual_id), amount=1.0)
-                
-                # Store in recent for user
-                if user_id:
-                    redis_client.push_recent(f"user:{user_id}:recent_certs", str(qual_id))
-                    
-                return QualificationDetailResponse(**cached)
-    except Exception as e:
-        logger.warning(f"Cache read failed for cert detail: {e}")
+    cached_response = get_cached_response(request, cache_key)
+    if cached_response is not None:
+        logger.debug(f"Cache hit for cert detail: {qual_id}")
+        # Increment trending traffic (write-behind buffer)
+        trending_buffer.add(str(qual_id), amount=1.0)
+
+        # Store in recent for user
+        if user_id:
+            redis_client.push_recent(f"user:{user_id}:recent_certs", str(qual_id))
+
+        return cached_response
     
     # Get from database
-    qual = qualification_crud.get_with_stats(db, qual_id)
+    qual = await qualification_async_crud.get_with_stats(db, qual_id)
     if not qual:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -255,15 +263,14 @@ async def get_cert_detail(
         )
     
     # Increment trending traffic for DB hit too
-    redis_client.increment_trending("trending_certs", str(qual_id), amount=1.0)
+    trending_buffer.add(str(qual_id), amount=1.0)
     
     # Store in recent for user
     if user_id:
         redis_client.push_recent(f"user:{user_id}:recent_certs", str(qual_id))
     
     # Get aggregated stats
-    from app.crud import get_qualification_aggregated_stats
-    aggregated_stats = get_qualification_aggregated_stats(db, qual_id)
+    aggregated_stats = await get_qualification_aggregated_stats_async(db, qual_id)
     
     response = QualificationDetailResponse(
         qual_id=qual.qual_id,
@@ -315,9 +322,7 @@ async def get_cert_detail(
     )
     
     # Cache the response
-    redis_client.set(cache_key, response.model_dump(mode="json"), get_cache_ttl("detail"))
-    
-    return response
+    return cache_and_respond(request, cache_key, response, get_cache_ttl("detail"))
 
 
 @router.get(
@@ -327,33 +332,26 @@ async def get_cert_detail(
     description="Get year/round statistics for a specific certification."
 )
 async def get_cert_stats(
+    request: Request,
     qual_id: int,
     year: Optional[int] = Query(None, description="Filter by year"),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
     _: None = Depends(check_rate_limit)
 ):
     """Get certification statistics."""
     cache_key = redis_client.make_cache_key(
-        f"certs:stats:{qual_id}",
+        f"certs:stats:v2:{qual_id}",
         year=year
     )
     
     # Try cache
-    try:
-        cached = redis_client.get(cache_key)
-        if cached:
-            if isinstance(cached, str):
-                import orjson
-                cached = orjson.loads(cached)
-            
-            if isinstance(cached, dict):
-                logger.debug(f"Cache hit for cert stats: {qual_id}")
-                return QualificationStatsListResponse(**cached)
-    except Exception as e:
-        logger.warning(f"Cache read failed for cert stats: {e}")
+    cached_response = get_cached_response(request, cache_key)
+    if cached_response is not None:
+        logger.debug(f"Cache hit for cert stats: {qual_id}")
+        return cached_response
     
     # Check if qualification exists
-    qual = qualification_crud.get_by_id(db, qual_id)
+    qual = await qualification_async_crud.get_by_id(db, qual_id)
     if not qual:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -361,7 +359,7 @@ async def get_cert_stats(
         )
     
     # Get stats
-    stats = stats_crud.get_by_qual_id(db, qual_id, year)
+    stats = await stats_async_crud.get_by_qual_id(db, qual_id, year)
     
     response = QualificationStatsListResponse(
         items=stats,
@@ -369,9 +367,7 @@ async def get_cert_stats(
     )
     
     # Cache the response
-    redis_client.set(cache_key, response.model_dump(mode="json"), get_cache_ttl("stats"))
-    
-    return response
+    return cache_and_respond(request, cache_key, response, get_cache_ttl("stats"))
 
 
 @router.get(
@@ -381,6 +377,7 @@ async def get_cert_stats(
     description="Get pass rate trends for the recent 3 years to analyze difficulty."
 )
 async def get_cert_trends(
+    request: Request,
     qual_id: int,
     db: Session = Depends(get_db_session),
     _: None = Depends(check_rate_limit)
@@ -396,22 +393,14 @@ async def get_cert_trends(
     current_year = date.today().year
     start_year = current_year - 3
     cache_key = redis_client.make_cache_key(
-        f"certs:trends:{qual_id}",
+        f"certs:trends:v2:{qual_id}",
         start_year=start_year
     )
     
     # Try cache
-    try:
-        cached = redis_client.get(cache_key)
-        if cached:
-            if isinstance(cached, str):
-                import orjson
-                cached = orjson.loads(cached)
-            
-            if isinstance(cached, list):
-                return [PassRateTrendResponse(**row) for row in cached]
-    except Exception as e:
-        logger.warning(f"Cache read failed for cert trends: {e}")
+    cached_response = get_cached_response(request, cache_key)
+    if cached_response is not None:
+        return cached_response
 
     query = text("""
         SELECT 
@@ -446,11 +435,9 @@ async def get_cert_trends(
         """)
         results = db.execute(query_calc, {"qual_id": qual_id, "start_year": start_year}).mappings().all()
 
-    # Convert mapping rows to basic dicts for caching
-    dicts = [dict(row) for row in results]
-    redis_client.set(cache_key, dicts, get_cache_ttl("detail"))
-
-    return [PassRateTrendResponse(**row) for row in dicts]
+    # response_model 검증을 거친 형태로 직렬화해 캐시·응답에 같은 바이트 사용
+    trends = [PassRateTrendResponse(**dict(row)) for row in results]
+    return cache_and_respond(request, cache_key, trends, get_cache_ttl("detail"))
 
 
 @router.get(
@@ -464,7 +451,7 @@ async def get_trending_certs(
     db: Session = Depends(get_db_session),
     _: None = Depends(check_rate_limit),
 ):
-    """Get real-time trending certifications from Redis."""
+    """Get real-time trending certifications from Redis (반감기 감쇠 점수, trending_buffer가 주기 반영)."""
     trending_data = redis_client.get_trending("trending_certs", limit)
     
     if not trending_data:
@@ -1,14 +1,21 @@
 """API dependencies."""
 from fastapi import Depends, HTTPException, status, Request, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 from functools import lru_cache
+from collections import OrderedDict
+import copy
 import logging
+import threading
+import time
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.config import get_settings
 from app.redis_client import redis_client
+from app.utils.catalog_version import catalog_etag_for_path
+from app.utils.response_cache import etag_matches
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -20,6 +27,11 @@ def get_db_session(db: Session = Depends(get_db)) -> Session:
     return db
 
 
+def get_async_db_session(db: AsyncSession = Depends(get_async_db)) -> AsyncSession:
+    """Get async database session (asyncpg). async def 조회 라우트용."""
+    return db
+
+
 def verify_job_secret(x_job_secret: Optional[str] = Header(None)) -> bool:
     """Verify job secret for admin endpoints."""
     if not settings.JOB_SECRET or not settings.JOB_SECRET.strip():
@@ -41,6 +53,19 @@ def verify_job_secret(x_job_secret: Optional[str] = Header(None)) -> bool:
     return True
 
 
+async def check_catalog_not_modified(request: Request) -> None:
+    """
+    카탈로그 GET의 If-None-Match가 현재 데이터 버전 ETag와 같으면 304 (본문 없음).
+    라우트에서 check_rate_limit 뒤에 선언해 레이트 리밋을 먼저 적용한다. 304는 예외 처리기가 만들므로
+    CORS·보안 헤더 미들웨어도 그대로 거친다.
+    """
+    if request.method != "GET" or not request.headers.get("if-none-match"):
+        return
+    etag = catalog_etag_for_path(request.url.path, request.url.query)
+    if etag and etag_matches(request, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
 def _extract_client_ip(request: Request) -> str:
     """클라이언트 IP 추출. Render 등 프록시 뒤에서는 XFF 마지막 값(프록시가 추가한 실제 IP) 사용.
     첫 번째 값은 클라이언트가 위조 가능하므로 Rate Limit 키로 신뢰하지 않는다."""
@@ -51,13 +76,55 @@ def _extract_client_ip(request: Request) -> str:
     return getattr(request.client, "host", None) if request.client else "127.0.0.1"
 
 
-def check_rate_limit(request: Request) -> None:
+class _LocalFloodGuard:
+    """
+    프로세스 내 사전 리미터. 고정 윈도우로 키별 요청 시도 수를 세고, 한 윈도우에 limit × FLOOD_FACTOR 번을 넘긴
+    클라이언트는 Redis를 거치지 않고 바로 거부한다 (명백한 폭주만 — 정상 한도 판정은 Redis GCRA가 담당).
+    키 수는 max_keys로 제한 (초과 시 오래된 키부터 제거).
+    """
+
+    FLOOD_FACTOR = 2
+
+    def __init__(self, max_keys: int = 10_000):
+        self._windows: "OrderedDict[str, list]" = OrderedDict()
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, max_requests: int, window_seconds: int) -> int:
+        """시도 1회 기록. 폭주로 판단되면 윈도우 종료까지 남은 초, 아니면 0."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or now - entry[0] >= window_seconds:
+                entry = [now, 0]
+                self._windows[key] = entry
+            self._windows.move_to_end(key)
+            entry[1] += 1
+            while len(self._windows) > self._max_keys:
+                self._windows.popitem(last=False)
+            if entry[1] > max_requests * self.FLOOD_FACTOR:
+                return max(1, int(window_seconds - (now - entry[0])))
+        return 0
+
+
+_flood_guard = _LocalFloodGuard()
+
+
+async def _enforce_rate_limit(key: str, max_requests: int, window_seconds: int) -> tuple:
+    """사전 리미터 → Redis GCRA(EVALSHA 1회, async) 순으로 판정. (allowed, remaining, reset_after)"""
+    flood_retry = _flood_guard.hit(key, max_requests, window_seconds)
+    if flood_retry:
+        return False, 0, flood_retry
+    return await redis_client.check_rate_limit_async(key, max_requests, window_seconds)
+
+
+async def check_rate_limit(request: Request) -> None:
     """Check rate limit for request."""
     client_ip = _extract_client_ip(request)
     
     key = f"rate_limit:{client_ip}"
     
-    allowed, remaining, reset_after = redis_client.check_rate_limit(
+    allowed, remaining, reset_after = await _enforce_rate_limit(
         key,
         settings.RATE_LIMIT_REQUESTS,
         settings.RATE_LIMIT_WINDOW
@@ -79,11 +146,11 @@ def check_rate_limit(request: Request) -> None:
     request.state.rate_limit_remaining = remaining
 
 
-def check_auth_rate_limit(request: Request) -> None:
+async def check_auth_rate_limit(request: Request) -> None:
     """Auth 전용 엄격 레이트 리밋 (send_code, login, password_reset 등). 분당 5회 등."""
     client_ip = _extract_client_ip(request)
     key = f"rate_limit_auth:{client_ip}"
-    allowed, remaining, reset_after = redis_client.check_rate_limit(
+    allowed, remaining, reset_after = await _enforce_rate_limit(
         key,
         settings.AUTH_RATE_LIMIT_REQUESTS,
         settings.AUTH_RATE_LIMIT_WINDOW,
@@ -102,7 +169,7 @@ def check_auth_rate_limit(request: Request) -> None:
 
 
 import base64
-import time
+import hashlib
 from jose import jwt, JWTError
 from app.models import Profile
 
@@ -110,19 +177,45 @@ import httpx
 from jose import jwk
 
 # JWKS TTL 캐시 (1시간). Supabase 키 로테이션 시 재시작 없이 신규 토큰 검증 가능.
-_JWKS_CACHE: dict = {"data": None, "ts": 0.0}
+# keys: kid → jwk.construct 결과, by_alg: alg → 첫 키 (kid 불일치 시 fallback). 갱신 시 1회만 구성.
+_JWKS_CACHE: dict = {"data": None, "ts": 0.0, "keys": {}, "by_alg": {}}
 _JWKS_TTL_SECONDS = 3600
+# 모르는 kid가 오면(키 로테이션 직후) TTL 전이라도 재조회. 단, 이 간격(초)보다 자주 하지 않음.
+_JWKS_MIN_REFRESH_SECONDS = 60
+
 
+def _build_jwks_keys(data: dict) -> None:
+    """JWKS 응답으로 kid/alg → 검증 키 객체 맵 구성. 키 집합이 바뀌면 검증 토큰 캐시도 비운다."""
+    keys: dict = {}
+    by_alg: dict = {}
+    for k in (data or {}).get("keys", []):
+        try:
+            key = jwk.construct(k)
+        except Exception as e:
+            logger.warning(f"Skipping unusable JWKS key kid={k.get('kid')}: {e}")
+            continue
+        if k.get("kid"):
+            keys[k["kid"]] = key
+        if k.get("alg"):
+            by_alg.setdefault(k["alg"], key)
+    if set(keys) != set(_JWKS_CACHE["keys"]):
+        _verified_tokens.clear()
+    _JWKS_CACHE["keys"] = keys
+    _JWKS_CACHE["by_alg"] = by_alg
 
-def _get_supabase_jwks(url: str) -> dict:
+
+def _get_supabase_jwks(url: str, force: bool = False) -> dict:
     """Fetch and cache Supabase JWKS with TTL."""
     now = time.time()
-    if _JWKS_CACHE["data"] is not None and (now - _JWKS_CACHE["ts"]) < _JWKS_TTL_SECONDS:
-        return _JWKS_CACHE["data"]
+    if _JWKS_CACHE["data"] is not None:
+        age = now - _JWKS_CACHE["ts"]
+        if age < _JWKS_TTL_SECONDS and not (force and age >= _JWKS_MIN_REFRESH_SECONDS):
+            return _JWKS_CACHE["data"]
     try:
         response = httpx.get(url, timeout=5)
         response.raise_for_status()
         data = response.json()
+        _build_jwks_keys(data)
         _JWKS_CACHE["data"] = data
         _JWKS_CACHE["ts"] = now
         return data
@@ -132,8 +225,100 @@ def _get_supabase_jwks(url: str) -> dict:
             return _JWKS_CACHE["data"]
         return {}
 
+
+def _get_jwks_key(url: str, kid: Optional[str], alg: str):
+    """kid(없으면 alg)에 해당하는 미리 구성된 검증 키. 모르는 kid면 JWKS를 한 번 재조회."""
+    jwks = _get_supabase_jwks(url)
+    if not jwks or "keys" not in jwks:
+        raise Exception("Empty or invalid JWKS response")
+    key = _JWKS_CACHE["keys"].get(kid)
+    if key is None and kid:
+        _get_supabase_jwks(url, force=True)
+        key = _JWKS_CACHE["keys"].get(kid)
+    if key is None:
+        # Fallback: try first key with matching alg if no kid match
+        key = _JWKS_CACHE["by_alg"].get(alg)
+    if key is None:
+        raise Exception(f"No matching key found in JWKS for alg={alg} kid={kid}")
+    return key
+
+
+@lru_cache(maxsize=4)
+def _hs256_secret(secret: str):
+    """SUPABASE_JWT_SECRET이 base64로 보이면 디코딩 (설정값당 1회)."""
+    if len(secret) > 20 and '=' in secret:
+        try:
+            return base64.b64decode(secret)
+        except Exception:
+            return secret
+    return secret
+
+
+class _VerifiedTokenCache:
+    """
+    서명 검증을 마친 JWT payload LRU (키: 토큰 SHA-256). 같은 토큰의 반복 요청은 서명 검증을 건너뛴다.
+    exp가 지났거나 max_ttl(초)을 넘긴 항목은 사용하지 않는다.
+    저장·반환 모두 복사본이라 호출부가 payload(중첩 user_metadata 포함)를 수정해도 다른 요청에 새지 않는다.
+    """
+
+    def __init__(self, max_size: int, max_ttl: int):
+        self._cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._max_size = max_size
+        self._max_ttl = max_ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        if self._max_size <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        return copy.deepcopy(payload)
+
+    def set(self, token: str, payload: dict) -> None:
+        if self._max_size <= 0:
+            return
+        now = time.time()
+        expires_at = now + self._max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._cache[key] = (copy.deepcopy(payload), expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_verified_tokens = _VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_MAX_TTL)
+
+
 def _decode_supabase_token(token: str) -> dict:
-    """Helper to decode Supabase JWT token supporting HS256 (user/service) and RS256/ES256 (access tokens)."""
+    """
+    Helper to decode Supabase JWT token supporting HS256 (user/service) and RS256/ES256 (access tokens).
+    검증에 성공한 토큰은 exp 전까지 캐시에서 바로 반환한다 (호출마다 독립된 payload 사본).
+    """
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        return cached
     try:
         # Check header to determine algorithm
         header = jwt.get_unverified_header(token)
@@ -141,18 +326,9 @@ def _decode_supabase_token(token: str) -> dict:
         
         if alg == "HS256":
             # Symmetric key verification (classic Supabase)
-            secret = settings.SUPABASE_JWT_SECRET
-            if len(secret) > 20 and '=' in secret:
-                try:
-                    decoded_secret = base64.b64decode(secret)
-                except:
-                    decoded_secret = secret
-            else:
-                decoded_secret = secret
-                
-            return jwt.decode(
+            payload = jwt.decode(
                 token, 
-                decoded_secret, 
+                _hs256_secret(settings.SUPABASE_JWT_SECRET), 
                 algorithms=["HS256"], 
                 options={"verify_aud": False}
             )
@@ -164,45 +340,16 @@ def _decode_supabase_token(token: str) -> dict:
                  raise Exception("SUPABASE_URL required for RS256/ES256 verification")
                  
             jwks_url = f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json"
+            key = _get_jwks_key(jwks_url, header.get("kid"), alg)
             try:
-                # Add User-Agent to avoid blocking by some servers
-                jwks = _get_supabase_jwks(jwks_url)
+                payload = jwt.decode(
+                    token,
+                    key,
+                    algorithms=[alg],
+                    options={"verify_aud": False}
+                )
             except Exception as e:
-                logger.error(f"JWKS fetch failed: {e}")
-                raise Exception("JWKS fetch failed")
-
-            if not jwks or "keys" not in jwks:
-                raise Exception("Empty or invalid JWKS response")
-            
-            # Find matching key
-            kid = header.get("kid")
-            key_data = None
-            
-            for k in jwks.get("keys", []):
-                if k.get("kid") == kid:
-                    key_data = k
-                    break
-            
-            if not key_data:
-                # Fallback: try first key with matching alg if no kid match
-                for k in jwks.get("keys", []):
-                    if k.get("alg") == alg:
-                        key_data = k
-                        break
-                
-            if key_data:
-                try:
-                    key = jwk.construct(key_data)
-                    return jwt.decode(
-                        token,
-                        key,
-                        algorithms=[alg],
-                        options={"verify_aud": False}
-                    )
-                except Exception as e:
-                     raise Exception(f"Token signature verification failed: {e}")
-            else:
-                raise Exception(f"No matching key found in JWKS for alg={alg} kid={kid}")
+                 raise Exception(f"Token signature verification failed: {e}")
         
         else:
             raise Exception(f"Unsupported algorithm: {alg}")
@@ -210,6 +357,8 @@ def _decode_supabase_token(token: str) -> dict:
     except Exception as e:
         logger.error(f"Token decode error: {e}")
         raise e
+    _verified_tokens.set(token, payload)
+    return payload
 
 def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
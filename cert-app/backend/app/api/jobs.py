@@ -1,10 +1,10 @@
 
 from typing import Optional, List
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session, check_rate_limit
-from app.crud import job_crud
+from app.api.deps import get_async_db_session, check_rate_limit, check_catalog_not_modified
+from app.crud_async import job_async_crud
 from app.schemas import JobResponse, JobListResponse
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
@@ -16,8 +16,9 @@ async def get_jobs(
     q: Optional[str] = Query(None, description="Job name search"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db_session),
-    _: None = Depends(check_rate_limit)
+    db: AsyncSession = Depends(get_async_db_session),
+    _: None = Depends(check_rate_limit),
+    __: None = Depends(check_catalog_not_modified),
 ):
     """Search for jobs and their outlook/salary info."""
     cache_key = f"jobs:list:v6:{q}:{page}:{page_size}"
@@ -29,7 +30,7 @@ async def get_jobs(
     except Exception:
         pass
 
-    items, total = job_crud.get_list(db, q, page, page_size)
+    items, total = await job_async_crud.get_list(db, q, page, page_size)
 
     total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
@@ -48,8 +49,9 @@ async def get_jobs(
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: int,
-    db: Session = Depends(get_db_session),
-    _: None = Depends(check_rate_limit)
+    db: AsyncSession = Depends(get_async_db_session),
+    _: None = Depends(check_rate_limit),
+    __: None = Depends(check_catalog_not_modified),
 ):
     """Get detailed information for a specific job."""
     cache_key = f"jobs:detail:v5:{job_id}"
@@ -61,7 +63,7 @@ async def get_job(
     except Exception:
         pass
 
-    job = job_crud.get_by_id(db, job_id)
+    job = await job_async_crud.get_by_id(db, job_id)
     if not job:
         from fastapi import HTTPException, status
         raise HTTPException(
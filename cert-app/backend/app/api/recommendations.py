@@ -6,10 +6,10 @@ import math
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_, text
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db_session, check_rate_limit, get_current_user
+from app.api.deps import get_db_session, check_rate_limit, check_catalog_not_modified, get_current_user
 from app.schemas import (
     RecommendationListResponse,
     RecommendationResponse,
@@ -19,6 +19,8 @@ from app.schemas import (
 )
 from app.crud import major_map_crud
 from app.redis_client import redis_client
+from app.services.major_index import resolve_major
+from app.services.recommendation_matrix import get_recommendation_matrix
 from app.config import get_settings
 
 settings = get_settings()
@@ -128,6 +130,31 @@ def generate_recommendation_reason(
     return " / ".join(reasons) if reasons else "전공 기반 추천"
 
 
+def _rows_from_mappings(mappings, grade_year: Optional[int]) -> list[dict]:
+    """ORM 매핑(qualification.stats joinedload) → 추천 행. 행렬 미구축 시 폴백 경로."""
+    rows: list[dict] = []
+    for mapping in mappings:
+        qual = mapping.qualification
+        if not qual:
+            continue
+        latest_stats = None
+        if qual.stats:
+            latest_stats = max(qual.stats, key=lambda s: (s.year, s.exam_round))
+        rows.append(
+            {
+                "qual_id": qual.qual_id,
+                "qual_name": qual.qual_name,
+                "qual_type": qual.qual_type,
+                "main_field": qual.main_field,
+                "managing_body": qual.managing_body,
+                "reason": generate_recommendation_reason(mapping, latest_stats),
+                "latest_pass_rate": latest_stats.pass_rate if latest_stats else None,
+                "raw": _compute_raw_recommendation_score(mapping, latest_stats, grade_year),
+            }
+        )
+    return rows
+
+
 @router.get(
     "",
     response_model=RecommendationListResponse,
@@ -150,7 +177,7 @@ async def get_recommendations(
     """Get certification recommendations for a major."""
     fetch_n = _recommendation_fetch_limit(limit)
     cache_key = redis_client.make_cache_key(
-        "recs:v7",
+        "recs:v8",
         major=major.lower().strip(),
         limit=limit,
         min_score=round(min_score, 2),
@@ -167,86 +194,56 @@ async def get_recommendations(
 
     search_major = major.strip()
     resolved_major = search_major
-    mappings = major_map_crud.get_by_major_with_stats(db, search_major, fetch_n)
-
-    if not mappings:
-        clean_major = search_major
-        for suffix in ["학부", "학과", "전공", "공학부"]:
-            if clean_major.endswith(suffix):
-                clean_major = clean_major[: -len(suffix)]
-                break
-
-        from app.models import MajorQualificationMap
-
-        matched_map = (
-            db.query(MajorQualificationMap.major)
-            .filter(
-                or_(
-                    MajorQualificationMap.major.ilike(f"%{clean_major}%"),
-                    text(":major ILIKE '%' || major || '%'"),
-                )
-            )
-            .params(major=search_major)
-            .first()
-        )
-
-        if not matched_map and len(clean_major) >= 3:
-            short_major = clean_major[:2]
-            matched_map = (
-                db.query(MajorQualificationMap.major)
-                .filter(MajorQualificationMap.major.ilike(f"%{short_major}%"))
-                .first()
-            )
-
-        if matched_map:
-            matched_major = matched_map[0]
-            logger.info("Fuzzy match: '%s' -> '%s'", search_major, matched_major)
-            mappings = major_map_crud.get_by_major_with_stats(db, matched_major, fetch_n)
-            resolved_major = matched_major
-
-    if not mappings:
-        return RecommendationListResponse(items=[], major=search_major, total=0)
-
-    rows: list[dict] = []
-    for mapping in mappings:
-        qual = mapping.qualification
-        if not qual:
-            continue
-        latest_stats = None
-        if qual.stats:
-            latest_stats = max(qual.stats, key=lambda s: (s.year, s.exam_round))
-        raw = _compute_raw_recommendation_score(mapping, latest_stats, grade_year)
-        rows.append(
-            {
-                "mapping": mapping,
-                "qual": qual,
-                "latest_stats": latest_stats,
-                "raw": raw,
-            }
+    match_confidence: Optional[float] = None
+    # 행렬이 아직 준비되지 않았으면(기동 직후·버전 변경 직후) None → 아래 ORM 경로, 구축은 백그라운드
+    matrix = get_recommendation_matrix()
+
+    def _has_major(name: str) -> bool:
+        if matrix is not None:
+            return matrix.has_major(name)
+        return bool(major_map_crud.get_by_major(db, name, 1))
+
+    if not _has_major(search_major):
+        # 인메모리 전공 인덱스로 퍼지 해석 (정규형·접미사 제거·포함·bigram 유사도, DB 조회 없음)
+        match = resolve_major(search_major)
+        if match is None:
+            return RecommendationListResponse(items=[], major=search_major, total=0)
+        resolved_major = match.major
+        match_confidence = match.confidence
+        logger.info(
+            "Fuzzy match: '%s' -> '%s' (%s, confidence=%.2f)",
+            search_major, resolved_major, match.method, match.confidence,
         )
+    else:
+        match_confidence = 1.0
 
-    rows = [r for r in rows if r["raw"] + 1e-9 >= min_score]
-    rows.sort(key=lambda r: r["raw"], reverse=True)
-    rows = rows[:limit]
+    # 사전 계산 행렬: 전공 인덱스 조회 + top-k 부분 정렬 (행렬 구축 실패 시에만 ORM 경로)
+    if matrix is not None:
+        rows = matrix.top_k(resolved_major, limit, fetch_n, min_score, grade_year)
+    else:
+        mappings = major_map_crud.get_by_major_with_stats(db, resolved_major, fetch_n)
+        if not mappings:
+            return RecommendationListResponse(items=[], major=search_major, total=0)
+        rows = _rows_from_mappings(mappings, grade_year)
+        rows = [r for r in rows if r["raw"] + 1e-9 >= min_score]
+        rows.sort(key=lambda r: r["raw"], reverse=True)
+        rows = rows[:limit]
 
     raws = [float(r["raw"]) for r in rows]
     display_scores = _apply_display_score_spread(raws)
 
     recommendations = []
     for r, disp in zip(rows, display_scores, strict=True):
-        qual = r["qual"]
-        mapping = r["mapping"]
-        latest_stats = r["latest_stats"]
         recommendations.append(
             RecommendationResponse(
-                qual_id=qual.qual_id,
-                qual_name=qual.qual_name,
-                qual_type=qual.qual_type,
-                main_field=qual.main_field,
-                managing_body=qual.managing_body,
+                qual_id=r["qual_id"],
+                qual_name=r["qual_name"],
+                qual_type=r["qual_type"],
+                main_field=r["main_field"],
+                managing_body=r["managing_body"],
                 score=round(float(disp), 1),
-                reason=generate_recommendation_reason(mapping, latest_stats),
-                latest_pass_rate=latest_stats.pass_rate if latest_stats else None,
+                reason=r["reason"],
+                latest_pass_rate=r["latest_pass_rate"],
             )
         )
 
@@ -254,6 +251,7 @@ async def get_recommendations(
         items=recommendations,
         major=resolved_major,
         total=len(recommendations),
+        match_confidence=match_confidence,
     )
 
     redis_client.set(cache_key, response.model_dump(mode="json"), get_cache_ttl())
@@ -308,7 +306,8 @@ async def get_my_recommendations(
 )
 async def get_available_majors(
     db: Session = Depends(get_db_session),
-    _: None = Depends(check_rate_limit)
+    _: None = Depends(check_rate_limit),
+    __: None = Depends(check_catalog_not_modified),
 ):
     """Get list of available majors."""
     cache_key = "recs:majors:v5"
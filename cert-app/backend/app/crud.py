@@ -3,8 +3,9 @@
 from types import SimpleNamespace
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, asc, or_, and_, text
+from sqlalchemy import func, desc, asc, or_, and_, select
 
+from app.utils.sql_registry import hot_statement
 from app.models import Qualification, QualificationStats, MajorQualificationMap, UserFavorite, UserAcquiredCert, Job, Major
 from app.schemas import (
     QualificationCreate, QualificationUpdate,
@@ -13,6 +14,105 @@ from app.schemas import (
 )
 
 
+# ============== Shared statement builders (sync Session / AsyncSession 공용) ==============
+
+def build_qualification_list_query(
+    q: Optional[str] = None,
+    main_field: Optional[str] = None,
+    ncs_large: Optional[str] = None,
+    qual_type: Optional[str] = None,
+    managing_body: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    has_pass_rate: Optional[bool] = None,
+    sort: str = "name",
+    sort_desc: bool = True,
+):
+    """자격증 목록 (count 문, 정렬된 select 문). 페이지네이션은 호출부에서 offset/limit."""
+    stmt = select(Qualification)
+
+    # Apply filters
+    if q:
+        stmt = stmt.where(
+            or_(
+                Qualification.qual_name.ilike(f"%{q}%"),
+                Qualification.managing_body.ilike(f"%{q}%")
+            )
+        )
+
+    if main_field:
+        stmt = stmt.where(Qualification.main_field == main_field)
+
+    if ncs_large:
+        stmt = stmt.where(Qualification.ncs_large == ncs_large)
+
+    if qual_type:
+        stmt = stmt.where(Qualification.qual_type == qual_type)
+
+    if managing_body:
+        stmt = stmt.where(Qualification.managing_body == managing_body)
+
+    if is_active is not None:
+        stmt = stmt.where(Qualification.is_active == is_active)
+
+    # 합격률 데이터가 존재하는 자격증 (pass_rate IS NOT NULL인 stats 레코드가 있는 것)
+    with_pass_rate = (
+        select(QualificationStats.qual_id)
+        .where(QualificationStats.pass_rate.isnot(None))
+        .distinct()
+    )
+    if has_pass_rate is True:
+        stmt = stmt.where(Qualification.qual_id.in_(with_pass_rate))
+    elif has_pass_rate is False:
+        # 합격률 데이터가 없는 자격증만
+        stmt = stmt.where(~Qualification.qual_id.in_(with_pass_rate))
+
+    count_stmt = select(func.count()).select_from(stmt.subquery())
+
+    # Apply sorting
+    if sort == "name":
+        stmt = stmt.order_by(desc(Qualification.qual_name) if sort_desc else asc(Qualification.qual_name))
+    elif sort == "recent":
+        stmt = stmt.order_by(desc(Qualification.created_at) if sort_desc else asc(Qualification.created_at))
+    elif sort in ["pass_rate", "difficulty"]:
+        # stats 조인 후 그룹 집계로 정렬
+        stmt = stmt.outerjoin(QualificationStats).group_by(Qualification.qual_id)
+        if sort == "pass_rate":
+            # 합격률 높은 순 / 낮은 순 (NULL은 항상 마지막)
+            stmt = stmt.order_by(
+                desc(func.avg(QualificationStats.pass_rate)).nulls_last()
+                if sort_desc else
+                asc(func.avg(QualificationStats.pass_rate)).nulls_last()
+            )
+        else:
+            # 난이도 정렬: difficulty_score 기준 (표시 avg_difficulty와 동일 소스로 정렬)
+            # NULL은 마지막, sort_desc=True → 높은 순(어려운 순)
+            stmt = stmt.order_by(
+                desc(func.avg(QualificationStats.difficulty_score)).nulls_last()
+                if sort_desc else
+                asc(func.avg(QualificationStats.difficulty_score)).nulls_last()
+            )
+
+    return count_stmt, stmt
+
+
+# 필터 옵션: 단일 쿼리로 4개 컬럼 값 수집 후 Python에서 distinct (라운드트립 1회)
+FILTER_OPTIONS_STMT = select(
+    Qualification.main_field,
+    Qualification.ncs_large,
+    Qualification.qual_type,
+    Qualification.managing_body,
+).where(Qualification.is_active == True)
+
+
+def filter_options_from_rows(rows) -> dict:
+    return {
+        "main_fields": sorted({r.main_field for r in rows if r.main_field}),
+        "ncs_large": sorted({r.ncs_large for r in rows if r.ncs_large}),
+        "qual_types": sorted({r.qual_type for r in rows if r.qual_type}),
+        "managing_bodies": sorted({r.managing_body for r in rows if r.managing_body}),
+    }
+
+
 # ============== Qualification CRUD ==============
 
 class QualificationCRUD:
@@ -48,105 +148,27 @@ class QualificationCRUD:
         cached_total: Optional[int] = None,
     ) -> tuple[List[Qualification], int]:
         """Get paginated list of qualifications with filters. cached_total가 있으면 count() 생략."""
-        query = db.query(Qualification)
-        
-        # Apply filters
-        if q:
-            query = query.filter(
-                or_(
-                    Qualification.qual_name.ilike(f"%{q}%"),
-                    Qualification.managing_body.ilike(f"%{q}%")
-                )
-            )
-        
-        if main_field:
-            query = query.filter(Qualification.main_field == main_field)
-        
-        if ncs_large:
-            query = query.filter(Qualification.ncs_large == ncs_large)
-        
-        if qual_type:
-            query = query.filter(Qualification.qual_type == qual_type)
-        
-        if managing_body:
-            query = query.filter(Qualification.managing_body == managing_body)
-        
-        if is_active is not None:
-            query = query.filter(Qualification.is_active == is_active)
-
-        if has_pass_rate is True:
-            # 합격률 데이터가 존재하는 자격증만 (pass_rate IS NOT NULL인 stats 레코드가 있는 것)
-            query = query.filter(
-                Qualification.qual_id.in_(
-                    db.query(QualificationStats.qual_id)
-                    .filter(QualificationStats.pass_rate.isnot(None))
-                    .distinct()
-                )
-            )
-        elif has_pass_rate is False:
-            # 합격률 데이터가 없는 자격증만
-            query = query.filter(
-                ~Qualification.qual_id.in_(
-                    db.query(QualificationStats.qual_id)
-                    .filter(QualificationStats.pass_rate.isnot(None))
-                    .distinct()
-                )
-            )
-        
+        count_stmt, stmt = build_qualification_list_query(
+            q=q, main_field=main_field, ncs_large=ncs_large, qual_type=qual_type,
+            managing_body=managing_body, is_active=is_active, has_pass_rate=has_pass_rate,
+            sort=sort, sort_desc=sort_desc,
+        )
         if cached_total is not None:
             total = cached_total
         else:
-            total = query.count()
-        
-        # Apply sorting
-        if sort == "name":
-            query = query.order_by(desc(Qualification.qual_name) if sort_desc else asc(Qualification.qual_name))
-        elif sort == "recent":
-            query = query.order_by(desc(Qualification.created_at) if sort_desc else asc(Qualification.created_at))
-        elif sort in ["pass_rate", "difficulty"]:
-            # stats 조인 후 그룹 집계로 정렬
-            query = query.outerjoin(QualificationStats).group_by(Qualification.qual_id)
-            if sort == "pass_rate":
-                # 합격률 높은 순 / 낮은 순 (NULL은 항상 마지막)
-                query = query.order_by(
-                    desc(func.avg(QualificationStats.pass_rate)).nulls_last()
-                    if sort_desc else
-                    asc(func.avg(QualificationStats.pass_rate)).nulls_last()
-                )
-            else:
-                # 난이도 정렬: difficulty_score 기준 (표시 avg_difficulty와 동일 소스로 정렬)
-                # NULL은 마지막, sort_desc=True → 높은 순(어려운 순)
-                query = query.order_by(
-                    desc(func.avg(QualificationStats.difficulty_score)).nulls_last()
-                    if sort_desc else
-                    asc(func.avg(QualificationStats.difficulty_score)).nulls_last()
-                )
-        
+            total = db.execute(count_stmt).scalar_one()
+
         # Apply pagination
         offset = (page - 1) * page_size
-        items = query.offset(offset).limit(page_size).all()
-        
+        items = db.execute(stmt.offset(offset).limit(page_size)).scalars().all()
+
         return items, total
     
     @staticmethod
     def get_filter_options(db: Session) -> dict:
         """Get available filter options. 단일 쿼리로 4개 컬럼 값 수집 후 Python에서 distinct (라운드트립 1회)."""
-        rows = db.query(
-            Qualification.main_field,
-            Qualification.ncs_large,
-            Qualification.qual_type,
-            Qualification.managing_body,
-        ).filter(Qualification.is_active == True).all()
-        main_fields = sorted({r.main_field for r in rows if r.main_field})
-        ncs_large = sorted({r.ncs_large for r in rows if r.ncs_large})
-        qual_types = sorted({r.qual_type for r in rows if r.qual_type})
-        managing_bodies = sorted({r.managing_body for r in rows if r.managing_body})
-        return {
-            "main_fields": main_fields,
-            "ncs_large": ncs_large,
-            "qual_types": qual_types,
-            "managing_bodies": managing_bodies,
-        }
+        rows = db.execute(FILTER_OPTIONS_STMT).all()
+        return filter_options_from_rows(rows)
     
     @staticmethod
     def create(db: Session, obj_in: QualificationCreate) -> Qualification:
@@ -577,26 +599,51 @@ def get_qualification_aggregated_stats(
     }
 
 
+# 집계 통계 bulk 조회 3종 (바인드 1개: ids). 핫 statement로 등록, AsyncSession 경로(app.crud_async)와 공용.
+AGG_STATS_SQL = hot_statement("qual_stats_agg_bulk", """
+    SELECT qual_id,
+           AVG(pass_rate) AS avg_pass_rate,
+           AVG(difficulty_score) AS avg_diff,
+           COALESCE(SUM(candidate_cnt), 0) AS total_cands,
+           COUNT(stat_id) AS num_records
+    FROM qualification_stats
+    WHERE qual_id = ANY(:ids)
+    GROUP BY qual_id
+""")
+# Latest pass rate per qual_id (DISTINCT ON)
+LATEST_PASS_RATE_SQL = hot_statement("qual_latest_pass_rate_bulk", """
+    SELECT DISTINCT ON (qual_id) qual_id, pass_rate
+    FROM qualification_stats
+    WHERE qual_id = ANY(:ids)
+    ORDER BY qual_id, year DESC, exam_round DESC
+""")
+# Qualification metadata for level weighting
+QUAL_GRADE_SQL = hot_statement("qual_grade_bulk", """
+    SELECT qual_id, qual_type, grade_code
+    FROM qualification
+    WHERE qual_id = ANY(:ids)
+""")
+
+
 def get_qualification_aggregated_stats_bulk(db: Session, qual_ids: List[int]) -> dict:
     """Get aggregated stats for multiple qualifications in bulk. = ANY(:ids)로 바인드 1개만 사용해 로그 폭주 방지."""
     if not qual_ids:
         return {}
+    params = {"ids": qual_ids}
+    return aggregate_qualification_stats(
+        qual_ids,
+        AGG_STATS_SQL.execute(db, params).fetchall(),
+        LATEST_PASS_RATE_SQL.execute(db, params).fetchall(),
+        QUAL_GRADE_SQL.execute(db, params).fetchall(),
+    )
 
+
+def aggregate_qualification_stats(qual_ids: List[int], rows1, rows2, rows3) -> dict:
+    """AGG_STATS_SQL / LATEST_PASS_RATE_SQL / QUAL_GRADE_SQL 결과 → qual_id별 난이도·합격률·응시자 수."""
     stats_map = {}
     latest_pass_rate_map = {}
     qual_metadata = {}
 
-    # 1. Raw aggregated stats (바인드 1개: ids)
-    rows1 = db.execute(text("""
-        SELECT qual_id,
-               AVG(pass_rate) AS avg_pass_rate,
-               AVG(difficulty_score) AS avg_diff,
-               COALESCE(SUM(candidate_cnt), 0) AS total_cands,
-               COUNT(stat_id) AS num_records
-        FROM qualification_stats
-        WHERE qual_id = ANY(:ids)
-        GROUP BY qual_id
-    """), {"ids": qual_ids}).fetchall()
     for r in rows1:
         stats_map[r.qual_id] = SimpleNamespace(
             qual_id=r.qual_id,
@@ -605,23 +652,8 @@ def get_qualification_aggregated_stats_bulk(db: Session, qual_ids: List[int]) ->
             total_cands=r.total_cands or 0,
             num_records=r.num_records or 0,
         )
-
-    # 2. Latest pass rate per qual_id (DISTINCT ON)
-    rows2 = db.execute(text("""
-        SELECT DISTINCT ON (qual_id) qual_id, pass_rate
-        FROM qualification_stats
-        WHERE qual_id = ANY(:ids)
-        ORDER BY qual_id, year DESC, exam_round DESC
-    """), {"ids": qual_ids}).fetchall()
     for r in rows2:
         latest_pass_rate_map[r.qual_id] = float(r.pass_rate) if r.pass_rate is not None else None
-
-    # 3. Qualification metadata for level weighting
-    rows3 = db.execute(text("""
-        SELECT qual_id, qual_type, grade_code
-        FROM qualification
-        WHERE qual_id = ANY(:ids)
-    """), {"ids": qual_ids}).fetchall()
     for r in rows3:
         qual_metadata[r.qual_id] = SimpleNamespace(qual_type=r.qual_type, grade_code=r.grade_code)
 
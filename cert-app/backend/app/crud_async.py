@@ -0,0 +1,184 @@
+"""
+Async read CRUD (AsyncSession / asyncpg) — async def 라우트의 조회 경로용.
+
+동기 Session 쿼리를 async 핸들러에서 바로 실행하면 DB 대기 동안 이벤트 루프가 멈춰 같은 워커의 다른 요청까지
+지연된다. 여기 함수들은 app.crud 와 같은 쿼리(공용 statement builder·SQL 상수)를 await로 실행하고,
+결과 가공(난이도 집계 등)도 app.crud 함수를 그대로 사용한다.
+
+관계(relationship)는 async에서 lazy load가 불가하므로 응답에 필요한 관계는 모두 eager load 한다.
+"""
+from typing import List, Optional
+
+from sqlalchemy import desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.crud import (
+    AGG_STATS_SQL,
+    FILTER_OPTIONS_STMT,
+    LATEST_PASS_RATE_SQL,
+    QUAL_GRADE_SQL,
+    aggregate_qualification_stats,
+    build_qualification_list_query,
+    filter_options_from_rows,
+)
+from app.models import Job, Major, Qualification, QualificationStats
+
+
+# ============== Qualification ==============
+
+class AsyncQualificationCRUD:
+    """Read operations for Qualification (async)."""
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, qual_id: int) -> Optional[Qualification]:
+        """Get qualification by ID."""
+        result = await db.execute(select(Qualification).where(Qualification.qual_id == qual_id).limit(1))
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_with_stats(db: AsyncSession, qual_id: int) -> Optional[Qualification]:
+        """Get qualification with stats and jobs."""
+        result = await db.execute(
+            select(Qualification)
+            .options(joinedload(Qualification.stats), joinedload(Qualification.jobs))
+            .where(Qualification.qual_id == qual_id)
+        )
+        return result.unique().scalars().first()
+
+    @staticmethod
+    async def get_list(
+        db: AsyncSession,
+        q: Optional[str] = None,
+        main_field: Optional[str] = None,
+        ncs_large: Optional[str] = None,
+        qual_type: Optional[str] = None,
+        managing_body: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        has_pass_rate: Optional[bool] = None,
+        sort: str = "name",
+        sort_desc: bool = True,
+        page: int = 1,
+        page_size: int = 20,
+        cached_total: Optional[int] = None,
+    ) -> tuple[List[Qualification], int]:
+        """QualificationCRUD.get_list 과 동일 (cached_total가 있으면 count 생략)."""
+        count_stmt, stmt = build_qualification_list_query(
+            q=q, main_field=main_field, ncs_large=ncs_large, qual_type=qual_type,
+            managing_body=managing_body, is_active=is_active, has_pass_rate=has_pass_rate,
+            sort=sort, sort_desc=sort_desc,
+        )
+        if cached_total is not None:
+            total = cached_total
+        else:
+            total = (await db.execute(count_stmt)).scalar_one()
+        offset = (page - 1) * page_size
+        items = (await db.execute(stmt.offset(offset).limit(page_size))).scalars().all()
+        return items, total
+
+    @staticmethod
+    async def get_filter_options(db: AsyncSession) -> dict:
+        """Get available filter options."""
+        rows = (await db.execute(FILTER_OPTIONS_STMT)).all()
+        return filter_options_from_rows(rows)
+
+
+class AsyncQualificationStatsCRUD:
+    """Read operations for QualificationStats (async)."""
+
+    @staticmethod
+    async def get_by_qual_id(
+        db: AsyncSession,
+        qual_id: int,
+        year: Optional[int] = None
+    ) -> List[QualificationStats]:
+        """Get stats by qualification ID."""
+        stmt = select(QualificationStats).where(QualificationStats.qual_id == qual_id)
+        if year:
+            stmt = stmt.where(QualificationStats.year == year)
+        stmt = stmt.order_by(desc(QualificationStats.year), desc(QualificationStats.exam_round))
+        return (await db.execute(stmt)).scalars().all()
+
+
+async def get_qualification_aggregated_stats_bulk_async(db: AsyncSession, qual_ids: List[int]) -> dict:
+    """get_qualification_aggregated_stats_bulk 의 async 버전 (같은 SQL·같은 집계)."""
+    if not qual_ids:
+        return {}
+    params = {"ids": qual_ids}
+    rows1 = (await AGG_STATS_SQL.execute_async(db, params)).fetchall()
+    rows2 = (await LATEST_PASS_RATE_SQL.execute_async(db, params)).fetchall()
+    rows3 = (await QUAL_GRADE_SQL.execute_async(db, params)).fetchall()
+    return aggregate_qualification_stats(qual_ids, rows1, rows2, rows3)
+
+
+async def get_qualification_aggregated_stats_async(db: AsyncSession, qual_id: int) -> dict:
+    """get_qualification_aggregated_stats 의 async 버전 (통계 없으면 total_candidates=None)."""
+    stats = (await get_qualification_aggregated_stats_bulk_async(db, [qual_id]))[qual_id]
+    if stats["avg_difficulty"] is None:
+        stats["total_candidates"] = None
+    return stats
+
+
+# ============== Job / Major ==============
+
+class AsyncJobCRUD:
+    """Read operations for Job (async)."""
+
+    @staticmethod
+    async def get_list(
+        db: AsyncSession,
+        q: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> tuple[List[Job], int]:
+        """Get list of jobs (JobResponse.qualifications 용으로 관계를 selectin 로드)."""
+        stmt = select(Job)
+        if q:
+            stmt = stmt.where(
+                or_(
+                    Job.job_name.ilike(f"%{q}%"),
+                    Job.outlook_summary.ilike(f"%{q}%")
+                )
+            )
+        total = (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+        offset = (page - 1) * page_size
+        result = await db.execute(
+            stmt.options(selectinload(Job.qualifications)).offset(offset).limit(page_size)
+        )
+        return result.scalars().all(), total
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, job_id: int) -> Optional[Job]:
+        """Get job by ID with related qualifications."""
+        result = await db.execute(
+            select(Job).options(joinedload(Job.qualifications)).where(Job.job_id == job_id)
+        )
+        return result.unique().scalars().first()
+
+
+class AsyncMajorCRUD:
+    """Read operations for Major (async)."""
+
+    @staticmethod
+    async def get_list(
+        db: AsyncSession,
+        q: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> tuple[List[Major], int]:
+        """Get list of majors."""
+        stmt = select(Major)
+        if q:
+            stmt = stmt.where(Major.major_name.ilike(f"%{q}%"))
+        total = (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+        offset = (page - 1) * page_size
+        items = (await db.execute(stmt.offset(offset).limit(page_size))).scalars().all()
+        return items, total
+
+
+# ============== Export instances ==============
+
+qualification_async_crud = AsyncQualificationCRUD()
+stats_async_crud = AsyncQualificationStatsCRUD()
+job_async_crud = AsyncJobCRUD()
+major_async_crud = AsyncMajorCRUD()
@@ -1,27 +1,119 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine, event
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import AsyncGenerator, Generator
+from uuid import uuid4
 import logging
+import time
 
 from app.config import get_settings
+from app.utils.db_metrics import record_checkout, record_checkout_timeout, record_query, register_engine
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+
+class _TimedPoolMixin:
+    """checkout(대기 + pre_ping 포함) 시간·사용 중 커넥션 수·overflow·타임아웃을 db_metrics에 기록."""
+
+    metrics_name = "sync"
+
+    def connect(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            record_checkout_timeout(self.metrics_name)
+            raise
+        record_checkout(
+            self.metrics_name,
+            (time.perf_counter() - t0) * 1000.0,
+            in_use=self.checkedout(),
+            overflow=max(0, self.overflow()),
+        )
+        return conn
+
+
+class _TimedQueuePool(_TimedPoolMixin, QueuePool):
+    metrics_name = "sync"
+
+
+class _TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """비동기 엔진용. connect()는 greenlet 안에서 실행되므로 asyncio 대기 시간도 포함된다."""
+
+    metrics_name = "async"
+
+
+def _async_database_url(url: str):
+    """postgresql://… → postgresql+asyncpg://… (asyncpg가 모르는 sslmode 쿼리는 connect_args ssl로 옮김)."""
+    u = make_url(url).set(drivername="postgresql+asyncpg")
+    connect_args = {"statement_cache_size": settings.ASYNC_DB_STATEMENT_CACHE_SIZE}
+    if settings.ASYNC_DB_STATEMENT_CACHE_SIZE <= 0:
+        # pgbouncer transaction 모드: 서버 커넥션이 바뀌어도 prepared statement 이름이 겹치지 않게
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        u = u.update_query_dict({"prepared_statement_cache_size": "0"})
+    sslmode = u.query.get("sslmode")
+    if sslmode:
+        u = u.difference_update_query(["sslmode"])
+        if sslmode != "disable":
+            connect_args["ssl"] = sslmode
+    return u, connect_args
+
+
+def _instrument_queries(sync_engine, name: str) -> None:
+    """cursor execute 전후 시간 → db_metrics (statement 지문·요청별 카운트, 느린 쿼리는 경고 로그)."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        ms = (time.perf_counter() - starts.pop()) * 1000.0
+        record_query(name, ms, statement)
+        if ms >= settings.DB_SLOW_QUERY_MS:
+            logger.warning("Slow query (%s, %.1fms): %s", name, ms, " ".join(statement.split())[:300])
+
+
 # Create engine
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=_TimedQueuePool,
     pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     echo=settings.DEBUG,
 )
+_instrument_queries(engine, _TimedQueuePool.metrics_name)
+register_engine(_TimedQueuePool.metrics_name, engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) — async def 라우트의 읽기 경로용. 느린 쿼리가 이벤트 루프(다른 요청)를 막지 않는다.
+_async_url, _async_connect_args = _async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    _async_url,
+    poolclass=_TimedAsyncQueuePool,
+    pool_pre_ping=True,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    connect_args=_async_connect_args,
+    echo=settings.DEBUG,
+)
+_instrument_queries(async_engine.sync_engine, _TimedAsyncQueuePool.metrics_name)
+register_engine(_TimedAsyncQueuePool.metrics_name, async_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Get database session dependency."""
@@ -32,6 +124,12 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session dependency (asyncpg)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def check_database_connection() -> bool:
     """Check if database connection is healthy."""
     try:
@@ -49,7 +147,7 @@ if settings.DEBUG:
     @event.listens_for(engine, "connect")
     def on_connect(dbapi_conn, connection_record):
         logger.debug("Database connection established")
-    
+
     @event.listens_for(engine, "checkout")
     def on_checkout(dbapi_conn, connection_record, connection_proxy):
         logger.debug("Database connection checked out from pool")
@@ -1,4 +1,6 @@
 """RAG 하이퍼파라미터: top_k, alpha, thresholds, rerank 경로, 캐시 TTL 등."""
+import hashlib
+import json
 from contextvars import ContextVar, Token
 from functools import lru_cache
 from pathlib import Path
@@ -328,8 +330,54 @@ class RAGSettings(BaseSettings):
         extra = "ignore"
 
 
-_rag_field_overrides: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
-    "rag_field_overrides", default=None
+class RAGSettingsSnapshot:
+    """
+    해석이 끝난(환경 + A/B 오버라이드) RAG 설정의 읽기 전용 스냅샷.
+
+    필드는 일반 인스턴스 속성이라 `s.RAG_X`·`getattr(s, "RAG_X", default)`가 dict 조회 한 번이다.
+    fingerprint는 생성 시 1회 계산한 전체 필드 값 해시 — 캐시 키에 그대로 쓴다.
+    오버라이드는 model_copy(update=...)와 같이 검증 없이 덮어쓴다 (검증은 app.rag.experiment에서).
+    """
+
+    def __init__(self, values: Dict[str, Any], base: Optional["RAGSettingsSnapshot"] = None,
+                 overrides: Optional[Dict[str, Any]] = None):
+        d = self.__dict__
+        d.update(values)
+        d["fields"] = tuple(values)
+        d["base"] = base
+        d["overrides"] = dict(overrides) if overrides else None
+        raw = json.dumps(values, sort_keys=True, default=str, ensure_ascii=False)
+        d["fingerprint"] = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_settings(cls, settings: RAGSettings) -> "RAGSettingsSnapshot":
+        return cls({name: getattr(settings, name) for name in RAGSettings.model_fields})
+
+    def with_overrides(self, overrides: Optional[Dict[str, Any]]) -> "RAGSettingsSnapshot":
+        if not overrides:
+            return self
+        values = self.model_dump()
+        values.update(overrides)
+        return RAGSettingsSnapshot(values, base=self, overrides=overrides)
+
+    def model_dump(self) -> Dict[str, Any]:
+        d = self.__dict__
+        return {name: d[name] for name in d["fields"]}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"RAGSettingsSnapshot is read-only ({name})")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"RAGSettingsSnapshot is read-only ({name})")
+
+    def __repr__(self) -> str:
+        return f"RAGSettingsSnapshot(fingerprint={self.fingerprint!r}, overrides={self.overrides!r})"
+
+
+# 요청 스코프 스냅샷 (A/B 미들웨어가 set_rag_field_overrides로 설정). 없으면 환경 기본 스냅샷.
+# ThreadPoolExecutor 작업에는 app.rag.request_memo.propagate_context로 컨텍스트째 넘긴다.
+_rag_settings_snapshot: ContextVar[Optional[RAGSettingsSnapshot]] = ContextVar(
+    "rag_settings_snapshot", default=None
 )
 
 
@@ -339,27 +387,40 @@ def _rag_settings_from_env() -> RAGSettings:
     return RAGSettings()
 
 
-def get_rag_settings() -> RAGSettings:
-    """요청 단위 A/B 시 app.rag.experiment 미들웨어가 필드 오버라이드를 넣을 수 있음."""
-    base = _rag_settings_from_env()
-    ovr = _rag_field_overrides.get()
-    if ovr:
-        return base.model_copy(update=ovr)
-    return base
+@lru_cache()
+def _rag_base_snapshot() -> RAGSettingsSnapshot:
+    return RAGSettingsSnapshot.from_settings(_rag_settings_from_env())
+
+
+def get_rag_settings() -> RAGSettingsSnapshot:
+    """요청 단위 A/B 시 app.rag.experiment 미들웨어가 필드 오버라이드를 넣은 스냅샷, 아니면 환경 기본 스냅샷."""
+    base = _rag_base_snapshot()
+    snap = _rag_settings_snapshot.get()
+    if snap is None:
+        return base
+    if snap.base is not base:
+        # 요청 도중 clear_rag_settings_cache() (스크립트 trial 등) → 새 기본값 위에 오버라이드 재적용 (기본값당 1회)
+        rebased = snap.__dict__.get("_rebased")
+        if rebased is None or rebased.base is not base:
+            rebased = snap.__dict__["_rebased"] = base.with_overrides(snap.overrides)
+        return rebased
+    return snap
 
 
 def set_rag_field_overrides(overrides: Optional[Dict[str, Any]]) -> Token:
-    """미들웨어에서만 사용. reset_rag_field_overrides(token)으로 복구."""
-    return _rag_field_overrides.set(overrides)
+    """미들웨어에서만 사용. 오버라이드를 적용한 스냅샷을 1회 만들어 컨텍스트에 둔다. reset_rag_field_overrides(token)으로 복구."""
+    snap = _rag_base_snapshot().with_overrides(overrides) if overrides else None
+    return _rag_settings_snapshot.set(snap)
 
 
 def reset_rag_field_overrides(token: Token) -> None:
-    _rag_field_overrides.reset(token)
+    _rag_settings_snapshot.reset(token)
 
 
 def clear_rag_settings_cache() -> None:
     """환경변수 재로드·스크립트 trial 간 기본 설정 초기화."""
     _rag_settings_from_env.cache_clear()
+    _rag_base_snapshot.cache_clear()
 
 
 def get_rag_index_dir() -> Path:
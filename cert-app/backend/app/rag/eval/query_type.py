@@ -14,6 +14,8 @@
 import re
 from typing import Optional
 
+from app.rag.request_memo import request_memoized
+
 # 지원하는 query_type 값 (집계·표 일관용)
 QUERY_TYPES = (
     "keyword",
@@ -22,6 +24,7 @@ QUERY_TYPES = (
 )
 
 
+@request_memoized("classify_query_type")
 def classify_query_type(query: str, from_golden: Optional[str] = None) -> str:
     """
     query_type: keyword | natural | mixed
@@ -5,11 +5,12 @@
 - CHALLENGERS: 이름 → {RAG_*: 값} 딕셔너리. eval 스크립트가 순서대로 control 대비 실행.
 
 운영 A/B: main.py → rag_ab_middleware → 요청 스코프에서 set_rag_field_overrides 로
-RAG_CHALLENGER_PRESET 필드만 덮어씀 (get_rag_settings()가 model_copy 반영).
+RAG_CHALLENGER_PRESET 필드만 덮어씀 (오버라이드를 반영한 설정 스냅샷을 요청당 1회 생성).
 """
 
 from __future__ import annotations
 
+import json
 import logging
 import secrets
 from typing import Any, Callable, Dict, List, Tuple
@@ -97,16 +98,33 @@ RAG_AB_CHALLENGERS: List[Tuple[str, Dict[str, Any]]] = [
 ]
 
 
+# (기본 설정 fingerprint, 프리셋 JSON) → 검증된 오버라이드. 프리셋은 고정이라 요청마다 model_validate 하지 않는다.
+_overrides_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+
 def challenger_preset_to_overrides(preset: Dict[str, Any]) -> Dict[str, Any]:
     """
-    문자열 기반 프리셋을 get_rag_settings().model_copy(update=...)에 넣을 수 있는
+    문자열 기반 프리셋을 set_rag_field_overrides(...)에 넣을 수 있는
     네이티브 값 dict로 변환. 알 수 없는 키·검증 실패 시 해당 키는 스킵.
     """
-    from app.rag.config import RAGSettings, get_rag_settings
+    from app.rag.config import get_rag_settings
 
     if not preset:
         return {}
     base = get_rag_settings()
+    try:
+        cache_key = (base.fingerprint, json.dumps(preset, sort_keys=True, default=str))
+    except Exception:
+        return _validate_preset(base, preset)
+    cached = _overrides_cache.get(cache_key)
+    if cached is None:
+        cached = _overrides_cache[cache_key] = _validate_preset(base, preset)
+    return dict(cached)
+
+
+def _validate_preset(base: Any, preset: Dict[str, Any]) -> Dict[str, Any]:
+    from app.rag.config import RAGSettings
+
     data = base.model_dump()
     keys_in = [k for k in preset if k in RAGSettings.model_fields]
     if not keys_in:
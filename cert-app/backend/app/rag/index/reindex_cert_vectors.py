@@ -253,6 +253,16 @@ def reindex_cert_vectors(
             stats.sparse_patched,
             elapsed_ms,
         )
+        if not dry_run and (stats.updated or stats.sparse_patched):
+            # certificates_vectors 도메인·메타가 바뀌었을 수 있음 → 워커들의 후보 피처 스토어 재적재
+            try:
+                from app.rag.retrieve.candidate_features import invalidate_candidate_feature_store
+                from app.utils.catalog_version import bump_catalog_version
+
+                bump_catalog_version()
+                invalidate_candidate_feature_store()
+            except Exception as e:
+                logger.warning("catalog version bump after reindex failed: %s", e)
         return stats
     finally:
         db.close()
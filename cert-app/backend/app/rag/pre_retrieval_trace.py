@@ -35,6 +35,8 @@ class PreRetrievalTrace(BaseModel):
     vector_search_meta: Dict[str, Any] = Field(default_factory=dict)
     rewrite_skipped: bool = False
     rewrite_skip_reason: Optional[str] = None  # identifier_heavy | budget_ms_below_min_for_rewrite
+    # 요청 단위 메모(app.rag.request_memo) 이름별 {"hits", "misses"} — trace 조립 시점까지
+    request_memo: Dict[str, Dict[str, int]] = Field(default_factory=dict)
 
     def as_log_dict(self) -> Dict[str, Any]:
         return self.model_dump()
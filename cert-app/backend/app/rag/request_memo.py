@@ -0,0 +1,147 @@
+"""
+요청 단위 메모이제이션 컨텍스트 (RAG 파이프라인).
+
+hybrid_retrieve 1회 안에서 같은 파생값을 여러 곳에서 다시 계산한다 — classify_query_type,
+extract_slots_for_dense(재질의 파이프라인 + 도메인/난이도 주석), _query_suggests_it, expand_query_single_string 등.
+요청 스코프 동안 (이름, 인자 키) → 결과를 보관해 재사용한다.
+
+- 스코프: request_memo_scope() (hybrid_retrieve 진입 시 with_request_memo로 자동). 중첩되면 바깥 스코프를 그대로 쓴다.
+  스코프 밖 호출은 메모 없이 원 함수를 그대로 실행 (프로세스 전역 캐시가 아니므로 요청 간 값이 새지 않음).
+- 저장소는 contextvar로 걸어 두며, ThreadPoolExecutor 작업은 propagate_context(fn)로 감싸 제출해야 워커 스레드에서도
+  같은 메모(및 A/B 설정 스냅샷 contextvar)를 본다. asyncio.to_thread는 컨텍스트를 자체 복사한다.
+- 예외는 캐시하지 않는다. 인자 키를 만들 수 없으면(해시 불가 등) 그 호출만 메모 없이 실행.
+- 이름별 hit/miss는 request_memo_stats()로 읽어 PreRetrievalTrace.request_memo에 싣는다.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class RequestMemo:
+    """요청 1건의 (이름, 키) → 값 저장소. 워커 스레드와 공유되므로 저장·카운터는 락으로 보호."""
+
+    __slots__ = ("_store", "_lock", "_hits", "_misses")
+
+    def __init__(self):
+        self._store: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def get_or_compute(self, name: str, key: Hashable, compute: Callable[[], T]) -> T:
+        k = (name, key)
+        with self._lock:
+            value = self._store.get(k, _MISSING)
+            if value is not _MISSING:
+                self._hits[name] = self._hits.get(name, 0) + 1
+                return value
+        # 계산은 락 밖에서 (동시에 두 스레드가 계산하면 먼저 넣은 값을 공유)
+        value = compute()
+        with self._lock:
+            self._misses[name] = self._misses.get(name, 0) + 1
+            return self._store.setdefault(k, value)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """{이름: {"hits": n, "misses": m}} (이름 순)."""
+        with self._lock:
+            names = sorted(set(self._hits) | set(self._misses))
+            return {n: {"hits": self._hits.get(n, 0), "misses": self._misses.get(n, 0)} for n in names}
+
+
+_current: contextvars.ContextVar[Optional[RequestMemo]] = contextvars.ContextVar(
+    "rag_request_memo", default=None
+)
+
+
+def current_request_memo() -> Optional[RequestMemo]:
+    return _current.get()
+
+
+@contextmanager
+def request_memo_scope() -> Iterator[RequestMemo]:
+    """요청 스코프 열기. 이미 열려 있으면 바깥 메모를 그대로 돌려준다."""
+    memo = _current.get()
+    if memo is not None:
+        yield memo
+        return
+    memo = RequestMemo()
+    token = _current.set(memo)
+    try:
+        yield memo
+    finally:
+        _current.reset(token)
+
+
+def with_request_memo(fn: Callable[..., T]) -> Callable[..., T]:
+    """함수 실행 전체를 request_memo_scope()로 감싸는 데코레이터 (파이프라인 진입점용)."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with request_memo_scope():
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def request_memo_stats() -> Dict[str, Dict[str, int]]:
+    memo = _current.get()
+    return memo.stats() if memo is not None else {}
+
+
+def profile_key(profile: Any) -> Optional[str]:
+    """UserProfile(dict) → 메모 키용 문자열. 비어 있으면 None (재질의 캐시 키 규칙과 동일하게 프로필 없음 취급)."""
+    if not profile:
+        return None
+    return json.dumps(profile, sort_keys=True, default=str, ensure_ascii=False)
+
+
+def request_memoized(
+    name: str,
+    key: Optional[Callable[..., Hashable]] = None,
+    copy: Optional[Callable[[Any], Any]] = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    요청 스코프 안에서 결과를 재사용하는 데코레이터.
+    key: 인자 → 해시 가능한 키 (기본: (args, sorted kwargs)). copy: 호출자가 결과를 변경할 수 있으면 복사 함수(예: dict).
+    """
+
+    def decorate(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            memo = _current.get()
+            if memo is None:
+                return fn(*args, **kwargs)
+            try:
+                k = key(*args, **kwargs) if key is not None else (args, tuple(sorted(kwargs.items())))
+                hash(k)
+            except Exception:
+                return fn(*args, **kwargs)
+            value = memo.get_or_compute(name, k, lambda: fn(*args, **kwargs))
+            return copy(value) if copy is not None else value
+
+        return wrapper
+
+    return decorate
+
+
+def propagate_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    현재 컨텍스트(요청 메모·A/B 오버라이드 등 contextvar)를 복사해 fn을 그 안에서 실행하는 callable.
+    executor.submit(propagate_context(fn)) 형태로 사용 — 제출마다 새로 복사해야 한다 (Context는 동시 진입 불가).
+    """
+    ctx = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        return ctx.run(fn, *args, **kwargs)
+
+    return run
@@ -0,0 +1,376 @@
+"""
+후보 자격증 피처 스토어 (qual_id → 정적 메타 + 사전 계산 토큰 집합, in-memory).
+
+metadata/personalized soft score는 hybrid_retrieve마다 후보 qual_id에 대해 qualification ·
+major_qualification_map · certificates_vectors를 조회하고, 후보마다 전공 정규화·도메인 탐지·토큰 분리를 반복했다.
+이 값들은 자격증 단위로 정적이므로 전체를 한 번 적재해 두고 조회는 dict 조회 + frozenset 교집합만 한다.
+
+- 메타 dict는 fetch_qual_metadata_bulk와 같은 모양(같은 조립 함수 fill_qual_metadata)이고, "features" 키에 QualFeatures를 붙인다.
+  호출자가 dict를 변경(merge_difficulty_into_metadata 등)하므로 조회 시 얕은 복사본을 돌려준다.
+- 카탈로그 데이터 버전(app.utils.catalog_version)이 바뀌거나 CANDIDATE_FEATURE_STORE_MAX_AGE(초)가 지나면 다음 조회가
+  백그라운드 스레드 재적재를 걸고, 끝날 때까지는 이전 스토어를 그대로 쓴다 (요청이 전체 테이블 적재를 기다리지 않음).
+  재색인(app.rag.index.reindex_cert_vectors)은 완료 시 카탈로그 버전을 올린다.
+- 적재 실패·비활성이면 None → fetch_qual_metadata_bulk가 기존 qual_id 단위 SQL로 폴백.
+- CandidateFeatureMatrix: 토큰 집합 피처를 열(column)별 packed bitset(uint64) 행렬로 둔 것. 배치 soft score
+  (compute_metadata_soft_scores / compute_personalized_soft_scores)가 후보 전체를 NumPy 연산으로 처리한다.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.rag.utils.major_normalize import normalize_major
+from app.utils.catalog_version import get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# fetch_qual_metadata_bulk의 hot statement와 같은 컬럼·정렬 (qual_id 필터만 없음)
+_ALL_QUAL_META_SQL = text("SELECT qual_id, main_field, ncs_large FROM qualification")
+_ALL_QUAL_MAJORS_SQL = text("SELECT qual_id, major FROM major_qualification_map ORDER BY qual_id, score DESC")
+_ALL_QUAL_VECTOR_DOMAIN_SQL = text("""
+    SELECT qual_id, domain, domain_normalized, domain_keywords, metadata
+    FROM certificates_vectors
+    WHERE COALESCE(chunk_index, 0) = 0
+""")
+
+
+def _tokens(s: Any) -> FrozenSet[str]:
+    """공백/쉼표 분리 토큰 (soft score의 _normalize_tokens와 동일)."""
+    if not s or not isinstance(s, str):
+        return frozenset()
+    return frozenset(t.strip() for t in s.replace(",", " ").split() if t.strip())
+
+
+def _tokens_from_maybe_list(v: Any) -> FrozenSet[str]:
+    if v is None:
+        return frozenset()
+    if isinstance(v, list):
+        return _tokens(" ".join(str(x) for x in v if str(x).strip()))
+    return _tokens(str(v))
+
+
+class QualFeatures:
+    """
+    자격증 1건의 soft score용 토큰 집합 (모두 frozenset).
+    - job_tokens: main_field + ncs_large + metadata main_fields/ncs_large (RAG_METADATA_SOFT_MAIN_FIELD_IN_JOB_MATCH=True)
+    - job_tokens_no_main_field: 위에서 main_field 토큰만 뺀 것 (False일 때)
+    - major_set: related_majors를 major_category로 정규화
+    - domain_tokens / domain_keyword_tokens: 넓은 도메인 + cert 도메인 / cert domain_keywords
+    - main_field_tokens / ncs_tokens / field_tokens: 개인화(다음 단계·즐겨찾기 분야)용
+    """
+
+    __slots__ = (
+        "job_tokens",
+        "job_tokens_no_main_field",
+        "major_set",
+        "domain_tokens",
+        "domain_keyword_tokens",
+        "main_field_tokens",
+        "ncs_tokens",
+        "field_tokens",
+        "is_it",
+    )
+
+    def __init__(self, meta: Dict[str, Any]):
+        main_field = meta.get("main_field")
+        ncs_large = meta.get("ncs_large")
+        self.main_field_tokens = _tokens(str(main_field or ""))
+        self.ncs_tokens = _tokens(str(ncs_large or ""))
+        self.field_tokens = _tokens(str(main_field or "") + " " + str(ncs_large or ""))
+        rest = (
+            self.ncs_tokens
+            | _tokens_from_maybe_list(meta.get("main_fields"))
+            | _tokens_from_maybe_list(meta.get("ncs_large_list"))
+        )
+        self.job_tokens = self.main_field_tokens | rest
+        self.job_tokens_no_main_field = rest
+
+        majors = meta.get("related_majors") or []
+        if isinstance(majors, list):
+            self.major_set = frozenset(n for n in (normalize_major(str(m).strip()) for m in majors) if n)
+        else:
+            self.major_set = (
+                frozenset({normalize_major(str(majors).strip())}) if str(majors).strip() else frozenset()
+            )
+
+        self.domain_tokens = _tokens(
+            " ".join(
+                list(meta.get("domains") or [])
+                + [str(meta.get("cert_domain") or ""), str(meta.get("cert_top_domain") or "")]
+            )
+        )
+        self.domain_keyword_tokens = _tokens(str(meta.get("cert_domain_keywords") or ""))
+        self.is_it = meta.get("is_it")
+
+
+def qual_features(meta: Dict[str, Any]) -> QualFeatures:
+    """메타 dict의 사전 계산 피처 (스토어 밖에서 만든 dict면 즉석 계산)."""
+    feats = meta.get("features")
+    if isinstance(feats, QualFeatures):
+        return feats
+    return QualFeatures(meta)
+
+
+# CandidateFeatureMatrix 열 = QualFeatures의 frozenset 속성
+_SET_COLUMNS = (
+    "job_tokens",
+    "job_tokens_no_main_field",
+    "major_set",
+    "domain_tokens",
+    "domain_keyword_tokens",
+    "main_field_tokens",
+    "ncs_tokens",
+    "field_tokens",
+)
+
+
+class BitsetColumn:
+    """
+    후보별 토큰 집합을 열 전용 어휘 기준 packed bitset으로 보관.
+    마지막 행은 빈 집합 — 후보 없음(행 번호 -1)이 그대로 빈 집합으로 조회된다.
+    """
+
+    __slots__ = ("vocab", "bits", "nonempty")
+
+    def __init__(self, sets: Sequence[FrozenSet[Any]]):
+        vocab: Dict[Any, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for i, tokens in enumerate(sets):
+            for t in tokens:
+                rows.append(i)
+                cols.append(vocab.setdefault(t, len(vocab)))
+        words = max(1, (len(vocab) + 63) // 64)
+        bits = np.zeros((len(sets) + 1, words), dtype=np.uint64)
+        if rows:
+            c = np.asarray(cols, dtype=np.int64)
+            np.bitwise_or.at(
+                bits,
+                (np.asarray(rows, dtype=np.int64), c >> 6),
+                np.left_shift(np.uint64(1), (c & 63).astype(np.uint64)),
+            )
+        self.vocab = vocab
+        self.bits = bits
+        self.nonempty = bits.any(axis=1)
+
+    def mask(self, tokens: Iterable[Any]) -> Optional[np.ndarray]:
+        """질의 토큰 집합 → bitset. 어휘에 없는 토큰은 어떤 후보와도 겹칠 수 없으므로 무시, 하나도 없으면 None."""
+        out: Optional[np.ndarray] = None
+        for t in tokens:
+            j = self.vocab.get(t)
+            if j is None:
+                continue
+            if out is None:
+                out = np.zeros(self.bits.shape[1], dtype=np.uint64)
+            out[j >> 6] |= np.uint64(1) << np.uint64(j & 63)
+        return out
+
+    def intersects(self, rows: np.ndarray, tokens: Iterable[Any]) -> np.ndarray:
+        """행별 (후보 집합 ∩ tokens) ≠ ∅."""
+        q = self.mask(tokens)
+        if q is None:
+            return np.zeros(len(rows), dtype=bool)
+        return (self.bits[rows] & q).any(axis=1)
+
+
+class CandidateFeatureMatrix:
+    """qual_id → 행 번호 + 열별 BitsetColumn + is_it(-1=None, 0, 1). 배치 soft score 입력."""
+
+    def __init__(self, qual_ids: Sequence[int], features: Sequence[QualFeatures]):
+        self.index: Dict[int, int] = {qid: i for i, qid in enumerate(qual_ids)}
+        self.columns: Dict[str, BitsetColumn] = {
+            name: BitsetColumn([getattr(f, name) for f in features]) for name in _SET_COLUMNS
+        }
+        is_it = np.full(len(features) + 1, -1, dtype=np.int8)
+        for i, f in enumerate(features):
+            if f.is_it is not None:
+                is_it[i] = 1 if f.is_it else 0
+        self.is_it = is_it
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def column(self, name: str) -> BitsetColumn:
+        return self.columns[name]
+
+    def rows(self, qual_ids: Iterable[Optional[int]]) -> np.ndarray:
+        """후보 qual_id 목록 → 행 번호 배열 (없는 qual_id·None은 -1 = 빈 피처 행)."""
+        index = self.index
+        return np.fromiter((index.get(q, -1) if q is not None else -1 for q in qual_ids), dtype=np.int64)
+
+    def restricted(self, qual_ids: Iterable[int]) -> "CandidateFeatureMatrix":
+        """qual_ids 행만 조회되는 뷰 (열·is_it 배열은 공유, 나머지 qual_id는 -1 = 빈 피처 행)."""
+        view = object.__new__(CandidateFeatureMatrix)
+        index = self.index
+        view.index = {q: index[q] for q in qual_ids if q in index}
+        view.columns = self.columns
+        view.is_it = self.is_it
+        return view
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[int, Dict[str, Any]]) -> "CandidateFeatureMatrix":
+        qual_ids = list(metadata)
+        return cls(qual_ids, [qual_features(metadata[q]) for q in qual_ids])
+
+
+def feature_matrix_for(metadata: Dict[int, Dict[str, Any]]) -> CandidateFeatureMatrix:
+    """
+    메타 dict 묶음에 맞는 피처 행렬. 전부 현재 피처 스토어에서 나온 dict면 스토어의 사전 구축 행렬을 metadata의
+    qual_id로 제한한 뷰를, 아니면(SQL 폴백·외부 dict) 이 묶음으로 즉석 구축.
+    어느 쪽이든 metadata에 없는 qual_id는 후보별 함수(빈 메타 dict)와 같이 빈 피처로 채점된다.
+    """
+    store = _store
+    if store is not None and all(
+        meta.get("features") is not None and meta.get("features") is store.features(qid)
+        for qid, meta in metadata.items()
+    ):
+        return store.matrix.restricted(metadata)
+    return CandidateFeatureMatrix.from_metadata(metadata)
+
+
+class CandidateFeatureStore:
+    """qual_id → (메타 dict, QualFeatures). metadata_for()는 SQL 없이 요청용 복사본을 만든다."""
+
+    def __init__(self, version: str, metadata: Dict[int, Dict[str, Any]]):
+        self.version = version
+        self._metadata = metadata
+        qual_ids = list(metadata)
+        self.matrix = CandidateFeatureMatrix(qual_ids, [metadata[q]["features"] for q in qual_ids])
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def metadata_for(self, qual_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        out: Dict[int, Dict[str, Any]] = {}
+        for qid in qual_ids:
+            meta = self._metadata.get(qid)
+            if meta is not None:
+                out[qid] = dict(meta)
+        return out
+
+    def features(self, qual_id: int) -> Optional[QualFeatures]:
+        meta = self._metadata.get(qual_id)
+        return meta["features"] if meta is not None else None
+
+    @classmethod
+    def build(cls, db, version: str) -> "CandidateFeatureStore":
+        from app.rag.retrieve.metadata_soft_score import fill_qual_metadata
+
+        t0 = time.perf_counter()
+        metadata: Dict[int, Dict[str, Any]] = {}
+        fill_qual_metadata(
+            metadata,
+            db.execute(_ALL_QUAL_META_SQL).fetchall(),
+            lambda _ids: db.execute(_ALL_QUAL_MAJORS_SQL).fetchall(),
+            lambda _ids: db.execute(_ALL_QUAL_VECTOR_DOMAIN_SQL).fetchall(),
+        )
+        for meta in metadata.values():
+            meta["features"] = QualFeatures(meta)
+        store = cls(version, metadata)
+        logger.info(
+            "Candidate feature store built: %d quals in %.1fms (version=%s)",
+            len(metadata), (time.perf_counter() - t0) * 1000, version,
+        )
+        return store
+
+
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_store: Optional[CandidateFeatureStore] = None
+_building = False
+# 적재 실패 시 요청마다 재시도하지 않도록 최소 간격(초)
+_RETRY_AFTER_FAILURE = 30.0
+_last_failure = 0.0
+
+
+def _is_fresh(store: Optional[CandidateFeatureStore], version: str) -> bool:
+    if store is None or store.version != version:
+        return False
+    max_age = get_settings().CANDIDATE_FEATURE_STORE_MAX_AGE
+    return not max_age or (time.time() - store.built_at) < max_age
+
+
+def build_candidate_feature_store() -> Optional[CandidateFeatureStore]:
+    """현재 버전 스토어를 자체 세션으로 동기 적재 (백그라운드 스레드·기동 선적재용). 실패 시 이전 스토어."""
+    global _store, _last_failure
+    with _build_lock:
+        version = get_catalog_version()
+        if _is_fresh(_store, version):
+            return _store
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            built = CandidateFeatureStore.build(db, version)
+            if len(built):
+                with _lock:
+                    _store = built
+            else:
+                _last_failure = time.time()
+        except Exception as e:
+            _last_failure = time.time()
+            logger.warning("Candidate feature store build failed: %s", e)
+        finally:
+            db.close()
+        return _store
+
+
+def _build_in_background() -> None:
+    global _building
+    try:
+        build_candidate_feature_store()
+    finally:
+        with _lock:
+            _building = False
+
+
+def get_candidate_feature_store() -> Optional[CandidateFeatureStore]:
+    """
+    피처 스토어. 버전 변경·만료 시 이전 스토어를 그대로 돌려주고 백그라운드 재적재를 건다
+    (요청 경로에서는 적재하지 않음 — 스토어가 아직 없으면 None → 호출자는 SQL 폴백).
+    """
+    global _building
+    if not get_settings().CANDIDATE_FEATURE_STORE_ENABLE:
+        return None
+    version = get_catalog_version()
+    current = _store
+    if _is_fresh(current, version):
+        return current
+    with _lock:
+        if _building or time.time() - _last_failure < _RETRY_AFTER_FAILURE:
+            return current
+        _building = True
+    try:
+        threading.Thread(
+            target=_build_in_background, name="candidate-feature-store-build", daemon=True
+        ).start()
+    except Exception as e:
+        with _lock:
+            _building = False
+        logger.warning("Candidate feature store build could not be scheduled: %s", e)
+    return current
+
+
+def invalidate_candidate_feature_store() -> None:
+    """같은 프로세스에서 재색인한 직후 등 — 다음 조회 때 재적재 (그때까지는 SQL 폴백)."""
+    global _store
+    with _lock:
+        _store = None
+
+
+def prewarm_candidate_feature_store() -> bool:
+    """기동 시 1회 적재 — 첫 RAG 요청부터 스토어 경로를 쓰도록."""
+    if not get_settings().CANDIDATE_FEATURE_STORE_ENABLE:
+        return False
+    try:
+        return build_candidate_feature_store() is not None
+    except Exception:
+        logger.debug("candidate feature store prewarm failed", exc_info=True)
+        return False
@@ -0,0 +1,245 @@
+"""
+점수 융합 커널 (NumPy) — RRF / linear / CombSUM / CombMNZ.
+
+hybrid의 _rrf_merge* / _linear_merge* / _combsum_merge_n / _combmnz_merge_n은 채널 융합, multi-query dense 융합,
+keyword·COT·stepback 병합, hierarchical blend에서 질의당 여러 번 호출된다. chunk_id → 점수 dict를 채널마다 만들고
+후보마다 Python 루프로 정규화·가중합한 뒤 전체 리스트를 정렬하던 것을, 융합 1회마다:
+
+1. FusionIdSpace가 chunk_id를 첫 등장 순서대로 0..n-1 정수로 매핑하고,
+2. 채널마다 (행 번호, 원점수, 순위) 배열(FusionChannel)을 만든 뒤,
+3. min-max·순위 변환·가중합을 길이 n 벡터 연산으로 처리하고, top_k가 있으면 argpartition으로 상위만 정렬한다.
+
+- 기존 merge 함수와 점수는 비트 단위로 같다: 같은 연산을 같은 채널 순서로 누적하고(0.0 + x = x),
+  리스트에 같은 chunk_id가 여러 번 있으면 dict 구성과 같이 마지막 등장의 점수·순위를 쓴다.
+- 동점 순서: 기존 구현은 set 순회 순서(프로세스마다 해시 시드로 달라짐)였고, 여기서는 첫 등장 순서로 고정된다.
+- top_k 결과는 전체 정렬 결과의 앞 top_k와 같다 (경계 동점까지 포함해 다시 안정 정렬).
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 채널에 없는 문서의 RRF 순위 (기존 rank_map.get(cid, 9999)와 동일)
+MISSING_RANK = 9999
+
+ScoredList = Sequence[Tuple[str, float]]
+
+
+class FusionChannel:
+    """한 채널의 (행 번호, 원점수, 1부터 시작하는 순위). 행 번호는 FusionIdSpace 기준, 중복 chunk_id는 마지막 등장."""
+
+    __slots__ = ("rows", "scores", "ranks")
+
+    def __init__(self, rows: np.ndarray, scores: np.ndarray, ranks: np.ndarray):
+        self.rows = rows
+        self.scores = scores
+        self.ranks = ranks
+
+    def __len__(self) -> int:
+        return int(self.rows.shape[0])
+
+
+class FusionIdSpace:
+    """융합 1회용 chunk_id ↔ 정수 행 번호 매핑 (첫 등장 순서)."""
+
+    __slots__ = ("ids", "_index")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def intern(self, cid: str) -> int:
+        row = self._index.get(cid)
+        if row is None:
+            row = len(self.ids)
+            self._index[cid] = row
+            self.ids.append(cid)
+        return row
+
+    def channel(self, scored: ScoredList) -> FusionChannel:
+        # {cid: 마지막 위치} — dict 구성({cid: s for ...})과 같은 last-wins, 키 순서는 첫 등장
+        last = {cid: i for i, (cid, _) in enumerate(scored)}
+        intern = self.intern
+        m = len(last)
+        rows = np.fromiter((intern(cid) for cid in last), dtype=np.int64, count=m)
+        pos = np.fromiter(last.values(), dtype=np.int64, count=m)
+        scores = np.fromiter((scored[i][1] for i in last.values()), dtype=np.float64, count=m)
+        return FusionChannel(rows, scores, pos + 1)
+
+    def channels(self, lists: Sequence[ScoredList]) -> List[FusionChannel]:
+        return [self.channel(lst) for lst in lists]
+
+    def dense(self, channel: FusionChannel, values: np.ndarray, fill: float = 0.0) -> np.ndarray:
+        """채널 값 → 길이 len(self) 벡터 (채널에 없는 행은 fill). 모든 채널을 intern한 뒤 호출."""
+        out = np.full(len(self.ids), fill, dtype=np.float64)
+        out[channel.rows] = values
+        return out
+
+    def present(self, channel: FusionChannel) -> np.ndarray:
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[channel.rows] = True
+        return mask
+
+    def ranked(
+        self,
+        scores: np.ndarray,
+        keep: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """점수 내림차순 [(chunk_id, score)]. 동점은 첫 등장 순. keep(bool)이 있으면 해당 행만, top_k가 있으면 상위만."""
+        rows = np.flatnonzero(keep) if keep is not None else np.arange(scores.shape[0])
+        vals = scores[rows]
+        k = rows.shape[0] if top_k is None else max(0, min(int(top_k), rows.shape[0]))
+        if k < rows.shape[0]:
+            if k == 0:
+                return []
+            # 경계값 이상(동점 포함)만 남긴 뒤 안정 정렬 → 전체 정렬의 앞 k개와 동일
+            kth = -np.partition(-vals, k - 1)[k - 1]
+            sel = np.flatnonzero(vals >= kth)
+            rows, vals = rows[sel], vals[sel]
+        order = np.argsort(-vals, kind="stable")[:k]
+        ids = self.ids
+        return [(ids[r], s) for r, s in zip(rows[order].tolist(), vals[order].tolist())]
+
+
+def _weights(weights: Optional[Sequence[float]], n: int) -> List[float]:
+    """가중치 None·길이 불일치면 균등 1/n (기존 merge 규칙)."""
+    if weights is None or len(weights) != n:
+        return [1.0 / n] * n
+    return list(weights)
+
+
+def _pow(values: np.ndarray, p: float) -> np.ndarray:
+    """원소별 v**p. np.power(float64)는 SIMD 구현이 libm pow와 1ulp 다를 수 있어 기존 점수와 맞추려고 Python pow 사용
+    (지수 != 1인 비기본 설정에서만 호출)."""
+    return np.fromiter((v ** p for v in values.tolist()), dtype=np.float64, count=values.shape[0])
+
+
+def rrf_terms(k: int, ranks: np.ndarray, p: float) -> np.ndarray:
+    """_rrf_score_term 벡터판: 1/(k+rank)^p."""
+    denom = (k + ranks).astype(np.float64)
+    if p == 1.0:
+        return 1.0 / denom
+    return 1.0 / _pow(denom, p)
+
+
+def minmax(values: np.ndarray) -> np.ndarray:
+    """(v - min) / (max - min). max <= min이면 분모 1.0."""
+    if not values.size:
+        return values
+    mn = values.min()
+    mx = values.max()
+    r = mx - mn if mx > mn else 1.0
+    return (values - mn) / r
+
+
+def norm_power(values: np.ndarray, p: float) -> np.ndarray:
+    """_linear_norm_power 벡터판: 양수에만 ^p."""
+    if p == 1.0:
+        return values
+    out = values.copy()
+    pos = out > 0.0
+    out[pos] = _pow(out[pos], p)
+    return out
+
+
+def rrf_fuse(
+    lists: Sequence[ScoredList],
+    weights: Optional[Sequence[float]],
+    k: int,
+    p: float = 1.0,
+    top_k: Optional[int] = None,
+) -> List[Tuple[str, float]]:
+    """score(d) = sum_i w_i / (k + rank_i(d))^p, 채널에 없으면 rank=MISSING_RANK."""
+    if not lists:
+        return []
+    weights = _weights(weights, len(lists))
+    space = FusionIdSpace()
+    channels = space.channels(lists)
+    if not len(space):
+        return []
+    missing = float(rrf_terms(k, np.array([MISSING_RANK]), p)[0])
+    total = np.zeros(len(space), dtype=np.float64)
+    for w, ch in zip(weights, channels):
+        total += w * space.dense(ch, rrf_terms(k, ch.ranks, p), fill=missing)
+    return space.ranked(total, top_k=top_k)
+
+
+def linear_fuse(
+    lists: Sequence[ScoredList],
+    weights: Optional[Sequence[float]],
+    p: float = 1.0,
+    top_k: Optional[int] = None,
+) -> List[Tuple[str, float]]:
+    """S = sum_i w_i * norm_i(d)^p (채널별 min-max, 채널에 없으면 0)."""
+    if not lists:
+        return []
+    weights = _weights(weights, len(lists))
+    space = FusionIdSpace()
+    channels = space.channels(lists)
+    if not len(space):
+        return []
+    total = np.zeros(len(space), dtype=np.float64)
+    for w, ch in zip(weights, channels):
+        total += w * norm_power(space.dense(ch, minmax(ch.scores)), p)
+    return space.ranked(total, top_k=top_k)
+
+
+def combsum_fuse(
+    lists: Sequence[ScoredList],
+    weights: Optional[Sequence[float]] = None,
+    top_k: Optional[int] = None,
+) -> List[Tuple[str, float]]:
+    """CombSUM: score(d) = sum_i w_i * minmax_i(d)."""
+    if not lists:
+        return []
+    w = _weights(weights, len(lists))
+    space = FusionIdSpace()
+    channels = space.channels(lists)
+    total = np.zeros(len(space), dtype=np.float64)
+    for wi, ch in zip(w, channels):
+        total += wi * space.dense(ch, minmax(ch.scores))
+    return space.ranked(total, top_k=top_k)
+
+
+def combmnz_fuse(
+    lists: Sequence[ScoredList],
+    weights: Optional[Sequence[float]] = None,
+    norm_mode: str = "minmax",
+    zero_mode: str = "topn",
+    zero_threshold: float = 0.0,
+    rank_exponent: float = 1.0,
+    top_k: Optional[int] = None,
+) -> List[Tuple[str, float]]:
+    """CombMNZ: score(d) = nz(d) * sum_i w_i * norm_i(d). nz·합 모두 0이면 제외 (_combmnz_merge_n 참고)."""
+    if not lists:
+        return []
+    w = _weights(weights, len(lists))
+    norm_mode = (norm_mode or "minmax").lower()
+    zero_mode = (zero_mode or "topn").lower()
+    p = rank_exponent if rank_exponent > 0 else 1.0
+    space = FusionIdSpace()
+    channels = space.channels(lists)
+    n = len(space)
+    count = np.zeros(n, dtype=np.int64)
+    sum_norm = np.zeros(n, dtype=np.float64)
+    for wi, ch in zip(w, channels):
+        if not len(ch):
+            continue
+        if norm_mode == "rank":
+            base = 1.0 + ch.ranks
+            norm = 1.0 / (base if p == 1.0 else _pow(base, p))
+        else:
+            norm = minmax(ch.scores)
+        counted = space.present(ch)
+        values = space.dense(ch, norm)
+        if zero_mode == "threshold":
+            counted &= values >= zero_threshold
+        count += counted
+        sum_norm += np.where(counted, wi * values, 0.0)
+    keep = (count > 0) & (sum_norm > 0.0)
+    return space.ranked(count * sum_norm, keep=keep, top_k=top_k)
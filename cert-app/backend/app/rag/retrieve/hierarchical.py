@@ -11,11 +11,11 @@ import re
 import time
 from typing import Dict, List, Tuple
 
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.rag.config import get_rag_settings
 from app.rag.index.bm25_index import BM25Index
+from app.utils.sql_registry import hot_statement
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,16 @@ _CACHE_PARENT_BY_CHILD: Dict[str, int] = {}
 # RAG_HIERARCHICAL_STAT_SKIP_SEC 동안은 DB stat 없이 메모리 인덱스만 사용(요청당 COUNT 왕복 제거).
 _hier_trust_until: float = 0.0
 
+_INDEX_STAT_SQL = hot_statement("hier_index_stat", """
+    SELECT COUNT(*)::int AS cnt, COALESCE(MAX(EXTRACT(EPOCH FROM updated_at))::bigint, 0) AS max_updated
+    FROM certificates_vectors
+""")
+_INDEX_ROWS_SQL = hot_statement("hier_index_rows", """
+    SELECT qual_id, COALESCE(chunk_index, 0) AS chunk_index, COALESCE(content, '') AS content
+    FROM certificates_vectors
+    WHERE content IS NOT NULL AND TRIM(content) != ''
+""")
+
 _SECTION_SPLIT_RE = re.compile(
     r"(?:\n{2,}|\s*\|\s*|(?=(?:응시자격|시험과목|활용직무|난이도|추천\s*대상)\s*[:：]))"
 )
@@ -57,29 +67,14 @@ def _ensure_hierarchical_index(db: Session) -> Tuple[BM25Index, Dict[str, int]]:
     ):
         return _CACHE_INDEX, _CACHE_PARENT_BY_CHILD
 
-    stat = db.execute(
-        text(
-            """
-            SELECT COUNT(*)::int AS cnt, COALESCE(MAX(EXTRACT(EPOCH FROM updated_at))::bigint, 0) AS max_updated
-            FROM certificates_vectors
-            """
-        )
-    ).fetchone()
+    stat = _INDEX_STAT_SQL.execute(db).fetchone()
     key = (int(getattr(stat, "cnt", 0) or 0), int(getattr(stat, "max_updated", 0) or 0))
     if _CACHE_INDEX is not None and _CACHE_KEY == key:
         if skip_sec > 0:
             _hier_trust_until = time.monotonic() + skip_sec
         return _CACHE_INDEX, _CACHE_PARENT_BY_CHILD
 
-    rows = db.execute(
-        text(
-            """
-            SELECT qual_id, COALESCE(chunk_index, 0) AS chunk_index, COALESCE(content, '') AS content
-            FROM certificates_vectors
-            WHERE content IS NOT NULL AND TRIM(content) != ''
-            """
-        )
-    ).fetchall()
+    rows = _INDEX_ROWS_SQL.execute(db).fetchall()
 
     docs: List[dict] = []
     parent_by_child: Dict[str, int] = {}
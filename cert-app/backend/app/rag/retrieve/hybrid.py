@@ -9,7 +9,6 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 
 from app.rag.config import get_rag_index_dir, get_rag_settings
 from app.rag.eval.query_type import classify_query_type
@@ -24,20 +23,31 @@ from app.rag.utils.dense_query_rewrite import (
     UserProfile,
 )
 from app.rag.pre_retrieval_trace import PreRetrievalTrace, log_pre_retrieval_trace
+from app.rag.request_memo import (
+    profile_key,
+    propagate_context,
+    request_memo_stats,
+    request_memoized,
+    with_request_memo,
+)
 from app.rag.utils.pre_retrieval_signals import pre_retrieval_aux_fields
 from app.rag.utils.hyde import generate_hyde_document
 from app.rag.utils.cot_query import expand_query_cot, stepback_query
+from app.rag.retrieve.candidate_features import feature_matrix_for
+from app.rag.utils.chunk_ids import parse_chunk_id, qual_id_of, qual_ids_of
+from app.rag.retrieve.fusion import combmnz_fuse, combsum_fuse, linear_fuse, rrf_fuse
 from app.rag.retrieve.metadata_soft_score import (
-    compute_metadata_soft_score,
+    compute_metadata_soft_scores,
     fetch_qual_metadata_bulk,
 )
 from app.rag.retrieve.personalized_soft_score import (
-    compute_personalized_soft_score,
+    compute_personalized_soft_scores,
     merge_difficulty_into_metadata,
 )
 from app.rag.retrieve.contrastive_retriever import contrastive_search
 from app.rag.retrieve.hierarchical import hierarchical_parent_candidates
 from app.rag.retrieve.contextual_retriever import contextual_child_search
+from app.utils.sql_registry import hot_statement
 from app.rag.retrieve.retrieval_result_cache import (
     eligible_for_retrieval_cache,
     get_cached_result,
@@ -176,6 +186,10 @@ def _three_way_weights_by_query_type(
     return (w_b, w_v, w_c)
 
 
+@request_memoized(
+    "query_suggests_it",
+    key=lambda query, user_profile=None: (query, profile_key(user_profile)),
+)
 def _query_suggests_it(query: str, user_profile: Any = None) -> bool:
     """쿼리가 IT 도메인으로 보이면 True. 도메인 가중치/도메인 불일치 감점에 사용."""
     try:
@@ -246,14 +260,9 @@ def _query_weights_by_type(query: str) -> Tuple[float, float]:
 def _dedup_per_cert(candidates: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
     """자격증(qual_id)당 최고점 청크 1개만 유지 후 점수 기준 재정렬. 상위 목록 다양화."""
     by_qual: Dict[int, Tuple[str, float]] = {}
-    for cid, score in candidates:
-        if ":" in cid:
-            try:
-                qid = int(cid.split(":")[0])
-                if qid not in by_qual or score > by_qual[qid][1]:
-                    by_qual[qid] = (cid, score)
-            except ValueError:
-                continue
+    for (cid, score), qid in zip(candidates, qual_ids_of(cid for cid, _ in candidates)):
+        if qid is not None and (qid not in by_qual or score > by_qual[qid][1]):
+            by_qual[qid] = (cid, score)
     out = list(by_qual.values())
     out.sort(key=lambda x: -x[1])
     return out
@@ -302,10 +311,7 @@ def _mmr_diversity_rerank(
     pool = candidates[: max(top_k * 4, top_k)]
 
     def _meta_for_chunk(cid: str) -> Dict[str, Any]:
-        try:
-            qid = int(cid.split(":")[0]) if ":" in cid else None
-        except ValueError:
-            qid = None
+        qid = qual_id_of(cid)
         if qid is None:
             return {}
         m = meta.get(qid, {}) or {}
@@ -341,66 +347,30 @@ def _mmr_diversity_rerank(
     return selected + tail
 
 
-def _rrf_score_term(k: int, rank: int, p: float) -> float:
-    """RRF 한 채널 기여: 1/(k+rank)^p. p=1이면 표준 RRF."""
-    denom = k + rank
-    if p == 1.0:
-        return 1.0 / denom
-    return 1.0 / (denom ** p)
-
-
 def _rrf_merge(
     bm25_list: List[Tuple[str, float]],
     vector_list: List[Tuple[str, float]],
     w_bm25: float = 0.5,
     w_vector: float = 0.5,
     rrf_k: Optional[int] = None,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """RRF: score(d) = w_b * 1/(k+rank_bm25)^p + w_v * 1/(k+rank_vector)^p. p=RAG_RRF_EXPONENT(기본 1)."""
     k = rrf_k if rrf_k is not None else _rrf_k()
-    p = _rrf_exponent()
-    rank_bm25 = {cid: i + 1 for i, (cid, _) in enumerate(bm25_list)}
-    rank_vec = {cid: i + 1 for i, (cid, _) in enumerate(vector_list)}
-    all_ids = set(rank_bm25) | set(rank_vec)
-    scores = [
-        (
-            cid,
-            w_bm25 * _rrf_score_term(k, rank_bm25.get(cid, 9999), p)
-            + w_vector * _rrf_score_term(k, rank_vec.get(cid, 9999), p),
-        )
-        for cid in all_ids
-    ]
-    scores.sort(key=lambda x: -x[1])
-    return scores
+    return rrf_fuse([bm25_list, vector_list], [w_bm25, w_vector], k, _rrf_exponent(), top_k=top_k)
 
 
 def _rrf_merge_n(
     lists: List[List[Tuple[str, float]]],
     weights: Optional[List[float]] = None,
     rrf_k: Optional[int] = None,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """N-way RRF: 여러 순위 리스트를 가중 RRF로 병합. score = sum w_i / (k+rank_i)^p. p=RAG_RRF_EXPONENT."""
     if not lists:
         return []
     k = rrf_k if rrf_k is not None else _rrf_k()
-    p = _rrf_exponent()
-    n = len(lists)
-    w = weights if weights is not None else [1.0 / n] * n
-    if len(w) != n:
-        w = [1.0 / n] * n
-    rank_maps = [{cid: i + 1 for i, (cid, _) in enumerate(lst)} for lst in lists]
-    all_ids = set()
-    for rm in rank_maps:
-        all_ids |= set(rm.keys())
-    scores = [
-        (
-            cid,
-            sum(wi * _rrf_score_term(k, rm.get(cid, 9999), p) for wi, rm in zip(w, rank_maps)),
-        )
-        for cid in all_ids
-    ]
-    scores.sort(key=lambda x: -x[1])
-    return scores
+    return rrf_fuse(lists, weights, k, _rrf_exponent(), top_k=top_k)
 
 
 def _rrf_merge_3(
@@ -411,32 +381,16 @@ def _rrf_merge_3(
     w_b: float = 1.0 / 3,
     w_c: float = 1.0 / 3,
     rrf_k: Optional[int] = None,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """3-way RRF: score(d) = w_a/(k+rank_a)^p + w_b/(k+rank_b)^p + w_c/(k+rank_c)^p. p=RAG_RRF_EXPONENT."""
     k = rrf_k if rrf_k is not None else _rrf_k()
-    p = _rrf_exponent()
-    rank_a = {cid: i + 1 for i, (cid, _) in enumerate(list_a)}
-    rank_b = {cid: i + 1 for i, (cid, _) in enumerate(list_b)}
-    rank_c = {cid: i + 1 for i, (cid, _) in enumerate(list_c)}
-    all_ids = set(rank_a) | set(rank_b) | set(rank_c)
-    scores = [
-        (
-            cid,
-            w_a * _rrf_score_term(k, rank_a.get(cid, 9999), p)
-            + w_b * _rrf_score_term(k, rank_b.get(cid, 9999), p)
-            + w_c * _rrf_score_term(k, rank_c.get(cid, 9999), p),
-        )
-        for cid in all_ids
-    ]
-    scores.sort(key=lambda x: -x[1])
-    return scores
+    return rrf_fuse([list_a, list_b, list_c], [w_a, w_b, w_c], k, _rrf_exponent(), top_k=top_k)
 
 
-def _linear_norm_power(val: float, p: float) -> float:
-    """정규화된 점수(0~1)에 지수 적용. p=1이면 그대로, p>1이면 높은 점수 강조."""
-    if p == 1.0 or val <= 0.0:
-        return val
-    return val ** p
+def _linear_norm_exponent() -> float:
+    """RAG_LINEAR_NORM_EXPONENT (하한 0.1). >1이면 정규화 점수 상위 강조."""
+    return max(0.1, float(getattr(get_rag_settings(), "RAG_LINEAR_NORM_EXPONENT", 1.0)))
 
 
 def _linear_merge_3(
@@ -446,37 +400,11 @@ def _linear_merge_3(
     w_a: float = 1.0 / 3,
     w_b: float = 1.0 / 3,
     w_c: float = 1.0 / 3,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """3-way linear fusion: 채널별 min-max 정규화 후 (선택) norm^p 적용, S = w_a*n_a + w_b*n_b + w_c*n_c.
     RAG_LINEAR_NORM_EXPONENT>1이면 상위 점수 강조."""
-    p = max(0.1, float(getattr(get_rag_settings(), "RAG_LINEAR_NORM_EXPONENT", 1.0)))
-    sa = {cid: s for cid, s in list_a}
-    sb = {cid: s for cid, s in list_b}
-    sc = {cid: s for cid, s in list_c}
-    all_ids = set(sa) | set(sb) | set(sc)
-    if not all_ids:
-        return []
-    vals_a = [sa[c] for c in all_ids if c in sa]
-    vals_b = [sb[c] for c in all_ids if c in sb]
-    vals_c = [sc[c] for c in all_ids if c in sc]
-    def _norm(vals, d):
-        if not vals:
-            return 0.0, 1.0
-        mn, mx = min(vals), max(vals)
-        r = mx - mn if mx > mn else 1.0
-        return mn, r
-    min_a, r_a = _norm(vals_a, sa)
-    min_b, r_b = _norm(vals_b, sb)
-    min_c, r_c = _norm(vals_c, sc)
-    scores = []
-    for cid in all_ids:
-        na = (sa.get(cid, 0) - min_a) / r_a if cid in sa else 0.0
-        nb = (sb.get(cid, 0) - min_b) / r_b if cid in sb else 0.0
-        nc = (sc.get(cid, 0) - min_c) / r_c if cid in sc else 0.0
-        na, nb, nc = _linear_norm_power(na, p), _linear_norm_power(nb, p), _linear_norm_power(nc, p)
-        scores.append((cid, w_a * na + w_b * nb + w_c * nc))
-    scores.sort(key=lambda x: -x[1])
-    return scores
+    return linear_fuse([list_a, list_b, list_c], [w_a, w_b, w_c], _linear_norm_exponent(), top_k=top_k)
 
 
 def _linear_merge(
@@ -484,67 +412,20 @@ def _linear_merge(
     vector_list: List[Tuple[str, float]],
     w_bm25: float = 0.5,
     w_vector: float = 0.5,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """2-way linear fusion: BM25·Dense min-max 정규화 후 (선택) norm^p, S = w_bm25*n_b + w_vector*n_v.
     RAG_LINEAR_NORM_EXPONENT>1이면 상위 점수 강조."""
-    p = max(0.1, float(getattr(get_rag_settings(), "RAG_LINEAR_NORM_EXPONENT", 1.0)))
-    bm25_scores = {cid: s for cid, s in bm25_list}
-    vec_scores = {cid: s for cid, s in vector_list}
-    all_ids = set(bm25_scores) | set(vec_scores)
-    if not all_ids:
-        return []
-
-    bm25_vals = [bm25_scores[cid] for cid in all_ids if cid in bm25_scores]
-    vec_vals = [vec_scores[cid] for cid in all_ids if cid in vec_scores]
-    min_b = min(bm25_vals) if bm25_vals else 0.0
-    max_b = max(bm25_vals) if bm25_vals else 1.0
-    min_v = min(vec_vals) if vec_vals else 0.0
-    max_v = max(vec_vals) if vec_vals else 1.0
-    range_b = max_b - min_b if max_b > min_b else 1.0
-    range_v = max_v - min_v if max_v > min_v else 1.0
-
-    scores = []
-    for cid in all_ids:
-        s_b = bm25_scores.get(cid)
-        s_v = vec_scores.get(cid)
-        norm_b = (s_b - min_b) / range_b if s_b is not None else 0.0
-        norm_v = (s_v - min_v) / range_v if s_v is not None else 0.0
-        norm_b = _linear_norm_power(norm_b, p)
-        norm_v = _linear_norm_power(norm_v, p)
-        combined = w_bm25 * norm_b + w_vector * norm_v
-        scores.append((cid, combined))
-    scores.sort(key=lambda x: -x[1])
-    return scores
+    return linear_fuse([bm25_list, vector_list], [w_bm25, w_vector], _linear_norm_exponent(), top_k=top_k)
 
 
 def _combsum_merge_n(
     lists: List[List[Tuple[str, float]]],
     weights: Optional[List[float]] = None,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """CombSUM: 채널별 min-max 정규화 후 가중합. score(d) = sum_i w_i * norm_i(d). 문헌(TREC fusion)."""
-    if not lists:
-        return []
-    n = len(lists)
-    w = weights if weights is not None else [1.0 / n] * n
-    if len(w) != n:
-        w = [1.0 / n] * n
-    score_maps: List[Dict[str, float]] = []
-    all_ids: set = set()
-    for lst in lists:
-        sid = {cid: s for cid, s in lst}
-        all_ids |= set(sid.keys())
-        vals = list(sid.values())
-        mn = min(vals) if vals else 0.0
-        mx = max(vals) if vals else 1.0
-        r = (mx - mn) if (mx > mn) else 1.0
-        norm_map = {cid: (s - mn) / r for cid, s in sid.items()}
-        score_maps.append(norm_map)
-    scores = [
-        (cid, sum(w[i] * score_maps[i].get(cid, 0.0) for i in range(n)))
-        for cid in all_ids
-    ]
-    scores.sort(key=lambda x: -x[1])
-    return scores
+    return combsum_fuse(lists, weights, top_k=top_k)
 
 
 def _combmnz_merge_n(
@@ -554,88 +435,29 @@ def _combmnz_merge_n(
     zero_mode: str = "topn",
     zero_threshold: float = 0.0,
     rank_exponent: float = 1.0,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """
     CombMNZ: 채널별 정규화 후 score(d) = nz(d) * sum_i w_i * norm_i(d).
 
     - norm_mode:
       * "minmax": 채널별 min-max 정규화 (기존 구현과 동일)
-      * "rank": 채널 내 순위 기반 점수화 (1 / (k + rank)^p)
+      * "rank": 채널 내 순위 기반 점수화 (1 / (1 + rank)^p, p=rank_exponent)
     - zero_mode:
       * "topn": 채널 리스트에 등장하면 nz=1 (기존 CombMNZ 정의)
       * "threshold": norm_i(d) >= zero_threshold 일 때만 nz에 포함
 
     기본 인자는 현재 프로덕션 동작과 동일한 결과를 내도록 설정되어 있다.
     """
-    if not lists:
-        return []
-    n = len(lists)
-    w = weights if weights is not None else [1.0 / n] * n
-    if len(w) != n:
-        w = [1.0 / n] * n
-
-    # 채널별 정규화 맵 계산
-    score_maps: List[Dict[str, float]] = []
-    all_ids: set = set()
-    norm_mode = (norm_mode or "minmax").lower()
-    zero_mode = (zero_mode or "topn").lower()
-    p = rank_exponent if rank_exponent > 0 else 1.0
-
-    for lst in lists:
-        sid = {cid: s for cid, s in lst}
-        all_ids |= set(sid.keys())
-        if not sid:
-            score_maps.append({})
-            continue
-
-        if norm_mode == "rank":
-            # 순위 기반 정규화: 1 / (k + rank)^p
-            # lst는 이미 점수 기준 내림차순 정렬되어 있다고 가정.
-            norm_map: Dict[str, float] = {}
-            for rank, (cid, _) in enumerate(lst, start=1):
-                norm_map[cid] = 1.0 / ((1.0 + rank) ** p)
-        else:
-            # 기본: 채널별 min-max 정규화 (기존 구현)
-            vals = list(sid.values())
-            mn = min(vals) if vals else 0.0
-            mx = max(vals) if vals else 1.0
-            r = (mx - mn) if (mx > mn) else 1.0
-            norm_map = {cid: (s - mn) / r for cid, s in sid.items()}
-
-        score_maps.append(norm_map)
-
-    # CombMNZ 점수 계산
-    scores: List[Tuple[str, float]] = []
-    for cid in all_ids:
-        # nz(d): non-zero 채널 수
-        if zero_mode == "threshold":
-            count = sum(
-                1
-                for i in range(n)
-                if cid in score_maps[i] and score_maps[i][cid] >= zero_threshold
-            )
-        else:
-            # 기본: 리스트에만 등장하면 nz=1
-            count = sum(1 for i in range(n) if cid in score_maps[i])
-
-        if count == 0:
-            continue
-
-        sum_norm = 0.0
-        for i in range(n):
-            v = score_maps[i].get(cid)
-            if v is None:
-                continue
-            if zero_mode == "threshold" and v < zero_threshold:
-                continue
-            sum_norm += w[i] * v
-
-        if sum_norm <= 0.0:
-            continue
-        scores.append((cid, count * sum_norm))
-
-    scores.sort(key=lambda x: -x[1])
-    return scores
+    return combmnz_fuse(
+        lists,
+        weights,
+        norm_mode=norm_mode,
+        zero_mode=zero_mode,
+        zero_threshold=zero_threshold,
+        rank_exponent=rank_exponent,
+        top_k=top_k,
+    )
 
 
 def _apply_query_type_combmnz_weights(
@@ -1017,6 +839,7 @@ def _hybrid_contrastive_query_gate(
     return use_cq, False
 
 
+@with_request_memo
 def hybrid_retrieve(
     db: Session,
     query: str,
@@ -1225,6 +1048,7 @@ def hybrid_retrieve(
                     vector_search_meta={},
                     rewrite_skipped=rewrite_skipped,
                     rewrite_skip_reason=rewrite_skip_reason,
+                    request_memo=request_memo_stats(),
                 )
                 if pre_retrieval_trace_out is not None:
                     pre_retrieval_trace_out.clear()
@@ -1310,9 +1134,9 @@ def hybrid_retrieve(
 
         _max_workers = 3 if run_ct_parallel else 2
         with ThreadPoolExecutor(max_workers=_max_workers) as ex:
-            fv = ex.submit(_run_vec)
-            fb = ex.submit(_run_bm)
-            fct = ex.submit(_run_ct) if run_ct_parallel else None
+            fv = ex.submit(propagate_context(_run_vec))
+            fb = ex.submit(propagate_context(_run_bm))
+            fct = ex.submit(propagate_context(_run_ct)) if run_ct_parallel else None
             vector_results, hyde_results = fv.result()
             bm25_scores = fb.result()
             if fct is not None:
@@ -1433,6 +1257,7 @@ def hybrid_retrieve(
             vector_search_meta=dict(vec_trace.get("vector_search_meta") or {}),
             rewrite_skipped=rewrite_skipped,
             rewrite_skip_reason=rewrite_skip_reason,
+            request_memo=request_memo_stats(),
         )
         if pre_retrieval_trace_out is not None:
             pre_retrieval_trace_out.clear()
@@ -1488,6 +1313,8 @@ def hybrid_retrieve(
         query, query_type, settings
     )
     rrf_k = rrf_k_override if rrf_k_override is not None else _rrf_k()
+    # 융합 결과는 상위 top_n*2만 쓰므로 커널에서 argpartition으로 그만큼만 정렬
+    fusion_top_k = top_n * 2
     if channels_set:
         lists_to_merge: List[List[Tuple[str, float]]] = []
         weights_to_merge: List[float] = []
@@ -1510,7 +1337,7 @@ def hybrid_retrieve(
         if len(lists_to_merge) == 0:
             combined: List[Tuple[str, float]] = []
         elif len(lists_to_merge) == 1:
-            combined = lists_to_merge[0][: top_n * 2]
+            combined = lists_to_merge[0][:fusion_top_k]
         elif fusion_method == "linear":
             # Query-type adaptive 3-way linear fusion: trial_2 가중치 기반.
             # 사용 중인 채널만 남기고, 해당 채널의 linear weight를 합=1로 정규화해서 사용한다.
@@ -1530,16 +1357,19 @@ def hybrid_retrieve(
 
             if len(lists_to_merge) == 2:
                 w0, w1 = norm_weights[0], norm_weights[1]
-                combined = _linear_merge(lists_to_merge[0], lists_to_merge[1], w_bm25=w0, w_vector=w1)
+                combined = _linear_merge(
+                    lists_to_merge[0], lists_to_merge[1], w_bm25=w0, w_vector=w1, top_k=fusion_top_k
+                )
             else:
                 # len == 3
                 w0, w1, w2 = norm_weights[0], norm_weights[1], norm_weights[2]
                 combined = _linear_merge_3(
                     lists_to_merge[0], lists_to_merge[1], lists_to_merge[2],
                     w_a=w0, w_b=w1, w_c=w2,
+                    top_k=fusion_top_k,
                 )
         elif fusion_method == "combsum":
-            combined = _combsum_merge_n(lists_to_merge, weights=weights_to_merge)
+            combined = _combsum_merge_n(lists_to_merge, weights=weights_to_merge, top_k=fusion_top_k)
         elif fusion_method == "combmnz":
             adj_weights = _apply_query_type_combmnz_weights(
                 weights_to_merge,
@@ -1556,9 +1386,12 @@ def hybrid_retrieve(
                 zero_mode=getattr(settings, "RAG_COMBMNZ_ZERO_MODE", "topn"),
                 zero_threshold=getattr(settings, "RAG_COMBMNZ_ZERO_THRESHOLD", 0.0),
                 rank_exponent=getattr(settings, "RAG_COMBMNZ_RANK_EXPONENT", 1.0),
+                top_k=fusion_top_k,
             )
         else:
-            combined = _rrf_merge_n(lists_to_merge, weights=weights_to_merge, rrf_k=rrf_k)
+            combined = _rrf_merge_n(
+                lists_to_merge, weights=weights_to_merge, rrf_k=rrf_k, top_k=fusion_top_k
+            )
     elif getattr(settings, "RAG_CONTRASTIVE_ENABLE", False) and contrastive_results:
         w_b = rrf_w_bm25 if rrf_w_bm25 is not None else getattr(settings, "RAG_RRF_W_BM25", 1.0)
         w_v = rrf_w_dense1536 if rrf_w_dense1536 is not None else getattr(settings, "RAG_RRF_W_DENSE1536", 1.0)
@@ -1578,11 +1411,13 @@ def hybrid_retrieve(
             combined = _linear_merge_3(
                 bm25_scores, vector_results, contrastive_results,
                 w_a=w0, w_b=w1, w_c=w2,
+                top_k=fusion_top_k,
             )
         elif fusion_method == "combsum":
             combined = _combsum_merge_n(
                 [bm25_scores, vector_results, contrastive_results],
                 weights=[w_b, w_v, w_c],
+                top_k=fusion_top_k,
             )
         elif fusion_method == "combmnz":
             base_weights = [w_b, w_v, w_c]
@@ -1601,12 +1436,14 @@ def hybrid_retrieve(
                 zero_mode=getattr(settings, "RAG_COMBMNZ_ZERO_MODE", "topn"),
                 zero_threshold=getattr(settings, "RAG_COMBMNZ_ZERO_THRESHOLD", 0.0),
                 rank_exponent=getattr(settings, "RAG_COMBMNZ_RANK_EXPONENT", 1.0),
+                top_k=fusion_top_k,
             )
         else:
             combined = _rrf_merge_n(
                 [bm25_scores, vector_results, contrastive_results],
                 weights=[w_b, w_v, w_c],
                 rrf_k=rrf_k,
+                top_k=fusion_top_k,
             )
     elif hyde_results and getattr(settings, "RAG_HYDE_ENABLE", False):
         w_hyde = getattr(settings, "RAG_HYDE_WEIGHT", 0.2)
@@ -1619,25 +1456,35 @@ def hybrid_retrieve(
             combined = _linear_merge_3(
                 bm25_scores, vector_results, hyde_results,
                 w_a=w_b, w_b=w_v, w_c=w_hyde,
+                top_k=fusion_top_k,
             )
         elif fusion_method == "combsum":
             combined = _combsum_merge_n(
                 [bm25_scores, vector_results, hyde_results],
                 weights=[w_b, w_v, w_hyde],
+                top_k=fusion_top_k,
             )
         else:
             combined = _rrf_merge_3(
                 bm25_scores, vector_results, hyde_results,
                 w_a=w_b, w_b=w_v, w_c=w_hyde, rrf_k=rrf_k,
+                top_k=fusion_top_k,
             )
     else:
         if fusion_method == "linear":
-            combined = _linear_merge(bm25_scores, vector_results, w_bm25=w_bm25, w_vector=w_vector)
+            combined = _linear_merge(
+                bm25_scores, vector_results, w_bm25=w_bm25, w_vector=w_vector, top_k=fusion_top_k
+            )
         elif fusion_method == "combsum":
-            combined = _combsum_merge_n([bm25_scores, vector_results], weights=[w_bm25, w_vector])
+            combined = _combsum_merge_n(
+                [bm25_scores, vector_results], weights=[w_bm25, w_vector], top_k=fusion_top_k
+            )
         else:
-            combined = _rrf_merge(bm25_scores, vector_results, w_bm25=w_bm25, w_vector=w_vector, rrf_k=rrf_k)
-    candidates = combined[: top_n * 2]
+            combined = _rrf_merge(
+                bm25_scores, vector_results,
+                w_bm25=w_bm25, w_vector=w_vector, rrf_k=rrf_k, top_k=fusion_top_k,
+            )
+    candidates = combined[:fusion_top_k]
 
     # 메타/개인화 soft·리랭커 문맥이 동일 슬롯을 쓰므로 extract_slots_for_dense는 요청당 1회.
     query_slots_for_scoring: Optional[Dict[str, Any]] = None
@@ -1656,15 +1503,10 @@ def hybrid_retrieve(
         """chunk_id(qual:chunk)에서 qual_id 목록을 순서 유지·중복 제거로 추출."""
         seen: set = set()
         out: List[int] = []
-        for cid, _ in cands:
-            if ":" in cid:
-                try:
-                    qid = int(cid.split(":")[0])
-                    if qid not in seen:
-                        seen.add(qid)
-                        out.append(qid)
-                except ValueError:
-                    pass
+        for qid in qual_ids_of(cid for cid, _ in cands):
+            if qid is not None and qid not in seen:
+                seen.add(qid)
+                out.append(qid)
         return out
 
     metadata_soft_enabled = getattr(settings, "RAG_METADATA_SOFT_SCORE_ENABLE", False)
@@ -1700,8 +1542,8 @@ def hybrid_retrieve(
                             s.close()
 
                     with ThreadPoolExecutor(max_workers=2) as ex:
-                        fm = ex.submit(_load_meta_bulk)
-                        fs = ex.submit(_load_stats_bulk)
+                        fm = ex.submit(propagate_context(_load_meta_bulk))
+                        fs = ex.submit(propagate_context(_load_stats_bulk))
                         meta_bulk = fm.result()
                         stats_bulk_pre = fs.result()
                 else:
@@ -1738,12 +1580,13 @@ def hybrid_retrieve(
                     if getattr(settings, "RAG_METADATA_DOMAIN_MISMATCH_ENABLE", False)
                     else None
                 )
-                scored = []
-                for cid, base_score in candidates:
-                    qid = int(cid.split(":")[0]) if ":" in cid else None
-                    qual_meta = meta.get(qid, {}) if qid is not None else {}
-                    soft = compute_metadata_soft_score(query_slots, qual_meta, soft_config, query_is_it=query_is_it)
-                    scored.append((cid, base_score + soft))
+                cand_qids = qual_ids_of(cid for cid, _ in candidates)
+                softs = compute_metadata_soft_scores(
+                    query_slots, feature_matrix_for(meta), cand_qids, soft_config, query_is_it=query_is_it
+                )
+                scored = [
+                    (cid, base_score + float(soft)) for (cid, base_score), soft in zip(candidates, softs)
+                ]
                 scored.sort(key=lambda x: -x[1])
                 candidates = scored
         except Exception:
@@ -1781,14 +1624,19 @@ def hybrid_retrieve(
                     "grade_difficulty_bonus": getattr(settings, "RAG_PERSONALIZED_GRADE_DIFFICULTY_BONUS", 0.10),
                     "far_too_difficult_penalty": getattr(settings, "RAG_PERSONALIZED_FAR_TOO_DIFFICULT_PENALTY", -0.15),
                 }
-                scored_pers = []
-                for cid, base_score in candidates:
-                    qid = int(cid.split(":")[0]) if ":" in cid else None
-                    qual_meta = meta_pers.get(qid, {}) if qid is not None else {}
-                    personal = compute_personalized_soft_score(
-                        query_slots, qual_meta, user_profile, personal_config
-                    )
-                    scored_pers.append((cid, base_score + personal))
+                cand_qids = qual_ids_of(cid for cid, _ in candidates)
+                personals = compute_personalized_soft_scores(
+                    query_slots,
+                    feature_matrix_for(meta_pers),
+                    cand_qids,
+                    user_profile,
+                    personal_config,
+                    difficulties=[(meta_pers.get(q) or {}).get("avg_difficulty") for q in cand_qids],
+                )
+                scored_pers = [
+                    (cid, base_score + float(personal))
+                    for (cid, base_score), personal in zip(candidates, personals)
+                ]
                 scored_pers.sort(key=lambda x: -x[1])
                 candidates = scored_pers
         except Exception as e:
@@ -1903,6 +1751,24 @@ def hybrid_retrieve(
     return candidates[:top_k]
 
 
+# 리랭커·PRF용 chunk content / qual_name 조회 (qual_id 단위 bulk, 핫 statement)
+_CONTENTS_AND_NAMES_SQL = hot_statement("chunk_contents_and_names_by_qual", """
+    SELECT v.qual_id, COALESCE(v.chunk_index, 0) AS chunk_index, v.content, q.qual_name
+    FROM certificates_vectors v
+    LEFT JOIN qualification q ON q.qual_id = v.qual_id
+    WHERE v.qual_id = ANY(:ids)
+""")
+_CONTENTS_SQL = hot_statement("chunk_contents_by_qual", """
+    SELECT qual_id, COALESCE(chunk_index, 0) AS chunk_index, content
+    FROM certificates_vectors
+    WHERE qual_id = ANY(:ids)
+""")
+_QUAL_NAMES_SQL = hot_statement(
+    "qual_names_by_id",
+    "SELECT qual_id, qual_name FROM qualification WHERE qual_id = ANY(:ids)",
+)
+
+
 def _fetch_contents_and_qual_names_by_chunk_ids(
     db: Session, chunk_ids: List[str]
 ) -> Tuple[Dict[str, str], Dict[str, str]]:
@@ -1911,24 +1777,14 @@ def _fetch_contents_and_qual_names_by_chunk_ids(
         return {}, {}
     qual_to_chunks: Dict[int, set] = {}
     for cid in chunk_ids:
-        if ":" in cid:
-            try:
-                a, b = cid.split(":", 1)
-                qid, cidx = int(a), int(b)
-                qual_to_chunks.setdefault(qid, set()).add(cidx)
-            except ValueError:
-                continue
+        parts = parse_chunk_id(cid)
+        if parts is not None:
+            qual_to_chunks.setdefault(parts[0], set()).add(parts[1])
     if not qual_to_chunks:
         return {}, {}
     qual_ids = list(qual_to_chunks.keys())
     try:
-        sql = text("""
-            SELECT v.qual_id, COALESCE(v.chunk_index, 0) AS chunk_index, v.content, q.qual_name
-            FROM certificates_vectors v
-            LEFT JOIN qualification q ON q.qual_id = v.qual_id
-            WHERE v.qual_id = ANY(:ids)
-        """)
-        rows = db.execute(sql, {"ids": qual_ids}).fetchall()
+        rows = _CONTENTS_AND_NAMES_SQL.execute(db, {"ids": qual_ids}).fetchall()
     except Exception:
         return _fetch_contents_by_chunk_ids(db, chunk_ids), _fetch_qual_names_for_chunk_ids(db, chunk_ids)
     contents: Dict[str, str] = {}
@@ -1950,32 +1806,19 @@ def _fetch_qual_names_for_chunk_ids(db: Session, chunk_ids: List[str]) -> Dict[s
     """chunk_id(qual_id:chunk_index) 목록에 대해 qual_id → qual_name 맵을 구한 뒤 chunk_id → qual_name 반환."""
     if not chunk_ids:
         return {}
-    qual_ids: List[int] = []
-    for cid in chunk_ids:
-        if ":" in cid:
-            try:
-                qual_ids.append(int(cid.split(":", 1)[0]))
-            except ValueError:
-                pass
+    chunk_qids = qual_ids_of(chunk_ids)
+    qual_ids = list(dict.fromkeys(qid for qid in chunk_qids if qid is not None))
     if not qual_ids:
         return {}
-    qual_ids = list(dict.fromkeys(qual_ids))
     try:
-        rows = db.execute(
-            text("SELECT qual_id, qual_name FROM qualification WHERE qual_id = ANY(:ids)"),
-            {"ids": qual_ids},
-        ).fetchall()
+        rows = _QUAL_NAMES_SQL.execute(db, {"ids": qual_ids}).fetchall()
         qid_to_name = {r.qual_id: (r.qual_name or "").strip() for r in rows}
     except Exception:
         return {}
     out: Dict[str, str] = {}
-    for cid in chunk_ids:
-        if ":" in cid:
-            try:
-                qid = int(cid.split(":", 1)[0])
-                out[cid] = qid_to_name.get(qid, "")
-            except ValueError:
-                pass
+    for cid, qid in zip(chunk_ids, chunk_qids):
+        if qid is not None:
+            out[cid] = qid_to_name.get(qid, "")
     return out
 
 
@@ -2026,27 +1869,15 @@ def _fetch_contents_by_chunk_ids(db: Session, chunk_ids: List[str]) -> Dict[str,
 
     qual_to_chunks: Dict[int, set[int]] = {}
     for cid in chunk_ids:
-        if ":" in cid:
-            try:
-                a, b = cid.split(":", 1)
-                qid = int(a)
-                cidx = int(b)
-                qual_to_chunks.setdefault(qid, set()).add(cidx)
-            except ValueError:
-                continue
+        parts = parse_chunk_id(cid)
+        if parts is not None:
+            qual_to_chunks.setdefault(parts[0], set()).add(parts[1])
     if not qual_to_chunks:
         return {}
 
     qual_ids = list(qual_to_chunks.keys())
     try:
-        sql = text(
-            """
-            SELECT qual_id, COALESCE(chunk_index, 0) AS chunk_index, content
-            FROM certificates_vectors
-            WHERE qual_id = ANY(:ids)
-            """
-        )
-        rows = db.execute(sql, {"ids": qual_ids}).fetchall()
+        rows = _CONTENTS_SQL.execute(db, {"ids": qual_ids}).fetchall()
     except Exception:
         return {}
 
@@ -2091,14 +1922,8 @@ def _apply_metadata_filter(
     if not allowed_qual_ids:
         return []
     out = []
-    for cid, score in candidates:
-        if ":" in cid:
-            try:
-                qid = int(cid.split(":")[0])
-                if qid in allowed_qual_ids:
-                    out.append((cid, score))
-            except ValueError:
-                out.append((cid, score))
-        else:
+    for (cid, score), qid in zip(candidates, qual_ids_of(cid for cid, _ in candidates)):
+        # qual_id를 알 수 없는 항목은 필터 대상이 아니므로 유지
+        if qid is None or qid in allowed_qual_ids:
             out.append((cid, score))
     return out if out else candidates
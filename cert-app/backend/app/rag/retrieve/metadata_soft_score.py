@@ -2,13 +2,16 @@
 Metadata 기반 soft scoring: 직무/전공/추천대상 일치 시 가산, 분야 이탈 시 감점.
 쿼리 도메인(IT·디지털 집중 vs 그 외) ↔ 자격 메타 불일치 시 감점(선택, RAG_METADATA_DOMAIN_MISMATCH_ENABLE).
 전공 비교 시 쿼리/자격증 모두 major_category로 정규화해 매칭률을 높임.
+자격증 쪽 토큰 집합은 QualFeatures(app.rag.retrieve.candidate_features)로 사전 계산된 값을 사용.
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 
+from app.rag.retrieve.candidate_features import CandidateFeatureMatrix, qual_features
 from app.rag.utils.major_normalize import normalize_major
+from app.utils.sql_registry import hot_statement
 
 
 # 기본 가중치 (config로 오버라이드)
@@ -28,15 +31,6 @@ def _normalize_tokens(s: str) -> set:
     return set(t.strip() for t in s.replace(",", " ").split() if t.strip())
 
 
-def _tokens_from_maybe_list(v: Any) -> set:
-    """문자열/리스트 입력을 토큰 set으로 정규화."""
-    if v is None:
-        return set()
-    if isinstance(v, list):
-        return _normalize_tokens(" ".join(str(x) for x in v if str(x).strip()))
-    return _normalize_tokens(str(v))
-
-
 def _normalize_major_token_set(s: str) -> set:
     """
     쿼리 전공 문자열을 토큰 단위로 major_category 정규화.
@@ -88,28 +82,9 @@ def compute_metadata_soft_score(
     q_main_field = _normalize_tokens(str(query_slots.get("분야") or ""))
     q_ncs = _normalize_tokens(str(query_slots.get("NCS대분류") or ""))
 
-    qual_main_fields = _tokens_from_maybe_list(qual_metadata.get("main_fields"))
-    qual_ncs_list = _tokens_from_maybe_list(qual_metadata.get("ncs_large_list"))
-    mf_tokens = (
-        _normalize_tokens(str(qual_metadata.get("main_field") or ""))
-        if main_field_in_job_match
-        else set()
-    )
-    qual_job = (
-        mf_tokens
-        | _normalize_tokens(str(qual_metadata.get("ncs_large") or ""))
-        | qual_main_fields
-        | qual_ncs_list
-    )
-    qual_majors = qual_metadata.get("related_majors") or []
-    if isinstance(qual_majors, list):
-        qual_major_set = set()
-        for m in qual_majors:
-            n = normalize_major(str(m).strip())
-            if n:
-                qual_major_set.add(n)
-    else:
-        qual_major_set = {normalize_major(str(qual_majors).strip())} if str(qual_majors).strip() else set()
+    feats = qual_features(qual_metadata)
+    qual_job = feats.job_tokens if main_field_in_job_match else feats.job_tokens_no_main_field
+    qual_major_set = feats.major_set
 
     if q_job and qual_job and _overlap_ratio(q_job, qual_job) > 0:
         score += job_bonus
@@ -121,13 +96,8 @@ def compute_metadata_soft_score(
         score += field_penalty * 0.5
 
     # 넓은 도메인(IT/금융/의료/관광 등) 일치 시 가산
-    qual_domains = _normalize_tokens(
-        " ".join(
-            (qual_metadata.get("domains") or [])
-            + [str(qual_metadata.get("cert_domain") or ""), str(qual_metadata.get("cert_top_domain") or "")]
-        )
-    )
-    qual_domain_keywords = _normalize_tokens(str(qual_metadata.get("cert_domain_keywords") or ""))
+    qual_domains = feats.domain_tokens
+    qual_domain_keywords = feats.domain_keyword_tokens
     if q_domains and qual_domains and _overlap_ratio(q_domains, qual_domains) > 0:
         score += domain_bonus
     # 정규화도메인(상위 도메인) 또는 분야(main_field)·NCS 대분류가 겹치면 추가로 약한 가산
@@ -152,117 +122,192 @@ def compute_metadata_soft_score(
     return score
 
 
+def compute_metadata_soft_scores(
+    query_slots: Dict[str, Any],
+    matrix: CandidateFeatureMatrix,
+    qual_ids: Sequence[Optional[int]],
+    config: Dict[str, Any] | None = None,
+    query_is_it: Optional[bool] = None,
+) -> np.ndarray:
+    """
+    compute_metadata_soft_score의 배치판: 질의 토큰은 한 번만 만들고 후보 전체를 bitset 교집합으로 판정.
+    qual_ids[i]의 메타가 없으면(None·행렬에 없음) 빈 메타와 같은 0.0. 가산 순서가 같아 결과는 후보별 함수와 동일.
+    """
+    cfg = config or {}
+    job_bonus = float(cfg.get("job_bonus", DEFAULT_JOB_BONUS))
+    major_bonus = float(cfg.get("major_bonus", DEFAULT_MAJOR_BONUS))
+    target_bonus = float(cfg.get("target_bonus", DEFAULT_TARGET_BONUS))
+    field_penalty = float(cfg.get("field_penalty", DEFAULT_FIELD_PENALTY))
+    domain_mismatch_penalty = float(cfg.get("domain_mismatch_penalty", 0.0))
+    domain_bonus = float(cfg.get("domain_bonus", DEFAULT_DOMAIN_BONUS))
+    domain_keyword_bonus = float(cfg.get("domain_keyword_bonus", DEFAULT_DOMAIN_KEYWORD_BONUS))
+    main_field_in_job_match = bool(cfg.get("main_field_in_job_match", True))
+
+    q_job = _normalize_tokens(str(query_slots.get("희망직무") or query_slots.get("관심분야") or ""))
+    q_major = _normalize_major_token_set(str(query_slots.get("전공") or ""))
+    q_interest = _normalize_tokens(str(query_slots.get("관심분야") or ""))
+    q_domains = _normalize_tokens(str(query_slots.get("도메인") or ""))
+    q_top_domain = _normalize_tokens(str(query_slots.get("정규화도메인") or ""))
+    q_domain_keywords = _normalize_tokens(str(query_slots.get("도메인_키워드") or ""))
+    q_main_field = _normalize_tokens(str(query_slots.get("분야") or ""))
+    q_ncs = _normalize_tokens(str(query_slots.get("NCS대분류") or ""))
+
+    rows = matrix.rows(qual_ids)
+    score = np.zeros(len(rows), dtype=np.float64)
+    if not len(rows):
+        return score
+    job_col = matrix.column("job_tokens" if main_field_in_job_match else "job_tokens_no_main_field")
+    domain_col = matrix.column("domain_tokens")
+    # 각 항: 조건이 거짓인 후보는 +0.0 (값 불변) → 후보별 함수와 같은 순서로 더해 부동소수 결과까지 동일
+    if q_job:
+        job_hit = job_col.intersects(rows, q_job)
+        score += np.where(job_hit, job_bonus, 0.0)
+    if q_major:
+        score += np.where(matrix.column("major_set").intersects(rows, q_major), major_bonus, 0.0)
+    if q_interest:
+        score += np.where(job_col.intersects(rows, q_interest), target_bonus * 0.5, 0.0)
+    if q_job and len(q_job) >= 2:
+        score += np.where(job_col.nonempty[rows] & ~job_hit, field_penalty * 0.5, 0.0)
+    if q_domains:
+        score += np.where(domain_col.intersects(rows, q_domains), domain_bonus, 0.0)
+    if q_top_domain:
+        score += np.where(domain_col.intersects(rows, q_top_domain), domain_bonus * 0.5, 0.0)
+    if q_main_field:
+        score += np.where(job_col.intersects(rows, q_main_field), job_bonus * 0.5, 0.0)
+    if q_ncs:
+        score += np.where(job_col.intersects(rows, q_ncs), job_bonus * 0.3, 0.0)
+    if q_domain_keywords:
+        score += np.where(
+            matrix.column("domain_keyword_tokens").intersects(rows, q_domain_keywords), domain_keyword_bonus, 0.0
+        )
+    if query_is_it is not None and domain_mismatch_penalty != 0.0:
+        is_it = matrix.is_it[rows]
+        mismatch = (is_it >= 0) & (is_it != (1 if query_is_it else 0))
+        score += np.where(mismatch, domain_mismatch_penalty, 0.0)
+    return score
+
+
+_QUAL_META_SQL = hot_statement(
+    "soft_score_qual_meta",
+    "SELECT qual_id, main_field, ncs_large FROM qualification WHERE qual_id = ANY(:ids)",
+)
+_QUAL_MAJORS_SQL = hot_statement("soft_score_qual_majors", """
+    SELECT qual_id, major FROM major_qualification_map
+    WHERE qual_id = ANY(:ids) ORDER BY qual_id, score DESC
+""")
+_QUAL_VECTOR_DOMAIN_SQL = hot_statement("soft_score_qual_vector_domain", """
+    SELECT qual_id, domain, domain_normalized, domain_keywords, metadata
+    FROM certificates_vectors
+    WHERE qual_id = ANY(:ids)
+      AND COALESCE(chunk_index, 0) = 0
+""")
+
+
 def fetch_qual_metadata_bulk(db: Session, qual_ids: List[int]) -> Dict[int, Dict[str, Any]]:
-    """qual_id 목록에 대해 main_field, ncs_large, related_majors 조회."""
+    """
+    qual_id 목록에 대해 main_field, ncs_large, related_majors, 도메인 메타 조회.
+    후보 피처 스토어(app.rag.retrieve.candidate_features)가 적재돼 있으면 SQL 없이 메모리에서 복사본을 돌려준다.
+    """
     if not qual_ids:
         return {}
+    try:
+        from app.rag.retrieve.candidate_features import get_candidate_feature_store
+
+        store = get_candidate_feature_store()
+    except Exception:
+        store = None
+    if store is not None:
+        return store.metadata_for(qual_ids)
     out: Dict[int, Dict[str, Any]] = {}
     try:
-        rows = db.execute(
-            text("SELECT qual_id, main_field, ncs_large FROM qualification WHERE qual_id = ANY(:ids)"),
-            {"ids": qual_ids},
-        ).fetchall()
-        for r in rows:
-            out[r.qual_id] = {
-                "main_field": (r.main_field or "").strip(),
-                "ncs_large": (r.ncs_large or "").strip(),
-                "related_majors": [],
-            }
-        if out:
-            maj_rows = db.execute(
-                text("""
-                    SELECT qual_id, major FROM major_qualification_map
-                    WHERE qual_id = ANY(:ids) ORDER BY qual_id, score DESC
-                """),
-                {"ids": list(out.keys())},
-            ).fetchall()
-            by_qual: Dict[int, List[str]] = {}
-            for r in maj_rows:
-                by_qual.setdefault(r.qual_id, [])
-                if len(by_qual[r.qual_id]) < 5:
-                    by_qual[r.qual_id].append((r.major or "").strip())
-            for qid, majors in by_qual.items():
-                if qid in out:
-                    raw_list = [m for m in majors if m]
-                    out[qid]["related_majors"] = raw_list
-                    # 자격증 메타데이터에도 전공 원본 + major_category(정규화)를 모두 보관
-                    out[qid]["related_majors_normalized"] = [normalize_major(m) for m in raw_list]
-        # certificates_vectors의 domain/domain_normalized를 함께 읽어, 도메인 기반 soft score 신호를 강화
-        if out:
-            vec_rows = db.execute(
-                text(
-                    """
-                    SELECT qual_id, domain, domain_normalized, domain_keywords, metadata
-                    FROM certificates_vectors
-                    WHERE qual_id = ANY(:ids)
-                      AND COALESCE(chunk_index, 0) = 0
-                    """
-                ),
-                {"ids": list(out.keys())},
-            ).fetchall()
-            for r in vec_rows:
-                if r.qual_id not in out:
-                    continue
-                out[r.qual_id]["cert_domain"] = (r.domain or "").strip()
-                out[r.qual_id]["cert_top_domain"] = (r.domain_normalized or "").strip()
-                out[r.qual_id]["cert_domain_keywords"] = (r.domain_keywords or "").strip()
-                md = r.metadata if isinstance(r.metadata, dict) else {}
-                if isinstance(md, dict):
-                    main_fields = md.get("main_fields")
-                    ncs_large_list = md.get("ncs_large")
-                    if isinstance(main_fields, list):
-                        out[r.qual_id]["main_fields"] = [
-                            str(x).strip() for x in main_fields if str(x).strip()
-                        ][:8]
-                    if isinstance(ncs_large_list, list):
-                        out[r.qual_id]["ncs_large_list"] = [
-                            str(x).strip() for x in ncs_large_list if str(x).strip()
-                        ][:8]
-                # major_qualification_map에 없을 때는 qual_vector metadata.related_majors를 폴백으로 사용
-                if not (out[r.qual_id].get("related_majors") or []):
-                    md_maj = md.get("related_majors") if isinstance(md, dict) else None
-                    if isinstance(md_maj, list):
-                        cleaned = [str(m).strip() for m in md_maj if str(m).strip()]
-                        if cleaned:
-                            out[r.qual_id]["related_majors"] = cleaned[:5]
-                            out[r.qual_id]["related_majors_normalized"] = [normalize_major(m) for m in cleaned[:5]]
-        # IT·디지털 집중 플래그 및 넓은 도메인 플래그 (불일치 감점·도메인 보너스용)
-        try:
-            from app.rag.utils.domain_tokens import (
-                get_it_tokens,
-                get_non_it_tokens,
-                detect_broad_domains_in_text,
-            )
-            it_tokens = get_it_tokens()
-            non_it_tokens = get_non_it_tokens()
-            for qid, meta in out.items():
-                text_parts = " ".join(
-                    [
-                        str(meta.get("main_field") or ""),
-                        str(meta.get("ncs_large") or ""),
-                        str(meta.get("cert_domain") or ""),
-                        str(meta.get("cert_top_domain") or ""),
-                        str(meta.get("cert_domain_keywords") or ""),
-                    ]
-                    + [str(m) for m in (meta.get("related_majors") or [])]
-                )
-                is_it = None
-                for t in it_tokens:
-                    if t in text_parts:
-                        is_it = True
-                        break
-                if is_it is None:
-                    for t in non_it_tokens:
-                        if t in text_parts:
-                            is_it = False
-                            break
-                meta["is_it"] = is_it
-                # 넓은 도메인(금융, 의료, 관광/서비스 등) 라벨
-                meta["domains"] = detect_broad_domains_in_text(text_parts)
-        except Exception:
-            for meta in out.values():
-                meta["is_it"] = None
-                meta["domains"] = []
+        fill_qual_metadata(
+            out,
+            _QUAL_META_SQL.execute(db, {"ids": qual_ids}).fetchall(),
+            lambda ids: _QUAL_MAJORS_SQL.execute(db, {"ids": ids}).fetchall(),
+            lambda ids: _QUAL_VECTOR_DOMAIN_SQL.execute(db, {"ids": ids}).fetchall(),
+        )
     except Exception:
         pass
     return out
+
+
+def fill_qual_metadata(
+    out: Dict[int, Dict[str, Any]],
+    rows: Iterable[Any],
+    load_majors: Callable[[List[int]], Iterable[Any]],
+    load_vectors: Callable[[List[int]], Iterable[Any]],
+) -> None:
+    """
+    qualification 행 + (qual_id 목록 → major_qualification_map 행 / certificates_vectors 행) 로더로 out을 채운다.
+    로더 결과에 out에 없는 qual_id가 섞여 있어도 무시하므로 전체 테이블 행을 넘겨도 된다 (피처 스토어 적재).
+    조회 예외는 호출자로 전파 — 그 시점까지 채운 out은 남는다.
+    """
+    for r in rows:
+        out[r.qual_id] = {
+            "main_field": (r.main_field or "").strip(),
+            "ncs_large": (r.ncs_large or "").strip(),
+            "related_majors": [],
+        }
+    if out:
+        maj_rows = load_majors(list(out.keys()))
+        by_qual: Dict[int, List[str]] = {}
+        for r in maj_rows:
+            by_qual.setdefault(r.qual_id, [])
+            if len(by_qual[r.qual_id]) < 5:
+                by_qual[r.qual_id].append((r.major or "").strip())
+        for qid, majors in by_qual.items():
+            if qid in out:
+                raw_list = [m for m in majors if m]
+                out[qid]["related_majors"] = raw_list
+                # 자격증 메타데이터에도 전공 원본 + major_category(정규화)를 모두 보관
+                out[qid]["related_majors_normalized"] = [normalize_major(m) for m in raw_list]
+    # certificates_vectors의 domain/domain_normalized를 함께 읽어, 도메인 기반 soft score 신호를 강화
+    if out:
+        vec_rows = load_vectors(list(out.keys()))
+        for r in vec_rows:
+            if r.qual_id not in out:
+                continue
+            out[r.qual_id]["cert_domain"] = (r.domain or "").strip()
+            out[r.qual_id]["cert_top_domain"] = (r.domain_normalized or "").strip()
+            out[r.qual_id]["cert_domain_keywords"] = (r.domain_keywords or "").strip()
+            md = r.metadata if isinstance(r.metadata, dict) else {}
+            if isinstance(md, dict):
+                main_fields = md.get("main_fields")
+                ncs_large_list = md.get("ncs_large")
+                if isinstance(main_fields, list):
+                    out[r.qual_id]["main_fields"] = [
+                        str(x).strip() for x in main_fields if str(x).strip()
+                    ][:8]
+                if isinstance(ncs_large_list, list):
+                    out[r.qual_id]["ncs_large_list"] = [
+                        str(x).strip() for x in ncs_large_list if str(x).strip()
+                    ][:8]
+            # major_qualification_map에 없을 때는 qual_vector metadata.related_majors를 폴백으로 사용
+            if not (out[r.qual_id].get("related_majors") or []):
+                md_maj = md.get("related_majors") if isinstance(md, dict) else None
+                if isinstance(md_maj, list):
+                    cleaned = [str(m).strip() for m in md_maj if str(m).strip()]
+                    if cleaned:
+                        out[r.qual_id]["related_majors"] = cleaned[:5]
+                        out[r.qual_id]["related_majors_normalized"] = [normalize_major(m) for m in cleaned[:5]]
+    # IT·디지털 집중 플래그 및 넓은 도메인 플래그 (불일치 감점·도메인 보너스용)
+    try:
+        from app.rag.utils.domain_tokens import analyze_domain_text
+
+        for qid, meta in out.items():
+            text_parts = " ".join(
+                [
+                    str(meta.get("main_field") or ""),
+                    str(meta.get("ncs_large") or ""),
+                    str(meta.get("cert_domain") or ""),
+                    str(meta.get("cert_top_domain") or ""),
+                    str(meta.get("cert_domain_keywords") or ""),
+                ]
+                + [str(m) for m in (meta.get("related_majors") or [])]
+            )
+            # IT 토큰 우선 → 비IT 토큰 → None, 넓은 도메인(금융, 의료, 관광/서비스 등) 라벨 — 한 번의 스캔
+            meta["is_it"], meta["domains"] = analyze_domain_text(text_parts)
+    except Exception:
+        for meta in out.values():
+            meta["is_it"] = None
+            meta["domains"] = []
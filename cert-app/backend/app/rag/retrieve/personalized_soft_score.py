@@ -2,10 +2,14 @@
 개인화 soft scoring: 전공/학년/즐겨찾기/취득 자격증/난이도 적합도를 반영한 점수 보정.
 profile 없으면 0 반환 (fallback). 기존 metadata_soft_score와 병행 사용 가능.
 전공 비교 시 profile/자격증 모두 major_category로 정규화해 매칭률을 높임.
+자격증 쪽 토큰 집합은 QualFeatures(app.rag.retrieve.candidate_features)로 사전 계산된 값을 사용.
 """
 import logging
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Sequence, Set
 
+import numpy as np
+
+from app.rag.retrieve.candidate_features import CandidateFeatureMatrix, qual_features
 from app.rag.utils.dense_query_rewrite import UserProfile
 from app.rag.utils.major_normalize import normalize_major
 
@@ -88,19 +92,13 @@ def compute_personalized_soft_score(
             )
         return score
 
+    feats = qual_features(qual_metadata)
+
     # 전공 일치 (profile.major vs qual related_majors). 둘 다 major_category로 정규화 후 비교.
     profile_major = (profile.get("major") or "").strip()
     if profile_major:
         q_major_norm = normalize_major(profile_major)
-        qual_majors = qual_metadata.get("related_majors") or []
-        if isinstance(qual_majors, list):
-            qual_major_set = set()
-            for m in qual_majors:
-                n = normalize_major(str(m).strip())
-                if n:
-                    qual_major_set.add(n)
-        else:
-            qual_major_set = {normalize_major(str(qual_majors).strip())} if str(qual_majors).strip() else set()
+        qual_major_set = feats.major_set
         if q_major_norm and qual_major_set and q_major_norm in qual_major_set:
             score += major_bonus
             applied_major = major_bonus
@@ -110,9 +108,7 @@ def compute_personalized_soft_score(
     for t in profile.get("favorite_field_tokens") or []:
         favorite_field_tokens |= _normalize_tokens(str(t))
     if favorite_field_tokens:
-        qual_job = _normalize_tokens(
-            str(qual_metadata.get("main_field") or "") + " " + str(qual_metadata.get("ncs_large") or "")
-        )
+        qual_job = feats.field_tokens
         if qual_job and _overlap_ratio(qual_job, favorite_field_tokens) > 0:
             score += favorite_field_bonus
             applied_fav = favorite_field_bonus
@@ -122,8 +118,8 @@ def compute_personalized_soft_score(
     if acquired_meta and cand_diff is not None:
         try:
             cand_diff_f = float(cand_diff)
-            qual_mf = _normalize_tokens(str(qual_metadata.get("main_field") or ""))
-            qual_ncs = _normalize_tokens(str(qual_metadata.get("ncs_large") or ""))
+            qual_mf = feats.main_field_tokens
+            qual_ncs = feats.ncs_tokens
             for aid in acquired_ids:
                 am = acquired_meta.get(aid)
                 if not am:
@@ -178,6 +174,122 @@ def compute_personalized_soft_score(
     return score
 
 
+def compute_personalized_soft_scores(
+    query_slots: Dict[str, Any],
+    matrix: CandidateFeatureMatrix,
+    qual_ids: Sequence[Optional[int]],
+    profile: Optional[UserProfile] = None,
+    config: Optional[Dict[str, float]] = None,
+    acquired_meta: Optional[Dict[int, Dict[str, Any]]] = None,
+    difficulties: Optional[Sequence[Any]] = None,
+) -> np.ndarray:
+    """
+    compute_personalized_soft_score의 배치판: 프로필 쪽 값은 한 번만 만들고 후보 전체를 벡터 연산으로 판정.
+    difficulties[i]: 후보 i의 avg_difficulty (merge_difficulty_into_metadata로 넣던 값, 없으면 None).
+    qual_ids[i]의 메타가 없으면(None·행렬에 없음) 0.0. 가산 순서가 같아 결과는 후보별 함수와 동일.
+    """
+    n = len(qual_ids)
+    score = np.zeros(n, dtype=np.float64)
+    if not profile or not n:
+        return score
+
+    cfg = config or {}
+    major_bonus = float(cfg.get("major_bonus", DEFAULT_MAJOR_BONUS))
+    favorite_field_bonus = float(cfg.get("favorite_field_bonus", DEFAULT_FAVORITE_FIELD_BONUS))
+    acquired_penalty = float(cfg.get("acquired_penalty", DEFAULT_ACQUIRED_PENALTY))
+    next_step_bonus = float(cfg.get("next_step_bonus", DEFAULT_NEXT_STEP_BONUS))
+    grade_difficulty_bonus = float(cfg.get("grade_difficulty_bonus", DEFAULT_GRADE_DIFFICULTY_BONUS))
+    far_too_difficult_penalty = float(cfg.get("far_too_difficult_penalty", DEFAULT_FAR_TOO_DIFFICULT_PENALTY))
+    far_too_easy_penalty = float(cfg.get("far_too_easy_penalty", DEFAULT_FAR_TOO_EASY_PENALTY))
+
+    rows = matrix.rows(qual_ids)
+    present = rows >= 0
+    acquired_ids: List[int] = list(profile.get("acquired_qual_ids") or [])
+    acquired = np.fromiter(
+        (bool(acquired_ids) and q is not None and q in acquired_ids for q in qual_ids), dtype=bool, count=n
+    )
+
+    # 후보 난이도: None·변환 실패는 diff_ok=False (후보별 함수에서 해당 블록을 건너뛰는 경우)
+    diff = np.full(n, np.nan, dtype=np.float64)
+    diff_ok = np.zeros(n, dtype=bool)
+    for i, d in enumerate(difficulties if difficulties is not None else ()):
+        if d is None:
+            continue
+        try:
+            diff[i] = float(d)
+            diff_ok[i] = True
+        except (TypeError, ValueError):
+            pass
+
+    # 각 항: 조건이 거짓인 후보는 +0.0 (값 불변) → 후보별 함수와 같은 순서로 더한다
+    profile_major = (profile.get("major") or "").strip()
+    if profile_major:
+        q_major_norm = normalize_major(profile_major)
+        if q_major_norm:
+            score += np.where(matrix.column("major_set").intersects(rows, (q_major_norm,)), major_bonus, 0.0)
+
+    favorite_field_tokens: Set[str] = set()
+    for t in profile.get("favorite_field_tokens") or []:
+        favorite_field_tokens |= _normalize_tokens(str(t))
+    if favorite_field_tokens:
+        score += np.where(
+            matrix.column("field_tokens").intersects(rows, favorite_field_tokens), favorite_field_bonus, 0.0
+        )
+
+    # 다음 단계: 취득 자격 순서대로 보며 후보별로 첫 조건 충족 시 1회 (난이도 변환 실패 시 이후 취득 자격은 보지 않음)
+    if acquired_meta:
+        next_hit = np.zeros(n, dtype=bool)
+        active = diff_ok.copy()
+        mf_col = matrix.column("main_field_tokens")
+        ncs_col = matrix.column("ncs_tokens")
+        for aid in acquired_ids:
+            am = acquired_meta.get(aid)
+            if not am:
+                continue
+            acq_diff = am.get("avg_difficulty")
+            if acq_diff is None:
+                continue
+            try:
+                acq_diff_f = float(acq_diff)
+            except (TypeError, ValueError):
+                break
+            cond = active & ~(diff <= acq_diff_f + 0.5)
+            if not cond.any():
+                continue
+            overlap = mf_col.intersects(rows, _normalize_tokens(str(am.get("main_field") or ""))) | ncs_col.intersects(
+                rows, _normalize_tokens(str(am.get("ncs_large") or ""))
+            )
+            hit = cond & overlap
+            next_hit |= hit
+            active &= ~hit
+        score += np.where(next_hit, next_step_bonus, 0.0)
+
+    grade_level = profile.get("grade_level")
+    if grade_level is not None:
+        try:
+            g: Optional[int] = int(grade_level)
+        except (TypeError, ValueError):
+            g = None
+        if g is not None:
+            if g <= 2:
+                bonus = diff_ok & (diff <= 5.5)
+                far = diff_ok & ~bonus & (diff >= 8.0)
+                score += np.where(bonus, grade_difficulty_bonus, np.where(far, far_too_difficult_penalty, 0.0))
+            else:
+                bonus = diff_ok & (diff >= 5.0) & (diff <= 7.5)
+                far = diff_ok & ~bonus & (diff >= 9.0)
+                easy = diff_ok & ~bonus & ~far & (diff <= 4.0) if g >= 3 else np.zeros(n, dtype=bool)
+                score += np.where(
+                    bonus,
+                    grade_difficulty_bonus,
+                    np.where(far, far_too_difficult_penalty * 0.5, np.where(easy, far_too_easy_penalty, 0.0)),
+                )
+
+    # 이미 취득한 자격증 → 다른 항 없이 강한 감점, 메타 없는 후보 → 0.0
+    score = np.where(acquired, 0.0 + acquired_penalty, score)
+    return np.where(present, score, 0.0)
+
+
 def merge_difficulty_into_metadata(
     metadata_by_qual: Dict[int, Dict[str, Any]],
     difficulty_by_qual: Dict[int, float],
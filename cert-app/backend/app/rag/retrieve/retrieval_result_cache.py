@@ -13,30 +13,12 @@ from app.redis_client import redis_client
 
 logger = logging.getLogger(__name__)
 
-_PREFIX = "rag:hybrid:result:v1:"
+_PREFIX = "rag:hybrid:result:v2:"
 
 
 def _settings_fingerprint() -> str:
-    s = get_rag_settings()
-    parts = [
-        str(getattr(s, "RAG_FUSION_METHOD", "linear")),
-        str(getattr(s, "RAG_TOP_N_CANDIDATES", "")),
-        str(getattr(s, "RAG_RRF_K", "")),
-        str(getattr(s, "RAG_CONTRASTIVE_ENABLE", "")),
-        str(getattr(s, "RAG_METADATA_SOFT_SCORE_ENABLE", "")),
-        str(getattr(s, "RAG_VECTOR_THRESHOLD", "")),
-        str(getattr(s, "RAG_DENSE_USE_QUERY_REWRITE", "")),
-        str(getattr(s, "RAG_CHANNEL_CONTEXTUAL_PROMPT_ENABLE", "")),
-        str(getattr(s, "RAG_CHANNEL_CONTEXTUAL_PROMPT_APPLY_BM25", "")),
-        str(getattr(s, "RAG_PERSONALIZED_SOFT_SCORE_ENABLE", "")),
-        str(getattr(s, "RAG_HIERARCHICAL_RETRIEVAL_ENABLE", "")),
-        str(getattr(s, "RAG_HIERARCHICAL_BLEND_WEIGHT", "")),
-        str(getattr(s, "RAG_RRF_W_CONTRASTIVE768", "")),
-        str(getattr(s, "RAG_BM25_TOP_N", "")),
-        str(getattr(s, "RAG_CONTRASTIVE_TOP_N", "")),
-    ]
-    raw = "|".join(parts)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    """결과에 영향을 주는 설정 전체의 지문 (설정 스냅샷 생성 시 계산해 둔 값)."""
+    return get_rag_settings().fingerprint
 
 
 def eligible_for_retrieval_cache(
@@ -0,0 +1,80 @@
+"""
+Aho-Corasick 다중 패턴 매처 (순수 Python).
+
+패턴마다 라벨 집합을 붙여 두고, 텍스트를 한 번 훑어 등장한 모든 패턴(겹침·포함 관계 포함)의 라벨 합집합을 구한다.
+`any(tok in text for tok in tokens)`를 토큰 수만큼 반복하던 substring 검사를 텍스트 길이 1회 스캔으로 바꾼다.
+
+- 대소문자·공백을 그대로 비교한다 (`tok in text`와 동일한 의미).
+- 빈 패턴은 항상 부분 문자열이므로 그 라벨은 always_labels로 분리해 매 호출 결과에 포함한다.
+- 각 상태의 출력 라벨은 fail 링크를 따라 미리 합쳐 두어 스캔 중에는 집합 합집합만 한다.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Tuple
+
+
+class AhoCorasick:
+    """(pattern, label) 쌍으로 구축. labels_in(text)는 등장한 패턴 라벨의 frozenset."""
+
+    __slots__ = ("_goto", "_fail", "_out", "_alphabet", "always_labels", "pattern_count")
+
+    def __init__(self, pairs: Iterable[Tuple[str, Hashable]]):
+        goto: List[Dict[str, int]] = [{}]
+        out: List[set] = [set()]
+        always: set = set()
+        count = 0
+        for pattern, label in pairs:
+            if not pattern:
+                always.add(label)
+                continue
+            count += 1
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(set())
+                state = nxt
+            out[state].add(label)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                cand = goto[f].get(ch, 0)
+                fail[nxt] = cand if cand != nxt else 0
+                out[nxt] |= out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out: List[FrozenSet[Hashable]] = [frozenset(o) for o in out]
+        self._alphabet = frozenset(goto[0].keys()).union(*(g.keys() for g in goto))
+        self.always_labels: FrozenSet[Hashable] = frozenset(always)
+        self.pattern_count = count
+
+    def labels_in(self, text: str) -> FrozenSet[Hashable]:
+        """text에 부분 문자열로 등장하는 모든 패턴의 라벨 합집합 (+ 빈 패턴 라벨)."""
+        goto, fail, out, alphabet = self._goto, self._fail, self._out, self._alphabet
+        found = set(self.always_labels)
+        state = 0
+        for ch in text or "":
+            if ch not in alphabet:
+                # 어떤 패턴에도 없는 문자 → 루트로 (fail 체인 순회 생략)
+                state = 0
+                continue
+            trans = goto[state]
+            while state and ch not in trans:
+                state = fail[state]
+                trans = goto[state]
+            state = trans.get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return frozenset(found)
@@ -0,0 +1,37 @@
+"""
+chunk_id("qual_id:chunk_index") 파싱 헬퍼 (상태 없음).
+
+hybrid의 여러 단계(_dedup_per_cert·MMR·soft score·content 조회·메타 필터)가 같은 split(":")·int() 코드를
+각자 try/except로 반복하던 것을 한곳에 모았다. 규칙은 기존 코드와 같다.
+- qual_id: ':'가 있을 때만 int(첫 ':' 앞부분). int() 실패면 None (':' 없는 id도 None).
+- (qual_id, chunk_index): int(첫 ':' 앞), int(첫 ':' 뒤 전체). 둘 중 하나라도 실패하면 None.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Tuple
+
+
+def qual_id_of(chunk_id: str) -> Optional[int]:
+    """chunk_id의 qual_id (파싱 불가면 None)."""
+    if ":" not in chunk_id:
+        return None
+    try:
+        return int(chunk_id.split(":", 1)[0])
+    except ValueError:
+        return None
+
+
+def qual_ids_of(chunk_ids: Iterable[str]) -> List[Optional[int]]:
+    """chunk_id 목록 → qual_id 목록 (파싱 불가 항목은 None, 순서·길이 유지)."""
+    return [qual_id_of(cid) for cid in chunk_ids]
+
+
+def parse_chunk_id(chunk_id: str) -> Optional[Tuple[int, int]]:
+    """chunk_id → (qual_id, chunk_index). 둘 중 하나라도 파싱 불가면 None."""
+    if ":" not in chunk_id:
+        return None
+    a, b = chunk_id.split(":", 1)
+    try:
+        return int(a), int(b)
+    except ValueError:
+        return None
@@ -13,10 +13,13 @@ import json
 import logging
 import re
 import time
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, TypedDict
 
 from app.config import get_settings
 from app.redis_client import redis_client
+from app.rag.request_memo import profile_key, request_memoized
+from app.rag.utils.aho_corasick import AhoCorasick
 from app.rag.utils.domain_tokens import detect_broad_domains_in_text
 from app.rag.utils.major_normalize import normalize_major
 
@@ -320,28 +323,77 @@ def _query_suggests_it_domain(slots: Dict[str, str], original: str) -> bool:
     import os
     if os.environ.get("BM25_BASELINE_MODE") == "1":
         return True
-    from app.rag.utils.domain_tokens import get_it_tokens, get_non_it_tokens
-    it_tokens = get_it_tokens()
-    non_it_tokens = get_non_it_tokens()
-    # 전공명만 보고 '데이터'가 IT로 잡히는 경우를 줄이기 위해, 원문·희망직무의 비IT 신호를 먼저 본다.
-    job_query = " ".join([str(slots.get("희망직무", "")), original or ""]).strip()
-    for t in non_it_tokens:
-        if t in job_query:
-            return False
+    from app.rag.utils.domain_tokens import classify_it_signal
+    # 전공명만 보고 '데이터'가 IT로 잡히는 경우를 줄이기 위해, 비IT 신호를 먼저 본다.
+    # (원문·희망직무는 combined의 연속 부분 문자열이라 combined 한 번 스캔으로 같은 판정)
     combined = " ".join([str(slots.get("전공", "")), str(slots.get("희망직무", "")), original or ""])
     combined = (combined or "").strip()
-    for t in non_it_tokens:
-        if t in combined:
-            return False
-    for t in it_tokens:
-        if t in combined:
-            return True
-    return False
+    return classify_it_signal(combined, prefer_non_it=True) is True
+
+
+class _FirstMatchPattern:
+    """
+    패턴 리스트를 한 번만 컴파일해 두고 `for p in patterns: re.search(p, q)`와 같은 순서로 첫 매칭을 찾는다.
+    (re 모듈 캐시 조회·플래그 처리 없이 컴파일된 객체를 바로 사용)
+    """
+
+    __slots__ = ("patterns", "_compiled")
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        self.patterns = list(patterns)
+        self._compiled = tuple(re.compile(p, flags) for p in self.patterns)
+
+    def search(self, text: str) -> Optional[tuple[int, Optional[str]]]:
+        """(첫 매칭 패턴 인덱스, 그 패턴의 group(1)) 또는 None."""
+        for i, rx in enumerate(self._compiled):
+            m = rx.search(text)
+            if m:
+                return i, (m.group(1) if rx.groups else None)
+        return None
+
+
+_GRADE_RE = re.compile(r"([1-4])\s*학년")
+_MAJOR_MATCHER = _FirstMatchPattern(MAJOR_PATTERNS, re.IGNORECASE)
+_JOB_MATCHER = _FirstMatchPattern(JOB_PATTERNS)
+_PURPOSE_MATCHER = _FirstMatchPattern(PURPOSE_PATTERNS)
+_JOB_RELATED_WORK_RE = re.compile(r"(\S+)\s*관련\s*일\s*하고\s*싶")
+_JOB_SIDE_RE = re.compile(r"(\S+)\s*쪽\s*(?:일|으로|가고|취업|하고)?")
+_JOB_SIDE_SUFFIX_RE = re.compile(r"\s*쪽(?:으로)?$")
+
+# 전공 폴백: 자주 등장하는 학과/계열 키워드 (리스트 순서상 첫 포함 토큰)
+_FALLBACK_MAJORS = (
+    "산업데이터공학과",
+    "AI데이터공학과",
+    "AI빅데이터학과",
+    "컴퓨터공학",
+    "컴퓨터공학과",
+    "컴퓨터정보과",
+    "소프트웨어학과",
+    "소프트웨어공학과",
+    "정보통신",
+    "정보보안",
+    "경영학",
+    "통계학",
+)
+# 슬롯 규칙의 부분 문자열 조건에 쓰이는 키워드 (질의 1회 스캔으로 포함 여부 집합을 만든다)
+_SLOT_KEYWORDS = _FALLBACK_MAJORS + (
+    "직무", "데이터 관련", "데이터 쪽", "ADsP", "다음에 뭐 따면", "되려면", "뭐 따야",
+    "백엔드", "개발자", "빅데이터", "분석가", "가려면", "가고 싶어", "가고싶어", "IT",
+    "취업", "이직", "추천", "취업용", "입문용", "실무용", "실무 쪽", "실무",
+    "도전", "준비하고 싶어", "미리 준비", "조금 더 어려운 걸 해보고 싶어", "준비하고 있어",
+    "되고 싶어", "되고싶어", "일 하고 싶어", "일하고 싶어", "하고 싶어", "하고싶어", "쪽", "일",
+)
+_SLOT_KEYWORD_MATCHER = AhoCorasick((k, k) for k in _SLOT_KEYWORDS)
+_EXTRACT_SLOTS_CACHE_SIZE = 4096
 
 
 def _extract_slots(query: str) -> Dict[str, str]:
-    """규칙 기반으로 전공/희망직무/목적 슬롯 추출."""
-    q = (query or "").strip()
+    """규칙 기반으로 전공/희망직무/목적 슬롯 추출. (정규화 질의 단위로 메모이즈, 호출자 수정에 대비해 복사본 반환)"""
+    return dict(_extract_slots_cached((query or "").strip()))
+
+
+@lru_cache(maxsize=_EXTRACT_SLOTS_CACHE_SIZE)
+def _extract_slots_cached(q: str) -> Dict[str, str]:
     slots: Dict[str, str] = {
         "전공": "",
         "희망직무": "",
@@ -350,69 +402,51 @@ def _extract_slots(query: str) -> Dict[str, str]:
     }
     if not q:
         return slots
+    kw = _SLOT_KEYWORD_MATCHER.labels_in(q)
 
     # 학년: "1학년", "2학년", "4학년" 등 (neither 쿼리 보강)
-    grade_m = re.search(r"([1-4])\s*학년", q)
+    grade_m = _GRADE_RE.search(q)
     if grade_m:
         slots["학년"] = f"{grade_m.group(1)}학년"
 
-    for pattern in MAJOR_PATTERNS:
-        m = re.search(pattern, q, re.IGNORECASE)
-        if m:
-            slots["전공"] = normalize_major(m.group(1).strip())
-            break
+    major_m = _MAJOR_MATCHER.search(q)
+    if major_m:
+        slots["전공"] = normalize_major(major_m[1].strip())
     if not slots["전공"]:
-        # 전공 폴백: 자주 등장하는 학과/계열 키워드
-        fallback_majors = [
-            "산업데이터공학과",
-            "AI데이터공학과",
-            "AI빅데이터학과",
-            "컴퓨터공학",
-            "컴퓨터공학과",
-            "컴퓨터정보과",
-            "소프트웨어학과",
-            "소프트웨어공학과",
-            "정보통신",
-            "정보보안",
-            "경영학",
-            "통계학",
-        ]
-        for token in fallback_majors:
-            if token in q:
+        for token in _FALLBACK_MAJORS:
+            if token in kw:
                 slots["전공"] = normalize_major(token)
                 break
 
-    for pattern in JOB_PATTERNS:
-        m = re.search(pattern, q)
-        if m:
-            slots["희망직무"] = m.group(1).strip()
-            break
-    if not slots["희망직무"] and "직무" in q:
+    job_m = _JOB_MATCHER.search(q)
+    if job_m:
+        slots["희망직무"] = job_m[1].strip()
+    if not slots["희망직무"] and "직무" in kw:
         idx = q.find("직무")
         start = max(0, idx - 12)
         slots["희망직무"] = q[start:idx + 6].strip()
-    if not slots["희망직무"] and ("데이터 관련" in q or "데이터 쪽" in q):
+    if not slots["희망직무"] and ("데이터 관련" in kw or "데이터 쪽" in kw):
         slots["희망직무"] = "데이터 분석"
-    if not slots["희망직무"] and "ADsP" in q and "다음에 뭐 따면" in q:
+    if not slots["희망직무"] and "ADsP" in kw and "다음에 뭐 따면" in kw:
         # ADsP 이후 로드맵 질의: 데이터 분석 직무/로드맵으로 본다.
         slots["희망직무"] = "데이터 분석"
-    if not slots["희망직무"] and ("되려면" in q or "뭐 따야" in q):
-        for token in ["백엔드", "개발자", "빅데이터", "분석가"]:
-            if token in q:
-                slots["희망직무"] = "백엔드 개발" if "백엔드" in q or "개발자" in q else ("빅데이터 분석" if "빅데이터" in q or "분석가" in q else token)
-                break
-    if not slots["희망직무"] and ("가려면" in q or "가고 싶어" in q or "가고싶어" in q) and "직무" in q:
-        slots["희망직무"] = "IT 직무" if "IT" in q else "데이터 분석"
+    if not slots["희망직무"] and ("되려면" in kw or "뭐 따야" in kw):
+        if "백엔드" in kw or "개발자" in kw:
+            slots["희망직무"] = "백엔드 개발"
+        elif "빅데이터" in kw or "분석가" in kw:
+            slots["희망직무"] = "빅데이터 분석"
+    if not slots["희망직무"] and ("가려면" in kw or "가고 싶어" in kw or "가고싶어" in kw) and "직무" in kw:
+        slots["희망직무"] = "IT 직무" if "IT" in kw else "데이터 분석"
 
     # 일반적인 "X 관련 일 하고 싶어" 패턴 (통번역/인공지능/3D 조형/사무·경영 등)
     if not slots["희망직무"]:
-        m = re.search(r"(\S+)\s*관련\s*일\s*하고\s*싶", q)
+        m = _JOB_RELATED_WORK_RE.search(q)
         if m:
             slots["희망직무"] = m.group(1).strip()
 
     # 일반적인 "X 쪽으로/쪽 일/쪽 가고 싶어" 패턴 (도메인 전체를 희망 직무로 사용)
     if not slots["희망직무"]:
-        m = re.search(r"(\S+)\s*쪽\s*(?:일|으로|가고|취업|하고)?", q)
+        m = _JOB_SIDE_RE.search(q)
         if m:
             slots["희망직무"] = m.group(1).strip()
 
@@ -426,54 +460,54 @@ def _extract_slots(query: str) -> Dict[str, str]:
                 job = job[: -len(suffix)]
                 break
         # 뒤에 붙은 '쪽' / '쪽으로' 제거 (예: "인공지능 쪽", "인공지능 쪽으로")
-        job_norm = re.sub(r"\s*쪽(?:으로)?$", "", job).strip()
+        job_norm = _JOB_SIDE_SUFFIX_RE.sub("", job).strip()
         # "쪽" / "쪽으로"만 남은 경우는 의미 없는 값이므로 비움
         if job_norm in {"", "쪽", "쪽으로"}:
             slots["희망직무"] = ""
         else:
             slots["희망직무"] = job_norm
 
-    for p in PURPOSE_PATTERNS:
-        if re.search(p, q):
-            if "취업" in p or "취업" in q:
-                slots["목적"] = "취업 준비"
-            elif "이직" in p or "이직" in q:
-                slots["목적"] = "이직 준비"
-            elif "입문" in p:
-                slots["목적"] = "입문"
-            elif "실무" in p:
-                slots["목적"] = "실무"
-            elif "커리어" in p:
-                slots["목적"] = "취업 준비"
-            elif "범용성" in p:
-                slots["목적"] = "자격증 추천"
-            else:
-                slots["목적"] = "자격증 추천"
-            break
-    if not slots["목적"] and ("취업" in q or "추천" in q):
-        slots["목적"] = "취업 준비" if "취업" in q else "자격증 추천"
-    if not slots["목적"] and ("취업용" in q or "입문용" in q or "실무용" in q or "실무 쪽" in q):
-        if "취업용" in q or "취업" in q:
+    purpose_m = _PURPOSE_MATCHER.search(q)
+    if purpose_m:
+        p = PURPOSE_PATTERNS[purpose_m[0]]
+        if "취업" in p or "취업" in kw:
             slots["목적"] = "취업 준비"
-        elif "입문용" in q:
+        elif "이직" in p or "이직" in kw:
+            slots["목적"] = "이직 준비"
+        elif "입문" in p:
             slots["목적"] = "입문"
-        elif "실무" in q:
+        elif "실무" in p:
             slots["목적"] = "실무"
+        elif "커리어" in p:
+            slots["목적"] = "취업 준비"
+        elif "범용성" in p:
+            slots["목적"] = "자격증 추천"
         else:
+            slots["목적"] = "자격증 추천"
+    if not slots["목적"] and ("취업" in kw or "추천" in kw):
+        slots["목적"] = "취업 준비" if "취업" in kw else "자격증 추천"
+    if not slots["목적"] and ("취업용" in kw or "입문용" in kw or "실무용" in kw or "실무 쪽" in kw):
+        if "취업용" in kw or "취업" in kw:
             slots["목적"] = "취업 준비"
-    if not slots["목적"] and ("도전" in q or "준비하고 싶어" in q or "미리 준비" in q or "조금 더 어려운 걸 해보고 싶어" in q):
+        elif "입문용" in kw:
+            slots["목적"] = "입문"
+        elif "실무" in kw:
+            slots["목적"] = "실무"
+        else:
+            slots["목적"] = "취업 준비"
+    if not slots["목적"] and ("도전" in kw or "준비하고 싶어" in kw or "미리 준비" in kw or "조금 더 어려운 걸 해보고 싶어" in kw):
         # "조금 더 어려운 걸 해보고 싶어" 같은 표현은 기존 자격 이후 심화/상위 자격 추천 요청
         # 이 경우도 학습 데이터와 파이프라인에서는 자격증 추천으로 본다.
         slots["목적"] = "자격증 추천"
-    if not slots["목적"] and ("준비하고 있어" in q or "가려면" in q):
-        slots["목적"] = "취업 준비" if "취업" in q or "직무" in q else "자격증 추천"
+    if not slots["목적"] and ("준비하고 있어" in kw or "가려면" in kw):
+        slots["목적"] = "취업 준비" if "취업" in kw or "직무" in kw else "자격증 추천"
     # 직업/직무명을 언급하면서 "~되고 싶어", "~일 하고 싶어"로 끝나는 경우는 취업 목적일 가능성이 높음
     if not slots["목적"]:
-        if ("되고 싶어" in q or "되고싶어" in q or "일 하고 싶어" in q or "일하고 싶어" in q):
+        if ("되고 싶어" in kw or "되고싶어" in kw or "일 하고 싶어" in kw or "일하고 싶어" in kw):
             slots["목적"] = "취업 준비"
         # "~하고 싶어" 이면서 '쪽' 또는 '일' 같은 표현이 함께 나오면 역시 취업 목적일 가능성이 큼
-        elif "하고 싶어" in q or "하고싶어" in q:
-            if "쪽" in q or "일" in q or "취업" in q:
+        elif "하고 싶어" in kw or "하고싶어" in kw:
+            if "쪽" in kw or "일" in kw or "취업" in kw:
                 slots["목적"] = "취업 준비"
 
     return slots
@@ -486,6 +520,10 @@ logger = logging.getLogger(__name__)
 _settings = get_settings()
 _LOCAL_QT_CACHE: Dict[str, tuple[float, Optional[str]]] = {}
 _LOCAL_QT_CACHE_MAX = 2048
+# 슬롯 파이프라인(규칙 + intent/dense_slot 벡터 보정 + 프로필) 결과. 한 검색 안에서 재질의·메타 soft·리랭커가
+# 같은 (질문, 프로필)로 반복 호출하므로 벡터 조회 왕복을 한 번으로 줄인다. (Redis 번들과 같은 TTL)
+_LOCAL_SLOTS_CACHE: Dict[str, tuple[float, Dict[str, str]]] = {}
+_LOCAL_SLOTS_CACHE_MAX = 2048
 
 
 def _local_qt_cache_get(key: str, ttl_s: int) -> tuple[bool, Optional[str]]:
@@ -513,6 +551,25 @@ def _local_qt_cache_set(key: str, qt: Optional[str]) -> None:
             _LOCAL_QT_CACHE.pop(k, None)
 
 
+def _local_slots_cache_get(key: str, ttl_s: int) -> Optional[Dict[str, str]]:
+    row = _LOCAL_SLOTS_CACHE.get(key)
+    if not row:
+        return None
+    ts, slots = row
+    if (time.time() - ts) > max(1, ttl_s):
+        _LOCAL_SLOTS_CACHE.pop(key, None)
+        return None
+    return dict(slots)
+
+
+def _local_slots_cache_set(key: str, slots: Dict[str, str]) -> None:
+    _LOCAL_SLOTS_CACHE[key] = (time.time(), dict(slots))
+    if len(_LOCAL_SLOTS_CACHE) > _LOCAL_SLOTS_CACHE_MAX:
+        oldest = sorted(_LOCAL_SLOTS_CACHE.items(), key=lambda kv: kv[1][0])[: _LOCAL_SLOTS_CACHE_MAX // 2]
+        for k, _ in oldest:
+            _LOCAL_SLOTS_CACHE.pop(k, None)
+
+
 def _dense_cache_hash(q: str, profile: Optional[UserProfile]) -> str:
     """
     Redis 재질의/슬롯 캐시 키용 해시.
@@ -532,13 +589,16 @@ def _dense_cache_hash(q: str, profile: Optional[UserProfile]) -> str:
         return redis_client.hash_query_params(q=qn)
 
 
-def _apply_intent_vector_fallback(slots: Dict[str, str], original: str) -> Dict[str, str]:
+def _apply_intent_vector_fallback(
+    slots: Dict[str, str], original: str, errors: Optional[List[str]] = None
+) -> Dict[str, str]:
     """
     규칙 기반 슬롯 추출 이후, 희망직무/목적이 비어 있거나 애매한 경우
     Supabase intent_labels 테이블(쿼리 임베딩 ↔ 라벨 임베딩 유사도)로 보정한다.
 
     - job(희망직무): 비어 있거나 포괄적일 때만 보정
     - purpose(목적): 비어 있을 때만 보정
+    - errors: 전달하면 조회 실패 사유를 추가 (실패 결과를 캐시하지 않도록)
     """
     q = (original or "").strip()
     if not q:
@@ -559,6 +619,8 @@ def _apply_intent_vector_fallback(slots: Dict[str, str], original: str) -> Dict[
         from app.rag.utils.intent_vector_labels import lookup_intent_labels_with_vector
     except Exception:
         logger.debug("intent_vector_fallback: import failed (intent lookup disabled?)", exc_info=True)
+        if errors is not None:
+            errors.append("intent:import")
         return slots
 
     kinds: List[str] = []
@@ -570,9 +632,11 @@ def _apply_intent_vector_fallback(slots: Dict[str, str], original: str) -> Dict[
         return slots
 
     try:
-        intent_labels = lookup_intent_labels_with_vector(q, kinds=kinds, top_k=1)
+        intent_labels = lookup_intent_labels_with_vector(q, kinds=kinds, top_k=1, errors=errors)
     except Exception:
         logger.debug("intent_vector_fallback: lookup failed", exc_info=True)
+        if errors is not None:
+            errors.append("intent:lookup")
         return slots
 
     if need_job and intent_labels.get("job"):
@@ -584,7 +648,10 @@ def _apply_intent_vector_fallback(slots: Dict[str, str], original: str) -> Dict[
 
 
 def _apply_dense_slot_vector_fallback(
-    slots: Dict[str, str], original: str, _profile: Optional[UserProfile] = None
+    slots: Dict[str, str],
+    original: str,
+    _profile: Optional[UserProfile] = None,
+    errors: Optional[List[str]] = None,
 ) -> Dict[str, str]:
     """
     intent_vector_fallback 이후, dense_slot_labels 테이블(쿼리 임베딩 ↔ 슬롯 라벨 유사도)로
@@ -592,36 +659,44 @@ def _apply_dense_slot_vector_fallback(
 
     - job: 비어 있거나 포괄적(IT 직무, 개발, 데이터 분석, 쪽)일 때만 보정
     - purpose: 비어 있거나 "자격증 추천"일 때만 보정
+    - errors: 전달하면 조회 실패 사유를 추가 (실패 결과를 캐시하지 않도록)
     """
     q = (original or "").strip()
     if not q:
         return slots
 
     try:
-        from app.rag.utils.slot_vector_labels import lookup_slot_label_with_vector
+        from app.rag.utils.slot_vector_labels import lookup_slot_labels_with_vector
     except Exception:
         logger.debug("dense_slot_vector_fallback: import failed", exc_info=True)
+        if errors is not None:
+            errors.append("slot:import")
         return slots
 
     missing_job = not (slots.get("희망직무") or "").strip()
     generic_job = (slots.get("희망직무") or "").strip() in {"IT 직무", "개발", "데이터 분석", "쪽"}
-    if missing_job or generic_job:
-        try:
-            label = lookup_slot_label_with_vector(q, "job", top_k=1)
-            if label:
-                slots["희망직무"] = label
-        except Exception:
-            logger.debug("dense_slot_vector_fallback: job lookup failed", exc_info=True)
-
     missing_purpose = not (slots.get("목적") or "").strip()
     generic_purpose = (slots.get("목적") or "").strip() == "자격증 추천"
+    slot_types: List[str] = []
+    if missing_job or generic_job:
+        slot_types.append("job")
     if missing_purpose or generic_purpose:
-        try:
-            label = lookup_slot_label_with_vector(q, "purpose", top_k=1)
-            if label:
-                slots["목적"] = label
-        except Exception:
-            logger.debug("dense_slot_vector_fallback: purpose lookup failed", exc_info=True)
+        slot_types.append("purpose")
+    if not slot_types:
+        return slots
+
+    # job·purpose를 한 번에 조회 (라벨 인덱스 행렬곱 1회)
+    try:
+        labels = lookup_slot_labels_with_vector(q, slot_types, top_k=1, errors=errors)
+    except Exception:
+        logger.debug("dense_slot_vector_fallback: lookup failed", exc_info=True)
+        if errors is not None:
+            errors.append("slot:lookup")
+        return slots
+    if labels.get("job"):
+        slots["희망직무"] = labels["job"]
+    if labels.get("purpose"):
+        slots["목적"] = labels["purpose"]
 
     return slots
 
@@ -633,17 +708,41 @@ def _slots_from_rewrite_pipeline(
     """
     재질의(rewrite_for_dense)와 동일한 슬롯 파이프라인.
     규칙 추출 → intent 벡터 보정 → dense_slot 벡터 보정 → 프로필 병합.
+    (질문+프로필 해시 단위로 프로세스 로컬 캐시. 벡터 보정 조회가 실패한 결과는 캐시하지 않음)
     """
+    # intent·dense_slot 보정 on/off·임계값은 A/B 변형·설정마다 다를 수 있어 키에 포함
+    try:
+        from app.rag.config import get_rag_settings
+
+        _rag = get_rag_settings()
+        variant = (
+            f"{_settings.INTENT_LABEL_LOOKUP_ENABLE}:{_settings.INTENT_LABEL_MIN_SIMILARITY}:"
+            f"{_rag.RAG_DENSE_SLOT_VECTOR_FALLBACK_ENABLE}:{_rag.RAG_DENSE_SLOT_VECTOR_MIN_SIM}"
+        )
+    except Exception:
+        variant = ""
+    cache_key = f"{_dense_cache_hash(q, profile)}:{variant}"
+    cached = _local_slots_cache_get(cache_key, int(_settings.CACHE_TTL_RAG))
+    if cached is not None:
+        return cached
+    errors: List[str] = []
     slots = _extract_slots(q)
     try:
-        slots = _apply_intent_vector_fallback(slots, q)
+        slots = _apply_intent_vector_fallback(slots, q, errors)
     except Exception:
         logger.debug("slots_from_rewrite_pipeline: intent_vector_fallback failed", exc_info=True)
+        errors.append("intent")
     try:
-        slots = _apply_dense_slot_vector_fallback(slots, q, profile)
+        slots = _apply_dense_slot_vector_fallback(slots, q, profile, errors)
     except Exception:
         logger.debug("slots_from_rewrite_pipeline: dense_slot_vector_fallback failed", exc_info=True)
+        errors.append("slot")
     slots = _merge_profile_into_slots(slots, profile)
+    if errors:
+        # 임베딩·DB 일시 장애로 보정이 빠진 슬롯을 CACHE_TTL_RAG 동안 고정하지 않도록 다음 요청에서 재시도
+        logger.debug("slots_from_rewrite_pipeline: not caching (lookup failed: %s)", ",".join(errors))
+    else:
+        _local_slots_cache_set(cache_key, slots)
     return slots
 
 
@@ -1068,6 +1167,11 @@ def rewrite_for_dense_with_type(
     return rewrite, qt, scoring_slots
 
 
+@request_memoized(
+    "extract_slots_for_dense",
+    key=lambda query, profile=None: ((query or "").strip(), profile_key(profile)),
+    copy=dict,
+)
 def extract_slots_for_dense(query: str, profile: Optional[UserProfile] = None) -> Dict[str, Any]:
     """
     메타 soft / 리랭커 등에서 사용하는 슬롯 dict.
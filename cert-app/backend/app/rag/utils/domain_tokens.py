@@ -2,9 +2,14 @@
 자격증 직종·도메인 토큰 (IT·디지털 집중 vs 그 외 직종 신호, BM25 확장 등).
 data/domain_tokens.json이 있으면 로드, 없으면 하드코딩 기본값 사용.
 넓은 도메인은 domain_tokens_new_cert_full.json(전 직종) 우선.
+
+토큰 감지(넓은 도메인·overrides·IT/비IT)는 로드된 토큰 전체로 만든 Aho-Corasick 오토마톤 하나로
+텍스트를 한 번만 훑는다 (토큰 수만큼 `tok in text` 반복하던 방식과 결과 동일).
 """
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.rag.utils.aho_corasick import AhoCorasick
 
 # 기본값: export_domain_tokens.py 실행 전 또는 JSON 없을 때 사용
 _DEFAULT_IT_TOKENS = frozenset({
@@ -41,6 +46,14 @@ _cached: Dict[str, Any] | None = None
 _broad_domains_cache: Dict[str, List[str]] | None = None
 _broad_overrides_cache: List[Dict[str, str]] | None = None
 _domain_to_top_cache: Optional[Dict[str, str]] = None
+# (소스 캐시 객체들, 오토마톤). 소스 캐시가 교체되면 재구축
+_matcher_cache: Optional[Tuple[tuple, AhoCorasick]] = None
+
+# 오토마톤 라벨: (종류, 도메인)
+_LABEL_IT = ("it", "")
+_LABEL_NON_IT = ("non_it", "")
+_KIND_DOMAIN = "domain"
+_KIND_OVERRIDE = "override"
 
 
 def _domain_tokens_path() -> Path:
@@ -567,45 +580,83 @@ def _get_broad_overrides() -> List[Dict[str, str]]:
     return _broad_overrides_cache
 
 
+def _get_domain_matcher() -> AhoCorasick:
+    """넓은 도메인 토큰·overrides·IT/비IT 토큰 전체의 오토마톤 (JSON 로드 후 1회 구축)."""
+    global _matcher_cache
+    sources = (get_broad_domains(), _get_broad_overrides(), load_domain_tokens())
+    cached = _matcher_cache
+    if cached is not None and all(a is b for a, b in zip(cached[0], sources)):
+        return cached[1]
+    broad, overrides, tokens = sources
+    pairs: List[Tuple[str, tuple]] = []
+    for domain, domain_tokens in broad.items():
+        pairs.extend((t, (_KIND_DOMAIN, domain)) for t in domain_tokens if t)
+    for item in overrides:
+        phrase = item.get("phrase") or ""
+        domain = item.get("domain") or ""
+        if phrase and domain:
+            pairs.append((phrase, (_KIND_OVERRIDE, domain)))
+    # IT/비IT는 빈 토큰도 기존 `"" in text`(항상 참)와 같게 취급 (always_labels)
+    pairs.extend((t, _LABEL_IT) for t in tokens["it_tokens"])
+    pairs.extend((t, _LABEL_NON_IT) for t in tokens["non_it_tokens"])
+    matcher = AhoCorasick(pairs)
+    _matcher_cache = (sources, matcher)
+    return matcher
+
+
+def _domains_from_labels(labels: FrozenSet[tuple]) -> List[str]:
+    # overrides 구문이 하나라도 있으면 지정 도메인만, 아니면 일반 토큰 도메인 (둘 다 중복 제거 후 정렬)
+    overrides = sorted({d for kind, d in labels if kind == _KIND_OVERRIDE})
+    if overrides:
+        return overrides
+    return sorted({d for kind, d in labels if kind == _KIND_DOMAIN})
+
+
+def _it_signal_from_labels(labels: FrozenSet[tuple], prefer_non_it: bool = False) -> Optional[bool]:
+    if prefer_non_it and _LABEL_NON_IT in labels:
+        return False
+    if _LABEL_IT in labels:
+        return True
+    if _LABEL_NON_IT in labels:
+        return False
+    return None
+
+
 def detect_broad_domains_in_text(text: str) -> List[str]:
     """
     입력 텍스트에서 넓은 도메인(IT, 금융, 의료 등)을 부분 문자열 기반으로 감지.
-    여러 도메인이 매칭되면 중복 제거 후 정렬된 리스트를 반환.
+    overrides 구문이 포함되면 지정 도메인만, 아니면 토큰이 등장한 도메인 전체를 중복 제거 후 정렬해 반환.
     """
-    cfg = get_broad_domains()  # {"IT": [...], ...}
     text = (text or "").strip()
     if not text:
         return []
+    return _domains_from_labels(_get_domain_matcher().labels_in(text))
 
-    # 1) overrides: 특정 구문이 포함되면 지정 도메인만 반환
-    overrides = _get_broad_overrides()
-    override_found: List[str] = []
-    if overrides:
-        for item in overrides:
-            phrase = item.get("phrase") or ""
-            domain = item.get("domain") or ""
-            if phrase and domain and phrase in text:
-                override_found.append(domain)
-        if override_found:
-            return sorted(dict.fromkeys(override_found))
-
-    # 2) 일반 토큰: 토큰 길이 내림차순으로 긴 토큰 우선 매칭
-    token_domain_pairs: List[tuple[str, str]] = []
-    for domain, tokens in cfg.items():
-        for token in tokens:
-            if token:
-                token_domain_pairs.append((token, domain))
-    # 긴 토큰이 먼저 매칭되도록 길이 기준 내림차순 정렬
-    token_domain_pairs.sort(key=lambda x: len(x[0]), reverse=True)
-
-    found: List[str] = []
-    for token, domain in token_domain_pairs:
-        if token in text and domain not in found:
-            found.append(domain)
-
-    # 순서를 안정적으로 유지하기 위해 dict.fromkeys로 중복 제거 후 정렬
-    uniq = sorted(dict.fromkeys(found))
-    return uniq
+
+def classify_it_signal(text: str, prefer_non_it: bool = False) -> Optional[bool]:
+    """
+    IT 토큰이 있으면 True, 없고 비IT 토큰이 있으면 False, 둘 다 없으면 None.
+    prefer_non_it=True면 비IT 토큰을 먼저 본다 (둘 다 있으면 False).
+    """
+    return _it_signal_from_labels(_get_domain_matcher().labels_in(text or ""), prefer_non_it)
+
+
+def contains_non_it_token(text: str) -> bool:
+    """비(디지털 집중) 직종 토큰이 하나라도 포함되면 True."""
+    return _LABEL_NON_IT in _get_domain_matcher().labels_in(text or "")
+
+
+def analyze_domain_text(text: str) -> Tuple[Optional[bool], List[str]]:
+    """(classify_it_signal(text), detect_broad_domains_in_text(text)) — 앞뒤 공백이 없으면 한 번의 스캔으로."""
+    text = text or ""
+    matcher = _get_domain_matcher()
+    labels = matcher.labels_in(text)
+    stripped = text.strip()
+    if not stripped:
+        return _it_signal_from_labels(labels), []
+    if stripped != text:
+        return _it_signal_from_labels(labels), _domains_from_labels(matcher.labels_in(stripped))
+    return _it_signal_from_labels(labels), _domains_from_labels(labels)
 
 
 def get_it_tokens() -> frozenset:
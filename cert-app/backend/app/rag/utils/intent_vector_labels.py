@@ -25,6 +25,7 @@ def lookup_intent_labels_with_vector(
     top_k: int = 1,
     min_similarity: float | None = None,
     query_embedding: Optional[List[float]] = None,
+    errors: Optional[List[str]] = None,
 ) -> Dict[str, str]:
     """
     룰 기반 슬롯 추출이 애매한 경우 Supabase 벡터 intent 라벨 테이블에서 보정용 라벨을 조회한다.
@@ -33,6 +34,7 @@ def lookup_intent_labels_with_vector(
     - kinds: ["job", "purpose", "major", "domain"] 등 조회할 intent 종류
     - top_k: kind **별** 최근접 라벨 개수 (기본 1)
     - query_embedding: 호출자가 이미 구한 쿼리 임베딩이면 전달해 OpenAI 중복 호출 방지
+    - errors: 전달하면 임베딩·DB 조회 실패 시 사유를 추가 (빈 결과가 '라벨 없음'인지 '조회 실패'인지 구분용)
     """
     if not _is_enabled():
         return {}
@@ -47,12 +49,16 @@ def lookup_intent_labels_with_vector(
             from app.utils.ai import get_embedding
         except Exception:
             logger.debug("intent_vector_labels: get_embedding import failed", exc_info=True)
+            if errors is not None:
+                errors.append("intent:embedding")
             return {}
 
         try:
             embedding = get_embedding(q)
         except Exception:
             logger.debug("intent_vector_labels: get_embedding failed", exc_info=True)
+            if errors is not None:
+                errors.append("intent:embedding")
             return {}
 
     if not isinstance(embedding, list) or not embedding:
@@ -73,6 +79,23 @@ def lookup_intent_labels_with_vector(
         sim_threshold = 0.99
     max_distance = 1.0 - sim_threshold
 
+    # 메모리 라벨 인덱스: 모든 kind를 행렬곱 1회로 (미적재·비활성이면 아래 DB 쿼리)
+    try:
+        from app.rag.utils.label_vector_index import SOURCE_INTENT, lookup_label_groups
+
+        found = lookup_label_groups(embedding, SOURCE_INTENT, kinds_list, sim_threshold, max(1, top_k))
+    except Exception:
+        logger.debug("intent_vector_labels: label index lookup failed", exc_info=True)
+        found = None
+    if found is not None:
+        out: Dict[str, str] = {}
+        for kind in sorted(found):
+            for label, _sim in found[kind]:
+                if label:
+                    out[kind] = str(label)
+                    break
+        return out
+
     db = SessionLocal()
     try:
         # kind별로 가장 가까운 라벨만 선택 (전역 ORDER BY + LIMIT는
@@ -107,6 +130,8 @@ def lookup_intent_labels_with_vector(
         ).fetchall()
     except Exception:
         logger.debug("intent_vector_labels: DB lookup failed", exc_info=True)
+        if errors is not None:
+            errors.append("intent:db")
         return {}
     finally:
         db.close()
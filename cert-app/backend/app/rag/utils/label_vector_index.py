@@ -0,0 +1,304 @@
+"""
+intent / query_type / dense_slot 라벨 벡터 인덱스 (in-memory, NumPy).
+
+intent_labels·dense_slot_labels·query_type_labels는 작은 라벨 테이블인데, 재질의 경로에서 조회마다
+SessionLocal을 열고 1536차원 벡터 리터럴을 보내 pgvector 최근접 쿼리를 (kind·slot_type마다) 실행했다.
+세 테이블을 한 번에 읽어 L2 정규화한 float32 행렬 하나로 두고, 조회는 행렬곱 1회 + 그룹별 argmax로 처리한다.
+
+- 그룹: "intent:<kind>", "slot:<slot_type>", "query_type". 행은 그룹별 연속 구간으로 정렬해 둔다.
+- pgvector 코사인 거리(<=>) = 1 - 코사인 유사도. `거리 <= max_distance` ⇔ `유사도 >= 1 - max_distance`.
+  노름 0 벡터는 pgvector에서 NaN 거리라 매칭되지 않으므로 적재 시 제외한다.
+- 라벨 테이블은 카탈로그 데이터가 아니므로 카탈로그 버전과 무관하다. LABEL_VECTOR_INDEX_MAX_AGE(초)가 지나거나
+  라벨 적재 후 invalidate_label_vector_index()가 호출되면 다음 조회가 백그라운드 스레드 재적재를 걸고,
+  끝날 때까지는 이전 인덱스를 그대로 쓴다 (재질의 요청이 세 임베딩 테이블 적재를 기다리지 않음).
+- 적재 실패·테이블 없음이면 해당 소스는 인덱스에 없고, 호출자는 기존 pgvector 쿼리로 폴백한다.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SOURCE_INTENT = "intent"
+SOURCE_SLOT = "slot"
+SOURCE_QUERY_TYPE = "query_type"
+
+# (소스, SQL). grp는 소스 내 그룹(kind·slot_type), value는 조회 결과로 돌려줄 값.
+# embedding은 드라이버와 무관하게 pgvector 텍스트 표현("[x,y,...]")으로 읽는다.
+_SOURCE_SQL: Tuple[Tuple[str, str], ...] = (
+    (
+        SOURCE_INTENT,
+        "SELECT kind AS grp, label AS value, embedding::text AS embedding "
+        "FROM intent_labels WHERE embedding IS NOT NULL",
+    ),
+    (
+        SOURCE_SLOT,
+        "SELECT slot_type AS grp, label_text AS value, embedding::text AS embedding "
+        "FROM dense_slot_labels WHERE active = true AND embedding IS NOT NULL",
+    ),
+    (
+        SOURCE_QUERY_TYPE,
+        "SELECT NULL AS grp, query_type AS value, embedding::text AS embedding "
+        "FROM query_type_labels WHERE embedding IS NOT NULL",
+    ),
+)
+
+
+def group_name(source: str, grp: Optional[str] = None) -> str:
+    """소스·그룹 → 인덱스 그룹 이름 ("intent:job", "slot:purpose", "query_type")."""
+    return f"{source}:{grp}" if grp else source
+
+
+def _parse_vector(raw) -> Optional[np.ndarray]:
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        body = raw.strip().strip("[]")
+        if not body:
+            return None
+        return np.asarray(body.split(","), dtype=np.float32)
+    return np.asarray(raw, dtype=np.float32)
+
+
+class LabelVectorIndex:
+    """정규화된 라벨 임베딩 행렬 + 그룹별 행 구간. nearest()는 행렬곱 1회로 요청 그룹 전부를 처리."""
+
+    def __init__(
+        self,
+        version: int,
+        matrix: np.ndarray,
+        values: List[Optional[str]],
+        groups: Dict[str, Tuple[int, int]],
+        sources: frozenset,
+    ):
+        self.version = version
+        self.matrix = matrix
+        self.values = values
+        self.groups = groups
+        self.sources = sources
+        self.built_at = time.time()
+
+    @property
+    def dim(self) -> int:
+        return int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0
+
+    def covers(self, source: str) -> bool:
+        """해당 소스 테이블이 적재되었는지 (False면 호출자가 DB 쿼리로 폴백)."""
+        return source in self.sources
+
+    def nearest(
+        self,
+        embedding: Sequence[float],
+        groups: Iterable[str],
+        min_similarity: float,
+        top_k: int = 1,
+    ) -> Optional[Dict[str, List[Tuple[Optional[str], float]]]]:
+        """
+        그룹별 유사도 상위 top_k (값, 유사도) — 유사도 내림차순, min_similarity 미만 제외.
+        차원이 맞지 않거나 쿼리 벡터 노름이 0이면 None(→ 호출자 폴백 / 매칭 없음과 구분).
+        """
+        q = np.asarray(embedding, dtype=np.float32)
+        if q.ndim != 1 or q.shape[0] != self.dim:
+            return None
+        norm = float(np.linalg.norm(q))
+        if not norm:
+            return {g: [] for g in groups}
+        sims = self.matrix @ (q / norm)
+        k = max(1, int(top_k))
+        out: Dict[str, List[Tuple[Optional[str], float]]] = {}
+        for g in groups:
+            span = self.groups.get(g)
+            if span is None:
+                out[g] = []
+                continue
+            start, end = span
+            seg = sims[start:end]
+            if k == 1:
+                order = [int(np.argmax(seg))] if seg.size else []
+            else:
+                order = np.argsort(-seg, kind="stable")[:k].tolist()
+            out[g] = [
+                (self.values[start + i], float(seg[i]))
+                for i in order
+                if seg[i] >= min_similarity
+            ]
+        return out
+
+    @classmethod
+    def build(cls, db, version: int) -> "LabelVectorIndex":
+        t0 = time.perf_counter()
+        rows: List[Tuple[str, Optional[str], np.ndarray]] = []
+        sources = set()
+        for source, sql in _SOURCE_SQL:
+            try:
+                fetched = db.execute(text(sql)).fetchall()
+            except Exception as e:
+                # 테이블 미생성 등: 이 소스만 제외 (해당 조회는 DB 폴백)
+                logger.debug("label vector index: %s load failed: %s", source, e)
+                try:
+                    db.rollback()
+                except Exception:
+                    pass
+                continue
+            sources.add(source)
+            for r in fetched:
+                vec = _parse_vector(r.embedding)
+                if vec is None or not vec.size:
+                    continue
+                norm = float(np.linalg.norm(vec))
+                if not norm:
+                    continue
+                rows.append((group_name(source, r.grp), r.value, vec / norm))
+
+        dims = {vec.shape[0] for _, _, vec in rows}
+        if len(dims) > 1:
+            # 차원이 섞여 있으면 가장 많은 차원만 사용 (다른 모델로 적재된 행 제외)
+            common = max(dims, key=lambda d: sum(1 for _, _, v in rows if v.shape[0] == d))
+            rows = [row for row in rows if row[2].shape[0] == common]
+        rows.sort(key=lambda row: row[0])
+
+        groups: Dict[str, Tuple[int, int]] = {}
+        for i, (g, _, _) in enumerate(rows):
+            start, _ = groups.get(g, (i, i))
+            groups[g] = (start, i + 1)
+        matrix = (
+            np.vstack([vec for _, _, vec in rows]).astype(np.float32, copy=False)
+            if rows
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+        index = cls(
+            version=version,
+            matrix=matrix,
+            values=[value for _, value, _ in rows],
+            groups=groups,
+            sources=frozenset(sources),
+        )
+        logger.info(
+            "Label vector index built: %d rows, %d groups, sources=%s in %.1fms (version=%s)",
+            len(rows), len(groups), sorted(sources), (time.perf_counter() - t0) * 1000, version,
+        )
+        return index
+
+
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_index: Optional[LabelVectorIndex] = None
+_building = False
+# invalidate_label_vector_index()마다 증가하는 라벨 세대 (인덱스 version과 다르면 재적재 대상)
+_generation = 0
+# 적재 실패 시 요청마다 재시도하지 않도록 최소 간격(초)
+_RETRY_AFTER_FAILURE = 30.0
+_last_failure = 0.0
+
+
+def _is_fresh(index: Optional[LabelVectorIndex]) -> bool:
+    if index is None or index.version != _generation:
+        return False
+    max_age = get_settings().LABEL_VECTOR_INDEX_MAX_AGE
+    return not max_age or (time.time() - index.built_at) < max_age
+
+
+def build_label_vector_index() -> Optional[LabelVectorIndex]:
+    """라벨 인덱스를 자체 세션으로 동기 적재 (백그라운드 스레드·기동 선적재용). 실패 시 이전 인덱스."""
+    global _index, _last_failure
+    with _build_lock:
+        if _is_fresh(_index):
+            return _index
+        from app.database import SessionLocal
+
+        generation = _generation
+        db = SessionLocal()
+        try:
+            built = LabelVectorIndex.build(db, generation)
+            if built.sources:
+                with _lock:
+                    _index = built
+            else:
+                _last_failure = time.time()
+        except Exception as e:
+            _last_failure = time.time()
+            logger.warning("Label vector index build failed: %s", e)
+        finally:
+            db.close()
+        return _index
+
+
+def _build_in_background() -> None:
+    global _building
+    try:
+        build_label_vector_index()
+    finally:
+        with _lock:
+            _building = False
+
+
+def get_label_vector_index() -> Optional[LabelVectorIndex]:
+    """
+    라벨 인덱스. 만료·무효화 시 이전 인덱스를 그대로 돌려주고 백그라운드 재적재를 건다
+    (요청 경로에서는 적재하지 않음 — 인덱스가 아직 없으면 None → 호출자는 pgvector 쿼리로 폴백).
+    """
+    global _building
+    if not get_settings().LABEL_VECTOR_INDEX_ENABLE:
+        return None
+    current = _index
+    if _is_fresh(current):
+        return current
+    with _lock:
+        if _building or time.time() - _last_failure < _RETRY_AFTER_FAILURE:
+            return current
+        _building = True
+    try:
+        threading.Thread(target=_build_in_background, name="label-vector-index-build", daemon=True).start()
+    except Exception as e:
+        with _lock:
+            _building = False
+        logger.warning("Label vector index build could not be scheduled: %s", e)
+    return current
+
+
+def invalidate_label_vector_index() -> None:
+    """intent_labels·dense_slot_labels·query_type_labels 적재 후 호출 — 다음 조회 때 백그라운드 재적재 (그동안 이전 인덱스)."""
+    global _generation, _last_failure
+    with _lock:
+        _generation += 1
+        _last_failure = 0.0
+
+
+def lookup_label_groups(
+    embedding: Sequence[float],
+    source: str,
+    grps: Iterable[Optional[str]],
+    min_similarity: float,
+    top_k: int = 1,
+) -> Optional[Dict[Optional[str], List[Tuple[Optional[str], float]]]]:
+    """
+    source 내 여러 그룹(kind·slot_type)을 한 번에 조회. {grp: [(값, 유사도), ...]}.
+    인덱스 비활성·미적재·소스 누락·차원 불일치면 None (호출자는 DB 쿼리로 폴백).
+    """
+    index = get_label_vector_index()
+    if index is None or not index.covers(source):
+        return None
+    grps = list(grps)
+    result = index.nearest(embedding, [group_name(source, g) for g in grps], min_similarity, top_k)
+    if result is None:
+        return None
+    return {g: result[group_name(source, g)] for g in grps}
+
+
+def prewarm_label_vector_index() -> bool:
+    """기동 시 1회 적재 — 첫 재질의부터 인덱스 경로를 쓰도록."""
+    if not get_settings().LABEL_VECTOR_INDEX_ENABLE:
+        return False
+    try:
+        return build_label_vector_index() is not None
+    except Exception:
+        logger.debug("label vector index prewarm failed", exc_info=True)
+        return False
@@ -4,13 +4,17 @@
 - data/major_normalize.json 은 Supabase major 테이블에서 export한
   major_name → major_category 매핑만 사용 (equals 규칙만 적용).
 - contains/prefix/regex 규칙은 사용하지 않음.
+- major_key / strip_major_suffix / major_ngrams 는 전공명 퍼지 매칭(app.services.major_index)과
+  공유하는 정규화 기본 함수. equals 별칭 표(load_major_aliases)도 같은 인덱스가 그대로 사용한다.
 """
 
 from __future__ import annotations
 
 import json
+import re
+import unicodedata
 from pathlib import Path
-from typing import Dict, List, TypedDict
+from typing import Dict, FrozenSet, List, TypedDict
 
 
 class MajorRule(TypedDict, total=False):
@@ -20,6 +24,31 @@ class MajorRule(TypedDict, total=False):
 
 
 _RULES_CACHE: List[MajorRule] | None = None
+_ALIAS_CACHE: Dict[str, str] | None = None
+
+# 전공명 끝의 학과 단위 접미사 (긴 것부터 — "공학부"가 "학부"보다 먼저)
+MAJOR_SUFFIXES = ("공학부", "학부", "학과", "전공", "계열")
+_KEY_STRIP_RE = re.compile(r"[\s\-_·ㆍ.,/()\[\]]+")
+
+
+def major_key(major: str) -> str:
+    """비교용 정규형: NFKC + 소문자 + 공백·구두점 제거 ("컴퓨터 공학과" == "컴퓨터공학과")."""
+    text = unicodedata.normalize("NFKC", major or "").lower()
+    return _KEY_STRIP_RE.sub("", text)
+
+
+def strip_major_suffix(key: str) -> str:
+    """학부/학과/전공 등 접미사 1개 제거. 제거 후 1글자 이하가 되면 원문 유지."""
+    for suffix in MAJOR_SUFFIXES:
+        if key.endswith(suffix) and len(key) - len(suffix) >= 2:
+            return key[: -len(suffix)]
+    return key
+
+
+def major_ngrams(key: str) -> FrozenSet[str]:
+    """양끝 공백 패딩 문자 bigram 집합 (pg_trgm 과 같은 방식, 한글 전공명 길이에 맞춰 n=2)."""
+    padded = f" {key} "
+    return frozenset(padded[i : i + 2] for i in range(len(padded) - 1))
 
 
 def _rules_path() -> Path:
@@ -62,6 +91,17 @@ def _load_rules() -> List[MajorRule]:
     return _RULES_CACHE
 
 
+def load_major_aliases() -> Dict[str, str]:
+    """equals 규칙을 pattern → normalized dict로 (규칙 순서상 첫 항목 우선)."""
+    global _ALIAS_CACHE
+    if _ALIAS_CACHE is None:
+        aliases: Dict[str, str] = {}
+        for rule in _load_rules():
+            aliases.setdefault(rule["pattern"], rule["normalized"])
+        _ALIAS_CACHE = aliases
+    return _ALIAS_CACHE
+
+
 def normalize_major(major: str) -> str:
     """
     전공 문자열을 Supabase major 테이블 기준으로 정규화 (major_name → major_category).
@@ -71,9 +111,5 @@ def normalize_major(major: str) -> str:
     if not text:
         return text
 
-    rules = _load_rules()
-    for rule in rules:
-        if text == rule["pattern"]:
-            return rule["normalized"]
-    return text
+    return load_major_aliases().get(text, text)
 
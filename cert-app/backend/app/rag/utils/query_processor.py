@@ -8,16 +8,19 @@ BM25 쿼리 전처리 및 확장.
 - 다른 방식: RAG_BM25_BASELINE_APPEND_ENABLE 시 비 cert-centric 추천 질의에 베이스라인 용어 추가
 - IT·디지털 집중 신호가 없는 직종 쿼리(관광, 간호 등)일 때는 IT 베이스라인 미추가
 """
+import os
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.rag.request_memo import request_memoized
 
 # 비(디지털 집중) 직종 토큰: data/domain_tokens.json 기반. BM25_BASELINE_MODE=1이면 항상 IT 베이스라인.
-def _get_bm25_non_it_tokens() -> frozenset:
-    import os
+def _has_bm25_non_it_token(text: str) -> bool:
     if os.environ.get("BM25_BASELINE_MODE") == "1":
-        return frozenset()
-    from app.rag.utils.domain_tokens import get_non_it_tokens
-    return get_non_it_tokens()
+        return False
+    from app.rag.utils.domain_tokens import contains_non_it_token
+    return contains_non_it_token(text)
 
 # 자격증 도메인 동의어/약어 사전
 SYNONYM_DICT = {
@@ -243,6 +246,50 @@ for key, value in RECOMMENDATION_QUERY_MAP.items():
     _NORMALIZED_RECOM[k] = value.split()
 
 
+class _PhraseTrie:
+    """
+    공백 제거 키(동의어·추천 키) 문자 트라이. 토큰 i부터 토큰을 이어 붙이며 내려가고, 토큰 경계에서만 키 완성 여부를 본다.
+    질의 토큰을 한 번 훑어 "연속 토큰 윈도(공백 제거) == 키"인 구간을 모두 찾는다 (겹치는 구간 포함).
+    """
+
+    __slots__ = ("_root",)
+    _END = None  # 노드 dict에서 키 완성 표시 (문자 키와 충돌하지 않음)
+
+    def __init__(self, keys: Iterable[str]):
+        self._root: Dict[Any, Any] = {}
+        for key in keys:
+            if not key:
+                continue
+            node = self._root
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[self._END] = key
+
+    def spans(self, tokens: List[str], max_tokens: int) -> List[Tuple[int, int, str]]:
+        """(시작 토큰, 끝 토큰(미포함), 키). 시작 위치 → 길이 순."""
+        out: List[Tuple[int, int, str]] = []
+        root, end_mark, n = self._root, self._END, len(tokens)
+        for i in range(n):
+            node = root
+            for j in range(i, min(i + max_tokens, n)):
+                for ch in tokens[j]:
+                    node = node.get(ch)
+                    if node is None:
+                        break
+                if node is None:
+                    break
+                key = node.get(end_mark)
+                if key is not None:
+                    out.append((i, j + 1, key))
+        return out
+
+
+_SYNONYM_TRIE = _PhraseTrie(_NORMALIZED_SYNONYMS)
+_RECO_TRIE = _PhraseTrie(_NORMALIZED_RECOM)
+# 정규화 질의 단위 확장 결과 캐시 크기
+_EXPANSION_CACHE_SIZE = 4096
+
+
 def _skip_generic_reco_job_expansion(tokens: List[str]) -> bool:
     """
     RECOMMENDATION_QUERY_MAP['직무']는 '개발 정보처리 데이터 … IT' 범용어를 붙인다.
@@ -354,9 +401,10 @@ RECOMMENDATION_QUERY_MAP_META: Dict[str, Dict[str, Any]] = {
 }
 
 
+@lru_cache(maxsize=_EXPANSION_CACHE_SIZE)
 def normalize_query(query: str) -> str:
     """
-    쿼리 정규화:
+    쿼리 정규화 (같은 원문은 캐시):
     - 소문자 변환
     - 특수문자(/, -, _, ., ,) → 공백
     - 다중 공백 정리
@@ -384,50 +432,35 @@ def normalize_query(query: str) -> str:
 def expand_query(query: str, max_expansions: int = 6) -> List[str]:
     """
     동의어/약어 확장:
-    - 쿼리의 각 토큰에 대해 동의어 사전 검색
+    - 쿼리의 각 토큰, 이어서 연속 2~4 토큰 구간을 동의어 사전(트라이)에서 검색
+    - 매칭 구간만 동의어로 바꾼 질의를 추가 (토큰 경계 기준)
     - 최대 max_expansions개까지만 확장 (과도한 확장 방지)
     
-    반환: [원본 쿼리, 확장 쿼리1, 확장 쿼리2, ...]
+    반환: [원본 쿼리, 확장 쿼리1, 확장 쿼리2, ...] (정규화 질의 단위 캐시)
     """
-    normalized = normalize_query(query)
-    tokens = normalized.split()
-    
-    # 토큰별 확장 수집
-    all_expansions: Set[str] = {normalized}
-    
-    for token in tokens:
-        token_normalized = token.replace(" ", "")
-        if token_normalized in _NORMALIZED_SYNONYMS:
-            for syn in _NORMALIZED_SYNONYMS[token_normalized]:
-                if syn != token:
-                    # 원본 쿼리에서 해당 토큰을 동의어로 대체
-                    expanded = normalized.replace(token, syn)
-                    all_expansions.add(expanded)
-                    if len(all_expansions) >= max_expansions:
-                        break
-        if len(all_expansions) >= max_expansions:
-            break
-    
-    # 연속 토큰 매칭 (예: "정보 처리 기사" → "정처기")
-    for i in range(len(tokens)):
-        for j in range(i + 2, min(i + 5, len(tokens) + 1)):
-            phrase = " ".join(tokens[i:j])
-            phrase_normalized = phrase.replace(" ", "")
-            if phrase_normalized in _NORMALIZED_SYNONYMS:
-                for syn in _NORMALIZED_SYNONYMS[phrase_normalized]:
-                    if syn != phrase:
-                        expanded = normalized.replace(phrase, syn)
-                        all_expansions.add(expanded)
-                        if len(all_expansions) >= max_expansions:
-                            break
-            if len(all_expansions) >= max_expansions:
-                break
-        if len(all_expansions) >= max_expansions:
-            break
-    
-    return list(all_expansions)[:max_expansions]
+    return list(_expand_query_cached(normalize_query(query), max_expansions))
 
 
+@lru_cache(maxsize=_EXPANSION_CACHE_SIZE)
+def _expand_query_cached(normalized: str, max_expansions: int) -> Tuple[str, ...]:
+    tokens = normalized.split()
+    all_expansions: Dict[str, None] = {normalized: None}
+    if len(all_expansions) >= max_expansions:
+        return tuple(all_expansions)[:max_expansions]
+    spans = _SYNONYM_TRIE.spans(tokens, 4)
+    # 단일 토큰 먼저, 그다음 연속 토큰 구간 (예: "정보 처리 기사" → "정처기")
+    ordered = [sp for sp in spans if sp[1] - sp[0] == 1] + [sp for sp in spans if sp[1] - sp[0] > 1]
+    for i, j, key in ordered:
+        phrase = " ".join(tokens[i:j])
+        for syn in _NORMALIZED_SYNONYMS[key]:
+            if syn != phrase:
+                all_expansions[" ".join(tokens[:i] + [syn] + tokens[j:])] = None
+                if len(all_expansions) >= max_expansions:
+                    return tuple(all_expansions)[:max_expansions]
+    return tuple(all_expansions)[:max_expansions]
+
+
+@request_memoized("expand_query_single_string")
 def expand_query_single_string(
     query: str,
     max_extra_terms: int = 8,
@@ -443,112 +476,116 @@ def expand_query_single_string(
     Query type별 expansion 원칙 (RECOMMENDATION_BM25.md):
     - cert_name_included, roadmap, comparison: CERT_CENTRIC_QUERY_TYPES. RECO_KEYS_SKIP으로 목적/전공/직무 스킵, name/alias·companion 유지.
     - major+job, purpose_only, keyword, natural, mixed: 전부 확장(스킵 없음).
+
+    결과는 (정규화 질의, query_type, 옵션, 베이스라인 설정) 단위로 캐시.
     """
     normalized = normalize_query(query)
     if not normalized:
         return query.strip()
+    baseline_append = medium_baseline = False
+    try:
+        from app.rag.config import get_rag_settings
+        s = get_rag_settings()
+        baseline_append = bool(s.RAG_BM25_BASELINE_APPEND_ENABLE)
+        medium_baseline = bool(getattr(s, "RAG_BM25_MEDIUM_BASELINE_ENABLE", False))
+    except Exception:
+        pass
+    return _expand_query_single_string_cached(
+        normalized,
+        max_extra_terms,
+        for_recommendation,
+        query_type,
+        baseline_append,
+        medium_baseline,
+        os.environ.get("BM25_BASELINE_MODE") == "1",
+    )
+
+
+@lru_cache(maxsize=_EXPANSION_CACHE_SIZE)
+def _expand_query_single_string_cached(
+    normalized: str,
+    max_extra_terms: int,
+    for_recommendation: bool,
+    query_type: Optional[str],
+    baseline_append: bool,
+    medium_baseline: bool,
+    baseline_mode: bool,
+) -> str:
     tokens = normalized.split()
     seen: Set[str] = set(tokens)
     extra: List[str] = []
+    domain_focused: Optional[bool] = None
+
+    def _domain_focused() -> bool:
+        nonlocal domain_focused
+        if domain_focused is None:
+            domain_focused = _skip_generic_reco_job_expansion(tokens)
+        return domain_focused
+
+    def _append(terms: Iterable[str]) -> None:
+        for term in terms:
+            if term and term.lower() not in seen:
+                seen.add(term.lower())
+                extra.append(term)
 
     # cert-centric(cert_name_included, roadmap, comparison): 목적/전공/직무 과확장 스킵, name/alias·companion 유지.
     skip_reco_keys = RECO_KEYS_SKIP_FOR_CERT_NAME if query_type in CERT_CENTRIC_QUERY_TYPES else set()
 
     # 1) 추천형: 직무/전공/목적 키워드 추가 (질의 재작성). cert_name_included면 job/major/purpose 키 스킵.
+    #    1-gram → 2-gram → 3-gram 순 (같은 길이 안에서는 위치 순)
     if for_recommendation and _NORMALIZED_RECOM:
-        for token in tokens:
-            key = _norm_reco_key(token)
+        spans = sorted(_RECO_TRIE.spans(tokens, 3), key=lambda sp: (sp[1] - sp[0], sp[0]))
+        for i, j, key in spans:
             if key in skip_reco_keys:
                 continue
-            if key == "직무" and _skip_generic_reco_job_expansion(tokens):
-                continue
-            if key in _NORMALIZED_RECOM:
-                for term in _NORMALIZED_RECOM[key]:
-                    if term and term.lower() not in seen:
-                        seen.add(term.lower())
-                        extra.append(term)
-        for i in range(len(tokens) - 1):
-            phrase_norm = _norm_reco_key(tokens[i] + tokens[i + 1])
-            if phrase_norm in skip_reco_keys:
+            if j - i == 1:
+                if key == "직무" and _domain_focused():
+                    continue
+            elif key in _RECO_PHRASE_SKIP_WHEN_DOMAIN_FOCUSED and _domain_focused():
                 continue
-            if phrase_norm in _RECO_PHRASE_SKIP_WHEN_DOMAIN_FOCUSED and _skip_generic_reco_job_expansion(tokens):
-                continue
-            if phrase_norm in _NORMALIZED_RECOM:
-                for term in _NORMALIZED_RECOM[phrase_norm]:
-                    if term and term.lower() not in seen:
-                        seen.add(term.lower())
-                        extra.append(term)
-        for i in range(len(tokens) - 2):
-            phrase_norm = _norm_reco_key(tokens[i] + tokens[i + 1] + tokens[i + 2])
-            if phrase_norm in skip_reco_keys:
-                continue
-            if phrase_norm in _RECO_PHRASE_SKIP_WHEN_DOMAIN_FOCUSED and _skip_generic_reco_job_expansion(tokens):
-                continue
-            if phrase_norm in _NORMALIZED_RECOM:
-                for term in _NORMALIZED_RECOM[phrase_norm]:
-                    if term and term.lower() not in seen:
-                        seen.add(term.lower())
-                        extra.append(term)
+            _append(_NORMALIZED_RECOM[key])
 
     # 2) 기존 자격증/직무 동의어 (exclusion: "컴활 말고" 시 컴활→컴퓨터활용능력 추가 생략)
     skip_synonym_tokens: Set[str] = set()
     if "말고" in normalized and "컴활" in tokens:
         skip_synonym_tokens.add("컴활")
-    for token in tokens:
+    for i, _j, key in _SYNONYM_TRIE.spans(tokens, 1):
         if len(extra) >= max_extra_terms * 2:
             break
-        key = token.replace(" ", "").lower()
         if key in skip_synonym_tokens:
             continue
-        if key in _NORMALIZED_SYNONYMS:
-            for syn in _NORMALIZED_SYNONYMS[key]:
-                term = syn.strip()
-                if term and term.lower() not in seen:
-                    seen.add(term.lower())
-                    extra.append(term)
+        _append(syn.strip() for syn in _NORMALIZED_SYNONYMS[key])
 
     # 3) 다른 방식: 비 cert-centric 추천 질의에 베이스라인 용어 추가 (IT·디지털 집중 신호 없으면 스킵)
+    has_non_it: Optional[bool] = None
     try:
-        from app.rag.config import get_rag_settings
-        s = get_rag_settings()
-        has_non_it = any(t in normalized for t in _get_bm25_non_it_tokens())
+        has_non_it = _has_bm25_non_it_token(normalized)
         if (
-            s.RAG_BM25_BASELINE_APPEND_ENABLE
+            baseline_append
             and for_recommendation
             and query_type not in CERT_CENTRIC_QUERY_TYPES
             and not has_non_it
-            and not _skip_generic_reco_job_expansion(tokens)
+            and not _domain_focused()
         ):
             # 8개: S@4/Hit@4/MRR 최고점. 관광·언어 등 IT·디지털 집중 신호 없는 질의에는 IT 베이스라인 미추가.
-            _baseline_terms = ["자격증", "정보처리", "SQLD", "ADsP", "IT", "취업", "실무", "로드맵"]
-            for term in _baseline_terms:
-                if term and term.lower() not in seen:
-                    seen.add(term.lower())
-                    extra.append(term)
+            _append(["자격증", "정보처리", "SQLD", "ADsP", "IT", "취업", "실무", "로드맵"])
             # 확장: 4~7단어 중간 길이일 때 직무·정보처리기사 추가 (기본 OFF)
-            if getattr(s, "RAG_BM25_MEDIUM_BASELINE_ENABLE", False) and 4 <= len(tokens) <= 7:
-                _medium_terms = ["직무", "정보처리기사"]
-                for term in _medium_terms:
-                    if term and term.lower() not in seen:
-                        seen.add(term.lower())
-                        extra.append(term)
+            if medium_baseline and 4 <= len(tokens) <= 7:
+                _append(["직무", "정보처리기사"])
     except Exception:
         pass
 
     # 4) IT·디지털 집중 신호 없는 질의: 도메인별 BM25 확장 (BM25_BASELINE_MODE=1이면 스킵)
     try:
-        import os
-        if os.environ.get("BM25_BASELINE_MODE") != "1":
-            has_non_it = any(t in normalized for t in _get_bm25_non_it_tokens())
+        if not baseline_mode:
+            if has_non_it is None:
+                has_non_it = _has_bm25_non_it_token(normalized)
             if has_non_it and for_recommendation:
                 from app.rag.utils.domain_tokens import get_non_it_bm25_expansion
                 expansion_map = get_non_it_bm25_expansion()
                 for key, terms in expansion_map.items():
                     if key in normalized:
-                        for term in terms:
-                            if term and term.lower() not in seen:
-                                seen.add(term.lower())
-                                extra.append(term)
+                        _append(terms)
                         if len(extra) >= max_extra_terms * 2:
                             break
     except Exception:
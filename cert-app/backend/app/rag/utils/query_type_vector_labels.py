@@ -64,6 +64,20 @@ def lookup_query_type_with_vector(
         sim = 0.99
     max_distance = 1.0 - sim
 
+    # 메모리 라벨 인덱스 (미적재·비활성이면 아래 DB 쿼리)
+    try:
+        from app.rag.utils.label_vector_index import SOURCE_QUERY_TYPE, lookup_label_groups
+
+        found = lookup_label_groups(embedding, SOURCE_QUERY_TYPE, [None], sim)
+    except Exception:
+        logger.debug("query_type_vector_labels: label index lookup failed", exc_info=True)
+        found = None
+    if found is not None:
+        hits = found[None]
+        if not hits or not hits[0][0]:
+            return None
+        return str(hits[0][0])
+
     db = SessionLocal()
     try:
         sql = text(
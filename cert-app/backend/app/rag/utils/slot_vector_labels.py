@@ -7,7 +7,7 @@ dense_slot_labels 테이블 기반 슬롯 벡터 라벨 조회.
 """
 
 import logging
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy import text
 
@@ -21,6 +21,9 @@ def _is_enabled() -> bool:
     return bool(getattr(get_rag_settings(), "RAG_DENSE_SLOT_VECTOR_FALLBACK_ENABLE", False))
 
 
+_VALID_SLOT_TYPES = frozenset({"domain", "difficulty", "job", "purpose", "major"})
+
+
 def lookup_slot_label_with_vector(
     query: str,
     slot_type: str,
@@ -35,16 +38,38 @@ def lookup_slot_label_with_vector(
     - slot_type: 'domain' | 'difficulty' | 'job' | 'purpose' | 'major'
     - query_embedding: 이미 계산된 쿼리 벡터 (재질의 파이프라인에서 OpenAI 중복 호출 방지)
     """
+    return lookup_slot_labels_with_vector(
+        query,
+        [slot_type],
+        top_k=top_k,
+        min_similarity=min_similarity,
+        query_embedding=query_embedding,
+    ).get(slot_type)
+
+
+def lookup_slot_labels_with_vector(
+    query: str,
+    slot_types: Iterable[str],
+    top_k: int = 1,
+    min_similarity: Optional[float] = None,
+    query_embedding: Optional[List[float]] = None,
+    errors: Optional[List[str]] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    여러 slot_type을 한 번에 조회 → {slot_type: label_text 또는 None}.
+    메모리 라벨 인덱스가 있으면 행렬곱 1회, 없으면 slot_type별 pgvector 쿼리.
+    errors를 전달하면 임베딩·DB 조회 실패 시 사유를 추가한다 (실패한 slot_type도 None이므로 구분용).
+    """
     if not _is_enabled():
-        return None
+        return {}
 
-    valid = {"domain", "difficulty", "job", "purpose", "major"}
-    if slot_type not in valid:
-        return None
+    types = [t for t in dict.fromkeys(slot_types) if t in _VALID_SLOT_TYPES]
+    if not types:
+        return {}
 
     q = (query or "").strip()
     if not q and not query_embedding:
-        return None
+        return {}
 
     embedding: Optional[List[float]] = query_embedding
     if embedding is None or not isinstance(embedding, list) or not embedding:
@@ -52,16 +77,20 @@ def lookup_slot_label_with_vector(
             from app.utils.ai import get_embedding
         except Exception:
             logger.debug("slot_vector_labels: get_embedding import failed", exc_info=True)
-            return None
+            if errors is not None:
+                errors.append("slot:embedding")
+            return {}
 
         try:
             embedding = get_embedding(q)
         except Exception:
             logger.debug("slot_vector_labels: get_embedding failed", exc_info=True)
-            return None
+            if errors is not None:
+                errors.append("slot:embedding")
+            return {}
 
     if not isinstance(embedding, list) or not embedding:
-        return None
+        return {}
 
     from app.rag.config import get_rag_settings
     _rag = get_rag_settings()
@@ -73,37 +102,59 @@ def lookup_slot_label_with_vector(
     sim_threshold = max(0.0, min(0.99, sim_threshold))
     max_distance = 1.0 - sim_threshold
 
+    try:
+        from app.rag.utils.label_vector_index import SOURCE_SLOT, lookup_label_groups
+
+        found = lookup_label_groups(embedding, SOURCE_SLOT, types, sim_threshold, max(1, top_k))
+    except Exception:
+        logger.debug("slot_vector_labels: label index lookup failed", exc_info=True)
+        found = None
+    if found is not None:
+        return {t: _label_text(found[t][0][0] if found[t] else None) for t in types}
+
+    out: Dict[str, Optional[str]] = {}
     db = SessionLocal()
     try:
-        sql = text(
-            """
-            SELECT label_text,
-                   (1 - (embedding <=> :embedding)) AS similarity
-            FROM dense_slot_labels
-            WHERE slot_type = :slot_type
-              AND active = true
-              AND (embedding <=> :embedding) <= :max_distance
-            ORDER BY embedding <=> :embedding
-            LIMIT :limit
-            """
-        )
-        rows = db.execute(
-            sql,
-            {
-                "embedding": str(embedding),
-                "slot_type": slot_type,
-                "max_distance": max_distance,
-                "limit": max(1, top_k),
-            },
-        ).fetchall()
-    except Exception as e:
-        logger.debug("slot_vector_labels: DB lookup failed: %s", e, exc_info=True)
-        return None
+        for slot_type in types:
+            try:
+                rows = db.execute(
+                    _SLOT_LABEL_SQL,
+                    {
+                        "embedding": str(embedding),
+                        "slot_type": slot_type,
+                        "max_distance": max_distance,
+                        "limit": max(1, top_k),
+                    },
+                ).fetchall()
+            except Exception as e:
+                logger.debug("slot_vector_labels: DB lookup failed: %s", e, exc_info=True)
+                try:
+                    db.rollback()
+                except Exception:
+                    pass
+                if errors is not None:
+                    errors.append(f"slot:db:{slot_type}")
+                out[slot_type] = None
+                continue
+            out[slot_type] = _label_text(getattr(rows[0], "label_text", None) if rows else None)
     finally:
         db.close()  # 세션 종료 시 ROLLBACK 로그는 정상(미커밋 트랜잭션). 조회 실패 시 위 except에서 None 반환. pgvector가 embedding을 문자열로 비교해 실패하면 예외 발생 가능 → Supabase에서는 CAST(:embedding AS vector) 등 확인.
+    return out
+
+
+_SLOT_LABEL_SQL = text(
+    """
+    SELECT label_text,
+           (1 - (embedding <=> :embedding)) AS similarity
+    FROM dense_slot_labels
+    WHERE slot_type = :slot_type
+      AND active = true
+      AND (embedding <=> :embedding) <= :max_distance
+    ORDER BY embedding <=> :embedding
+    LIMIT :limit
+    """
+)
+
 
-    if not rows:
-        return None
-    r = rows[0]
-    label_text = getattr(r, "label_text", None)
+def _label_text(label_text) -> Optional[str]:
     return str(label_text).strip() if label_text else None
@@ -1,9 +1,11 @@
+import asyncio
 import orjson
 import hashlib
 import logging
 from typing import Optional, Any, List
-from datetime import datetime
+import time
 import redis
+import redis.asyncio as aioredis
 from functools import wraps
 import json
 
@@ -13,11 +15,34 @@ settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+# 레이트 리밋: GCRA (Generic Cell Rate Algorithm). 키당 값 1개(TAT, 이론적 도착 시각 ms)만 저장 → 클라이언트당 O(1) 메모리.
+# 판정·갱신·만료를 스크립트 1회(EVALSHA)로 원자 처리. 거부된 요청은 상태를 바꾸지 않는다.
+# ARGV: interval_ms(= window/limit), window_ms(버스트 허용 = limit개), now_ms
+# 반환: {allowed(0/1), remaining, 초(허용: 완전 회복까지 / 거부: 재시도 가능까지)}
+RATE_LIMIT_LUA = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if allow_at > now then
+  return {0, 0, math.ceil((allow_at - now) / 1000)}
+end
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((window - (new_tat - now)) / interval), math.ceil((new_tat - now) / 1000)}
+"""
+
+
 class RedisClient:
     """Redis client wrapper for caching and rate limiting."""
     
     def __init__(self):
         self.client: Optional[redis.Redis] = None
+        self._async_client = None
+        self._async_loop = None
+        self._async_rate_limit_script = None
         self._connect()
     
     def _connect(self):
@@ -39,6 +64,7 @@ class RedisClient:
                 health_check_interval=30,
             )
             self.client.ping()
+            self._rate_limit_script = self.client.register_script(RATE_LIMIT_LUA)
             logger.info("Redis connection established")
         except Exception as e:
             logger.error(f"Redis connection failed: {e}. Performance may be degraded.")
@@ -59,7 +85,8 @@ class RedisClient:
         """Serialize value to JSON string using high-performance orjson."""
         try:
             # orjson returns bytes, we decode to str for redis-py (if decode_responses=True)
-            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_DATETIME).decode()
+            # datetime/date/UUID는 orjson이 기본 지원. 그 외 타입은 str()로 대체.
+            return orjson.dumps(value, default=str).decode()
         except Exception:
             return str(value)
     
@@ -107,6 +134,30 @@ class RedisClient:
             logger.warning("Redis set error key=%s type=%s: %s", key, type(e).__name__, e, exc_info=False)
             return False
     
+    def get_raw(self, key: str) -> Optional[str]:
+        """Get raw (already serialized) value without JSON decoding."""
+        if not self.client:
+            return None
+        try:
+            return self.client.get(key)
+        except Exception as e:
+            logger.warning("Redis get_raw error key=%s type=%s: %s", key, type(e).__name__, e, exc_info=False)
+            return None
+
+    def set_raw(self, key: str, value: str | bytes, ttl: Optional[int] = None) -> bool:
+        """Set pre-serialized value as-is (no JSON encoding)."""
+        if not self.client:
+            return False
+        try:
+            if ttl:
+                self.client.setex(key, ttl, value)
+            else:
+                self.client.set(key, value)
+            return True
+        except Exception as e:
+            logger.warning("Redis set_raw error key=%s type=%s: %s", key, type(e).__name__, e, exc_info=False)
+            return False
+
     def delete(self, key: str) -> bool:
         """Delete key from cache."""
         if not self.client:
@@ -143,6 +194,16 @@ class RedisClient:
     
     # ============== Rate Limiting ==============
     
+    def _rate_limit_args(self, max_requests: int, window_seconds: int) -> list:
+        window_ms = max(1, int(window_seconds * 1000))
+        interval_ms = window_ms / max(1, max_requests)
+        return [interval_ms, window_ms, int(time.time() * 1000)]
+
+    @staticmethod
+    def _rate_limit_result(res) -> tuple[bool, int, int]:
+        allowed, remaining, seconds = (int(x) for x in res)
+        return bool(allowed), remaining, seconds
+
     def check_rate_limit(
         self, 
         key: str, 
@@ -150,7 +211,7 @@ class RedisClient:
         window_seconds: int
     ) -> tuple[bool, int, int]:
         """
-        Check if request is within rate limit.
+        Check if request is within rate limit (GCRA, EVALSHA 1회).
         
         Returns:
             tuple: (allowed, remaining, reset_after)
@@ -162,36 +223,56 @@ class RedisClient:
             return True, max_requests, 0
 
         try:
-            pipe = self.client.pipeline()
-            now = datetime.utcnow().timestamp()
-            window_start = now - window_seconds
-            
-            # Remove old entries
-            pipe.zremrangebyscore(key, 0, window_start)
-            
-            # Count current entries
-            pipe.zcard(key)
-            
-            # Add current request
-            pipe.zadd(key, {str(now): now})
-            
-            # Set expiry on the key
-            pipe.expire(key, window_seconds)
-            
-            results = pipe.execute()
-            current_count = results[1]
-            
-            if current_count > max_requests:
-                # Remove the request we just added
-                self.client.zrem(key, str(now))
-                reset_after = int(window_seconds - (now - window_start))
-                return False, 0, reset_after
-            
-            remaining = max_requests - current_count
-            reset_after = window_seconds
-            
-            return True, remaining, reset_after
-            
+            res = self._rate_limit_script(
+                keys=[key], args=self._rate_limit_args(max_requests, window_seconds)
+            )
+            return self._rate_limit_result(res)
+        except Exception as e:
+            logger.error(f"Rate limit check error: {e}")
+            return True, max_requests, 0
+
+    def _get_async_client(self):
+        """레이트 리밋 전용 redis.asyncio 클라이언트 (이벤트 루프별로 생성 — 연결은 생성한 루프에 묶인다)."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_loop = loop
+            self._async_client = aioredis.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=getattr(settings, "REDIS_SOCKET_TIMEOUT", 10),
+            )
+            self._async_rate_limit_script = self._async_client.register_script(RATE_LIMIT_LUA)
+        return self._async_client
+
+    async def close_async_client(self) -> None:
+        """레이트 리밋용 async 클라이언트 연결 풀 종료 (앱 shutdown에서 생성한 루프 위에서 호출)."""
+        client = self._async_client
+        if client is None:
+            return
+        self._async_client = None
+        self._async_loop = None
+        self._async_rate_limit_script = None
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("Async Redis client close failed: %s", e)
+
+    async def check_rate_limit_async(
+        self,
+        key: str,
+        max_requests: int,
+        window_seconds: int,
+    ) -> tuple[bool, int, int]:
+        """check_rate_limit의 async 버전 (스레드풀을 거치지 않고 이벤트 루프에서 EVALSHA)."""
+        if not self.client:
+            return True, max_requests, 0
+        try:
+            self._get_async_client()
+            res = await self._async_rate_limit_script(
+                keys=[key], args=self._rate_limit_args(max_requests, window_seconds)
+            )
+            return self._rate_limit_result(res)
         except Exception as e:
             logger.error(f"Rate limit check error: {e}")
             return True, max_requests, 0
@@ -211,6 +292,55 @@ class RedisClient:
             logger.error(f"Redis zincrby error: {e}")
             return False
             
+    def flush_trending(
+        self,
+        key: str,
+        increments: dict[str, float],
+        max_members: int = 100,
+        decay_factor: Optional[float] = None,
+    ) -> bool:
+        """
+        누적된 trending 증분을 한 번의 파이프라인으로 반영.
+        decay_factor가 주어지면 기존 점수 전체에 먼저 곱한 뒤(ZUNIONSTORE WEIGHTS) 증분을 더한다.
+        """
+        if not self.client:
+            return False
+        if not increments and decay_factor is None:
+            return True
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            if decay_factor is not None:
+                pipe.zunionstore(key, {key: decay_factor})
+            for member, amount in increments.items():
+                pipe.zincrby(key, amount, member)
+            # Keep only top N to save memory
+            pipe.zremrangebyrank(key, 0, -(max_members + 1))
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis trending flush error: {e}")
+            return False
+
+    def try_acquire_lock(self, key: str, ttl_seconds: int) -> bool:
+        """SET NX EX 기반 경량 락. 워커 간 주기 작업을 1회만 수행할 때 사용 (기본은 TTL 만료, 실패 시 release_lock)."""
+        if not self.client:
+            return False
+        try:
+            return bool(self.client.set(key, "1", nx=True, ex=max(1, int(ttl_seconds))))
+        except Exception as e:
+            logger.warning("Redis lock error key=%s: %s", key, e)
+            return False
+
+    def release_lock(self, key: str) -> bool:
+        """try_acquire_lock으로 잡은 락을 TTL 전에 해제 (작업 실패 시 다음 시도가 다시 잡을 수 있도록)."""
+        if not self.client:
+            return False
+        try:
+            return bool(self.client.delete(key))
+        except Exception as e:
+            logger.warning("Redis lock release error key=%s: %s", key, e)
+            return False
+
     def get_trending(self, key: str, top_n: int = 10) -> List[tuple[str, float]]:
         """Get top members from a sorted set with scores."""
         if not self.client:
@@ -266,6 +396,23 @@ class RedisClient:
             logger.error(f"Redis publish error: {e}")
             return 0
 
+    # ============== Stream Operations ==============
+
+    def xadd(self, stream: str, message: Any, maxlen: Optional[int] = None) -> Optional[str]:
+        """Append a message to a stream (field 'data' = serialized JSON). maxlen은 근사(~) 트림."""
+        if not self.client:
+            return None
+        try:
+            return self.client.xadd(
+                stream,
+                {"data": self._serialize(message)},
+                maxlen=maxlen,
+                approximate=True,
+            )
+        except Exception as e:
+            logger.error(f"Redis xadd error: {e}")
+            return None
+
     def get_pubsub(self):
         """Get a pubsub instance."""
         if not self.client:
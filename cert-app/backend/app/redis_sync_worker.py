@@ -1,41 +1,183 @@
 import logging
+import os
+import socket
+import time
 import orjson
+import redis
 from app.redis_client import redis_client
+from app.services.fast_sync_service import DIGEST_KEY
+from app.utils.stream_producer import CERT_UPDATES_STREAM, CERT_UPDATES_GROUP
+from app.utils.response_cache import CERT_DETAIL_CACHE_KEY
+from app.utils.catalog_version import bump_catalog_version
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("redis_worker")
 
-def start_redis_sync_worker():
+# 워커 처리량 지표 (다른 프로세스/admin API에서 조회할 수 있도록 Redis Hash에도 기록)
+METRICS_KEY = "cert_updates:worker_metrics"
+# 죽은 consumer가 ACK하지 못한 메시지를 넘겨받기 위한 최소 유휴 시간
+CLAIM_MIN_IDLE_MS = 60_000
+
+_metrics = {
+    "batches": 0,
+    "applied": 0,
+    "acked": 0,
+    "errors": 0,
+    "last_batch_size": 0,
+    "last_apply_ms": 0.0,
+    "last_entry_id": "",
+    "updated_at": 0.0,
+}
+
+
+def _ensure_group(client) -> None:
+    """Consumer group 생성 (스트림이 없으면 MKSTREAM). 이미 있으면 무시."""
+    try:
+        client.xgroup_create(CERT_UPDATES_STREAM, CERT_UPDATES_GROUP, id="0", mkstream=True)
+        logger.info(f"Created consumer group {CERT_UPDATES_GROUP} on {CERT_UPDATES_STREAM}.")
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _invalidate_list_caches(client) -> int:
+    """certs:list:* 무효화. KEYS 대신 SCAN으로 순회해 Redis 블로킹 방지."""
+    deleted = 0
+    batch = []
+    for key in client.scan_iter(match="certs:list:*", count=500):
+        batch.append(key)
+        if len(batch) >= 500:
+            deleted += client.unlink(*batch)
+            batch = []
+    if batch:
+        deleted += client.unlink(*batch)
+    return deleted
+
+
+def apply_batch(client, entries) -> int:
+    """
+    XREADGROUP 배치 1개를 파이프라인 1회로 반영한 뒤 ACK.
+    fastcert:{id} 갱신 + digest 제거(다음 FastSync에서 재비교) + certs:detail:{id} 무효화,
+    배치에 갱신이 하나라도 있으면 certs:list:* 도 무효화하고 카탈로그 버전을 1회 올린다
+    (이전 ETag의 If-None-Match가 304를 받지 않도록). 반영한 자격증 수 반환.
+    """
+    pipe = client.pipeline(transaction=False)
+    entry_ids = []
+    touched = 0
+    for entry_id, fields in entries:
+        entry_ids.append(entry_id)
+        try:
+            data = orjson.loads((fields or {}).get("data") or "null")
+        except orjson.JSONDecodeError:
+            logger.error(f"Dropping malformed stream entry {entry_id}")
+            continue
+        cert_id = data.get("qual_id") if isinstance(data, dict) else None
+        if not cert_id:
+            continue
+        # fastcert format for ultra-low latency API
+        payload = {"status": "success", "data": data}
+        pipe.set(f"fastcert:{cert_id}", orjson.dumps(payload).decode())
+        pipe.hdel(DIGEST_KEY, str(cert_id))
+        pipe.delete(CERT_DETAIL_CACHE_KEY.format(qual_id=cert_id))
+        touched += 1
+
+    if touched:
+        pipe.execute()
+        _invalidate_list_caches(client)
+        bump_catalog_version()
+    if entry_ids:
+        client.xack(CERT_UPDATES_STREAM, CERT_UPDATES_GROUP, *entry_ids)
+    return touched
+
+
+def _record_metrics(client, entries, touched: int, apply_ms: float) -> None:
+    _metrics["batches"] += 1
+    _metrics["applied"] += touched
+    _metrics["acked"] += len(entries)
+    _metrics["last_batch_size"] = len(entries)
+    _metrics["last_apply_ms"] = round(apply_ms, 2)
+    _metrics["last_entry_id"] = entries[-1][0] if entries else _metrics["last_entry_id"]
+    _metrics["updated_at"] = time.time()
+    try:
+        client.hset(METRICS_KEY, mapping={k: str(v) for k, v in _metrics.items()})
+    except Exception:
+        pass
+
+
+def get_stream_lag(client=None) -> dict:
+    """스트림 길이·consumer group pending/lag 조회 (admin 모니터링용)."""
+    client = client or redis_client.client
+    if client is None:
+        return {}
+    try:
+        info = {"stream": CERT_UPDATES_STREAM, "length": client.xlen(CERT_UPDATES_STREAM)}
+        for g in client.xinfo_groups(CERT_UPDATES_STREAM):
+            if g.get("name") == CERT_UPDATES_GROUP:
+                info.update(
+                    group=CERT_UPDATES_GROUP,
+                    consumers=g.get("consumers"),
+                    pending=g.get("pending"),
+                    # lag은 Redis 7+에서만 제공
+                    lag=g.get("lag"),
+                    last_delivered_id=g.get("last-delivered-id"),
+                )
+        info["worker"] = client.hgetall(METRICS_KEY)
+        return info
+    except redis.ResponseError:
+        # 스트림/그룹이 아직 없음
+        return {"stream": CERT_UPDATES_STREAM, "length": 0}
+
+
+def start_redis_sync_worker(consumer: str = None, batch_size: int = 100, block_ms: int = 5000):
     """
-    Redis Pub/Sub을 사용하여 자격증 데이터 변경을 수신하고
-    즉시 캐시를 갱신하는 초경량 워커 (안티그래비티 'Zero Cost' 동기화)
+    Redis Streams consumer group으로 자격증 데이터 변경을 배치 수신하고
+    파이프라인으로 캐시를 갱신하는 초경량 워커 (안티그래비티 'Zero Cost' 동기화).
+    기동 시 미ACK(pending) 메시지를 먼저 재처리하므로 워커가 내려가 있던 동안의 변경도 유실되지 않는다.
     """
-    pubsub = redis_client.get_pubsub()
-    if not pubsub:
+    client = redis_client.client
+    if not client:
         logger.error("Redis client not available.")
         return
 
-    channel = "cert_updates"
-    pubsub.subscribe(channel)
-    logger.info(f"Subscribed to {channel}. Waiting for updates...")
-
-    for message in pubsub.listen():
-        if message['type'] == 'message':
-            try:
-                # RedisClient publishes serialized data
-                data = orjson.loads(message['data'])
-                cert_id = data.get("qual_id")
-                
-                if cert_id:
-                    # fastcert format for ultra-low latency API
-                    payload = {"status": "success", "data": data}
-                    val_bytes = orjson.dumps(payload)
-                    
-                    # Update cache instantly
-                    redis_client.client.set(f"fastcert:{cert_id}", val_bytes.decode())
-                    logger.info(f"Cache updated instantly for cert {cert_id}")
-            except Exception as e:
-                logger.error(f"Sync worker error: {e}")
+    _ensure_group(client)
+    consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+    try:
+        # 죽은 consumer의 오래된 pending을 이 consumer로 이전 → 아래 "0" 읽기에서 재처리
+        client.xautoclaim(
+            CERT_UPDATES_STREAM, CERT_UPDATES_GROUP, consumer,
+            min_idle_time=CLAIM_MIN_IDLE_MS, start_id="0-0", count=1000,
+        )
+    except redis.ResponseError as e:
+        logger.warning(f"XAUTOCLAIM skipped: {e}")
+
+    logger.info(f"Consuming {CERT_UPDATES_STREAM} as {CERT_UPDATES_GROUP}/{consumer}. Waiting for updates...")
+    # "0" = 이 consumer의 pending 재처리, 다 비우면 ">" = 신규 메시지
+    read_id = "0"
+    while True:
+        try:
+            resp = client.xreadgroup(
+                CERT_UPDATES_GROUP,
+                consumer,
+                {CERT_UPDATES_STREAM: read_id},
+                count=batch_size,
+                block=None if read_id == "0" else block_ms,
+            )
+            entries = resp[0][1] if resp else []
+            if not entries:
+                if read_id == "0":
+                    read_id = ">"
+                continue
+
+            t0 = time.perf_counter()
+            touched = apply_batch(client, entries)
+            _record_metrics(client, entries, touched, (time.perf_counter() - t0) * 1000)
+            logger.info(f"Applied {touched} cert updates from {len(entries)} stream entries.")
+        except Exception as e:
+            _metrics["errors"] += 1
+            logger.error(f"Sync worker error: {e}")
+            # 반영 실패 배치는 ACK되지 않았으므로 pending부터 다시 읽는다
+            read_id = "0"
+            time.sleep(1)
 
 if __name__ == "__main__":
     try:
@@ -270,6 +270,8 @@ class RecommendationListResponse(BaseModel):
     items: List[RecommendationResponse]
     major: str
     total: int
+    # 입력 전공명 → major 해석 신뢰도 (1.0=정확히 일치, 퍼지 매칭이면 0~1)
+    match_confidence: Optional[float] = None
 
 
 class UserFavoriteListResponse(BaseModel):
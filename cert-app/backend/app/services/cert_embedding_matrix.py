@@ -0,0 +1,191 @@
+"""
+자격증 청크 임베딩 행렬 (in-process) — 전공 임베딩 ↔ 자격증 major_sim 계산용.
+
+hybrid_recommendation 은 매 요청 전공 임베딩을 텍스트 리터럴로 보내
+`MAX(1 - (embedding <=> :vec)) GROUP BY qual_id` 를 Postgres에서 계산했다.
+같은 전공(예: 컴퓨터공학과)이 반복되므로 프로세스 안에서 처리한다.
+
+- certificates_vectors 임베딩을 qual_id 순으로 정렬해 L2 정규화한 float32 행렬로 보관
+  (코사인 유사도 = 1 - cosine distance = 정규화 행렬 · 정규화 벡터).
+- qual_id별 청크 구간 시작 위치를 미리 계산 → per-qual max-pool 은 np.maximum.reduceat 1회.
+- 전공 임베딩 → qual별 유사도 벡터를 LRU로 memo (행렬 버전이 바뀌면 자동 무효화).
+- 구축은 백그라운드 스레드에서. 행렬이 준비되기 전·실패 시 호출부는 기존 DB 쿼리로 fallback.
+- (count, max(updated_at)) 시그니처를 주기적으로 확인해 재색인 후 재구축.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import orjson
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# 시그니처 재확인 간격(초) — 재색인 반영 지연 상한
+_CHECK_INTERVAL = 300.0
+# 구축 실패 시 재시도 최소 간격(초)
+_RETRY_AFTER_FAILURE = 60.0
+# 전공 임베딩 → 유사도 벡터 memo 상한 (qual 수 × 4바이트/항목)
+_SIM_CACHE_SIZE = 256
+
+_SIGNATURE_SQL = text("""
+    SELECT COUNT(*) AS n, MAX(updated_at) AS updated
+    FROM certificates_vectors
+    WHERE embedding IS NOT NULL
+""")
+_EMBEDDINGS_SQL = text("""
+    SELECT qual_id, embedding::text AS embedding
+    FROM certificates_vectors
+    WHERE embedding IS NOT NULL AND qual_id IS NOT NULL
+    ORDER BY qual_id
+""")
+
+
+class CertEmbeddingMatrix:
+    """정규화 청크 임베딩 행렬 + qual_id 구간. similarities()는 행렬-벡터 곱 + reduceat."""
+
+    def __init__(self, signature: str, qual_ids: np.ndarray, starts: np.ndarray, matrix: np.ndarray):
+        self.signature = signature
+        self.qual_ids = qual_ids          # (Q,) 고유 qual_id (오름차순)
+        self.starts = starts              # (Q,) 각 qual 청크 구간 시작 행
+        self.matrix = matrix              # (N, D) float32, 행 L2 정규화
+        self.position: Dict[int, int] = {int(q): i for i, q in enumerate(qual_ids)}
+        self.built_at = time.time()
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return int(self.matrix.shape[0])
+
+    @staticmethod
+    def _vector_key(vec: np.ndarray) -> str:
+        return hashlib.blake2b(vec.tobytes(), digest_size=16).hexdigest()
+
+    def similarities(self, vector: Sequence[float]) -> Optional[np.ndarray]:
+        """qual별 max(cosine similarity) 벡터 (qual_ids 순서). 차원 불일치·영벡터면 None."""
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        if vec.shape[0] != self.matrix.shape[1]:
+            return None
+        key = self._vector_key(vec)
+        with self._lock:
+            sims = self._cache.get(key)
+            if sims is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return sims
+            self._misses += 1
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0:
+            return None
+        sims = np.maximum.reduceat(self.matrix @ (vec / norm), self.starts)
+        with self._lock:
+            self._cache[key] = sims
+            while len(self._cache) > _SIM_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return sims
+
+    def lookup(self, vector: Sequence[float], qual_ids: Iterable[int]) -> Optional[Dict[int, float]]:
+        """qual_id → major_sim. 임베딩이 없는 qual은 결과에서 빠진다 (DB 쿼리와 동일)."""
+        sims = self.similarities(vector)
+        if sims is None:
+            return None
+        out: Dict[int, float] = {}
+        for q in qual_ids:
+            i = self.position.get(q)
+            if i is not None:
+                out[q] = float(sims[i])
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rows": len(self),
+                "quals": int(self.qual_ids.shape[0]),
+                "dim": int(self.matrix.shape[1]),
+                "signature": self.signature,
+                "built_at": self.built_at,
+                "sim_cache_size": len(self._cache),
+                "sim_cache_hits": self._hits,
+                "sim_cache_misses": self._misses,
+            }
+
+    @classmethod
+    def build(cls, db, signature: str) -> "CertEmbeddingMatrix":
+        t0 = time.perf_counter()
+        qual_col = []
+        vectors = []
+        dim = None
+        for r in db.execute(_EMBEDDINGS_SQL):
+            vec = np.asarray(orjson.loads(r.embedding), dtype=np.float32)
+            if dim is None:
+                dim = vec.shape[0]
+            if vec.shape[0] != dim:
+                continue
+            norm = float(np.linalg.norm(vec))
+            if norm == 0.0:
+                # pgvector는 영벡터 cosine distance가 NaN → 집계 대상에서 제외
+                continue
+            qual_col.append(int(r.qual_id))
+            vectors.append(vec / norm)
+        if not vectors:
+            raise ValueError("certificates_vectors has no embeddings")
+
+        quals = np.asarray(qual_col, dtype=np.int64)
+        boundary = np.flatnonzero(np.diff(quals)) + 1
+        starts = np.concatenate(([0], boundary)).astype(np.int64)
+        matrix = cls(signature, quals[starts], starts, np.vstack(vectors))
+        logger.info(
+            "Cert embedding matrix built: %d chunks, %d quals, dim=%d in %.1fms",
+            len(matrix), matrix.qual_ids.shape[0], dim, (time.perf_counter() - t0) * 1000,
+        )
+        return matrix
+
+
+_lock = threading.Lock()
+_matrix: Optional[CertEmbeddingMatrix] = None
+_state = {"checked_at": 0.0, "failed_at": 0.0, "building": False}
+
+
+def _signature(db) -> str:
+    row = db.execute(_SIGNATURE_SQL).first()
+    return f"{row.n}:{row.updated}"
+
+
+def _refresh() -> None:
+    """시그니처가 바뀌었으면 재구축 (백그라운드 스레드, 별도 세션)."""
+    global _matrix
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        signature = _signature(db)
+        if _matrix is None or _matrix.signature != signature:
+            _matrix = CertEmbeddingMatrix.build(db, signature)
+    except Exception as e:
+        _state["failed_at"] = time.time()
+        logger.warning("Cert embedding matrix build failed: %s", e)
+    finally:
+        db.close()
+        with _lock:
+            _state["building"] = False
+
+
+def get_cert_embedding_matrix() -> Optional[CertEmbeddingMatrix]:
+    """현재 행렬 반환 (없으면 None). 확인 주기가 지났으면 백그라운드 재확인·재구축을 시작한다."""
+    now = time.time()
+    with _lock:
+        due = now - _state["checked_at"] >= _CHECK_INTERVAL or _matrix is None
+        if due and not _state["building"] and now - _state["failed_at"] >= _RETRY_AFTER_FAILURE:
+            _state["building"] = True
+            _state["checked_at"] = now
+            threading.Thread(target=_refresh, name="cert-embedding-matrix", daemon=True).start()
+    return _matrix
+
@@ -467,6 +467,10 @@ class DataLoader:
 
         print(f"Loaded {len(self.qualifications)} quals, {len(self.jobs)} jobs, {len(self.major_mappings)} majors.")
 
+        # 카탈로그 ETag 무효화 (클라이언트·CDN 재검증 시 새 본문 수신)
+        from app.utils.catalog_version import bump_catalog_version
+        bump_catalog_version()
+
     def get_qualifications_list(self, q=None, main_field=None, ncs_large=None, qual_type=None, managing_body=None, is_active=None, sort="name", page=1, page_size=20):
         filtered = []
         for qual in self.qualifications:
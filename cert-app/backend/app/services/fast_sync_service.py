@@ -1,76 +1,193 @@
+import hashlib
 import logging
-from typing import List
+import threading
+from typing import Dict, List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models import Qualification
 from app.redis_client import redis_client
 from app.crud import get_qualification_aggregated_stats_bulk
+from app.config import get_settings
 import orjson
 import time
 
 logger = logging.getLogger("fast_sync")
 
+# fastcert:{id} payload digest 저장용 Hash. 값이 같고 키가 남아 있으면 SET 생략 (diff-only).
+DIGEST_KEY = "fastcert:_digest"
+# 중단 시 재개 지점(마지막으로 반영 완료한 qual_id). 정상 완료 시 삭제.
+CHECKPOINT_KEY = "fastcert:_sync:checkpoint"
+CHECKPOINT_TTL = 3600
+
+_SYNC_COLUMNS = (
+    Qualification.qual_id,
+    Qualification.qual_name,
+    Qualification.qual_type,
+    Qualification.main_field,
+    Qualification.ncs_large,
+    Qualification.managing_body,
+    Qualification.grade_code,
+    Qualification.is_active,
+)
+
 
 class FastSyncService:
     """
     Ultra-fast synchronization service using Redis Pipelining and Bulk operations.
     Inspired by Antigravity's 'Zero Gravity' throughput patterns.
+
+    서버 사이드 커서로 qualification을 청크 단위로 스트리밍하고, 청크마다 고정 크기 파이프라인으로 반영한다.
+    payload 해시가 이전 동기화와 같으면 SET을 생략하며, 진행 상황은 get_progress()로 조회한다.
     """
 
+    _lock = threading.Lock()
+    # _progress는 동기화 스레드가 갱신하고 admin 요청이 읽으므로 별도 락으로 보호
+    _progress_lock = threading.Lock()
+    _progress: Dict = {"state": "idle"}
+
     @staticmethod
-    def sync_all_to_redis(db: Session):
-        """
-        Synchronize all qualifications from Database to Redis in a single pipeline.
-        합격률·난이도·응시인원 통계를 포함하여 /certs/{id}/fast 응답에서 null이 나오지 않도록 함.
-        """
-        start_time = time.time()
-        logger.info("Starting Full Synchronous Burst to Redis...")
-
-        # 1. Fetch all active qualifications
-        quals = db.query(Qualification).filter(Qualification.is_active == True).all()
-        
-        if not quals:
-            logger.warning("No qualifications found to sync.")
-            return
+    def _build_payload(row, stats: dict) -> bytes:
+        # Prepare data (matching fastcert format + stats for /certs/{id}/fast)
+        data = {
+            "qual_id": row.qual_id,
+            "qual_name": row.qual_name,
+            "qual_type": row.qual_type,
+            "main_field": row.main_field,
+            "ncs_large": row.ncs_large,
+            "managing_body": row.managing_body,
+            "grade_code": row.grade_code,
+            "is_active": row.is_active,
+            "latest_pass_rate": stats.get("latest_pass_rate"),
+            "avg_difficulty": stats.get("avg_difficulty"),
+            "total_candidates": stats.get("total_candidates", 0),
+        }
+        return orjson.dumps({"status": "success", "data": data})
+
+    @staticmethod
+    def _digest(payload: bytes) -> str:
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
 
-        # 2. Bulk 조회: 합격률·난이도·응시인원 통계
-        qual_ids = [q.qual_id for q in quals]
+    @classmethod
+    def get_progress(cls) -> Dict:
+        """현재(또는 마지막) 동기화 진행 상황 스냅샷."""
+        with cls._progress_lock:
+            return dict(cls._progress)
+
+    @classmethod
+    def _set_progress(cls, **fields) -> Dict:
+        with cls._progress_lock:
+            cls._progress.update(fields)
+            return dict(cls._progress)
+
+    @classmethod
+    def _sync_chunk(cls, db: Session, rows: List, force: bool) -> tuple[int, int]:
+        """청크 1개: 통계 bulk 조회 → digest 비교 → 변경분만 파이프라인 SET. (written, skipped) 반환."""
+        client = redis_client.client
+        qual_ids = [r.qual_id for r in rows]
         stats_map = get_qualification_aggregated_stats_bulk(db, qual_ids)
 
-        # 3. Open Redis Pipeline for batching commands
+        payloads = {r.qual_id: cls._build_payload(r, stats_map.get(r.qual_id) or {}) for r in rows}
+        digests = {qid: cls._digest(p) for qid, p in payloads.items()}
+        if force:
+            previous = [None] * len(qual_ids)
+        else:
+            # digest만 남고 fastcert:{id}가 만료·축출된 경우에도 다시 쓰도록 키 존재 여부를 같은 왕복에서 확인
+            check = client.pipeline(transaction=False)
+            check.hmget(DIGEST_KEY, [str(q) for q in qual_ids])
+            for qid in qual_ids:
+                check.exists(f"fastcert:{qid}")
+            digest_values, *exists = check.execute()
+            previous = [prev if present else None for prev, present in zip(digest_values, exists)]
+
+        pipe = client.pipeline(transaction=False)
+        written = 0
+        for qid, prev in zip(qual_ids, previous):
+            if prev == digests[qid]:
+                continue
+            pipe.set(f"fastcert:{qid}", payloads[qid].decode())
+            pipe.hset(DIGEST_KEY, str(qid), digests[qid])
+            written += 1
+        pipe.set(CHECKPOINT_KEY, qual_ids[-1], ex=CHECKPOINT_TTL)
+        pipe.execute()
+        return written, len(qual_ids) - written
+
+    @classmethod
+    def sync_all_to_redis(
+        cls,
+        db: Session,
+        batch_size: Optional[int] = None,
+        force: bool = False,
+        resume: bool = True,
+    ):
+        """
+        Synchronize all active qualifications from Database to Redis in fixed-size pipeline batches.
+        합격률·난이도·응시인원 통계를 포함하여 /certs/{id}/fast 응답에서 null이 나오지 않도록 함.
+
+        - batch_size: 청크(= 파이프라인) 크기. 미지정 시 FAST_SYNC_BATCH_SIZE.
+        - force: digest 비교 없이 전체 재기록.
+        - resume: 이전 동기화가 중단된 경우 체크포인트 이후 qual_id부터 재개.
+        """
         if not redis_client.client:
             logger.error("Redis client not initialized. Sync cancelled.")
             return
+        if not cls._lock.acquire(blocking=False):
+            logger.warning("Fast sync already running. Skipped.")
+            return
 
-        pipe = redis_client.client.pipeline()
-        count = 0
-        for q in quals:
-            stats = stats_map.get(q.qual_id) or {}
-            # Prepare data (matching fastcert format + stats for /certs/{id}/fast)
-            data = {
-                "qual_id": q.qual_id,
-                "qual_name": q.qual_name,
-                "qual_type": q.qual_type,
-                "main_field": q.main_field,
-                "ncs_large": q.ncs_large,
-                "managing_body": q.managing_body,
-                "grade_code": q.grade_code,
-                "is_active": q.is_active,
-                "latest_pass_rate": stats.get("latest_pass_rate"),
-                "avg_difficulty": stats.get("avg_difficulty"),
-                "total_candidates": stats.get("total_candidates", 0),
-            }
-            payload = {"status": "success", "data": data}
-            pipe.set(f"fastcert:{q.qual_id}", orjson.dumps(payload).decode())
-            count += 1
-
-        # 3. Execute all commands in the buffer
-        pipe.execute()
-        
-        duration = time.time() - start_time
-        msg = f"Sync complete. {count} items pushed to Redis in {duration:.2f}s."
-        logger.info(msg)
-        print(msg)
-        return count
+        try:
+            start_time = time.time()
+            batch_size = batch_size or get_settings().FAST_SYNC_BATCH_SIZE
+            start_after = 0
+            if resume and not force:
+                raw = redis_client.client.get(CHECKPOINT_KEY)
+                start_after = int(raw) if raw else 0
+            with cls._progress_lock:
+                cls._progress = {
+                    "state": "running",
+                    "started_at": start_time,
+                    "resumed_from": start_after,
+                    "batch_size": batch_size,
+                    "batches": 0,
+                    "processed": 0,
+                    "written": 0,
+                    "skipped": 0,
+                    "last_qual_id": start_after,
+                }
+            logger.info("Starting chunked sync to Redis (batch=%s, resume_from=%s)...", batch_size, start_after)
+
+            # 서버 사이드 커서(yield_per)로 청크 단위 스트리밍 — 전체 ORM 객체를 메모리에 올리지 않음
+            stmt = (
+                select(*_SYNC_COLUMNS)
+                .where(Qualification.is_active == True, Qualification.qual_id > start_after)
+                .order_by(Qualification.qual_id)
+                .execution_options(yield_per=batch_size)
+            )
+            result = db.execute(stmt)
+            for rows in result.partitions(batch_size):
+                written, skipped = cls._sync_chunk(db, rows, force)
+                with cls._progress_lock:
+                    p = cls._progress
+                    p["batches"] += 1
+                    p["processed"] += len(rows)
+                    p["written"] += written
+                    p["skipped"] += skipped
+                    p["last_qual_id"] = rows[-1].qual_id
+
+            redis_client.client.delete(CHECKPOINT_KEY)
+            duration = time.time() - start_time
+            p = cls._set_progress(state="done", duration=round(duration, 3))
+            if p["processed"] == 0 and start_after == 0:
+                logger.warning("No qualifications found to sync.")
+            logger.info(
+                "Sync complete. %s items in %s batches (%s written, %s unchanged) in %.2fs.",
+                p["processed"], p["batches"], p["written"], p["skipped"], duration,
+            )
+            return p["written"]
+        except Exception:
+            cls._set_progress(state="failed")
+            raise
+        finally:
+            cls._lock.release()
 
 if __name__ == "__main__":
     import os
@@ -79,16 +196,17 @@ if __name__ == "__main__":
 
     from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
-    from app.config import get_settings
-    
+
+    logging.basicConfig(level=logging.INFO)
     settings = get_settings()
     engine = create_engine(settings.DATABASE_URL)
     SessionLocal = sessionmaker(bind=engine)
-    
+
     db = SessionLocal()
     try:
-        FastSyncService.sync_all_to_redis(db)
+        FastSyncService.sync_all_to_redis(db, force="--force" in sys.argv)
     finally:
         db.close()
 
 fast_sync_service = FastSyncService()
+
@@ -0,0 +1,314 @@
+"""
+전공명 해석 인덱스 (in-memory, 퍼지 매칭).
+
+사용자가 입력한 전공명을 major_qualification_map 의 전공명으로 해석한다. 이전에는 호출부마다
+exact → ILIKE '%clean%' → 역방향 ILIKE → 2글자 prefix ILIKE(get_recommendations),
+pg_trgm similarity() > 0.35 (hybrid_recommendation) 처럼 DB 왕복을 여러 번 했다.
+
+- 카탈로그 버전당 한 번 전공명 목록(+ major 테이블 major_name → major_category 별칭)을 읽어 구축.
+  버전이 바뀌면 백그라운드 스레드로 재구축하고, 완료될 때까지 이전 인덱스로 해석한다. 기동 시 main.py에서 선구축.
+- 해석 순서: exact → 별칭 → 정규형(공백·구두점 무시) → 접미사 제거 → 포함 관계 → 문자 bigram 유사도 → 2글자 prefix.
+- 결과는 MajorMatch(major, confidence, method). confidence 는 0~1 (exact=1.0).
+- resolve_majors()는 기존 pg_trgm 쿼리처럼 유사도 > 임계값인 전공을 모두 돌려준다 (hybrid 후보 조회용).
+- 정규화 기본 함수·equals 별칭 표는 app.rag.utils.major_normalize 와 공유.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.rag.utils.major_normalize import (
+    load_major_aliases,
+    major_key,
+    major_ngrams,
+    strip_major_suffix,
+)
+from app.utils.catalog_version import get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# pg_trgm 기본 임계값과 같은 수준 (기존 hybrid_recommendation fuzzy 쿼리 기준)
+NGRAM_MIN_SIMILARITY = 0.35
+# 해석 결과 memo 상한 (입력 전공명 종류가 많지 않으므로 작게 유지)
+_MEMO_MAX = 4096
+
+_MAJORS_SQL = text("""
+    SELECT major, COUNT(*) AS n
+    FROM major_qualification_map
+    GROUP BY major
+    ORDER BY n DESC, major
+""")
+_MAJOR_ALIAS_SQL = text("""
+    SELECT major_name, major_category
+    FROM major
+    WHERE major_category IS NOT NULL AND major_category <> ''
+""")
+
+
+class MajorMatch(NamedTuple):
+    major: str
+    confidence: float
+    method: str  # exact | alias | normalized | stem | contains | ngram | prefix
+
+
+class MajorIndex:
+    """전공명 목록의 정규형·접미사 제거형·bigram 역색인. resolve()는 DB 조회 없이 동작."""
+
+    def __init__(self, version: str, majors: Sequence[str], aliases: Optional[Dict[str, str]] = None):
+        # majors 는 우선순위 순 (매핑 수 내림차순) — 동점 후보는 앞쪽을 선택
+        self.version = version
+        self.majors: List[str] = list(majors)
+        self.exact: Dict[str, int] = {}
+        self.by_key: Dict[str, int] = {}
+        self.by_stem: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self.stems: List[str] = []
+        self.grams: List[FrozenSet[str]] = []
+        self.postings: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.majors):
+            key = major_key(name)
+            stem = strip_major_suffix(key)
+            self.exact.setdefault(name, i)
+            self.by_key.setdefault(key, i)
+            self.by_stem.setdefault(stem, i)
+            self.keys.append(key)
+            self.stems.append(stem)
+            grams = major_ngrams(stem)
+            self.grams.append(grams)
+            for g in grams:
+                self.postings.setdefault(g, []).append(i)
+
+        # 별칭: 입력 정규형 → 전공 인덱스 (별칭 대상이 인덱스에 있는 것만)
+        self.alias: Dict[str, int] = {}
+        for pattern, target in (aliases or {}).items():
+            j = self._lookup_exact(target)
+            if j is not None:
+                self.alias.setdefault(major_key(pattern), j)
+
+        self._memo: Dict[str, Optional[MajorMatch]] = {}
+        self._memo_lock = threading.Lock()
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.majors)
+
+    def __contains__(self, major: str) -> bool:
+        return major in self.exact
+
+    def _lookup_exact(self, name: str) -> Optional[int]:
+        i = self.exact.get(name)
+        if i is None:
+            i = self.by_key.get(major_key(name))
+        return i
+
+    def ngram_scores(self, stem: str) -> List[Tuple[int, float]]:
+        """stem 과 각 전공 stem 의 bigram Jaccard 유사도 (공통 bigram이 있는 전공만)."""
+        q = major_ngrams(stem)
+        if not q:
+            return []
+        overlap: Dict[int, int] = {}
+        for g in q:
+            for i in self.postings.get(g, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+        return [(i, c / (len(q) + len(self.grams[i]) - c)) for i, c in overlap.items()]
+
+    def resolve(self, query: str, min_confidence: float = 0.0) -> Optional[MajorMatch]:
+        """입력 전공명 → 가장 가까운 매핑 전공. 해석 실패(또는 confidence 미달) 시 None."""
+        query = (query or "").strip()
+        if not query:
+            return None
+        with self._memo_lock:
+            hit = query in self._memo
+            match = self._memo.get(query)
+        if not hit:
+            match = self._resolve(query)
+            with self._memo_lock:
+                if len(self._memo) >= _MEMO_MAX:
+                    self._memo.clear()
+                self._memo[query] = match
+        if match is None or match.confidence < min_confidence:
+            return None
+        return match
+
+    def resolve_all(self, query: str, min_similarity: float = NGRAM_MIN_SIMILARITY) -> List[MajorMatch]:
+        """입력 전공명과 유사도 > min_similarity 인 전공 전체 (기존 similarity(mq.major, :major) > 0.35 조건).
+        resolve() 결과가 임계값을 넘으면 맨 앞에 두고, 나머지는 bigram 유사도 내림차순."""
+        query = (query or "").strip()
+        if not query:
+            return []
+        out: List[MajorMatch] = []
+        best = self.resolve(query)
+        if best is not None and best.confidence > min_similarity:
+            out.append(best)
+        seen = {m.major for m in out}
+        stem = strip_major_suffix(major_key(query))
+        for j, sim in sorted(self.ngram_scores(stem), key=lambda x: (-x[1], x[0])):
+            if sim <= min_similarity:
+                break
+            if self.majors[j] not in seen:
+                seen.add(self.majors[j])
+                out.append(MajorMatch(self.majors[j], round(sim, 4), "ngram"))
+        return out
+
+    def _resolve(self, query: str) -> Optional[MajorMatch]:
+        i = self.exact.get(query)
+        if i is not None:
+            return MajorMatch(self.majors[i], 1.0, "exact")
+
+        key = major_key(query)
+        if not key:
+            return None
+        i = self.alias.get(key)
+        if i is not None:
+            return MajorMatch(self.majors[i], 0.95, "alias")
+        i = self.by_key.get(key)
+        if i is not None:
+            return MajorMatch(self.majors[i], 0.95, "normalized")
+        stem = strip_major_suffix(key)
+        i = self.by_stem.get(stem)
+        if i is not None:
+            return MajorMatch(self.majors[i], 0.9, "stem")
+
+        # 포함 관계 (기존 ILIKE '%clean%' / :major ILIKE '%'||major||'%'): 길이 비율이 가장 큰 전공
+        best, best_ratio = None, 0.0
+        for j, name_key in enumerate(self.keys):
+            if stem in name_key:
+                ratio = len(stem) / len(name_key)
+            elif name_key in key:
+                ratio = len(name_key) / len(key)
+            else:
+                continue
+            if ratio > best_ratio:
+                best, best_ratio = j, ratio
+        if best is not None:
+            return MajorMatch(self.majors[best], round(0.6 + 0.3 * best_ratio, 4), "contains")
+
+        # 문자 bigram 유사도 (기존 pg_trgm similarity > 0.35)
+        scored = self.ngram_scores(stem)
+        if scored:
+            j, sim = max(scored, key=lambda x: (x[1], -x[0]))
+            if sim >= NGRAM_MIN_SIMILARITY:
+                return MajorMatch(self.majors[j], round(sim, 4), "ngram")
+
+        # 최후 수단: 앞 2글자 포함 (기존 2-char prefix ILIKE)
+        if len(stem) >= 3:
+            prefix = stem[:2]
+            for j, name_key in enumerate(self.keys):
+                if prefix in name_key:
+                    return MajorMatch(self.majors[j], 0.3, "prefix")
+        return None
+
+    @classmethod
+    def build(cls, db: Session, version: str) -> "MajorIndex":
+        t0 = time.perf_counter()
+        majors = [r.major for r in db.execute(_MAJORS_SQL).fetchall() if r.major]
+        aliases = dict(load_major_aliases())
+        try:
+            for r in db.execute(_MAJOR_ALIAS_SQL).fetchall():
+                aliases.setdefault(r.major_name, r.major_category)
+        except Exception as e:
+            logger.debug("major alias table skipped: %s", e)
+            db.rollback()
+        index = cls(version, majors, aliases)
+        logger.info(
+            "Major index built: %d majors, %d aliases in %.1fms (version=%s)",
+            len(index), len(index.alias), (time.perf_counter() - t0) * 1000, version,
+        )
+        return index
+
+
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_index: Optional[MajorIndex] = None
+_building = False
+# 구축 실패 시 요청마다 재시도하지 않도록 최소 간격(초)
+_RETRY_AFTER_FAILURE = 30.0
+_last_failure = 0.0
+
+
+def _is_current(index: Optional[MajorIndex], version: str) -> bool:
+    return index is not None and index.version == version
+
+
+def build_major_index() -> Optional[MajorIndex]:
+    """현재 버전 인덱스를 자체 세션으로 동기 구축 (백그라운드 스레드·기동 선구축용). 실패 시 이전 인덱스."""
+    global _index, _last_failure
+    with _build_lock:
+        version = get_catalog_version()
+        if _is_current(_index, version):
+            return _index
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            built = MajorIndex.build(db, version)
+            with _lock:
+                _index = built
+        except Exception as e:
+            _last_failure = time.time()
+            logger.warning("Major index build failed: %s", e)
+        finally:
+            db.close()
+        return _index
+
+
+def _build_in_background() -> None:
+    global _building
+    try:
+        build_major_index()
+    finally:
+        with _lock:
+            _building = False
+
+
+def get_major_index() -> Optional[MajorIndex]:
+    """
+    전공 인덱스 반환. 카탈로그 버전이 바뀌었으면 백그라운드 재구축을 걸고 이전 인덱스를 그대로 반환한다
+    (요청 경로에서는 구축하지 않음). 아직 한 번도 구축되지 않았으면 None.
+    """
+    global _building
+    version = get_catalog_version()
+    current = _index
+    if _is_current(current, version):
+        return current
+    with _lock:
+        if _building or time.time() - _last_failure < _RETRY_AFTER_FAILURE:
+            return current
+        _building = True
+    try:
+        threading.Thread(target=_build_in_background, name="major-index-build", daemon=True).start()
+    except Exception as e:
+        with _lock:
+            _building = False
+        logger.warning("Major index build could not be scheduled: %s", e)
+    return current
+
+
+def prewarm_major_index() -> bool:
+    """기동 시 1회 구축 — 첫 전공 퍼지 해석부터 인덱스를 쓰도록."""
+    try:
+        return build_major_index() is not None
+    except Exception:
+        logger.debug("major index prewarm failed", exc_info=True)
+        return False
+
+
+def resolve_major(major: str, min_confidence: float = 0.0) -> Optional[MajorMatch]:
+    """전공명 해석 (인덱스 미구축 시 None)."""
+    index = get_major_index()
+    if index is None:
+        return None
+    return index.resolve(major, min_confidence)
+
+
+def resolve_majors(major: str, min_similarity: float = NGRAM_MIN_SIMILARITY) -> List[MajorMatch]:
+    """유사도 > min_similarity 인 전공 전체 (인덱스 미구축 시 빈 리스트)."""
+    index = get_major_index()
+    if index is None:
+        return []
+    return index.resolve_all(major, min_similarity)
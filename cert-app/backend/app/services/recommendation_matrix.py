@@ -0,0 +1,239 @@
+"""
+전공 → 자격증 추천 행렬 (사전 계산, in-memory).
+
+GET /recommendations 요청마다 major_qualification_map + qualification + 전체 stats를 joinedload해
+Python에서 max(stats)·점수 계산을 하던 것을, 데이터 적재 시점에 한 번만 계산해 둔다.
+
+- 저장 형태: 전공별 행 구간(CSR) — major_ptr[i]:major_ptr[i+1]이 전공 i의 매핑 행(매핑 score 내림차순).
+- 각 행의 원시 점수는 학년 보정 3가지(grade_year 없음 / ≤2 / >2)를 모두 미리 계산 → raw[variant, row].
+- 최신 통계(year, exam_round 최댓값)·추천 사유도 행마다 미리 반영.
+- 카탈로그 데이터 버전(app.utils.catalog_version)이 바뀌면 다음 조회가 백그라운드 스레드로 재구축을 건다
+  (DataLoader.load_data·admin 재구축/동기화가 버전을 올림). 구축은 요청 경로(이벤트 루프)에서 하지 않으며,
+  현재 버전 행렬이 준비될 때까지 조회는 None → 호출자는 기존 ORM 경로로 응답한다. 기동 시 main.py에서 선구축.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.catalog_version import get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+_MATRIX_SQL = text("""
+    WITH latest AS (
+        SELECT DISTINCT ON (qual_id) qual_id, candidate_cnt, pass_rate, difficulty_score
+        FROM qualification_stats
+        ORDER BY qual_id, year DESC, exam_round DESC
+    )
+    SELECT m.major, m.score, m.reason,
+           q.qual_id, q.qual_name, q.qual_type, q.main_field, q.managing_body,
+           l.qual_id IS NOT NULL AS has_stats,
+           l.candidate_cnt, l.pass_rate, l.difficulty_score
+    FROM major_qualification_map m
+    JOIN qualification q ON q.qual_id = m.qual_id
+    LEFT JOIN latest l ON l.qual_id = m.qual_id
+    ORDER BY m.major, m.score DESC, m.map_id
+""")
+
+# grade_year 보정 variant: 0=None, 1=≤2학년, 2=3학년 이상
+_GRADE_VARIANT_SAMPLES = (None, 1, 3)
+
+
+def grade_variant(grade_year: Optional[int]) -> int:
+    if grade_year is None:
+        return 0
+    return 1 if grade_year <= 2 else 2
+
+
+class RecommendationMatrix:
+    """전공 인덱스 × 매핑 행 점수. top_k()는 인덱스 조회 + 부분 정렬만 수행."""
+
+    def __init__(
+        self,
+        version: str,
+        majors: List[str],
+        major_ptr: np.ndarray,
+        raw: np.ndarray,
+        rows: List[dict],
+    ):
+        self.version = version
+        self.majors = majors
+        self.major_index: Dict[str, int] = {m: i for i, m in enumerate(majors)}
+        self.major_ptr = major_ptr
+        self.raw = raw
+        self.rows = rows
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def has_major(self, major: str) -> bool:
+        return major in self.major_index
+
+    def top_k(
+        self,
+        major: str,
+        limit: int,
+        fetch_n: int,
+        min_score: float = 0.0,
+        grade_year: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        전공의 매핑 상위 fetch_n행(매핑 score 순) 중 raw >= min_score인 행을 raw 내림차순으로 limit개.
+        동점은 매핑 순서 유지 (기존 list.sort 안정 정렬과 동일 결과).
+        """
+        i = self.major_index.get(major)
+        if i is None:
+            return []
+        start = int(self.major_ptr[i])
+        end = min(int(self.major_ptr[i + 1]), start + fetch_n)
+        scores = self.raw[grade_variant(grade_year), start:end]
+
+        idx = np.flatnonzero(scores + 1e-9 >= min_score)
+        if idx.size > limit:
+            # k번째 점수 이상(동점 포함)만 남긴 뒤 정렬 → 부분 정렬로도 안정 정렬과 같은 결과
+            kth = np.partition(-scores[idx], limit - 1)[limit - 1]
+            idx = idx[-scores[idx] <= kth]
+        order = idx[np.lexsort((idx, -scores[idx]))][:limit]
+        return [dict(self.rows[start + j], raw=float(scores[j])) for j in order]
+
+    @classmethod
+    def build(cls, db: Session, version: str) -> "RecommendationMatrix":
+        # 점수·사유 계산은 엔드포인트와 동일 함수를 사용해 결과를 그대로 유지 (순환 import 방지로 지연 import)
+        from app.api.recommendations import (
+            _compute_raw_recommendation_score,
+            generate_recommendation_reason,
+        )
+
+        t0 = time.perf_counter()
+        result = db.execute(_MATRIX_SQL).mappings().all()
+
+        majors: List[str] = []
+        ptr: List[int] = [0]
+        rows: List[dict] = []
+        raw_cols: List[List[float]] = [[], [], []]
+        for r in result:
+            if not majors or majors[-1] != r["major"]:
+                if majors:
+                    ptr.append(len(rows))
+                majors.append(r["major"])
+            mapping = SimpleNamespace(score=r["score"], reason=r["reason"])
+            latest = None
+            if r["has_stats"]:
+                latest = SimpleNamespace(
+                    candidate_cnt=r["candidate_cnt"],
+                    pass_rate=r["pass_rate"],
+                    difficulty_score=r["difficulty_score"],
+                )
+            for v, gy in enumerate(_GRADE_VARIANT_SAMPLES):
+                raw_cols[v].append(_compute_raw_recommendation_score(mapping, latest, gy))
+            rows.append({
+                "qual_id": r["qual_id"],
+                "qual_name": r["qual_name"],
+                "qual_type": r["qual_type"],
+                "main_field": r["main_field"],
+                "managing_body": r["managing_body"],
+                "reason": generate_recommendation_reason(mapping, latest),
+                "latest_pass_rate": latest.pass_rate if latest else None,
+            })
+        if majors:
+            ptr.append(len(rows))
+
+        matrix = cls(
+            version=version,
+            majors=majors,
+            major_ptr=np.asarray(ptr, dtype=np.int64),
+            raw=np.asarray(raw_cols, dtype=np.float64).reshape(3, len(rows)),
+            rows=rows,
+        )
+        logger.info(
+            "Recommendation matrix built: %d majors, %d rows in %.1fms (version=%s)",
+            len(majors), len(rows), (time.perf_counter() - t0) * 1000, version,
+        )
+        return matrix
+
+
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_matrix: Optional[RecommendationMatrix] = None
+_building = False
+# 구축 실패 시 요청마다 재시도하지 않도록 최소 간격(초)
+_RETRY_AFTER_FAILURE = 30.0
+_last_failure = 0.0
+
+
+def _is_current(matrix: Optional[RecommendationMatrix], version: str) -> bool:
+    return matrix is not None and matrix.version == version
+
+
+def build_recommendation_matrix() -> Optional[RecommendationMatrix]:
+    """현재 버전 행렬을 자체 세션으로 동기 구축 (백그라운드 스레드·기동 선구축용). 실패 시 이전 행렬."""
+    global _matrix, _last_failure
+    with _build_lock:
+        version = get_catalog_version()
+        if _is_current(_matrix, version):
+            return _matrix
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            built = RecommendationMatrix.build(db, version)
+            with _lock:
+                _matrix = built
+        except Exception as e:
+            _last_failure = time.time()
+            logger.warning("Recommendation matrix build failed: %s", e)
+        finally:
+            db.close()
+        return _matrix
+
+
+def _build_in_background() -> None:
+    global _building
+    try:
+        build_recommendation_matrix()
+    finally:
+        with _lock:
+            _building = False
+
+
+def get_recommendation_matrix() -> Optional[RecommendationMatrix]:
+    """
+    현재 카탈로그 버전의 행렬. 없거나 이전 버전이면 백그라운드 재구축을 걸고 None을 반환한다
+    (요청 경로에서는 구축하지 않음 — 호출자는 준비될 때까지 ORM 경로 사용).
+    """
+    global _building
+    version = get_catalog_version()
+    current = _matrix
+    if _is_current(current, version):
+        return current
+    with _lock:
+        if _building or time.time() - _last_failure < _RETRY_AFTER_FAILURE:
+            return None
+        _building = True
+    try:
+        threading.Thread(
+            target=_build_in_background, name="recommendation-matrix-build", daemon=True
+        ).start()
+    except Exception as e:
+        with _lock:
+            _building = False
+        logger.warning("Recommendation matrix build could not be scheduled: %s", e)
+    return None
+
+
+def prewarm_recommendation_matrix() -> bool:
+    """기동 시 1회 구축 — 첫 /recommendations 요청부터 행렬 경로를 쓰도록."""
+    try:
+        return build_recommendation_matrix() is not None
+    except Exception:
+        logger.debug("recommendation matrix prewarm failed", exc_info=True)
+        return False
@@ -6,6 +6,7 @@ import hashlib
 import json
 import logging
 import threading
+from functools import lru_cache
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -14,6 +15,7 @@ from app.utils.ai import get_embedding, get_embeddings_batch
 from app.config import get_settings
 from app.redis_client import redis_client
 from app.rag.ingest.canonical_text import normalize_text_for_embedding
+from app.utils.sql_registry import HotStatement, hot_statement
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -79,6 +81,31 @@ def _certificates_vectors_has_bm25_text_column(db: Session) -> bool:
         return _has_bm25_text_cache
 
 
+@lru_cache(maxsize=None)
+def _similarity_search_statement(include_content: bool, include_metadata: bool, exclude: bool) -> HotStatement:
+    """similarity_search SQL 변형(대용량 컬럼 선택 × 제외 목록 유무) — 변형별로 고정 텍스트·이름 1개."""
+    # Egress 최적화: content/metadata는 필요할 때만 실제 컬럼을 읽는다
+    cols = ", ".join([
+        "v.qual_id",
+        "v.name",
+        "v.content" if include_content else "NULL::text as content",
+        "v.metadata" if include_metadata else "NULL::jsonb as metadata",
+        "COALESCE(v.chunk_index, 0) as chunk_index",
+        "(1 - (v.embedding <=> :embedding)) as similarity",
+    ])
+    return hot_statement(
+        f"vector_similarity_search_c{int(include_content)}m{int(include_metadata)}x{int(exclude)}",
+        f"""
+            SELECT {cols}
+            FROM certificates_vectors v
+            WHERE (v.embedding <=> :embedding) <= :max_distance
+            {"AND v.qual_id != ALL(:exclude_ids)" if exclude else ""}
+            ORDER BY v.embedding <=> :embedding
+            LIMIT :limit
+        """,
+    )
+
+
 def _content_hash(content: str) -> str:
     """SHA-256 해시. 변경 시에만 임베딩 호출용."""
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -594,33 +621,7 @@ class VectorService:
                 # 캐시 문제가 있어도 검색 자체는 계속 진행
                 cache_key = None
 
-        # Egress 최적화를 위해 대용량 컬럼 선택 여부를 동적으로 결정
-        select_columns = [
-            "v.qual_id",
-            "v.name",
-            "COALESCE(v.chunk_index, 0) as chunk_index",
-            "(1 - (v.embedding <=> :embedding)) as similarity",
-        ]
-        if include_content:
-            select_columns.insert(2, "v.content")  # name 뒤에 content 배치
-        else:
-            select_columns.insert(2, "NULL::text as content")
-        if include_metadata:
-            select_columns.insert(3, "v.metadata")
-        else:
-            select_columns.insert(3, "NULL::jsonb as metadata")
-
-        sql = text("""
-            SELECT {cols}
-            FROM certificates_vectors v
-            WHERE (v.embedding <=> :embedding) <= :max_distance
-            {exclude_clause}
-            ORDER BY v.embedding <=> :embedding
-            LIMIT :limit
-        """.format(
-            cols=", ".join(select_columns),
-            exclude_clause="AND v.qual_id != ALL(:exclude_ids)" if exclude_qual_ids else ""
-        ))
+        sql = _similarity_search_statement(include_content, include_metadata, bool(exclude_qual_ids))
         params = {
             "embedding": str(query_embedding),  # pgvector 형식
             "max_distance": max_distance,
@@ -629,7 +630,7 @@ class VectorService:
         if exclude_qual_ids:
             params["exclude_ids"] = exclude_qual_ids
 
-        results = db.execute(sql, params).fetchall()
+        results = sql.execute(db, params).fetchall()
         out: List[Dict[str, Any]] = []
         for r in results:
             item: Dict[str, Any] = {
@@ -0,0 +1,107 @@
+"""
+카탈로그 데이터 버전 + ETag (HTTP conditional request).
+
+자격증·통계·직무·전공·필터 옵션은 월 1회 데이터 적재 때만 바뀐다. 이 데이터 버전으로 ETag를 만들면
+If-None-Match 요청을 Redis 캐시·DB 조회 없이 304로 응답할 수 있다.
+- 304 판단은 라우트 의존성(deps.check_catalog_not_modified, check_rate_limit 뒤)에서 하므로 레이트 리밋·CORS·
+  TrustedHost 등 미들웨어를 모두 거친다. 미들웨어는 응답에 ETag·Cache-Control만 붙인다.
+
+- 버전은 Redis `catalog:version`에 저장 (워커 간 공유). DataLoader.load_data·admin 동기화가 bump.
+- 요청 경로에서는 프로세스 내 캐시를 사용하고, CATALOG_VERSION_REFRESH_SECONDS마다만 Redis에서 재확인.
+  (다른 워커가 bump한 경우 최대 그 시간만큼 이전 ETag로 304가 나갈 수 있음)
+- Redis flush로 키가 사라지면 새 버전으로 초기화되어 ETag도 자연히 바뀐다.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+
+from app.config import get_settings
+from app.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+# API prefix 이후 경로 → 카탈로그 응답 여부 (사용자별·트래픽 기반 응답은 제외)
+_CATALOG_EXACT = {"certs", "certs/filter-options", "recommendations/majors", "jobs"}
+
+_lock = threading.Lock()
+_state = {"version": None, "checked_at": 0.0}
+
+
+def is_catalog_path(rest: str) -> bool:
+    """API prefix를 뗀 경로가 카탈로그 엔드포인트인지 (/certs, /certs/filter-options, /recommendations/majors, /jobs[/{id}])."""
+    if rest in _CATALOG_EXACT:
+        return True
+    return rest.startswith("jobs/") and rest[len("jobs/"):].isdigit()
+
+
+def _load_version() -> str:
+    """Redis에서 버전 조회. 없으면 현재 시각으로 초기화(SET NX). Redis 미연결이면 프로세스 기동 시각."""
+    fallback = _state["version"] or str(int(time.time()))
+    if not redis_client.client:
+        return fallback
+    try:
+        value = redis_client.client.get(CATALOG_VERSION_KEY)
+        if value is None:
+            redis_client.client.set(CATALOG_VERSION_KEY, fallback, nx=True)
+            value = redis_client.client.get(CATALOG_VERSION_KEY) or fallback
+        return str(value)
+    except Exception as e:
+        logger.debug("catalog version read failed: %s", e)
+        return fallback
+
+
+def get_catalog_version() -> str:
+    """현재 카탈로그 데이터 버전 (프로세스 내 캐시, 주기적으로 Redis 재확인)."""
+    now = time.time()
+    refresh = get_settings().CATALOG_VERSION_REFRESH_SECONDS
+    with _lock:
+        if _state["version"] is not None and now - _state["checked_at"] < refresh:
+            return _state["version"]
+    version = _load_version()
+    with _lock:
+        _state["version"] = version
+        _state["checked_at"] = now
+    return version
+
+
+def bump_catalog_version() -> str:
+    """데이터 적재·admin 동기화 후 호출. 모든 카탈로그 ETag를 무효화한다."""
+    version: Optional[str] = None
+    if redis_client.client:
+        try:
+            current = redis_client.client.get(CATALOG_VERSION_KEY)
+            # 시각 기반 초기값보다 항상 커지도록 max(now, current+1)
+            version = str(max(int(time.time()), int(current or 0) + 1))
+            redis_client.client.set(CATALOG_VERSION_KEY, version)
+        except Exception as e:
+            logger.warning("catalog version bump failed: %s", e)
+            version = None
+    if version is None:
+        version = str(max(int(time.time()), int(_state["version"] or 0) + 1))
+    with _lock:
+        _state["version"] = version
+        _state["checked_at"] = time.time()
+    logger.info("Catalog data version bumped to %s", version)
+    return version
+
+
+def catalog_etag_for_path(path: str, query: str = "") -> Optional[str]:
+    """API prefix를 포함한 요청 경로가 카탈로그 엔드포인트면 ETag, 아니면 None."""
+    prefix = (get_settings().API_V1_PREFIX or "/api/v1").rstrip("/")
+    path = (path or "").rstrip("/")
+    if not path.startswith(prefix):
+        return None
+    rest = path[len(prefix):].lstrip("/")
+    return catalog_etag(rest, query) if is_catalog_path(rest) else None
+
+
+def catalog_etag(path: str, query: str = "") -> str:
+    """카탈로그 버전 + 경로/쿼리 해시로 weak ETag 생성."""
+    h = hashlib.blake2b(f"{path}?{query}".encode("utf-8"), digest_size=6).hexdigest()
+    return f'W/"c{get_catalog_version()}-{h}"'
@@ -0,0 +1,280 @@
+"""
+DB 커넥션 풀·쿼리 계측 (프로세스 내 누적).
+
+- 풀 checkout 대기 시간: 풀에서 커넥션을 받기까지 걸린 시간 (풀 고갈 대기 + pre_ping + 신규 연결 포함).
+  풀 크기가 부족하면 여기서 먼저 드러난다. checkout 시점의 사용 중 커넥션 수·overflow 최대치, 타임아웃 횟수도 기록.
+- 쿼리 시간: cursor execute 전후 (before/after_cursor_execute 이벤트). 엔진별(sync=psycopg2, async=asyncpg) 합계와
+  statement 지문(리터럴 → ?, 공백 정리)별 count/avg/max.
+- 엔드포인트별 쿼리 수: DbRequestMetricsMiddleware가 요청마다 카운터를 contextvar로 걸어 두고, 끝나면 라우트 템플릿
+  (예: GET /api/v1/certs/{qual_id}) 단위로 합산. 요청당 DB_QUERY_COUNT_WARN 이상이면 경고 로그 (N+1 회귀 감지).
+  contextvar를 복사하지 않는 스레드(ThreadPoolExecutor 등)에서 실행된 쿼리는 엔진·statement 합계에만 들어간다.
+- 이름 붙은 핫 statement(app.utils.sql_registry)의 실행·prepare 횟수도 함께 내보낸다.
+- get_db_metrics(): admin JSON, render_prometheus(): Prometheus text exposition format.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# statement 지문 종류 상한 (초과분은 "<other>"로 합산)
+_MAX_STATEMENTS = 300
+_FINGERPRINT_SCAN = 2000
+_FINGERPRINT_MAX = 240
+_OTHER_STATEMENT = "<other>"
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WS_RE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_metrics: Dict[str, Dict[str, Any]] = {}
+_statements: Dict[str, Dict[str, Any]] = {}
+_endpoints: Dict[str, Dict[str, float]] = {}
+_engines: Dict[str, Any] = {}
+
+
+class _RequestQueries:
+    __slots__ = ("count", "ms")
+
+    def __init__(self):
+        self.count = 0
+        self.ms = 0.0
+
+
+_request_queries: contextvars.ContextVar[Optional[_RequestQueries]] = contextvars.ContextVar(
+    "db_request_queries", default=None
+)
+
+
+def _acc() -> Dict[str, float]:
+    return {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+
+def _add(acc: Dict[str, float], ms: float) -> None:
+    acc["count"] += 1
+    acc["total_ms"] += ms
+    if ms > acc["max_ms"]:
+        acc["max_ms"] = ms
+
+
+def _engine(engine_name: str) -> Dict[str, Any]:
+    st = _metrics.get(engine_name)
+    if st is None:
+        st = _metrics[engine_name] = {
+            "checkout": _acc(),
+            "query": _acc(),
+            "checkout_timeouts": 0,
+            "in_use_peak": 0,
+            "overflow_peak": 0,
+        }
+    return st
+
+
+@lru_cache(maxsize=1024)
+def statement_fingerprint(statement: str) -> str:
+    """SQL 문자열 → 지문 (리터럴 → ?, 공백 한 칸, 앞부분만)."""
+    s = _WS_RE.sub(" ", statement[:_FINGERPRINT_SCAN]).strip()
+    return _LITERAL_RE.sub("?", s)[:_FINGERPRINT_MAX]
+
+
+def register_engine(engine_name: str, engine) -> None:
+    """풀 게이지(사용 중·overflow)를 읽을 엔진 등록 (app.database가 엔진 생성 시 호출). dispose 후 새 풀도 따라간다."""
+    _engines[engine_name] = engine
+
+
+def record_checkout(engine_name: str, ms: float, in_use: int = 0, overflow: int = 0) -> None:
+    with _lock:
+        st = _engine(engine_name)
+        _add(st["checkout"], ms)
+        st["in_use_peak"] = max(st["in_use_peak"], in_use)
+        st["overflow_peak"] = max(st["overflow_peak"], overflow)
+
+
+def record_checkout_timeout(engine_name: str) -> None:
+    with _lock:
+        _engine(engine_name)["checkout_timeouts"] += 1
+
+
+def record_query(engine_name: str, ms: float, statement: Optional[str] = None) -> None:
+    fp = statement_fingerprint(statement) if statement else _OTHER_STATEMENT
+    req = _request_queries.get()
+    with _lock:
+        _add(_engine(engine_name)["query"], ms)
+        acc = _statements.get(fp)
+        if acc is None:
+            if len(_statements) >= _MAX_STATEMENTS:
+                fp = _OTHER_STATEMENT
+            acc = _statements.get(fp)
+            if acc is None:
+                acc = _statements[fp] = dict(_acc(), engine=engine_name)
+        _add(acc, ms)
+        if req is not None:
+            req.count += 1
+            req.ms += ms
+
+
+def _record_endpoint(key: str, req: _RequestQueries) -> None:
+    with _lock:
+        st = _endpoints.get(key)
+        if st is None:
+            st = _endpoints[key] = {"requests": 0, "queries": 0, "max_queries": 0, "query_ms": 0.0}
+        st["requests"] += 1
+        st["queries"] += req.count
+        st["max_queries"] = max(st["max_queries"], req.count)
+        st["query_ms"] += req.ms
+    warn_at = get_settings().DB_QUERY_COUNT_WARN
+    if warn_at and req.count >= warn_at:
+        logger.warning("High query count: %s ran %d queries (%.1fms)", key, req.count, req.ms)
+
+
+class DbRequestMetricsMiddleware:
+    """요청 1건의 쿼리 수·시간을 라우트 템플릿 단위로 집계 (pure ASGI — 스트리밍 본문 중 쿼리도 포함)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        req = _RequestQueries()
+        token = _request_queries.set(req)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_queries.reset(token)
+            route = scope.get("route")
+            if route is not None and req.count:
+                _record_endpoint(f"{scope.get('method', '')} {getattr(route, 'path', scope['path'])}", req)
+
+
+def _summary(acc: Dict[str, float]) -> dict:
+    count = int(acc["count"])
+    return {
+        "count": count,
+        "avg_ms": round(acc["total_ms"] / count, 3) if count else 0.0,
+        "max_ms": round(acc["max_ms"], 3),
+        "total_ms": round(acc["total_ms"], 3),
+    }
+
+
+def _pool_status() -> Dict[str, dict]:
+    status = {}
+    for name, engine in list(_engines.items()):
+        try:
+            pool = engine.pool
+            status[name] = {
+                "size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": getattr(pool, "_max_overflow", None),
+            }
+        except Exception as e:
+            status[name] = {"error": str(e)}
+    return status
+
+
+def get_db_metrics(top_statements: int = 30) -> Dict[str, Any]:
+    """
+    pools: 현재 풀 게이지, engines: checkout/query 누적·peak·timeout,
+    statements: total_ms 상위 지문, endpoints: 라우트별 요청 수·평균/최대 쿼리 수.
+    """
+    with _lock:
+        engines = {
+            name: {
+                "checkout": _summary(st["checkout"]),
+                "query": _summary(st["query"]),
+                "checkout_timeouts": st["checkout_timeouts"],
+                "in_use_peak": st["in_use_peak"],
+                "overflow_peak": st["overflow_peak"],
+            }
+            for name, st in _metrics.items()
+        }
+        statements: List[dict] = [
+            dict(_summary(acc), statement=fp, engine=acc["engine"])
+            for fp, acc in sorted(_statements.items(), key=lambda kv: -kv[1]["total_ms"])[:top_statements]
+        ]
+        endpoints = {
+            key: {
+                "requests": int(st["requests"]),
+                "avg_queries": round(st["queries"] / st["requests"], 2) if st["requests"] else 0.0,
+                "max_queries": int(st["max_queries"]),
+                "avg_query_ms": round(st["query_ms"] / st["requests"], 3) if st["requests"] else 0.0,
+            }
+            for key, st in sorted(_endpoints.items())
+        }
+    from app.utils.sql_registry import get_hot_statement_stats
+
+    return {
+        "pools": _pool_status(),
+        "engines": engines,
+        "statements": statements,
+        "hot_statements": get_hot_statement_stats(),
+        "endpoints": endpoints,
+    }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def render_prometheus() -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_str = ",".join(f'{k}="{_label(str(v))}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_str}}} {value}")
+
+    pools = _pool_status()
+    with _lock:
+        engines = {name: {k: (dict(v) if isinstance(v, dict) else v) for k, v in st.items()} for name, st in _metrics.items()}
+        statements = {fp: dict(acc) for fp, acc in _statements.items()}
+        endpoints = {key: dict(st) for key, st in _endpoints.items()}
+
+    for gauge in ("size", "in_use", "idle", "overflow"):
+        family(
+            f"certweb_db_pool_{gauge}", "gauge", f"Connection pool {gauge.replace('_', ' ')}",
+            [({"engine": n}, p[gauge]) for n, p in pools.items() if gauge in p],
+        )
+    family("certweb_db_pool_in_use_peak", "gauge", "Peak connections in use at checkout",
+           [({"engine": n}, st["in_use_peak"]) for n, st in engines.items()])
+    family("certweb_db_pool_checkout_timeouts_total", "counter", "Pool checkout timeouts",
+           [({"engine": n}, st["checkout_timeouts"]) for n, st in engines.items()])
+    for kind in ("checkout", "query"):
+        family(f"certweb_db_{kind}_seconds_total", "counter", f"Total {kind} time",
+               [({"engine": n}, round(st[kind]["total_ms"] / 1000.0, 6)) for n, st in engines.items()])
+        family(f"certweb_db_{kind}_total", "counter", f"{kind.capitalize()} count",
+               [({"engine": n}, int(st[kind]["count"])) for n, st in engines.items()])
+    family("certweb_db_statement_seconds_total", "counter", "Total time per statement fingerprint",
+           [({"engine": acc["engine"], "statement": fp}, round(acc["total_ms"] / 1000.0, 6))
+            for fp, acc in statements.items()])
+    family("certweb_db_statement_total", "counter", "Executions per statement fingerprint",
+           [({"engine": acc["engine"], "statement": fp}, int(acc["count"])) for fp, acc in statements.items()])
+    from app.utils.sql_registry import get_hot_statement_stats
+
+    hot = get_hot_statement_stats()
+    family("certweb_db_hot_statement_executions_total", "counter", "Executions per named hot statement",
+           [({"name": n}, st["executions"]) for n, st in hot.items()])
+    family("certweb_db_hot_statement_prepares_total", "counter", "Server-side PREPAREs per named hot statement",
+           [({"name": n}, st["prepares"]) for n, st in hot.items()])
+    family("certweb_db_hot_statement_seconds_total", "counter", "Total time per named hot statement",
+           [({"name": n}, round(st["total_ms"] / 1000.0, 6)) for n, st in hot.items()])
+    family("certweb_db_endpoint_requests_total", "counter", "Requests that ran at least one query",
+           [({"endpoint": key}, int(st["requests"])) for key, st in endpoints.items()])
+    family("certweb_db_endpoint_queries_total", "counter", "Queries per endpoint",
+           [({"endpoint": key}, int(st["queries"])) for key, st in endpoints.items()])
+    family("certweb_db_endpoint_max_queries", "gauge", "Max queries in a single request",
+           [({"endpoint": key}, int(st["max_queries"])) for key, st in endpoints.items()])
+    return "\n".join(lines) + "\n"
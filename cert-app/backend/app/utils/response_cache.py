@@ -0,0 +1,81 @@
+"""
+응답 바이트 캐시 (preserialized response cache).
+
+캐시 적중 시 Redis 값 → orjson 역직렬화 → Pydantic 재생성 → FastAPI 재검증·재직렬화의 3단계 변환 대신,
+최종 JSON 본문을 그대로 저장해 두었다가 Response(content=...)로 바로 반환한다 (fast_certs.get_cert_fast와 동일 방식).
+
+- ETag: 본문 해시 기반 weak ETag (GZip 미들웨어가 본문을 변형해도 의미가 유지되도록 W/ 사용).
+- If-None-Match 일치 시 본문 없이 304.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.redis_client import redis_client
+
+JSON_MEDIA_TYPE = "application/json"
+
+# certs 상세 캐시 키. 형식 변경(응답 바이트 저장) 시 v2로 분리 — redis_sync_worker도 이 키를 무효화한다.
+CERT_DETAIL_CACHE_KEY = "certs:detail:v2:{qual_id}"
+
+
+def etag_for(body: str | bytes) -> str:
+    """본문 해시로 weak ETag 생성."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더에 etag(또는 *)가 있으면 True. W/ 접두어는 약한 비교로 무시."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    target = etag[2:] if etag.startswith("W/") else etag
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == target:
+            return True
+    return False
+
+
+def json_bytes_response(request: Request, body: str | bytes, etag: Optional[str] = None) -> Response:
+    """직렬화된 JSON 본문으로 응답. If-None-Match 일치 시 304."""
+    etag = etag or etag_for(body)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers={"ETag": etag})
+
+
+def get_cached_response(request: Request, key: str) -> Optional[Response]:
+    """캐시된 응답 바이트가 있으면 역직렬화 없이 Response로 반환, 없으면 None."""
+    body = redis_client.get_raw(key)
+    if not body:
+        return None
+    return json_bytes_response(request, body)
+
+
+def serialize_payload(payload: Any) -> bytes:
+    """Pydantic 모델(또는 모델 리스트)·dict를 최종 JSON 바이트로 직렬화."""
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json")
+    elif isinstance(payload, list):
+        payload = [p.model_dump(mode="json") if isinstance(p, BaseModel) else p for p in payload]
+    return orjson.dumps(payload, default=str)
+
+
+def cache_and_respond(request: Request, key: str, payload: Any, ttl: int) -> Response:
+    """payload를 한 번만 직렬화해 캐시에 저장하고, 같은 바이트로 응답."""
+    body = serialize_payload(payload)
+    redis_client.set_raw(key, body, ttl)
+    return json_bytes_response(request, body)
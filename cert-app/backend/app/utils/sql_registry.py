@@ -0,0 +1,166 @@
+"""
+핫 SQL 레지스트리 (이름 붙은 고정 statement).
+
+RAG·카탈로그 경로의 자주 도는 쿼리(벡터 유사도 검색, 계층 인덱스, soft score 메타데이터, 집계 통계 등)는
+호출마다 text()(때로는 .format())로 SQL을 다시 만들었다. 여기서는 이름과 SQL 텍스트를 한 번만 만들어 두고
+실행 횟수·시간을 이름별로 집계한다.
+
+- SQL 텍스트가 고정되므로 SQLAlchemy compiled cache·asyncpg statement cache(ASYNC_DB_STATEMENT_CACHE_SIZE > 0)가
+  항상 적중한다.
+- DB_SERVER_PREPARE_ENABLE=True 이면 동기(psycopg2) 경로는 커넥션마다 한 번 `PREPARE name AS ...` 후
+  `EXECUTE name(...)`로 실행해 Postgres 파싱·플래닝을 생략한다. prepared statement는 서버 세션에 묶이므로
+  직접 연결(5432)·session 모드 pooler에서만 켠다 (Supabase transaction pooler 6543에서는 끌 것).
+  PREPARE만 커넥션당 1회 SAVEPOINT 안에서 실행하고(EXECUTE는 savepoint 없이), prepare 관련 오류
+  (_PREPARE_UNSUPPORTED)일 때만 프로세스 전체에서 끄고 일반 실행으로 넘어간다. 그 밖의 오류(타임아웃·취소·
+  잘못된 파라미터 등)는 재시도 없이 그대로 전파한다.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# :name 바인드 (::type 캐스트 제외)
+_BIND_RE = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_lock = threading.Lock()
+_registry: Dict[str, "HotStatement"] = {}
+_state = {"server_prepare_disabled": False}
+# 서버 prepare를 쓸 수 없는 연결(transaction pooler 등)의 SQLSTATE → 프로세스 전체에서 끔
+# (duplicate_prepared_statement, invalid_sql_statement_name, feature_not_supported)
+_PREPARE_UNSUPPORTED = frozenset({"42P05", "26000", "0A000"})
+# 이 statement만 prepare 불가 (indeterminate_datatype, ambiguous_parameter)
+_PREPARE_STATEMENT_ERRORS = frozenset({"42P18", "42P08"})
+
+
+class HotStatement:
+    """이름 붙은 고정 SQL. execute()/execute_async()가 Session/AsyncSession.execute를 대신한다."""
+
+    def __init__(self, name: str, sql: str):
+        if not _NAME_RE.match(name):
+            raise ValueError(f"invalid statement name: {name}")
+        self.name = name
+        self.sql = sql
+        self.clause = text(sql)
+        self.param_names: List[str] = list(dict.fromkeys(_BIND_RE.findall(sql)))
+        positions = {p: i + 1 for i, p in enumerate(self.param_names)}
+        self._prepare_sql = f"PREPARE {name} AS " + _BIND_RE.sub(lambda m: f"${positions[m.group(1)]}", sql)
+        args = ", ".join(f":{p}" for p in self.param_names)
+        self._execute_clause = text(f"EXECUTE {name}({args})" if args else f"EXECUTE {name}")
+        # psycopg2는 파라미터 없는 실행에서도 %를 해석할 수 있어 서버 prepare 대상에서 제외
+        self.preparable = "%" not in sql
+        self.executions = 0
+        self.prepares = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _record(self, ms: float) -> None:
+        with _lock:
+            self.executions += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def _prepare(self, conn, db) -> bool:
+        """커넥션당 1회 PREPARE (SAVEPOINT 안 — 실패해도 호출부 트랜잭션은 유지). 사용할 수 없으면 False."""
+        prepared = conn.info.setdefault("hot_prepared", set())
+        if self.name in prepared:
+            return True
+        try:
+            with db.begin_nested():
+                conn.exec_driver_sql(self._prepare_sql)
+        except DBAPIError as e:
+            code = _sqlstate(e)
+            if code in _PREPARE_UNSUPPORTED:
+                _disable_server_prepare(self.name, e)
+                return False
+            if code in _PREPARE_STATEMENT_ERRORS:
+                # 파라미터 타입을 추론할 수 없는 SQL — 이 statement만 일반 실행
+                self.preparable = False
+                logger.info("Hot statement %s is not preparable: %s", self.name, e)
+                return False
+            raise
+        prepared.add(self.name)
+        with _lock:
+            self.prepares += 1
+        return True
+
+    def execute(self, db, params: Optional[Dict[str, Any]] = None):
+        """동기 Session 실행 (서버 prepare 활성 시 PREPARE/EXECUTE)."""
+        t0 = time.perf_counter()
+        try:
+            if self.preparable and _server_prepare_enabled():
+                conn = db.connection()
+                if self._prepare(conn, db):
+                    try:
+                        return conn.execute(self._execute_clause, params or {})
+                    except DBAPIError as e:
+                        # prepared statement가 사라진 경우(pooler가 백엔드를 바꿈 등): 이후 요청은 일반 실행.
+                        # 트랜잭션이 이미 실패 상태라 같은 쿼리를 재시도하지 않고 호출부로 전파한다.
+                        if _sqlstate(e) in _PREPARE_UNSUPPORTED:
+                            _disable_server_prepare(self.name, e)
+                            conn.info.get("hot_prepared", set()).discard(self.name)
+                        raise
+            return db.execute(self.clause, params or {})
+        finally:
+            self._record((time.perf_counter() - t0) * 1000.0)
+
+    async def execute_async(self, db, params: Optional[Dict[str, Any]] = None):
+        """AsyncSession 실행 (asyncpg가 statement cache로 prepare)."""
+        t0 = time.perf_counter()
+        try:
+            return await db.execute(self.clause, params or {})
+        finally:
+            self._record((time.perf_counter() - t0) * 1000.0)
+
+    def stats(self) -> dict:
+        with _lock:
+            return {
+                "executions": self.executions,
+                "prepares": self.prepares,
+                "avg_ms": round(self.total_ms / self.executions, 3) if self.executions else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "total_ms": round(self.total_ms, 3),
+            }
+
+
+def _sqlstate(e: DBAPIError) -> Optional[str]:
+    orig = getattr(e, "orig", None)
+    return getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+
+
+def _disable_server_prepare(name: str, e: Exception) -> None:
+    _state["server_prepare_disabled"] = True
+    logger.warning("Server-side prepare disabled after %s failed: %s", name, e)
+
+
+def _server_prepare_enabled() -> bool:
+    return get_settings().DB_SERVER_PREPARE_ENABLE and not _state["server_prepare_disabled"]
+
+
+def hot_statement(name: str, sql: str) -> HotStatement:
+    """이름으로 statement 등록 (같은 이름 재등록 시 기존 객체 반환, SQL이 다르면 오류)."""
+    with _lock:
+        stmt = _registry.get(name)
+        if stmt is None:
+            stmt = _registry[name] = HotStatement(name, sql)
+        elif stmt.sql != sql:
+            raise ValueError(f"hot statement {name} registered with different SQL")
+        return stmt
+
+
+def get_hot_statement_stats() -> Dict[str, dict]:
+    """이름 → {executions, prepares, avg_ms, max_ms, total_ms}."""
+    with _lock:
+        statements = list(_registry.values())
+    return {s.name: s.stats() for s in sorted(statements, key=lambda s: s.name)}
@@ -0,0 +1,136 @@
+"""
+파이프라인 단계별 memo 캐시 + 단계 타이밍.
+
+하이브리드 추천처럼 여러 단계(전공 후보, RAG 후보, 점수화, 사유 생성)로 이뤄진 요청에서
+- StageCache: 단계 결과를 단계 고유 키(예: 전공명만, 관심사 질의만)로 프로세스 내 TTL LRU에 보관.
+  전체 응답 캐시(모든 파라미터 조합 키)와 달리, 전공이 같고 관심사·취득 자격증만 다른 요청도 재사용한다.
+- StageTimer: 요청 1건의 단계별 소요 시간·캐시 적중 여부. Server-Timing 헤더 문자열로도 내보낸다.
+- get_stage_stats(): 프로세스 누적 단계별 호출 수/평균·최대 ms/캐시 적중 수 (admin 모니터링용).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class StageCache:
+    """Thread-safe TTL LRU. get()은 (적중 여부, 값)을 반환 (None 값도 캐시 가능)."""
+
+    def __init__(self, name: str, max_size: int = 256, ttl_seconds: float = 600.0):
+        self.name = name
+        self._cache: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or time.time() - entry[1] > self._ttl:
+                if entry is not None:
+                    del self._cache[key]
+                self._misses += 1
+                return False, None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return True, entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._cache[key] = (value, time.time())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._cache),
+                "max_size": self._max_size,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate_percent": round(self._hits / total * 100, 2) if total else 0.0,
+            }
+
+
+_stats_lock = threading.Lock()
+_stage_stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+
+def _record(pipeline: str, stage: str, ms: float, cache_hit: Optional[bool]) -> None:
+    with _stats_lock:
+        st = _stage_stats.setdefault(pipeline, {}).setdefault(
+            stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "cache_hits": 0}
+        )
+        st["count"] += 1
+        st["total_ms"] += ms
+        st["max_ms"] = max(st["max_ms"], ms)
+        if cache_hit:
+            st["cache_hits"] += 1
+
+
+def get_stage_stats() -> Dict[str, Dict[str, dict]]:
+    """파이프라인 → 단계 → {count, avg_ms, max_ms, cache_hits} 누적 통계."""
+    with _stats_lock:
+        return {
+            pipeline: {
+                stage: {
+                    "count": int(st["count"]),
+                    "avg_ms": round(st["total_ms"] / st["count"], 2) if st["count"] else 0.0,
+                    "max_ms": round(st["max_ms"], 2),
+                    "cache_hits": int(st["cache_hits"]),
+                }
+                for stage, st in stages.items()
+            }
+            for pipeline, stages in _stage_stats.items()
+        }
+
+
+class StageTimer:
+    """
+    요청 1건의 단계별 소요 시간(ms)과 캐시 적중 여부. lap(name)은 직전 lap 이후 경과 시간을 name 단계로 기록하고
+    누적 통계에도 반영한다 (단계 경계에서 한 줄씩 호출).
+    """
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.timings: Dict[str, float] = {}
+        self.cache_hits: Dict[str, bool] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, name: str) -> float:
+        now = time.perf_counter()
+        ms = (now - self._last) * 1000.0
+        self._last = now
+        self.timings[name] = self.timings.get(name, 0.0) + ms
+        _record(self.pipeline, name, ms, self.cache_hits.get(name))
+        return ms
+
+    def mark_cache(self, name: str, hit: bool) -> None:
+        self.cache_hits[name] = hit
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "timings_ms": {k: round(v, 2) for k, v in self.timings.items()},
+            "cache_hits": dict(self.cache_hits),
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (예: major_candidates;dur=1.2;desc="hit", rag;dur=820.4)."""
+        parts = []
+        for name, ms in self.timings.items():
+            part = f"{name};dur={ms:.1f}"
+            if name in self.cache_hits:
+                part += f';desc="{"hit" if self.cache_hits[name] else "miss"}"'
+            parts.append(part)
+        return ", ".join(parts)
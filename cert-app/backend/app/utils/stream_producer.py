@@ -1,24 +1,33 @@
-
 import logging
 from app.redis_client import redis_client
 
 logger = logging.getLogger("stream_producer")
 
+# Redis Streams: 워커가 내려가 있어도 메시지가 보존되고, consumer group으로 재처리(replay) 가능
+CERT_UPDATES_STREAM = "cert_updates"
+CERT_UPDATES_GROUP = "cert_sync"
+# 스트림 길이 상한 (XADD MAXLEN ~). ACK 여부와 무관하게 오래된 항목부터 트림.
+CERT_UPDATES_MAXLEN = 100_000
+
+
 class StreamProducer:
     """
-    Producer for real-time certification updates using Redis Pub/Sub.
+    Producer for real-time certification updates using Redis Streams.
     (Kafka dependency removed for 'Pay-as-you-NOT' optimization)
     """
     def __init__(self):
-        self.channel = "cert_updates"
+        self.stream = CERT_UPDATES_STREAM
         logger.info("Redis Stream Producer initialized.")
 
     def produce_update(self, data: dict):
-        """Send update to Redis channel."""
+        """Append update to the cert_updates stream."""
         try:
-            receivers = redis_client.publish(self.channel, data)
-            logger.info(f"Published update for cert {data.get('qual_id')} to {receivers} listeners.")
+            entry_id = redis_client.xadd(self.stream, data, maxlen=CERT_UPDATES_MAXLEN)
+            if entry_id:
+                logger.info(f"Queued update for cert {data.get('qual_id')} as {entry_id}.")
+            else:
+                logger.warning(f"Update for cert {data.get('qual_id')} was not queued (Redis unavailable).")
         except Exception as e:
-            logger.error(f"Failed to publish redis message: {e}")
+            logger.error(f"Failed to append redis stream message: {e}")
 
 stream_producer = StreamProducer()
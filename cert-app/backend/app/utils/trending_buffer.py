@@ -0,0 +1,148 @@
+"""
+Trending 카운터 write-behind 버퍼.
+
+목록 검색·상세 조회마다 `trending_certs` 단일 키에 ZINCRBY + ZREMRANGEBYRANK를 보내던 방식 대신,
+프로세스 내에서 qual_id별로 증분을 합산해 두었다가 주기적으로 한 번의 파이프라인으로 반영한다.
+
+- 점수는 지수 반감기(TRENDING_HALF_LIFE_HOURS)로 감쇠 → 오래된 조회수보다 최근 트래픽이 우선.
+- 감쇠는 TRENDING_DECAY_INTERVAL마다 1회, 여러 워커 중 Redis 락을 잡은 쪽만 적용(중복 감쇠 방지).
+- 플러시 루프는 main.py lifespan에서 기동. 대기 키가 TRENDING_MAX_PENDING을 넘으면 add()는 플러시 루프를
+  깨우기만 한다 (요청 경로·이벤트 루프에서 Redis 왕복 없음). 루프가 없는 프로세스(스크립트 등)만 인라인 플러시.
+- 반영이 실패하면 증분을 버퍼에 되돌리고 감쇠 락도 해제해, 이번 감쇠는 다음 플러시에서 다시 시도된다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+TRENDING_KEY = "trending_certs"
+_DECAY_LOCK_KEY = "trending_certs:decay_lock"
+
+
+class TrendingBuffer:
+    """qual_id -> 누적 증분. add()는 메모리만 건드리고, flush()가 Redis에 일괄 반영."""
+
+    def __init__(self, key: str = TRENDING_KEY):
+        self.key = key
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._flushes = 0
+        self._flushed_increments = 0
+        self._decays = 0
+        # run_flush_loop 실행 중일 때만 설정 (add()가 다른 스레드에서 깨울 수 있도록 루프도 보관)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def add(self, member: str, amount: float = 1.0) -> None:
+        """증분을 버퍼에 합산. 대기 키가 상한을 넘으면 플러시 루프에 즉시 플러시를 요청."""
+        settings = get_settings()
+        with self._lock:
+            self._pending[member] = self._pending.get(member, 0.0) + amount
+            overflow = len(self._pending) >= settings.TRENDING_MAX_PENDING
+        if overflow:
+            self._request_flush()
+
+    def _request_flush(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            # 플러시 루프가 없는 프로세스(스크립트 등)
+            self.flush()
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # 루프 종료 직후: 종료 시 마지막 플러시가 남은 증분을 반영
+            pass
+
+    def _drain(self) -> Dict[str, float]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    @staticmethod
+    def decay_factor(interval_seconds: float, half_life_hours: float) -> float:
+        """interval 동안의 지수 감쇠 계수 0.5 ** (interval / half_life)."""
+        if half_life_hours <= 0:
+            return 1.0
+        return 0.5 ** (interval_seconds / (half_life_hours * 3600.0))
+
+    def flush(self) -> int:
+        """버퍼를 비우고 한 번의 파이프라인으로 반영. 반영한 member 수 반환 (실패 시 버퍼 복원)."""
+        settings = get_settings()
+        pending = self._drain()
+
+        decay = None
+        if settings.TRENDING_HALF_LIFE_HOURS > 0 and redis_client.try_acquire_lock(
+            _DECAY_LOCK_KEY, settings.TRENDING_DECAY_INTERVAL
+        ):
+            decay = self.decay_factor(settings.TRENDING_DECAY_INTERVAL, settings.TRENDING_HALF_LIFE_HOURS)
+
+        if not pending and decay is None:
+            return 0
+
+        ok = redis_client.flush_trending(
+            self.key,
+            pending,
+            max_members=settings.TRENDING_MAX_MEMBERS,
+            decay_factor=decay,
+        )
+        if not ok:
+            if decay is not None:
+                # 감쇠가 반영되지 않았으므로 락을 풀어 다음 플러시(이 워커 또는 다른 워커)가 다시 적용
+                redis_client.release_lock(_DECAY_LOCK_KEY)
+            if redis_client.client is not None:
+                # 일시 오류: 다음 주기에 재시도하도록 증분 복원
+                with self._lock:
+                    for member, amount in pending.items():
+                        self._pending[member] = self._pending.get(member, 0.0) + amount
+            return 0
+
+        with self._lock:
+            self._flushes += 1
+            self._flushed_increments += len(pending)
+            if decay is not None:
+                self._decays += 1
+        return len(pending)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "flushes": self._flushes,
+                "flushed_members": self._flushed_increments,
+                "decays": self._decays,
+            }
+
+    async def run_flush_loop(self) -> None:
+        """lifespan에서 create_task로 기동. 주기마다 또는 add()의 상한 초과 요청 시 플러시, 취소 시 남은 증분을 마지막으로 반영."""
+        loop = asyncio.get_running_loop()
+        interval = max(0.5, float(get_settings().TRENDING_FLUSH_INTERVAL))
+        wakeup = asyncio.Event()
+        self._loop, self._wakeup = loop, wakeup
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
+                try:
+                    await loop.run_in_executor(None, self.flush)
+                except Exception as e:
+                    logger.warning("Trending flush failed: %s", e)
+        except asyncio.CancelledError:
+            self._loop, self._wakeup = None, None
+            await loop.run_in_executor(None, self.flush)
+            raise
+        finally:
+            self._loop, self._wakeup = None, None
+
+
+trending_buffer = TrendingBuffer()
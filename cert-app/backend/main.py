@@ -13,6 +13,7 @@ from app.config import get_settings
 from app.database import check_database_connection
 from app.redis_client import redis_client
 from app.logging_config import log_audit
+from app.utils.catalog_version import catalog_etag_for_path
 from app.api import (
     certs,
     recommendations,
@@ -136,6 +137,7 @@ async def lifespan(app: FastAPI):
                 # 기존 flush_all() 대신 FastSyncService가 자체적으로
                 # 프로젝트 관련 key-prefix만 덮어쓰도록 설계되어 있어
                 # 여기서는 별도의 FLUSH를 호출하지 않는다.
+                # 청크 단위 + digest 비교라 재시작 시 변경된 자격증만 기록된다.
                 await loop.run_in_executor(None, FastSyncService.sync_all_to_redis, db)
             finally:
                 db.close()
@@ -187,10 +189,96 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(_background_hierarchical_prewarm())
 
+    async def _background_label_index_prewarm():
+        """intent/query_type/dense_slot 라벨 벡터 인덱스 선적재 — 첫 재질의에서의 라벨 테이블 적재 지연 완화."""
+        await asyncio.sleep(6)
+        try:
+            from app.rag.utils.label_vector_index import prewarm_label_vector_index
+
+            if not settings.LABEL_VECTOR_INDEX_ENABLE:
+                return
+            loop = asyncio.get_running_loop()
+            ok = await loop.run_in_executor(None, prewarm_label_vector_index)
+            if ok:
+                logger.info("Label vector index pre-warm completed.")
+            else:
+                logger.debug("Label vector index pre-warm skipped or failed.")
+        except Exception as e:
+            logger.warning("Label vector index pre-warm task failed: %s", e)
+
+    asyncio.create_task(_background_label_index_prewarm())
+
+    async def _background_candidate_feature_prewarm():
+        """RAG soft score용 후보 피처 스토어 선적재 — 첫 hybrid_retrieve에서의 전체 메타 적재 지연 완화."""
+        await asyncio.sleep(7)
+        try:
+            from app.rag.retrieve.candidate_features import prewarm_candidate_feature_store
+
+            if not settings.CANDIDATE_FEATURE_STORE_ENABLE:
+                return
+            loop = asyncio.get_running_loop()
+            ok = await loop.run_in_executor(None, prewarm_candidate_feature_store)
+            if ok:
+                logger.info("Candidate feature store pre-warm completed.")
+            else:
+                logger.debug("Candidate feature store pre-warm skipped or failed.")
+        except Exception as e:
+            logger.warning("Candidate feature store pre-warm task failed: %s", e)
+
+    asyncio.create_task(_background_candidate_feature_prewarm())
+
+    async def _background_recommendation_matrix_prewarm():
+        """전공 추천 행렬 선구축 — 첫 /recommendations 요청이 ORM 경로로 응답하는 구간을 줄인다."""
+        await asyncio.sleep(3)
+        try:
+            from app.services.recommendation_matrix import prewarm_recommendation_matrix
+
+            loop = asyncio.get_running_loop()
+            ok = await loop.run_in_executor(None, prewarm_recommendation_matrix)
+            if ok:
+                logger.info("Recommendation matrix pre-warm completed.")
+            else:
+                logger.debug("Recommendation matrix pre-warm skipped or failed.")
+        except Exception as e:
+            logger.warning("Recommendation matrix pre-warm task failed: %s", e)
+
+    asyncio.create_task(_background_recommendation_matrix_prewarm())
+
+    async def _background_major_index_prewarm():
+        """전공 인덱스 선구축 — 첫 전공 퍼지 해석이 인덱스 미구축으로 빈 결과가 되는 구간을 줄인다."""
+        await asyncio.sleep(3)
+        try:
+            from app.services.major_index import prewarm_major_index
+
+            loop = asyncio.get_running_loop()
+            ok = await loop.run_in_executor(None, prewarm_major_index)
+            if ok:
+                logger.info("Major index pre-warm completed.")
+            else:
+                logger.debug("Major index pre-warm skipped or failed.")
+        except Exception as e:
+            logger.warning("Major index pre-warm task failed: %s", e)
+
+    asyncio.create_task(_background_major_index_prewarm())
+
+    # Trending write-behind: 요청 경로에서는 메모리에만 합산, 주기적으로 파이프라인 1회 반영
+    from app.utils.trending_buffer import trending_buffer
+    trending_flush_task = asyncio.create_task(trending_buffer.run_flush_loop())
+
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    trending_flush_task.cancel()
+    try:
+        await trending_flush_task
+    except (asyncio.CancelledError, Exception):
+        pass
+
+    await redis_client.close_async_client()
+
+    from app.database import async_engine
+    await async_engine.dispose()
 
 
 # Create FastAPI app
@@ -224,10 +312,27 @@ app = FastAPI(
 
 # ============== Middleware Order (Last added is first to run) ==============
 
-# 4. GZip compression (Innermost)
+# 5. DB 쿼리 수 계측 (Innermost: 라우팅 결과(route)를 보고 엔드포인트별로 집계)
+from app.utils.db_metrics import DbRequestMetricsMiddleware
+
+app.add_middleware(DbRequestMetricsMiddleware)
+
+# 4. GZip compression
 from fastapi.middleware.gzip import GZipMiddleware
+
+
+class _GZipExceptStreamsMiddleware(GZipMiddleware):
+    """NDJSON 스트리밍(/stream) 응답은 압축 버퍼에 묶이지 않고 단계별로 바로 나가도록 GZip 제외."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 app.add_middleware(
-    GZipMiddleware,
+    _GZipExceptStreamsMiddleware,
     minimum_size=1000
 )
 
@@ -265,17 +370,31 @@ async def add_process_time_and_security_headers(request: Request, call_next):
             },
         )
     start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-
-    # HTTP 캐시: 읽기 전용·거의 안 변하는 GET에만 TTL 기반 Cache-Control (egress/재요청 감소)
-    if request.method == "GET" and response.status_code == 200:
+    rest = None
+    if request.method == "GET":
         path = (getattr(request, "url", None) and getattr(request.url, "path", None)) or request.scope.get("path") or ""
         path = (path or "").rstrip("/")
         prefix = (settings.API_V1_PREFIX or "/api/v1").rstrip("/")
         if path.startswith(prefix):
             rest = path[len(prefix) :].lstrip("/")
+
+    response = await call_next(request)
+    # 카탈로그 ETag(데이터 버전 기반). If-None-Match 304는 라우트의 check_catalog_not_modified가 처리
+    catalog_etag = catalog_etag_for_path(request.url.path, request.url.query) if rest is not None else None
+    process_time = time.time() - start_time
+    response.headers["X-Process-Time"] = str(process_time)
+    if catalog_etag and response.status_code in (200, 304):
+        response.headers["ETag"] = catalog_etag
+
+    # HTTP 캐시: 읽기 전용·거의 안 변하는 GET에만 TTL 기반 Cache-Control (egress/재요청 감소)
+    # 카탈로그 응답은 s-maxage로 CDN도 캐시, 만료 후엔 ETag 재검증(304)
+    if rest is not None and response.status_code in (200, 304):
+        if catalog_etag:
+            max_age = settings.CACHE_TTL_LIST if rest.startswith("certs") or rest.startswith("recommendations") else 3600
+            response.headers["Cache-Control"] = (
+                f"public, max-age={max_age}, s-maxage={settings.CATALOG_CDN_MAX_AGE}"
+            )
+        elif response.status_code == 200:
             if rest == "certs":
                 response.headers["Cache-Control"] = f"public, max-age={settings.CACHE_TTL_LIST}"
             elif rest.startswith("certs/filter-options"):
@@ -0,0 +1,324 @@
+"""
+app.rag.retrieve.fusion NumPy 커널이 hybrid의 기존 dict 기반 병합(_rrf_merge_n / _linear_merge(_3) /
+_combsum_merge_n / _combmnz_merge_n)과 같은 순서·같은 점수(비트 단위)를 내는지.
+
+기존 구현은 set 순회 순서로 동점을 정렬했으므로, 참조 결과는 (점수 내림차순, 첫 등장 순)으로 다시 정렬해 비교한다.
+"""
+import random
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from app.rag.retrieve.fusion import combmnz_fuse, combsum_fuse, linear_fuse, rrf_fuse
+
+ScoredList = List[Tuple[str, float]]
+
+
+# ---------------------------------------------------------------------------
+# 기존 dict 구현 (hybrid.py에서 옮겨 온 참조용 — 설정 조회만 인자로 바꿈)
+# ---------------------------------------------------------------------------
+
+
+def _rrf_score_term(k: int, rank: int, p: float) -> float:
+    denom = k + rank
+    if p == 1.0:
+        return 1.0 / denom
+    return 1.0 / (denom ** p)
+
+
+def _rrf_merge_n(lists, weights, k, p):
+    if not lists:
+        return []
+    n = len(lists)
+    w = weights if weights is not None else [1.0 / n] * n
+    if len(w) != n:
+        w = [1.0 / n] * n
+    rank_maps = [{cid: i + 1 for i, (cid, _) in enumerate(lst)} for lst in lists]
+    all_ids = set()
+    for rm in rank_maps:
+        all_ids |= set(rm.keys())
+    scores = [
+        (cid, sum(wi * _rrf_score_term(k, rm.get(cid, 9999), p) for wi, rm in zip(w, rank_maps)))
+        for cid in all_ids
+    ]
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+def _linear_norm_power(val: float, p: float) -> float:
+    if p == 1.0 or val <= 0.0:
+        return val
+    return val ** p
+
+
+def _linear_merge(bm25_list, vector_list, w_bm25, w_vector, p):
+    bm25_scores = {cid: s for cid, s in bm25_list}
+    vec_scores = {cid: s for cid, s in vector_list}
+    all_ids = set(bm25_scores) | set(vec_scores)
+    if not all_ids:
+        return []
+    bm25_vals = [bm25_scores[cid] for cid in all_ids if cid in bm25_scores]
+    vec_vals = [vec_scores[cid] for cid in all_ids if cid in vec_scores]
+    min_b = min(bm25_vals) if bm25_vals else 0.0
+    max_b = max(bm25_vals) if bm25_vals else 1.0
+    min_v = min(vec_vals) if vec_vals else 0.0
+    max_v = max(vec_vals) if vec_vals else 1.0
+    range_b = max_b - min_b if max_b > min_b else 1.0
+    range_v = max_v - min_v if max_v > min_v else 1.0
+    scores = []
+    for cid in all_ids:
+        s_b = bm25_scores.get(cid)
+        s_v = vec_scores.get(cid)
+        norm_b = (s_b - min_b) / range_b if s_b is not None else 0.0
+        norm_v = (s_v - min_v) / range_v if s_v is not None else 0.0
+        norm_b = _linear_norm_power(norm_b, p)
+        norm_v = _linear_norm_power(norm_v, p)
+        scores.append((cid, w_bm25 * norm_b + w_vector * norm_v))
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+def _linear_merge_3(list_a, list_b, list_c, w_a, w_b, w_c, p):
+    sa = {cid: s for cid, s in list_a}
+    sb = {cid: s for cid, s in list_b}
+    sc = {cid: s for cid, s in list_c}
+    all_ids = set(sa) | set(sb) | set(sc)
+    if not all_ids:
+        return []
+    vals_a = [sa[c] for c in all_ids if c in sa]
+    vals_b = [sb[c] for c in all_ids if c in sb]
+    vals_c = [sc[c] for c in all_ids if c in sc]
+
+    def _norm(vals):
+        if not vals:
+            return 0.0, 1.0
+        mn, mx = min(vals), max(vals)
+        r = mx - mn if mx > mn else 1.0
+        return mn, r
+
+    min_a, r_a = _norm(vals_a)
+    min_b, r_b = _norm(vals_b)
+    min_c, r_c = _norm(vals_c)
+    scores = []
+    for cid in all_ids:
+        na = (sa.get(cid, 0) - min_a) / r_a if cid in sa else 0.0
+        nb = (sb.get(cid, 0) - min_b) / r_b if cid in sb else 0.0
+        nc = (sc.get(cid, 0) - min_c) / r_c if cid in sc else 0.0
+        na, nb, nc = _linear_norm_power(na, p), _linear_norm_power(nb, p), _linear_norm_power(nc, p)
+        scores.append((cid, w_a * na + w_b * nb + w_c * nc))
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+def _combsum_merge_n(lists, weights=None):
+    if not lists:
+        return []
+    n = len(lists)
+    w = weights if weights is not None else [1.0 / n] * n
+    if len(w) != n:
+        w = [1.0 / n] * n
+    score_maps: List[Dict[str, float]] = []
+    all_ids: set = set()
+    for lst in lists:
+        sid = {cid: s for cid, s in lst}
+        all_ids |= set(sid.keys())
+        vals = list(sid.values())
+        mn = min(vals) if vals else 0.0
+        mx = max(vals) if vals else 1.0
+        r = (mx - mn) if (mx > mn) else 1.0
+        score_maps.append({cid: (s - mn) / r for cid, s in sid.items()})
+    scores = [(cid, sum(w[i] * score_maps[i].get(cid, 0.0) for i in range(n))) for cid in all_ids]
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+def _combmnz_merge_n(lists, weights=None, norm_mode="minmax", zero_mode="topn", zero_threshold=0.0, rank_exponent=1.0):
+    if not lists:
+        return []
+    n = len(lists)
+    w = weights if weights is not None else [1.0 / n] * n
+    if len(w) != n:
+        w = [1.0 / n] * n
+    score_maps: List[Dict[str, float]] = []
+    all_ids: set = set()
+    norm_mode = (norm_mode or "minmax").lower()
+    zero_mode = (zero_mode or "topn").lower()
+    p = rank_exponent if rank_exponent > 0 else 1.0
+    for lst in lists:
+        sid = {cid: s for cid, s in lst}
+        all_ids |= set(sid.keys())
+        if not sid:
+            score_maps.append({})
+            continue
+        if norm_mode == "rank":
+            norm_map: Dict[str, float] = {}
+            for rank, (cid, _) in enumerate(lst, start=1):
+                norm_map[cid] = 1.0 / ((1.0 + rank) ** p)
+        else:
+            vals = list(sid.values())
+            mn = min(vals) if vals else 0.0
+            mx = max(vals) if vals else 1.0
+            r = (mx - mn) if (mx > mn) else 1.0
+            norm_map = {cid: (s - mn) / r for cid, s in sid.items()}
+        score_maps.append(norm_map)
+    scores: List[Tuple[str, float]] = []
+    for cid in all_ids:
+        if zero_mode == "threshold":
+            count = sum(1 for i in range(n) if cid in score_maps[i] and score_maps[i][cid] >= zero_threshold)
+        else:
+            count = sum(1 for i in range(n) if cid in score_maps[i])
+        if count == 0:
+            continue
+        sum_norm = 0.0
+        for i in range(n):
+            v = score_maps[i].get(cid)
+            if v is None:
+                continue
+            if zero_mode == "threshold" and v < zero_threshold:
+                continue
+            sum_norm += w[i] * v
+        if sum_norm <= 0.0:
+            continue
+        scores.append((cid, count * sum_norm))
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+# ---------------------------------------------------------------------------
+# 입력 생성·비교
+# ---------------------------------------------------------------------------
+
+
+def _random_channels(rng: random.Random, n_channels: int) -> List[ScoredList]:
+    """채널별 점수 내림차순 리스트. 일부 채널은 비어 있고, 같은 chunk_id 중복·동점 점수가 섞인다."""
+    pool = [f"{rng.randint(1, 40)}:{rng.randint(0, 3)}" for _ in range(60)]
+    lists = []
+    for _ in range(n_channels):
+        if rng.random() < 0.15:
+            lists.append([])
+            continue
+        size = rng.randint(1, 30)
+        coarse = rng.random() < 0.5  # 동점이 많이 나오도록 거친 점수
+        scores = sorted(
+            (round(rng.uniform(-1.0, 5.0), 1) if coarse else rng.uniform(-1.0, 5.0) for _ in range(size)),
+            reverse=True,
+        )
+        lists.append([(rng.choice(pool), s) for s in scores])
+    return lists
+
+
+def _first_seen(lists: List[ScoredList]) -> Dict[str, int]:
+    order: Dict[str, int] = {}
+    for lst in lists:
+        for cid, _ in lst:
+            order.setdefault(cid, len(order))
+    return order
+
+
+def _canonical(reference: ScoredList, lists: List[ScoredList]) -> ScoredList:
+    """참조 결과의 동점 순서를 커널 규칙(첫 등장 순)으로 고정."""
+    order = _first_seen(lists)
+    return sorted(reference, key=lambda x: (-x[1], order[x[0]]))
+
+
+def _random_weights(rng: random.Random, n: int) -> Optional[List[float]]:
+    choice = rng.random()
+    if choice < 0.2:
+        return None
+    if choice < 0.3:
+        return [0.5] * (n + 1)  # 길이 불일치 → 균등 가중치
+    return [rng.uniform(0.05, 1.0) for _ in range(n)]
+
+
+def _assert_same(fused: ScoredList, reference: ScoredList, lists: List[ScoredList], top_k: Optional[int]) -> None:
+    expected = _canonical(reference, lists)
+    if top_k is not None:
+        expected = expected[:top_k]
+    assert [cid for cid, _ in fused] == [cid for cid, _ in expected]
+    assert [s for _, s in fused] == [s for _, s in expected]
+
+
+SEEDS = range(40)
+TOP_KS = [None, 0, 1, 5, 1000]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("top_k", TOP_KS)
+@pytest.mark.parametrize("p", [1.0, 1.3])
+def test_rrf_fuse_matches_dict_merge(seed, top_k, p):
+    rng = random.Random(seed)
+    lists = _random_channels(rng, rng.randint(1, 5))
+    weights = _random_weights(rng, len(lists))
+    k = rng.choice([1, 20, 60])
+    _assert_same(rrf_fuse(lists, weights, k, p, top_k=top_k), _rrf_merge_n(lists, weights, k, p), lists, top_k)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("top_k", TOP_KS)
+@pytest.mark.parametrize("p", [1.0, 2.0])
+def test_linear_fuse_matches_dict_merge(seed, top_k, p):
+    rng = random.Random(seed)
+    two = _random_channels(rng, 2)
+    w2 = [rng.uniform(0.05, 1.0) for _ in range(2)]
+    _assert_same(linear_fuse(two, w2, p, top_k=top_k), _linear_merge(*two, *w2, p), two, top_k)
+
+    three = _random_channels(rng, 3)
+    w3 = [rng.uniform(0.05, 1.0) for _ in range(3)]
+    _assert_same(linear_fuse(three, w3, p, top_k=top_k), _linear_merge_3(*three, *w3, p), three, top_k)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("top_k", TOP_KS)
+def test_combsum_fuse_matches_dict_merge(seed, top_k):
+    rng = random.Random(seed)
+    lists = _random_channels(rng, rng.randint(1, 5))
+    weights = _random_weights(rng, len(lists))
+    _assert_same(combsum_fuse(lists, weights, top_k=top_k), _combsum_merge_n(lists, weights), lists, top_k)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("top_k", TOP_KS)
+@pytest.mark.parametrize("norm_mode", ["minmax", "rank"])
+@pytest.mark.parametrize("zero_mode", ["topn", "threshold"])
+def test_combmnz_fuse_matches_dict_merge(seed, top_k, norm_mode, zero_mode):
+    rng = random.Random(seed)
+    lists = _random_channels(rng, rng.randint(1, 5))
+    weights = _random_weights(rng, len(lists))
+    zero_threshold = rng.choice([0.0, 0.05, 0.3, 0.6])
+    rank_exponent = rng.choice([1.0, 0.5, 0.0, -1.0])
+    kwargs = dict(
+        norm_mode=norm_mode,
+        zero_mode=zero_mode,
+        zero_threshold=zero_threshold,
+        rank_exponent=rank_exponent,
+    )
+    _assert_same(
+        combmnz_fuse(lists, weights, top_k=top_k, **kwargs),
+        _combmnz_merge_n(lists, weights, **kwargs),
+        lists,
+        top_k,
+    )
+
+
+@pytest.mark.parametrize(
+    "fuse",
+    [
+        lambda lists: rrf_fuse(lists, None, 60),
+        lambda lists: linear_fuse(lists, None),
+        lambda lists: combsum_fuse(lists),
+        lambda lists: combmnz_fuse(lists),
+    ],
+)
+def test_fuse_empty_inputs(fuse):
+    assert fuse([]) == []
+    assert fuse([[], []]) == []
+
+
+def test_duplicate_chunk_id_uses_last_occurrence():
+    """dict 구성과 같이 채널 안 중복 chunk_id는 마지막 등장의 점수·순위."""
+    lists = [[("a", 3.0), ("b", 2.0), ("a", 1.0)], [("b", 5.0), ("c", 4.0)]]
+    _assert_same(rrf_fuse(lists, None, 60), _rrf_merge_n(lists, None, 60, 1.0), lists, None)
+    _assert_same(combsum_fuse(lists), _combsum_merge_n(lists), lists, None)
+    _assert_same(
+        combmnz_fuse(lists, norm_mode="rank"), _combmnz_merge_n(lists, norm_mode="rank"), lists, None
+    )
@@ -0,0 +1,204 @@
+"""
+배치 soft score(compute_metadata_soft_scores / compute_personalized_soft_scores)가
+hybrid_retrieve의 기존 후보별 루프(compute_metadata_soft_score / compute_personalized_soft_score)와
+후보마다 같은 점수를 내는지 — 피처 스토어 행렬을 쓰는 경로와 즉석 구축 경로 모두.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from app.rag.retrieve import candidate_features
+from app.rag.retrieve.candidate_features import CandidateFeatureStore, QualFeatures, feature_matrix_for
+from app.rag.retrieve.metadata_soft_score import compute_metadata_soft_score, compute_metadata_soft_scores
+from app.rag.retrieve.personalized_soft_score import (
+    compute_personalized_soft_score,
+    compute_personalized_soft_scores,
+    merge_difficulty_into_metadata,
+)
+
+FIELDS = ["정보통신", "전기전자", "경영회계", "건설", "보건의료", "기계"]
+MAJORS = ["컴퓨터공학과", "전자공학과", "경영학과", "건축학과", "간호학과", "기계공학과", "소프트웨어학과"]
+DOMAINS = ["IT", "금융", "의료", "관광", "제조"]
+KEYWORDS = ["데이터", "네트워크", "보안", "회계", "설계", "품질"]
+
+METADATA_CONFIG = {
+    "job_bonus": 0.15,
+    "major_bonus": 0.10,
+    "target_bonus": 0.10,
+    "field_penalty": -0.20,
+    "domain_bonus": 0.15,
+    "domain_keyword_bonus": 0.08,
+    "domain_mismatch_penalty": -0.35,
+}
+
+
+def _pick(rng, pool, lo=0, hi=2):
+    return rng.sample(pool, rng.randint(lo, hi))
+
+
+def _random_meta(rng):
+    return {
+        "main_field": rng.choice(FIELDS + [""]),
+        "ncs_large": rng.choice(FIELDS + [""]),
+        "related_majors": _pick(rng, MAJORS, 0, 3),
+        "main_fields": _pick(rng, FIELDS),
+        "ncs_large_list": _pick(rng, FIELDS),
+        "cert_domain": rng.choice(DOMAINS + [""]),
+        "cert_top_domain": rng.choice(DOMAINS + [""]),
+        "cert_domain_keywords": " ".join(_pick(rng, KEYWORDS, 0, 3)),
+        "domains": _pick(rng, DOMAINS),
+        "is_it": rng.choice([None, True, False]),
+    }
+
+
+def _random_query_slots(rng):
+    slots = {
+        "희망직무": " ".join(_pick(rng, FIELDS, 0, 3)),
+        "관심분야": " ".join(_pick(rng, FIELDS)),
+        "전공": " ".join(_pick(rng, MAJORS)),
+        "도메인": " ".join(_pick(rng, DOMAINS)),
+        "정규화도메인": " ".join(_pick(rng, DOMAINS, 0, 1)),
+        "도메인_키워드": " ".join(_pick(rng, KEYWORDS)),
+        "분야": " ".join(_pick(rng, FIELDS, 0, 1)),
+        "NCS대분류": " ".join(_pick(rng, FIELDS, 0, 1)),
+    }
+    return {k: v for k, v in slots.items() if v or rng.random() < 0.5}
+
+
+def _random_profile(rng, qual_ids):
+    return {
+        "major": rng.choice(MAJORS + [""]),
+        "grade_level": rng.choice([None, 1, 2, 3, 4]),
+        "favorite_field_tokens": _pick(rng, FIELDS),
+        "acquired_qual_ids": rng.sample(qual_ids, rng.randint(0, 3)),
+    }
+
+
+def _random_acquired_meta(rng, profile):
+    return {
+        aid: {
+            "avg_difficulty": rng.choice([None, 3.0, 5.0, 6.5, "bad"]),
+            "main_field": rng.choice(FIELDS),
+            "ncs_large": rng.choice(FIELDS),
+        }
+        for aid in profile["acquired_qual_ids"]
+        if rng.random() < 0.8
+    }
+
+
+@pytest.fixture
+def feature_store(monkeypatch):
+    """무작위 자격증 80건으로 만든 피처 스토어를 현재 스토어로 설정."""
+    rng = random.Random(7)
+    metadata = {}
+    for qid in range(1, 81):
+        meta = _random_meta(rng)
+        meta["features"] = QualFeatures(meta)
+        metadata[qid] = meta
+    store = CandidateFeatureStore("test", metadata)
+    monkeypatch.setattr(candidate_features, "_store", store)
+    return store
+
+
+def _candidates(rng, meta, store_ids):
+    """meta에 있는 qual_id + 스토어에만 있는 qual_id + 어디에도 없는 qual_id + 파싱 실패(None) 후보."""
+    pool = list(meta) * 3 + [q for q in store_ids if q not in meta] + [900, 901, None]
+    return [rng.choice(pool) for _ in range(60)]
+
+
+def _scalar_metadata(query_slots, meta, cand_qids, query_is_it):
+    return [
+        compute_metadata_soft_score(
+            query_slots, meta.get(q, {}) if q is not None else {}, METADATA_CONFIG, query_is_it=query_is_it
+        )
+        for q in cand_qids
+    ]
+
+
+def _scalar_personalized(meta, cand_qids, profile, acquired_meta):
+    return [
+        compute_personalized_soft_score({}, meta.get(q, {}) if q is not None else {}, profile, None, acquired_meta)
+        for q in cand_qids
+    ]
+
+
+def _with_difficulty(rng, meta):
+    merge_difficulty_into_metadata(
+        meta, {q: rng.choice([None, 2.0, 4.0, 5.2, 6.0, 8.5, 9.5, "n/a"]) for q in meta if rng.random() < 0.8}
+    )
+    return meta
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_metadata_soft_scores_match_scalar_with_store_matrix(feature_store, seed):
+    rng = random.Random(seed)
+    meta = feature_store.metadata_for(rng.sample(range(1, 81), 25))
+    cand_qids = _candidates(rng, meta, range(1, 81))
+    query_slots = _random_query_slots(rng)
+    query_is_it = rng.choice([None, True, False])
+
+    batch = compute_metadata_soft_scores(
+        query_slots, feature_matrix_for(meta), cand_qids, METADATA_CONFIG, query_is_it=query_is_it
+    )
+    assert batch.tolist() == _scalar_metadata(query_slots, meta, cand_qids, query_is_it)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_personalized_soft_scores_match_scalar_with_store_matrix(feature_store, seed):
+    rng = random.Random(seed)
+    meta = _with_difficulty(rng, feature_store.metadata_for(rng.sample(range(1, 81), 25)))
+    cand_qids = _candidates(rng, meta, range(1, 81))
+    profile = _random_profile(rng, list(meta) + [900])
+    acquired_meta = _random_acquired_meta(rng, profile)
+
+    batch = compute_personalized_soft_scores(
+        {},
+        feature_matrix_for(meta),
+        cand_qids,
+        profile,
+        None,
+        acquired_meta,
+        difficulties=[(meta.get(q) or {}).get("avg_difficulty") for q in cand_qids],
+    )
+    assert batch.tolist() == _scalar_personalized(meta, cand_qids, profile, acquired_meta)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_soft_scores_match_scalar_without_store(seed):
+    """SQL 폴백 메타(features 없음) → 즉석 구축 행렬."""
+    rng = random.Random(100 + seed)
+    meta = _with_difficulty(rng, {qid: _random_meta(rng) for qid in range(1, 31)})
+    cand_qids = _candidates(rng, meta, [])
+    query_slots = _random_query_slots(rng)
+    profile = _random_profile(rng, list(meta))
+    acquired_meta = _random_acquired_meta(rng, profile)
+    matrix = feature_matrix_for(meta)
+
+    batch = compute_metadata_soft_scores(query_slots, matrix, cand_qids, METADATA_CONFIG, query_is_it=True)
+    assert batch.tolist() == _scalar_metadata(query_slots, meta, cand_qids, True)
+    batch = compute_personalized_soft_scores(
+        {},
+        matrix,
+        cand_qids,
+        profile,
+        None,
+        acquired_meta,
+        difficulties=[(meta.get(q) or {}).get("avg_difficulty") for q in cand_qids],
+    )
+    assert batch.tolist() == _scalar_personalized(meta, cand_qids, profile, acquired_meta)
+
+
+def test_store_matrix_is_restricted_to_metadata_ids(feature_store):
+    """스토어에는 있지만 이번 메타 묶음에 없는 qual_id는 빈 메타와 같이 0.0."""
+    meta = feature_store.metadata_for([1, 2, 3])
+    matrix = feature_matrix_for(meta)
+    assert sorted(matrix.index) == [1, 2, 3]
+    assert matrix.rows([1, 4, None]).tolist()[1:] == [-1, -1]
+
+    # 모든 자격증과 겹치는 질의 → 스토어 전체 행렬이었다면 4..80도 가산됐을 것
+    query_slots = {"희망직무": " ".join(FIELDS), "도메인": " ".join(DOMAINS)}
+    cand_qids = list(range(1, 81))
+    batch = compute_metadata_soft_scores(query_slots, matrix, cand_qids, METADATA_CONFIG)
+    assert batch.tolist() == _scalar_metadata(query_slots, meta, cand_qids, None)
+    assert not np.any(batch[3:])
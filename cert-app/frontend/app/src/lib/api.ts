@@ -260,6 +260,72 @@ export async function getHybridRecommendations(
   );
 }
 
+/** 스트리밍 단계: 전공 매핑 후보 → RAG 융합 순위 → 최종(사유 포함) */
+export type HybridRecommendationStage = 'major_candidates' | 'ranking' | 'final';
+
+/**
+ * hybrid-recommendation 스트리밍(NDJSON). 단계별 잠정 결과를 onStage로 전달하고 최종 응답을 반환.
+ * 스트림을 읽을 수 없는 환경이면 단일 응답 API로 대체.
+ */
+export async function streamHybridRecommendations(
+  major: string,
+  interest: string | undefined,
+  limit: number,
+  token: string | null | undefined,
+  onStage: (stage: HybridRecommendationStage, res: HybridRecommendationResponse) => void
+): Promise<HybridRecommendationResponse> {
+  const query = new URLSearchParams();
+  query.append('major', major);
+  if (interest) query.append('interest', interest);
+  query.append('limit', limit.toString());
+
+  const headers: Record<string, string> = {};
+  if (token) headers['Authorization'] = `Bearer ${token}`;
+  const controller = new AbortController();
+  const timeoutId = setTimeout(() => controller.abort(), AI_RECOMMENDATION_TIMEOUT_MS);
+  try {
+    const response = await fetch(
+      `${BASE_URL}/recommendations/ai/hybrid-recommendation/stream?${query.toString()}`,
+      { headers, signal: controller.signal }
+    );
+    if (!response.ok) {
+      const err = new Error(await getErrorDetail(response));
+      (err as any).status = response.status;
+      throw err;
+    }
+    if (!response.body) {
+      return await getHybridRecommendations(major, interest, limit, token);
+    }
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let final: HybridRecommendationResponse | null = null;
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (value) buffer += decoder.decode(value, { stream: true });
+      let nl: number;
+      while ((nl = buffer.indexOf('\n')) >= 0) {
+        const line = buffer.slice(0, nl).trim();
+        buffer = buffer.slice(nl + 1);
+        if (!line) continue;
+        const event = JSON.parse(line);
+        if (event.stage === 'error') {
+          const err = new Error(event.detail || 'API Error');
+          (err as any).status = event.status;
+          throw err;
+        }
+        onStage(event.stage, event.response);
+        if (event.stage === 'final') final = event.response;
+      }
+      if (done) break;
+    }
+    if (!final) throw new Error('추천 스트림이 완료되지 않았습니다.');
+    return final;
+  } finally {
+    clearTimeout(timeoutId);
+  }
+}
+
 export async function semanticSearch(
   query: string,
   limit: number = 10
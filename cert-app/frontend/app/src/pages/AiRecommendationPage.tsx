@@ -23,7 +23,7 @@ import { Input } from '@/components/ui/input';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Skeleton } from '@/components/ui/skeleton';
-import { getHybridRecommendations, getAvailableMajors, getCertificationsCatalogTotal, FALLBACK_CERT_CATALOG_TOTAL } from '@/lib/api';
+import { getHybridRecommendations, streamHybridRecommendations, getAvailableMajors, getCertificationsCatalogTotal, FALLBACK_CERT_CATALOG_TOTAL } from '@/lib/api';
 import { useRouter } from '@/lib/router';
 import { useAuth } from '@/hooks/useAuth';
 import type { HybridRecommendationResponse } from '@/types';
@@ -245,8 +245,16 @@ export function AiRecommendationPage() {
         setMajorError(null);
         setLoading(true);
         setError(null);
+        setResults(null);
         try {
-            const res = await getHybridRecommendations(major, interest, HYBRID_RECOMMEND_LIMIT, token);
+            // 스트리밍: 전공 매핑 후보·융합 순위를 먼저 표시하고 최종 결과로 교체
+            const res = await streamHybridRecommendations(
+                major,
+                interest,
+                HYBRID_RECOMMEND_LIMIT,
+                token,
+                (_stage, partial) => setResults(partial),
+            );
             setResults(res);
             // 결과를 sessionStorage에 캐싱 → 뒤로가기 시 재호출 없이 복원
             try {
@@ -443,8 +451,8 @@ export function AiRecommendationPage() {
                 </div>
             </div>
 
-            {/* Results Section */}
-            {loading && (
+            {/* Results Section — 스트리밍 중간 결과가 오면 스켈레톤 대신 잠정 목록 표시 */}
+            {loading && !results && (
                 <div className="space-y-6">
                     <div className="rounded-2xl border border-slate-800 bg-slate-900/40 px-4 py-4 text-center space-y-3">
                         <p className="text-sm text-slate-300 font-medium">